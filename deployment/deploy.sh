@@ -128,6 +128,9 @@ echo "Port: $PORT | Host: $HOST | Workers: $WORKERS"
 # Activate virtual environment
 source .venv/bin/activate
 
+# WAL + single-writer queue for multi-worker gunicorn
+export MRPC_DB_PROFILE=${MRPC_DB_PROFILE:-concurrent}
+
 # Start with gunicorn for production
 echo "Starting with gunicorn..."
 exec gunicorn -w $WORKERS -k gthread -b $HOST:$PORT app:server
@@ -174,6 +177,7 @@ Type=exec
 User=ec2-user
 WorkingDirectory=/home/ec2-user/mrpc/${DEPLOY_DIR}
 Environment=PATH=/home/ec2-user/mrpc/${DEPLOY_DIR}/.venv/bin
+Environment=MRPC_DB_PROFILE=concurrent
 ExecStart=/home/ec2-user/mrpc/${DEPLOY_DIR}/.venv/bin/gunicorn -w 4 -k gthread -b 0.0.0.0:3000 app:server
 Restart=always
 RestartSec=3
@@ -4,9 +4,12 @@ from dash import dcc, html, Dash, Output, Input, State
 from dash_auth import BasicAuth
 from callbacks.umap_callbacks import register_umap_callback
 import dash_bootstrap_components as dbc
-from utilities.mrpc_database import MRPCDatabase, setup_mrpc_database_callbacks
+from utilities.mrpc_database import get_database, setup_mrpc_database_callbacks
 from utilities.auth import basic_auth_callback
 from utilities.upload_callbacks import register_upload_callbacks
+from utilities.upload_routes import register_upload_routes
+from utilities.upload_jobs import upload_job_runner
+from utilities.maintenance import tag_registry_reconciler
 import callbacks.metadata_modal_callbacks  # noqa
 from config import REMOTE_STYLES
 from components.sidebar import sidebar
@@ -113,11 +116,17 @@ sidebar_state_store = dcc.Store(id="sidebar-collapsed", data=True)
 # Register UMAP visualization callbacks (ONCE only)
 register_umap_callback(app)
 
-# Register upload page callbacks
+# Register upload page callbacks and the file upload endpoint they reference
 register_upload_callbacks(app)
+register_upload_routes(app)
+
+# Background upload workers (also resume jobs left queued or interrupted by a restart)
+upload_job_runner.start()
+# Periodic check of the incrementally maintained tag registry counts
+tag_registry_reconciler.start()
 
 # Initialize MRPC Database system (single system, no fallbacks to avoid conflicts)
-db = MRPCDatabase()
+db = get_database()
 setup_mrpc_database_callbacks(app)
 # print(" MRPC Database system loaded successfully")
 
@@ -13,20 +13,28 @@ import pandas as pd
 import dash_bootstrap_components as dbc
 from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
-from utilities.backend import get_forum_data
+from utilities.backend import bulk_apply_tags, get_forum_data, get_forum_table_page
+from config import TABLE_PAGE_SIZE
 from components.ai_categories_section_card import load_existing_ai_categories
 from components.ai_questions_section_card import load_existing_ai_questions
 from components.combined_card import create_review_content_card
 from services.table_view import create_table_view
 from components.basic_metadata_content import create_basic_metadata_content
 from components.unified_user_card import create_unified_user_card
-from utilities.backend import load_existing_feedback, save_feedback_to_db
+from utilities.backend import (
+    load_existing_feedback,
+    load_post_detail_bundle,
+    save_feedback_to_db,
+)
 import uuid
 import json
 
 
-def create_unified_user_content(data_id):
-    """Create unified user content combining questions and topics using unified cards"""
+def create_unified_user_content(data_id, existing_questions=None, existing_topics=None):
+    """Create unified user content combining questions and topics using unified cards
+
+    Questions/topics already loaded (e.g. from a post detail bundle) skip the database query.
+    """
     from utilities.mrpc_database import MRPCDatabase
 
     print(f"🔍 DEBUG: Creating unified content for data_id: {data_id}")
@@ -35,9 +43,11 @@ def create_unified_user_content(data_id):
         db = MRPCDatabase()
 
         # Load existing user questions from database
-        existing_questions = db.get_user_questions(data_id)
+        if existing_questions is None:
+            existing_questions = db.get_user_questions(data_id)
         # Load existing user topics from database
-        existing_topics = db.get_category_notes(data_id)
+        if existing_topics is None:
+            existing_topics = db.get_category_notes(data_id)
 
         print(
             f"🔍 DEBUG: Found {len(existing_questions)} questions and {len(existing_topics)} topics"
@@ -370,8 +380,11 @@ def register_umap_callback(app):
         # Extract data for separate AI components
         data_id = customdata[0] if len(customdata) > 0 else "unknown"
 
+        # Everything the sidebar shows for this post, read on one connection
+        bundle = load_post_detail_bundle(data_id)
+
         # Load AI questions from database as individual cards
-        ai_question_cards = load_existing_ai_questions(data_id)
+        ai_question_cards = load_existing_ai_questions(data_id, bundle["ai_questions"])
 
         # If no AI questions in database, fallback to legacy inferred question
         if not ai_question_cards:
@@ -383,6 +396,9 @@ def register_umap_callback(app):
                     display_label="AI Inferred Question",
                     value=inferred_question,
                     card_type="ai_feedback",
+                    existing_feedback=bundle["feedback"].get(
+                        "LLM_inferred_question", {}
+                    ),
                 )
                 ai_question_cards = [fallback_ai_question]
             else:
@@ -395,7 +411,9 @@ def register_umap_callback(app):
                 ]
 
         # Load AI categories from database as individual cards
-        ai_category_cards = load_existing_ai_categories(data_id)
+        ai_category_cards = load_existing_ai_categories(
+            data_id, bundle["ai_categories"]
+        )
 
         # If no AI categories in database, fallback to legacy category
         if not ai_category_cards:
@@ -420,6 +438,7 @@ def register_umap_callback(app):
                     display_label="AI Inferred Category",
                     value=display_category,
                     card_type="ai_feedback",
+                    existing_feedback=bundle["feedback"].get(feedback_key, {}),
                 )
                 ai_category_cards = [fallback_ai_category]
             else:
@@ -432,7 +451,9 @@ def register_umap_callback(app):
                 ]
 
         # Create unified user content (questions + topics)
-        unified_user_content = create_unified_user_content(data_id)
+        unified_user_content = create_unified_user_content(
+            data_id, bundle["user_questions"], bundle["category_notes"]
+        )
 
         # Create sidebar reading pane content
         post_id = row_data.get("id", "unknown")
@@ -515,6 +536,8 @@ def register_umap_callback(app):
         [
             Output("forum-data-table", "data"),
             Output("forum-data-table", "page_count"),
+            # Also written by the pagination buttons
+            Output("forum-data-table", "page_current", allow_duplicate=True),
         ],
         [
             Input("forum-data-table", "filter_query"),
@@ -522,224 +545,45 @@ def register_umap_callback(app):
             Input("forum-data-table", "page_current"),
             Input("table-forum-selector", "value"),
             Input("table-topic-selector", "value"),
+            Input("table-search-input", "value"),
+            Input("bulk-tag-store", "data"),  # Reload after bulk tagging
         ],
-        allow_duplicate=True,
+        # The layout already renders the first page
+        prevent_initial_call=True,
     )
     def update_table_data(
-        filter_query, sort_by, page_current, selected_forum, selected_topic
+        filter_query,
+        sort_by,
+        page_current,
+        selected_forum,
+        selected_topic,
+        search,
+        bulk_tag_result,
     ):
         """Handle custom filtering, sorting, and pagination for the data table"""
-        # Get the full dataset with datatable format for aggregated questions/categories
-        df = get_forum_data(selected_forum, datatable_format=True)
-
-        # Start with full dataframe
-        filtered_df = df.copy()
-
-        # Apply topic filtering if topics are selected
-        if selected_topic and selected_topic != "all":
-            filtered_df = filtered_df[
-                filtered_df["llm_cluster_name"].isin(selected_topic)
-            ]
-
-        # Apply filtering if filter_query exists
-        if filter_query:
-            print(f"DEBUG: Filter query received: '{filter_query}'")  # Debug output
-            try:
-                # Parse the filter query - Dash uses a specific format
-                # Support for various filter operations
-                filtering_expressions = filter_query.split(" && ")
-                for expr in filtering_expressions:
-                    expr = expr.strip()
-                    print(
-                        f"DEBUG: Processing filter expression: '{expr}'"
-                    )  # Debug output
-
-                    if " scontains " in expr:
-                        col, value = expr.split(" scontains ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            print(
-                                f"DEBUG: Applying scontains filter - Column: {col}, Value: {value}"
-                            )
-                            filtered_df = filtered_df[
-                                filtered_df[col]
-                                .astype(str)
-                                .str.contains(value, case=False, na=False, regex=False)
-                            ]
-                    elif " contains " in expr:
-                        col, value = expr.split(" contains ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            print(
-                                f"DEBUG: Applying contains filter - Column: {col}, Value: {value}"
-                            )
-                            filtered_df = filtered_df[
-                                filtered_df[col]
-                                .astype(str)
-                                .str.contains(value, case=False, na=False, regex=False)
-                            ]
-                    elif " icontains " in expr:
-                        col, value = expr.split(" icontains ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            print(
-                                f"DEBUG: Applying icontains filter - Column: {col}, Value: {value}"
-                            )
-                            filtered_df = filtered_df[
-                                filtered_df[col]
-                                .astype(str)
-                                .str.contains(value, case=False, na=False, regex=False)
-                            ]
-                    elif " eq " in expr:
-                        col, value = expr.split(" eq ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            print(
-                                f"DEBUG: Applying eq filter - Column: {col}, Value: {value}"
-                            )
-                            filtered_df = filtered_df[
-                                filtered_df[col].astype(str).str.lower()
-                                == value.lower()
-                            ]
-                    elif " ne " in expr:
-                        col, value = expr.split(" ne ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            print(
-                                f"DEBUG: Applying ne filter - Column: {col}, Value: {value}"
-                            )
-                            filtered_df = filtered_df[
-                                filtered_df[col].astype(str).str.lower()
-                                != value.lower()
-                            ]
-                    elif " gt " in expr:
-                        col, value = expr.split(" gt ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            try:
-                                # Try numeric comparison first
-                                numeric_value = float(value)
-                                print(
-                                    f"DEBUG: Applying numeric gt filter - Column: {col}, Value: {numeric_value}"
-                                )
-                                filtered_df = filtered_df[
-                                    pd.to_numeric(filtered_df[col], errors="coerce")
-                                    > numeric_value
-                                ]
-                            except ValueError:
-                                # Fall back to string comparison
-                                print(
-                                    f"DEBUG: Applying string gt filter - Column: {col}, Value: {value}"
-                                )
-                                filtered_df = filtered_df[
-                                    filtered_df[col].astype(str) > value
-                                ]
-                    elif " lt " in expr:
-                        col, value = expr.split(" lt ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            try:
-                                # Try numeric comparison first
-                                numeric_value = float(value)
-                                print(
-                                    f"DEBUG: Applying numeric lt filter - Column: {col}, Value: {numeric_value}"
-                                )
-                                filtered_df = filtered_df[
-                                    pd.to_numeric(filtered_df[col], errors="coerce")
-                                    < numeric_value
-                                ]
-                            except ValueError:
-                                # Fall back to string comparison
-                                print(
-                                    f"DEBUG: Applying string lt filter - Column: {col}, Value: {value}"
-                                )
-                                filtered_df = filtered_df[
-                                    filtered_df[col].astype(str) < value
-                                ]
-                    elif " ge " in expr:
-                        col, value = expr.split(" ge ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            try:
-                                # Try numeric comparison first
-                                numeric_value = float(value)
-                                print(
-                                    f"DEBUG: Applying numeric ge filter - Column: {col}, Value: {numeric_value}"
-                                )
-                                filtered_df = filtered_df[
-                                    pd.to_numeric(filtered_df[col], errors="coerce")
-                                    >= numeric_value
-                                ]
-                            except ValueError:
-                                # Fall back to string comparison
-                                print(
-                                    f"DEBUG: Applying string ge filter - Column: {col}, Value: {value}"
-                                )
-                                filtered_df = filtered_df[
-                                    filtered_df[col].astype(str) >= value
-                                ]
-                    elif " le " in expr:
-                        col, value = expr.split(" le ", 1)
-                        col = col.strip("{}")
-                        value = value.strip("\"'")
-                        if col in filtered_df.columns:
-                            try:
-                                # Try numeric comparison first
-                                numeric_value = float(value)
-                                print(
-                                    f"DEBUG: Applying numeric le filter - Column: {col}, Value: {numeric_value}"
-                                )
-                                filtered_df = filtered_df[
-                                    pd.to_numeric(filtered_df[col], errors="coerce")
-                                    <= numeric_value
-                                ]
-                            except ValueError:
-                                # Fall back to string comparison
-                                print(
-                                    f"DEBUG: Applying string le filter - Column: {col}, Value: {value}"
-                                )
-                                filtered_df = filtered_df[
-                                    filtered_df[col].astype(str) <= value
-                                ]
-                print(f"DEBUG: After filtering, {len(filtered_df)} rows remain")
-            except Exception as e:
-                # If filtering fails, return original data
-                print(f"Filter error: {e}")  # For debugging
-                pass
-
-        # Apply sorting if sort_by exists - supports multiple column sorting
-        if sort_by:
-            # Build list of columns and directions for multi-column sorting
-            sort_columns = []
-            sort_directions = []
-
-            for sort_item in sort_by:
-                col = sort_item["column_id"]
-                direction = sort_item["direction"] == "asc"
-
-                if col in filtered_df.columns:
-                    sort_columns.append(col)
-                    sort_directions.append(direction)
-
-            if sort_columns:
-                # Apply multi-column sorting
-                filtered_df = filtered_df.sort_values(
-                    by=sort_columns,
-                    ascending=sort_directions,
-                    na_position="last",  # Put NaN values at the end
-                )
-
-        # No pagination - show all filtered results
-        page_count = 1  # Only one page since we show everything
-        paginated_df = filtered_df.copy()  # Use all filtered data
+        # A new filter, sort or selection starts again from the first page
+        triggered = {t["prop_id"] for t in callback_context.triggered}
+        if triggered & {
+            "forum-data-table.filter_query",
+            "forum-data-table.sort_by",
+            "table-forum-selector.value",
+            "table-topic-selector.value",
+            "table-search-input.value",
+        }:
+            page_current = 0
+
+        # Filtering, sorting and paging all run in SQL - only one page comes back
+        page = get_forum_table_page(
+            forum=selected_forum or "all",
+            topics=selected_topic,
+            filter_query=filter_query,
+            sort_by=sort_by,
+            page_current=page_current or 0,
+            page_size=TABLE_PAGE_SIZE,
+            search=search,
+        )
+        page_count = page["page_count"]
+        paginated_df = page["data"]
 
         # Apply markdown formatting for datatable display (same as in create_table_view)
         if (
@@ -764,10 +608,71 @@ def register_umap_callback(app):
                 format_for_datatable
             )
 
+        # SQL clamps past-the-end pages; report the page actually shown
         return (
             paginated_df.to_dict("records"),
             page_count,
+            page["page_current"],
+        )
+
+    @app.callback(
+        [
+            Output("bulk-tag-result", "children"),
+            Output("bulk-tag-store", "data"),
+        ],
+        Input("bulk-tag-apply-btn", "n_clicks"),
+        [
+            State("bulk-tag-type", "value"),
+            State("bulk-tag-values", "value"),
+            State("bulk-tag-mode", "value"),
+            State("forum-data-table", "filter_query"),
+            State("table-forum-selector", "value"),
+            State("table-topic-selector", "value"),
+            State("table-search-input", "value"),
+        ],
+        prevent_initial_call=True,
+    )
+    def apply_bulk_tags(
+        n_clicks,
+        tag_type,
+        tag_values,
+        mode,
+        filter_query,
+        selected_forum,
+        selected_topic,
+        search,
+    ):
+        """Tag every post behind the rows the table's current filters match"""
+        if not n_clicks:
+            raise PreventUpdate
+
+        values = [v.strip() for v in (tag_values or "").split(",") if v.strip()]
+        if not values and mode != "replace":
+            return (
+                dbc.Alert(
+                    "Enter at least one value", color="warning", className="py-1 small"
+                ),
+                no_update,
+            )
+
+        result = bulk_apply_tags(
+            {
+                "filter_query": filter_query,
+                "forum": selected_forum or "all",
+                "topics": selected_topic,
+                "search": search,
+            },
+            {tag_type: values},
+            mode=mode,
         )
+        alert = dbc.Alert(
+            result["message"],
+            color="success" if result["success"] else "danger",
+            className="py-1 small",
+        )
+        if not result["success"]:
+            return alert, no_update
+        return alert, {"n_clicks": n_clicks, **result}
 
     @app.callback(
         [
@@ -894,19 +799,29 @@ def register_umap_callback(app):
         Output("export-filtered-btn", "n_clicks"),
         [Input("export-filtered-btn", "n_clicks")],
         [
-            State("forum-data-table", "derived_virtual_data"),
+            State("forum-data-table", "filter_query"),
+            State("forum-data-table", "sort_by"),
             State("table-forum-selector", "value"),
+            State("table-topic-selector", "value"),
+            State("table-search-input", "value"),
         ],
         prevent_initial_call=True,
     )
-    def export_filtered_csv(n_clicks, table_data, selected_forum):
-        """Export the currently filtered/displayed data as CSV"""
-        if n_clicks and n_clicks > 0 and table_data:
-            import pandas as pd
+    def export_filtered_csv(
+        n_clicks, filter_query, sort_by, selected_forum, selected_topic, search
+    ):
+        """Export every row matching the current filters (not just the visible page) as CSV"""
+        if n_clicks and n_clicks > 0:
             import datetime
 
-            # Convert table data back to DataFrame
-            filtered_df = pd.DataFrame(table_data)
+            filtered_df = get_forum_table_page(
+                forum=selected_forum or "all",
+                topics=selected_topic,
+                filter_query=filter_query,
+                sort_by=sort_by,
+                page_size=None,
+                search=search,
+            )["data"]
 
             # Generate filename
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -107,13 +107,15 @@ def generate_ai_category_card(data_id, ai_category_data, category_number=1):
     )
 
 
-def load_existing_ai_categories(data_id: str):
-    """Load existing AI categories from database for a given item"""
+def load_existing_ai_categories(data_id: str, existing_ai_categories=None):
+    """Load existing AI categories from database for a given item.
+    Pass existing_ai_categories (e.g. from a post detail bundle) to skip the database query."""
     try:
-        from utilities.mrpc_database import MRPCDatabase
+        if existing_ai_categories is None:
+            from utilities.mrpc_database import MRPCDatabase
 
-        db = MRPCDatabase()
-        existing_ai_categories = db.get_ai_categories(data_id)
+            db = MRPCDatabase()
+            existing_ai_categories = db.get_ai_categories(data_id)
 
         ai_category_components = []
         for index, ai_category_data in enumerate(existing_ai_categories, 1):
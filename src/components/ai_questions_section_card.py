@@ -1,14 +1,16 @@
 import dash_bootstrap_components as dbc
 
 
-def load_existing_ai_questions(data_id: str):
+def load_existing_ai_questions(data_id: str, existing_ai_questions=None):
     """Load existing AI questions from database for a given item and return cards
-    Passed customdata[0] uuid id in posts then gathers all questions associated against post URL then generates cards"""
+    Passed customdata[0] uuid id in posts then gathers all questions associated against post URL then generates cards.
+    Pass existing_ai_questions (e.g. from a post detail bundle) to skip the database query."""
     try:
-        from utilities.mrpc_database import MRPCDatabase
+        if existing_ai_questions is None:
+            from utilities.mrpc_database import MRPCDatabase
 
-        db = MRPCDatabase()
-        existing_ai_questions = db.get_ai_questions(data_id)
+            db = MRPCDatabase()
+            existing_ai_questions = db.get_ai_questions(data_id)
 
         ai_question_components = []
         print(
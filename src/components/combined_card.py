@@ -11,6 +11,7 @@ def create_review_content_card(
     additional_content=None,
     card_class="ai-content-card h-100",
     body_class="ai-content-card-body d-flex flex-column h-100",
+    existing_feedback=None,
 ):
     """
     Create a unified, reusable card component for content review with various interaction types.
@@ -28,6 +29,8 @@ def create_review_content_card(
         additional_content: Optional list of additional content elements to include
         card_class: CSS classes for the card container
         body_class: CSS classes for the card body
+        existing_feedback: Optional preloaded feedback dict for "ai_feedback" cards
+            ({} when there is none); loaded from the database when None
     """
 
     # Handle different card types
@@ -59,6 +62,7 @@ def create_review_content_card(
             additional_content,
             card_class,
             body_class,
+            existing_feedback,
         )
     else:
         raise ValueError(f"Unknown card_type: {card_type}")
@@ -434,13 +438,16 @@ def _create_ai_feedback_card(
     additional_content,
     card_class,
     body_class,
+    existing_feedback=None,
 ):
     """Create AI feedback card with thumbs up/down and justification features using structured DBC components"""
     from dash import html
     import dash_bootstrap_components as dbc
 
     # Use the reusable feedback component with structured DBC layout
-    feedback_components = create_feedback_components(data_id, content_type)
+    feedback_components = create_feedback_components(
+        data_id, content_type, existing_feedback
+    )
 
     # Keep card neutral - apply colors only to specific feedback elements
     card_color = "light"  # Always use neutral card color
@@ -19,6 +19,9 @@ TABLE_COLUMN_ORDER = [
     "post_url",
 ]
 
+# Rows per page of the forum data table (paged, filtered and sorted in SQL)
+TABLE_PAGE_SIZE = 50
+
 # Common style patterns
 PLACEHOLDER_TEXT_STYLE = {
     "text-align": "center",
@@ -11,6 +11,12 @@ register_page(__name__, path="/upload", name="Upload")
 
 def layout():
     """Create the upload page layout"""
+    from utilities.auth import is_admin
+
+    try:
+        show_force_reingest = is_admin()
+    except Exception:
+        show_force_reingest = False
 
     return html.Div(
         [
@@ -42,7 +48,7 @@ def layout():
                                                     dcc.Upload(
                                                         id="upload-data",
                                                         children=[
-                                                            "Drag and Drop CSV file or ",
+                                                            "Drag and Drop a data file or ",
                                                             html.A(
                                                                 "Select a File",
                                                                 style={
@@ -74,14 +80,19 @@ def layout():
                                                             "borderColor": "#dc3545",
                                                             "backgroundColor": "#f8d7da",
                                                         },
-                                                        accept=".csv",
+                                                        accept=".csv,.parquet,.arrow,.feather",
                                                         multiple=False,
                                                     ),
                                                     # File format info
                                                     html.Small(
-                                                        "Supported format: CSV files only",
+                                                        "Supported formats: CSV, Parquet, Arrow/Feather",
                                                         className="text-muted d-block mt-2",
                                                     ),
+                                                    # File preview or send/validation errors
+                                                    html.Div(
+                                                        id="upload-preview",
+                                                        className="mt-3",
+                                                    ),
                                                     # Upload type selector
                                                     html.Div(
                                                         id="upload-type-container",
@@ -153,6 +164,18 @@ def layout():
                                                                     ),
                                                                 ]
                                                             ),
+                                                            # Admin override for files already uploaded
+                                                            dbc.Checkbox(
+                                                                id="upload-force-reingest",
+                                                                label="Re-ingest even if this exact file was uploaded before",
+                                                                value=False,
+                                                                className="mt-3",
+                                                                style=None
+                                                                if show_force_reingest
+                                                                else {
+                                                                    "display": "none"
+                                                                },
+                                                            ),
                                                             html.Div(
                                                                 className="mt-3",
                                                                 children=[
@@ -184,6 +207,9 @@ def layout():
                         ],
                         className="mb-4",
                     ),
+                    # Live progress of the background upload job
+                    html.Div(id="upload-job-progress"),
+                    dcc.Interval(id="upload-job-poll", interval=1000, disabled=True),
                     # Upload status alerts
                     html.Div(id="upload-alerts"),
                     # Upload history section
@@ -326,6 +352,10 @@ def layout():
             dcc.Store(id="current-type-filter", data="all"),
             # Store for pending action
             dcc.Store(id="pending-action-data", data={}),
+            # Token of the file spooled by /api/uploads (the bytes stay on the server)
+            dcc.Store(id="upload-token", data=None),
+            # Background job processing the submitted upload
+            dcc.Store(id="upload-job-id", data=None),
         ],
         className="h-100",
     )
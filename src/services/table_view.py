@@ -1,6 +1,6 @@
 import pandas as pd
-from utilities.backend import get_forum_data
-from config import TABLE_COLUMN_ORDER, DATATABLE_CELL_STYLE
+from utilities.backend import get_forum_filter_options, get_forum_table_page
+from config import TABLE_COLUMN_ORDER, DATATABLE_CELL_STYLE, TABLE_PAGE_SIZE
 import dash_bootstrap_components as dbc
 from dash import html, dcc
 import dash.dash_table as dash_table
@@ -11,14 +11,13 @@ def create_table_view(**kwargs) -> html.Div:
 
     Returns: html.Div(dbc.Card(DataTable))"""
 
-    # Get data directly from database using new datatable format
-    table_df = get_forum_data(
-        datatable_format=True
-    ).copy()  # Make a proper copy to avoid SettingWithCopyWarning
-    print(table_df.columns)
+    # Only the first page comes from the database; paging, sorting and
+    # filtering afterwards run in SQL through update_table_data
+    page = get_forum_table_page(page_current=0, page_size=TABLE_PAGE_SIZE)
+    table_df = page["data"]
     # Check if we got valid data
     if table_df.empty or len(table_df) == 0:
-        print("⚠️ Warning: get_forum_data returned empty DataFrame")
+        print("⚠️ Warning: get_forum_table_page returned no rows")
         # Return a simple error message component
         return html.Div(
             [
@@ -36,19 +35,16 @@ def create_table_view(**kwargs) -> html.Div:
             id="table-view-no-data-container",
         )
 
-    # Get unique forum values for the dropdown
-    unique_forums = (
-        sorted(table_df["forum"].unique()) if "forum" in table_df.columns else []
-    )
-    unique_topics = (
-        sorted(table_df["llm_cluster_name"].unique())
-        if "llm_cluster_name" in table_df.columns
-        else []
-    )
+    # Forum and topic values for the dropdowns (SELECT DISTINCT, not the whole table)
+    filter_options = get_forum_filter_options()
     forum_options = [{"label": "All Forums", "value": "all"}]
-    forum_options.extend([{"label": forum, "value": forum} for forum in unique_forums])
+    forum_options.extend(
+        [{"label": forum, "value": forum} for forum in filter_options["forums"]]
+    )
     topic_options = [{"label": "All Topics", "value": "all"}]
-    topic_options.extend([{"label": topic, "value": topic} for topic in unique_topics])
+    topic_options.extend(
+        [{"label": topic, "value": topic} for topic in filter_options["topics"]]
+    )
 
     # Convert newline-separated content to markdown for better display
     if "all_questions" in table_df.columns and "all_categories" in table_df.columns:
@@ -197,6 +193,19 @@ def create_table_view(**kwargs) -> html.Div:
                                         ],
                                         width="auto",
                                     ),
+                                    dbc.Col(
+                                        [
+                                            # Full-text search (FTS5) over posts and notes
+                                            dbc.Input(
+                                                id="table-search-input",
+                                                type="search",
+                                                placeholder="Search posts, questions and notes...",
+                                                debounce=True,
+                                                size="sm",
+                                            ),
+                                        ],
+                                        className="ms-3",
+                                    ),
                                     dbc.Col(
                                         [
                                             dbc.Button(
@@ -241,7 +250,10 @@ def create_table_view(**kwargs) -> html.Div:
                                 ],
                                 hidden_columns=[],
                                 column_selectable=False,
-                                page_action="none",  # Disable pagination to show all rows
+                                page_action="custom",  # Paged server-side in SQL
+                                page_current=0,
+                                page_size=TABLE_PAGE_SIZE,
+                                page_count=page["page_count"],
                                 sort_action="custom",
                                 filter_action="custom",
                                 row_selectable=False,
@@ -395,6 +407,53 @@ def create_table_view(**kwargs) -> html.Div:
                                 "Use the forum filter to narrow down the data shown in the table.",
                                 className="text-muted small",
                             ),
+                            html.Hr(),
+                            # Bulk tagging of every row the current filters match
+                            html.Label(
+                                "Tag all filtered rows:", className="fw-bold mb-2"
+                            ),
+                            dbc.InputGroup(
+                                [
+                                    dbc.Select(
+                                        id="bulk-tag-type",
+                                        options=[
+                                            {"label": "Group", "value": "groups"},
+                                            {"label": "Subgroup", "value": "subgroups"},
+                                            {"label": "Tag", "value": "tags"},
+                                        ],
+                                        value="tags",
+                                        style={"maxWidth": "8rem"},
+                                    ),
+                                    dbc.Input(
+                                        id="bulk-tag-values",
+                                        placeholder="Comma-separated values",
+                                    ),
+                                ],
+                                size="sm",
+                                className="mb-2",
+                            ),
+                            dbc.RadioItems(
+                                id="bulk-tag-mode",
+                                options=[
+                                    {"label": "Add", "value": "add"},
+                                    {"label": "Replace", "value": "replace"},
+                                    {"label": "Remove", "value": "remove"},
+                                ],
+                                value="add",
+                                inline=True,
+                                className="mb-2",
+                            ),
+                            dbc.Button(
+                                [
+                                    html.I(className="fas fa-tags me-1"),
+                                    "Tag all filtered rows",
+                                ],
+                                id="bulk-tag-apply-btn",
+                                color="primary",
+                                size="sm",
+                            ),
+                            html.Div(id="bulk-tag-result", className="mt-2"),
+                            dcc.Store(id="bulk-tag-store"),
                         ]
                     ),
                     dbc.ModalFooter(
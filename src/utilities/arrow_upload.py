@@ -0,0 +1,130 @@
+"""
+Parquet and Arrow IPC (Feather v2) upload files
+Reads schemas, row counts and record batches with pyarrow, so columnar uploads skip CSV parsing
+"""
+
+import os
+from typing import Iterator, Optional
+
+import pandas as pd
+
+# File extension -> pyarrow reader
+ARROW_FORMATS = {".parquet": "parquet", ".arrow": "ipc", ".feather": "ipc"}
+
+
+def arrow_format(filename: str) -> Optional[str]:
+    """'parquet' or 'ipc' for a columnar upload filename, None for anything else (CSV)"""
+    return ARROW_FORMATS.get(os.path.splitext(filename or "")[1].lower())
+
+
+def _open_ipc(path: str):
+    """IPC reader over a memory-mapped file; .arrow files may hold the stream format"""
+    import pyarrow as pa
+
+    source = pa.memory_map(path)
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def _ipc_batches(reader) -> Iterator:
+    if hasattr(reader, "get_batch"):
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+    else:
+        yield from reader
+
+
+def iter_record_batches(path: str, file_format: str, batch_size: int) -> Iterator:
+    """
+    Record batches of at most batch_size rows
+
+    Parquet is decoded one batch at a time; IPC batches are zero-copy slices
+    of the memory-mapped file.
+
+    Args:
+        path (str): File on disk
+        file_format (str): 'parquet' or 'ipc'
+        batch_size (int): Maximum rows per batch
+
+    Returns:
+        Iterator[pa.RecordBatch]: Batches in file order (empty batches skipped)
+    """
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+    else:
+        batches = (
+            batch.slice(offset, batch_size)
+            for batch in _ipc_batches(_open_ipc(path))
+            for offset in range(0, batch.num_rows, batch_size)
+        )
+    return (batch for batch in batches if batch.num_rows > 0)
+
+
+def read_head(path: str, file_format: str, rows: int):
+    """
+    First rows of the file as a pyarrow Table (empty, with the schema, if there are none)
+
+    Args:
+        path (str): File on disk
+        file_format (str): 'parquet' or 'ipc'
+        rows (int): Maximum rows to read
+
+    Returns:
+        pa.Table: Head of the file
+    """
+    import pyarrow as pa
+
+    batch = next(iter_record_batches(path, file_format, rows), None)
+    if batch is not None:
+        return pa.Table.from_batches([batch])
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path).empty_table()
+    return _open_ipc(path).schema.empty_table()
+
+
+def count_rows(path: str, file_format: str) -> int:
+    """Row count from Parquet metadata or the IPC batch headers, without decoding data"""
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).metadata.num_rows
+    return sum(batch.num_rows for batch in _ipc_batches(_open_ipc(path)))
+
+
+def to_frame(data) -> pd.DataFrame:
+    """
+    Convert a record batch or table to pandas for insertion
+
+    Numeric columns convert without copying where possible. Timestamps and
+    dates become text in SQLite's 'YYYY-MM-DD HH:MM:SS' form (whole seconds,
+    wall-clock time of the column's timezone) instead of driver-adapted
+    datetime objects.
+
+    Args:
+        data (pa.RecordBatch | pa.Table): Arrow data
+
+    Returns:
+        pd.DataFrame: One column per Arrow column
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for i, field in enumerate(data.schema):
+        if pa.types.is_timestamp(field.type):
+            seconds = data.column(i).cast(
+                pa.timestamp("s", tz=field.type.tz), safe=False
+            )
+            text = pc.strftime(seconds, format="%Y-%m-%d %H:%M:%S")
+        elif pa.types.is_date(field.type):
+            text = data.column(i).cast(pa.string())
+        else:
+            continue
+        data = data.set_column(i, field.name, text)
+    return data.to_pandas()
@@ -1,4 +1,5 @@
 from utilities.mrpc_database import MRPCDatabase
+from utilities.auth_cache import credential_cache, credential_key
 import base64
 
 
@@ -14,9 +15,22 @@ def authenticate_user(email, password):
         dict or None: User information dict if authentication successful, None otherwise
     """
     db = MRPCDatabase()
+
+    # Recently verified credentials skip the password hash and users lookup, as
+    # long as no worker has changed a password or account since they were cached
+    key = credential_key(email, password)
+    generation = db.get_credentials_generation()
+    if generation is not None:
+        cached_user = credential_cache.get(key, generation)
+        if cached_user:
+            return cached_user
+
     user_info = db.verify_user(email, password)
 
     if user_info:
+        if generation is not None:
+            # Generation read first: a concurrent change only makes this entry stale
+            credential_cache.set(key, user_info, generation)
         return user_info
     else:
         return None
@@ -30,9 +44,16 @@ def get_current_user():
         dict or None: User information dict with id, first_name, last_name, email if authenticated
     """
     try:
-        from flask import request
+        from flask import g, request
 
         auth_header = request.headers.get("Authorization", "")
+
+        # One callback can ask for the current user several times - memoize per request
+        memo = getattr(g, "_mrpc_current_user", None)
+        if memo is not None and memo[0] == auth_header:
+            return memo[1]
+
+        user_info = None
         if auth_header.startswith("Basic "):
             # Decode the base64 encoded credentials
             encoded_credentials = auth_header.split(" ")[1]
@@ -40,13 +61,38 @@ def get_current_user():
             username, password = decoded.split(":", 1)
 
             # Verify against our database
-            return authenticate_user(username, password)
-        return None
+            user_info = authenticate_user(username, password)
+
+        g._mrpc_current_user = (auth_header, user_info)
+        return user_info
     except Exception as e:
         print(f"Error extracting current user: {e}")
         return None
 
 
+def get_auth_cache_stats():
+    """
+    Get credential cache statistics for this worker process
+
+    Returns:
+        dict: hits, misses, evictions, size and hit_rate
+    """
+    return credential_cache.stats
+
+
+def invalidate_user_credentials(user_id: int = None):
+    """
+    Drop cached credentials so the next request re-verifies against the database
+
+    Args:
+        user_id: User whose credentials changed (default: clear the whole cache)
+    """
+    if user_id is None:
+        credential_cache.clear()
+    else:
+        credential_cache.invalidate_user(user_id)
+
+
 def get_current_user_id():
     """
     Get current authenticated user's ID for database foreign keys
@@ -0,0 +1,115 @@
+"""
+In-process cache of verified Basic Auth credentials
+Avoids re-hashing passwords and querying the users table on every Dash callback
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def credential_key(email, password) -> str:
+    """Digest of the credential pair so raw passwords are never kept in memory"""
+    return hashlib.sha256(f"{email}:{password}".encode("utf-8")).hexdigest()
+
+
+class CredentialCache:
+    """TTL- and size-bounded LRU cache of authenticated users
+
+    Each entry records the users credentials generation it was verified
+    under. A lookup passes the current generation (one-row read from the
+    database) and any older entry is a miss, so a password change or
+    deactivation made by any worker process takes effect everywhere at
+    once. Entries also expire after ttl_seconds as a backstop.
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str, generation: Optional[int] = None) -> Optional[Dict]:
+        """Return a copy of the cached user for this key, or None on miss/expiry
+
+        Args:
+            key: credential_key of the email/password pair
+            generation: Current credentials generation; entries cached under
+                another generation are dropped
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, entry_generation, user_info = entry
+            if expires_at <= now or entry_generation != generation:
+                del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return dict(user_info)
+
+    def set(self, key: str, user_info: Dict, generation: Optional[int] = None):
+        """Cache a successfully authenticated user, verified under generation"""
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + self.ttl_seconds,
+                generation,
+                dict(user_info),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_user(self, user_id: int) -> int:
+        """Drop every cached credential belonging to a user
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            stale = [
+                key
+                for key, (_, _, user_info) in self._entries.items()
+                if user_info.get("id") == user_id
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    @property
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every thread in this worker process
+credential_cache = CredentialCache()
@@ -20,6 +20,55 @@ def get_forum_data(forum: str = "all", datatable_format: bool = False) -> pd.Dat
         return pd.DataFrame()  # Return empty DataFrame on error
 
 
+def get_forum_table_page(
+    forum: str = "all",
+    topics=None,
+    filter_query: str = "",
+    sort_by=None,
+    page_current: int = 0,
+    page_size=50,
+    search: str = "",
+) -> dict:
+    """Get one filtered/sorted page of the forum datatable directly from database"""
+    db = MRPCDatabase()
+    try:
+        return db.get_datatable_page(
+            page_current=page_current,
+            page_size=page_size,
+            filter_query=filter_query,
+            sort_by=sort_by,
+            forum=forum,
+            topics=topics,
+            search=search,
+        )
+    except Exception as e:
+        print(f"Error in get_forum_table_page: {e}")
+        return {
+            "data": pd.DataFrame(),
+            "total_rows": 0,
+            "page_count": 1,
+            "page_current": 0,
+        }
+
+
+def get_forum_filter_options() -> dict:
+    """Get the forums and topics offered by the forum table's selectors"""
+    db = MRPCDatabase()
+    return db.get_datatable_filter_options()
+
+
+def bulk_apply_tags(filter_spec: dict, tags: dict, mode: str = "add") -> dict:
+    """Apply tags to every post behind the datatable rows matching the table's filters"""
+    db = MRPCDatabase()
+    return db.bulk_apply_tags(filter_spec, tags, mode=mode)
+
+
+def load_post_detail_bundle(data_id) -> dict:
+    """Load questions, categories, user notes and feedback for one post in a single round trip"""
+    db = MRPCDatabase()
+    return db.get_post_detail_bundle(data_id)
+
+
 def load_existing_feedback(data_id, inference_type):
     """Load existing feedback for a specific data point and inference type from SQLite database"""
 
@@ -27,11 +76,13 @@ def load_existing_feedback(data_id, inference_type):
     return db.get_inference_feedback(data_id, inference_type)
 
 
-def save_feedback_to_db(data_id, inference_type, rating, feedback_text, response_id):
-    """Save feedback data to SQLite database"""
+def save_feedback_to_db(
+    data_id, inference_type, rating, feedback_text, response_id, coalesce=False
+):
+    """Save feedback data to SQLite database (coalesce batches bursts of clicks)"""
     from utilities.mrpc_database import MRPCDatabase
 
     db = MRPCDatabase()
     return db.save_inference_feedback(
-        data_id, inference_type, rating, feedback_text, response_id
+        data_id, inference_type, rating, feedback_text, response_id, coalesce=coalesce
     )
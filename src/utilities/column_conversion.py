@@ -0,0 +1,103 @@
+"""
+Columnar type conversion for uploaded data
+Converts whole DataFrame columns to typed NumPy arrays with validity masks
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# (values, valid, invalid): typed values, mask of cells that converted to a
+# value, and mask of non-empty cells that could not be converted
+Conversion = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+BOOLEAN_STRINGS = {"true": True, "false": False, "1": True, "0": False}
+
+INTEGER_PATTERN = r"\s*[+-]?\d+\s*"
+
+
+def _numeric_values(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype=float, na_value=np.nan)
+
+
+def to_boolean(series: pd.Series) -> Conversion:
+    """
+    Strict booleans: True/False, 'true'/'false'/'1'/'0' in any case, or 0/1
+
+    Numeric columns must hold only 0 and 1 (a float column is an integer
+    column that pandas widened because of blank cells).
+    """
+    present = series.notna().to_numpy()
+
+    if pd.api.types.is_bool_dtype(series.dtype):
+        values = series.to_numpy(dtype=bool, na_value=False)
+        return values, present, np.zeros(len(series), dtype=bool)
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        numbers = _numeric_values(series)
+        valid = np.isin(numbers, (0, 1))
+        return numbers == 1, valid, present & ~valid
+
+    # Mixed/object columns: str() of bools and ints gives 'True'/'1', floats stay invalid
+    mapped = series.astype(str).str.strip().str.lower().map(BOOLEAN_STRINGS)
+    valid = present & mapped.notna().to_numpy()
+    values = mapped.eq(True).to_numpy()
+    return values, valid, present & ~valid
+
+
+def to_likert(series: pd.Series) -> Conversion:
+    """Strict Likert scores: integers (or integer strings) from 1 to 5, never booleans"""
+    present = series.notna().to_numpy()
+
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return np.zeros(len(series), dtype=np.int64), np.zeros_like(present), present
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        numbers = _numeric_values(series)
+    else:
+        text = series.astype(str)
+        numbers = pd.to_numeric(
+            text.where(text.str.fullmatch(INTEGER_PATTERN)), errors="coerce"
+        ).to_numpy(dtype=float)
+
+    valid = np.isin(numbers, (1, 2, 3, 4, 5))
+    values = np.where(valid, numbers, 0).astype(np.int64)
+    return values, valid, present & ~valid
+
+
+def to_int(series: pd.Series) -> Conversion:
+    """Lenient integers: numeric text and floats are truncated, anything else is empty"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        numbers = _numeric_values(series)
+    else:
+        numbers = pd.to_numeric(
+            series.astype(str).str.strip().where(series.notna()), errors="coerce"
+        ).to_numpy(dtype=float)
+
+    valid = np.isfinite(numbers)
+    values = np.trunc(np.where(valid, numbers, 0)).astype(np.int64)
+    return values, valid, np.zeros(len(series), dtype=bool)
+
+
+def to_timestamp(series: pd.Series) -> Conversion:
+    """ISO 8601 timestamps; values that do not parse are kept as their text"""
+    present = series.notna().to_numpy()
+    try:
+        parsed = pd.to_datetime(series, errors="coerce", format="mixed")
+    except (TypeError, ValueError):
+        # pandas < 2.0 has no format="mixed" and parses element by element anyway
+        parsed = pd.to_datetime(series, errors="coerce")
+
+    values = series.astype(str).to_numpy(dtype=object)
+    is_parsed = parsed.notna().to_numpy()
+    values[is_parsed] = parsed[is_parsed].map(pd.Timestamp.isoformat).to_numpy()
+    return values, present, np.zeros(len(series), dtype=bool)
+
+
+def as_sqlite_values(conversion: Conversion) -> np.ndarray:
+    """Object array of Python values with None where the cell is empty or invalid"""
+    values, valid, _ = conversion
+    column = values.astype(object)
+    column[~valid] = None
+    return column
@@ -0,0 +1,177 @@
+"""
+Process-wide SQLite connection pooling for MRPC
+Keeps warm connections per database file so callbacks don't pay connect/pragma setup cost
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+def _unicode_lower(value):
+    """Python's Unicode lower() for text; other values pass through unchanged"""
+    return value.lower() if isinstance(value, str) else value
+
+
+def register_sql_functions(conn: sqlite3.Connection):
+    """
+    Install the application SQL functions on a connection
+
+    lower() is replaced by a Unicode-aware version (SQLite's built-in one
+    only folds ASCII), so case-insensitive filters in SQL agree with the
+    pandas str.lower() path for text like "É".
+
+    Args:
+        conn: Connection to register the functions on
+    """
+    conn.create_function("lower", 1, _unicode_lower, deterministic=True)
+
+
+class SQLiteConnectionPool:
+    """Thread-safe pool of SQLite connections for a single database file
+
+    Connections are created with check_same_thread=False so they can be handed
+    between gthread worker threads, have their pragmas applied exactly once when
+    opened, and keep a prepared-statement cache for the lifetime of the pool.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_idle: int = 8,
+        pragmas: Optional[Dict[str, object]] = None,
+        cached_statements: int = 256,
+        timeout: float = 5.0,
+    ):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.pragmas = dict(pragmas or {})
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+        self._lock = threading.Lock()
+        self._file_identity = None
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def file_identity(self):
+        """(device, inode) of the database file, or None if it does not exist yet"""
+        try:
+            st = os.stat(self.db_path)
+            return (st.st_dev, st.st_ino)
+        except OSError:
+            return None
+
+    def _new_connection(self) -> sqlite3.Connection:
+        """Open a connection and apply the pool pragmas once"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        register_sql_functions(conn)
+        with self._lock:
+            self.stats["created"] += 1
+            self._file_identity = self.file_identity()
+        return conn
+
+    def _drain(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            self.stats["discarded"] += 1
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, reusing an idle one when possible"""
+        # A database file that was deleted/replaced (e.g. temp DBs in tests) must
+        # not be served by connections still pointing at the old inode
+        if self._file_identity is not None:
+            if self.file_identity() != self._file_identity:
+                self._drain()
+                self._file_identity = None
+
+        try:
+            conn = self._idle.get_nowait()
+            self.stats["reused"] += 1
+            return conn
+        except queue.Empty:
+            return self._new_connection()
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool (or close it if the pool is full)"""
+        # Undo per-call customisation so the next borrower gets a clean connection
+        conn.row_factory = None
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+            self.stats["discarded"] += 1
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection with sqlite3's commit-on-success/rollback-on-error semantics"""
+        conn = self.acquire()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close all idle connections held by this pool"""
+        self._drain()
+
+
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+_pools_pid = os.getpid()
+
+
+def get_connection_pool(db_path: str, **pool_options) -> SQLiteConnectionPool:
+    """
+    Get the shared connection pool for a database file in the current process
+
+    Pools are keyed by absolute path and recreated after a fork, so every
+    gunicorn worker owns its own connections.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+        **pool_options: Options passed to SQLiteConnectionPool when the pool is first created
+
+    Returns:
+        SQLiteConnectionPool: The pool for this database in this process
+    """
+    global _pools_pid
+
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            # Inherited from the parent process - never share sqlite handles across fork
+            _pools.clear()
+            _pools_pid = os.getpid()
+
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLiteConnectionPool(db_path, **pool_options)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close and forget every pool in this process (used by tests and shutdown hooks)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
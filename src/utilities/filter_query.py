@@ -0,0 +1,452 @@
+"""
+Compiler for the Dash DataTable filter_query grammar
+Parses a query once into an AST and evaluates it as parameterized SQL or a pandas mask
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Relational operators (symbol and word forms) -> canonical name
+RELATIONAL_OPERATORS = {
+    "=": "eq",
+    "eq": "eq",
+    "!=": "ne",
+    "ne": "ne",
+    ">": "gt",
+    "gt": "gt",
+    "<": "lt",
+    "lt": "lt",
+    ">=": "ge",
+    "ge": "ge",
+    "<=": "le",
+    "le": "le",
+    "contains": "contains",
+    "datestartswith": "datestartswith",
+}
+
+COMPARISON_SQL = {"eq": "=", "gt": ">", "lt": "<", "ge": ">=", "le": "<="}
+PYTHON_COMPARISONS = {
+    "eq": lambda series, value: series == value,
+    "gt": lambda series, value: series > value,
+    "lt": lambda series, value: series < value,
+    "ge": lambda series, value: series >= value,
+    "le": lambda series, value: series <= value,
+}
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<column>\{(?:[^{}\\]|\\.)*\})
+      | (?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`(?:[^`\\]|\\.)*`)
+      | (?P<logical>&&|\|\|)
+      | (?P<paren>[()])
+      | (?P<symbol>[si]?(?:>=|<=|!=|[=<>])|!)
+      | (?P<word>[^\s(){}"'`=<>!&|]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class FilterQuerySyntaxError(ValueError):
+    """Raised when a filter_query cannot be parsed"""
+
+
+def quote_identifier(column: str) -> str:
+    """Quote a (whitelisted) column name for use in SQL"""
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _unescape(text: str) -> str:
+    """Strip the surrounding quotes/braces and resolve backslash escapes"""
+    return re.sub(r"\\(.)", r"\1", text[1:-1])
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    """Split a filter_query into (kind, text) tokens"""
+    tokens = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise FilterQuerySyntaxError(f"Unexpected input at {position}: {query!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "word" and text.lower() in ("and", "or"):
+            kind, text = "logical", "&&" if text.lower() == "and" else "||"
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a tuple AST
+
+    Nodes are ("or", [nodes]), ("and", [nodes]), ("not", node) and
+    ("cmp", column, operator, value). && binds tighter than ||.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek()[0] is not None:
+            raise FilterQuerySyntaxError(f"Unexpected token {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.peek() == ("logical", "||"):
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else ("or", operands)
+
+    def parse_and(self):
+        operands = [self.parse_unary()]
+        while self.peek() == ("logical", "&&"):
+            self.take()
+            operands.append(self.parse_unary())
+        return operands[0] if len(operands) == 1 else ("and", operands)
+
+    def parse_unary(self):
+        kind, text = self.peek()
+        if (kind, text) == ("symbol", "!"):
+            self.take()
+            return ("not", self.parse_unary())
+        if (kind, text) == ("paren", "("):
+            self.take()
+            node = self.parse_or()
+            if self.take() != ("paren", ")"):
+                raise FilterQuerySyntaxError("Missing closing parenthesis")
+            return node
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        kind, text = self.take()
+        if kind != "column":
+            raise FilterQuerySyntaxError(f"Expected a {{column}}, got {text!r}")
+        column = _unescape(text)
+
+        kind, text = self.take()
+        operator = None
+        if kind in ("symbol", "word"):
+            name = text.lower()
+            # s/i (case) prefixes are accepted; matching is always case-insensitive
+            if name not in RELATIONAL_OPERATORS and name[:1] in ("s", "i"):
+                name = name[1:]
+            operator = RELATIONAL_OPERATORS.get(name)
+        if operator is None:
+            raise FilterQuerySyntaxError(f"Unsupported operator {text!r}")
+
+        kind, text = self.take()
+        if kind == "quoted":
+            value = _unescape(text)
+        elif kind == "word":
+            value = text
+        else:
+            raise FilterQuerySyntaxError(f"Expected a value after {operator}")
+        return ("cmp", column, operator, value)
+
+
+def parse_filter_query(filter_query: Optional[str]):
+    """
+    Parse a DataTable filter_query into a tuple AST
+
+    Args:
+        filter_query: e.g. '{forum} eq "cervical" && ({cluster} > 2 || {title} contains hpv)'
+
+    Returns:
+        The root node, or None for an empty query
+
+    Raises:
+        FilterQuerySyntaxError: If the query is malformed
+    """
+    if not filter_query or not filter_query.strip():
+        return None
+    return _Parser(_tokenize(filter_query)).parse()
+
+
+def _prune(node, column_types: Dict[str, str]):
+    """Drop comparisons on unknown columns (and any operator left empty)"""
+    kind = node[0]
+    if kind == "cmp":
+        return node if node[1] in column_types else None
+    if kind == "not":
+        child = _prune(node[1], column_types)
+        return None if child is None else ("not", child)
+    operands = [child for child in (_prune(n, column_types) for n in node[1]) if child]
+    if not operands:
+        return None
+    return operands[0] if len(operands) == 1 else (kind, operands)
+
+
+def _typed_value(column_type: str, operator: str, value: str):
+    """Pick how a comparison is evaluated: ("numeric"|"datetime"|"text", value)"""
+    if operator in ("contains", "datestartswith"):
+        return "text", value
+    if column_type == "numeric":
+        try:
+            return "numeric", float(value)
+        except ValueError:
+            pass
+    elif column_type == "datetime":
+        timestamp = pd.to_datetime(value, errors="coerce")
+        if not pd.isna(timestamp):
+            return "datetime", timestamp
+    return "text", value
+
+
+class CompiledFilter:
+    """A parsed filter_query bound to a column type map
+
+    Build these with compile_filter_query(), which caches them per query string.
+    """
+
+    def __init__(self, tree, column_types: Dict[str, str]):
+        self.tree = tree
+        self.column_types = column_types
+        self.columns: Set[str] = set()
+        self._collect_columns(tree)
+        self.sql, self.params = self._compile_sql()
+
+    def __bool__(self):
+        return self.tree is not None
+
+    def _collect_columns(self, node):
+        if node is None:
+            return
+        if node[0] == "cmp":
+            self.columns.add(node[1])
+        elif node[0] == "not":
+            self._collect_columns(node[1])
+        else:
+            for child in node[1]:
+                self._collect_columns(child)
+
+    # ---- SQL ----
+
+    def _compile_sql(self) -> Tuple[str, tuple]:
+        if self.tree is None:
+            return "", ()
+        params = []
+        sql = self._node_sql(self.tree, params)
+        # Compiled filters are shared through the cache, so keep params immutable
+        return sql, tuple(params)
+
+    def _node_sql(self, node, params) -> str:
+        kind = node[0]
+        if kind == "cmp":
+            return self._comparison_sql(node[1], node[2], node[3], params)
+        if kind == "not":
+            return f"NOT COALESCE({self._node_sql(node[1], params)}, 0)"
+        joiner = " AND " if kind == "and" else " OR "
+        return "(" + joiner.join(self._node_sql(n, params) for n in node[1]) + ")"
+
+    def _comparison_sql(self, column, operator, value, params) -> str:
+        ident = quote_identifier(column)
+        kind, typed = _typed_value(self.column_types[column], operator, value)
+
+        if operator == "contains":
+            # Case-insensitive literal substring match (no LIKE wildcards);
+            # pooled connections give lower() Python's Unicode folding
+            params.append(value)
+            return f"instr(lower(CAST({ident} AS TEXT)), lower(?)) > 0"
+        if operator == "datestartswith":
+            params.extend([len(value), value])
+            return f"substr(CAST({ident} AS TEXT), 1, ?) = ?"
+        if kind == "numeric":
+            params.append(typed)
+            return self._relational_sql(ident, operator, "?")
+        if kind == "datetime":
+            params.append(typed.strftime("%Y-%m-%d %H:%M:%S"))
+            return self._relational_sql(f"datetime({ident})", operator, "datetime(?)")
+
+        params.append(value)
+        if operator in ("eq", "ne"):
+            return self._relational_sql(
+                f"lower(CAST({ident} AS TEXT))", operator, "lower(?)"
+            )
+        return self._relational_sql(f"CAST({ident} AS TEXT)", operator, "?")
+
+    @staticmethod
+    def _relational_sql(target: str, operator: str, placeholder: str) -> str:
+        if operator == "ne":
+            # Like the in-memory filter, rows with no value are "not equal"
+            return f"{target} IS NOT {placeholder}"
+        return f"{target} {COMPARISON_SQL[operator]} {placeholder}"
+
+    # ---- pandas ----
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Evaluate the filter against a DataFrame as one boolean mask
+
+        Each referenced column is converted (lower-cased text, numeric or
+        datetime) at most once per call, however many comparisons use it.
+
+        Args:
+            df: Frame holding (at least) the referenced columns
+
+        Returns:
+            pd.Series: Boolean mask aligned with df.index
+        """
+        if self.tree is None:
+            return pd.Series(True, index=df.index)
+        prepared = {}
+        return self._node_mask(self.tree, df, prepared)
+
+    def _node_mask(self, node, df, prepared) -> pd.Series:
+        kind = node[0]
+        if kind == "cmp":
+            return self._comparison_mask(df, prepared, *node[1:])
+        if kind == "not":
+            return ~self._node_mask(node[1], df, prepared)
+        masks = [self._node_mask(n, df, prepared) for n in node[1]]
+        result = masks[0]
+        for mask in masks[1:]:
+            result = (result & mask) if kind == "and" else (result | mask)
+        return result
+
+    @staticmethod
+    def _prepared(df, prepared, column, kind) -> pd.Series:
+        key = (column, kind)
+        if key not in prepared:
+            series = df[column]
+            if kind == "numeric":
+                prepared[key] = pd.to_numeric(series, errors="coerce")
+            elif kind == "datetime":
+                try:
+                    # Stored dates mix "YYYY-MM-DD" and "YYYY-MM-DD HH:MM:SS"
+                    parsed = pd.to_datetime(series, errors="coerce", format="mixed")
+                except (TypeError, ValueError):
+                    # pandas < 2.0 has no "mixed" but parses per element anyway
+                    parsed = pd.to_datetime(series, errors="coerce")
+                prepared[key] = parsed
+            else:
+                text = series.astype(str).where(series.notna())
+                prepared[key] = text.str.lower() if kind == "lower" else text
+        return prepared[key]
+
+    def _comparison_mask(self, df, prepared, column, operator, value) -> pd.Series:
+        if column not in df.columns:
+            return pd.Series(False, index=df.index)
+        kind, typed = _typed_value(self.column_types[column], operator, value)
+
+        if operator == "contains":
+            text = self._prepared(df, prepared, column, "lower")
+            return text.str.contains(value.lower(), regex=False, na=False)
+        if operator == "datestartswith":
+            text = self._prepared(df, prepared, column, "text")
+            return text.str.startswith(value, na=False)
+
+        if kind in ("numeric", "datetime"):
+            series = self._prepared(df, prepared, column, kind)
+        elif operator in ("eq", "ne"):
+            series = self._prepared(df, prepared, column, "lower")
+            typed = value.lower()
+        else:
+            series = self._prepared(df, prepared, column, "text")
+
+        # Compare only rows that have a value; missing values never match
+        valid = series.notna().to_numpy()
+        compare = PYTHON_COMPARISONS["eq" if operator == "ne" else operator]
+        matches = np.zeros(len(series), dtype=bool)
+        matches[valid] = np.asarray(compare(series[valid], typed), dtype=bool)
+        if operator == "ne":
+            matches = ~matches
+        return pd.Series(matches, index=df.index)
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(filter_query: str, column_items: Tuple[Tuple[str, str], ...]):
+    column_types = dict(column_items)
+    tree = parse_filter_query(filter_query)
+    if tree is not None:
+        tree = _prune(tree, column_types)
+    return CompiledFilter(tree, column_types)
+
+
+def compile_filter_query(
+    filter_query: Optional[str],
+    columns: Union[Dict[str, str], Iterable[str]],
+) -> CompiledFilter:
+    """
+    Compile a DataTable filter_query, reusing earlier compilations of the same query
+
+    Comparisons on columns that aren't listed are dropped, matching the table's
+    previous behaviour of ignoring unknown filter columns.
+
+    Args:
+        filter_query: The table's filter_query string
+        columns: Column -> type ("text", "numeric", "datetime"), or names (all text)
+
+    Returns:
+        CompiledFilter: Falsy when nothing applies
+
+    Raises:
+        FilterQuerySyntaxError: If the query is malformed
+    """
+    if not isinstance(columns, dict):
+        columns = {column: "text" for column in columns}
+    return _compile_cached(filter_query or "", tuple(sorted(columns.items())))
+
+
+def filter_query_to_sql(
+    filter_query: Optional[str], columns: Union[Dict[str, str], Iterable[str]]
+) -> Tuple[str, List, Set[str]]:
+    """
+    Translate a DataTable filter_query into a parameterized SQL condition
+
+    Args:
+        filter_query: The table's filter_query, e.g. '{forum} contains "cervical"'
+        columns: Column -> type mapping (or names) the query may reference
+
+    Returns:
+        Tuple of (condition, params, referenced columns); condition is "" if nothing applies
+    """
+    compiled = compile_filter_query(filter_query, columns)
+    return compiled.sql, list(compiled.params), set(compiled.columns)
+
+
+def sort_by_to_sql(
+    sort_by: Optional[List[Dict]], columns: Iterable[str]
+) -> Tuple[str, Set[str]]:
+    """
+    Translate a DataTable sort_by list into an ORDER BY expression list
+
+    Args:
+        sort_by: List of {"column_id": ..., "direction": "asc"|"desc"}
+        columns: Column names that may be sorted on
+
+    Returns:
+        Tuple of (order expressions, referenced columns); "" if nothing applies
+    """
+    allowed = set(columns)
+    terms, used = [], set()
+
+    for item in sort_by or []:
+        column = item.get("column_id")
+        if column not in allowed or column in used:
+            continue
+        direction = "ASC" if item.get("direction") == "asc" else "DESC"
+        terms.append(f"{quote_identifier(column)} {direction} NULLS LAST")
+        used.add(column)
+
+    return ", ".join(terms), used
@@ -0,0 +1,71 @@
+"""
+Periodic Maintenance
+Background thread that runs database consistency checks on an interval
+"""
+
+import os
+import threading
+from typing import Callable
+
+from .mrpc_database import get_database
+
+
+class PeriodicTask:
+    """Run a callable every interval seconds on a daemon thread
+
+    The first run happens one interval after start(), so starting the app
+    never waits on maintenance. Errors are printed and the schedule goes on.
+    """
+
+    def __init__(self, name: str, task: Callable[[], object], interval: float):
+        self.name = name
+        self.task = task
+        self.interval = interval
+
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the thread in this process (again after a fork)"""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name=self.name, daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the thread after its current run"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run_once(self):
+        """Run the task now, printing rather than raising errors"""
+        try:
+            return self.task()
+        except Exception as e:
+            print(f"❌ Error in {self.name}: {e}")
+            return None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+
+# Seconds between checks of the trigger-maintained tag_registry counts
+TAG_REGISTRY_RECONCILE_SECONDS = float(
+    os.environ.get("MRPC_TAG_REGISTRY_RECONCILE_SECONDS", 3600)
+)
+
+# Global instance started by the app
+tag_registry_reconciler = PeriodicTask(
+    "tag-registry-reconcile",
+    lambda: get_database().reconcile_tag_registry(),
+    TAG_REGISTRY_RECONCILE_SECONDS,
+)
@@ -0,0 +1,143 @@
+"""
+MinHash signatures and LSH banding for near-duplicate post detection
+Shingles post text into word n-grams and signs whole batches of posts with NumPy
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_WORDS = 3
+
+# Estimated Jaccard similarity at which two posts count as near duplicates.
+# 16 bands of 8 rows make any pair above ~0.85 share a bucket >99% of the time.
+DEFAULT_THRESHOLD = 0.8
+
+WORD_PATTERN = r"\w+"
+
+
+def _splitmix64(seed: int, count: int) -> np.ndarray:
+    """Deterministic 64-bit constants; signatures are stored, so these must never change"""
+    mask = (1 << 64) - 1
+    values = []
+    state = seed
+    for _ in range(count):
+        state = (state + 0x9E3779B97F4A7C15) & mask
+        z = state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+        values.append(z ^ (z >> 31))
+    return np.array(values, dtype=np.uint64)
+
+
+# Multiply-shift hash family: h_i(x) = (a_i * x + b_i) mod 2^64 >> 32, a_i odd
+_PERMUTATION_A = _splitmix64(1, NUM_PERMUTATIONS) | np.uint64(1)
+_PERMUTATION_B = _splitmix64(2, NUM_PERMUTATIONS)
+_SHINGLE_MULTIPLIERS = _splitmix64(3, SHINGLE_WORDS) | np.uint64(1)
+_BAND_MULTIPLIERS = _splitmix64(4, ROWS_PER_BAND) | np.uint64(1)
+
+
+def shingle_hashes(texts: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash every word n-gram of every text
+
+    Text is lower-cased and split into words; texts shorter than
+    SHINGLE_WORDS words use their single words as shingles.
+
+    Args:
+        texts (pd.Series): Post bodies (missing values have no shingles)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: uint64 shingle hashes and, for each,
+            the position of its text in texts (ascending)
+    """
+    words = (
+        texts.reset_index(drop=True)
+        .fillna("")
+        .astype(str)
+        .str.lower()
+        .str.findall(WORD_PATTERN)
+        .explode()
+        .dropna()
+    )
+    positions = words.index.to_numpy(dtype=np.int64)
+    word_hashes = pd.util.hash_array(words.to_numpy(dtype=object))
+    if len(word_hashes) == 0:
+        return word_hashes, positions
+
+    counts = np.bincount(positions, minlength=len(texts))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    remaining = counts[positions] - (np.arange(len(positions)) - starts[positions])
+
+    padded = np.concatenate((word_hashes, np.zeros(SHINGLE_WORDS, dtype=np.uint64)))
+    shingles = np.zeros(len(word_hashes), dtype=np.uint64)
+    for offset, multiplier in enumerate(_SHINGLE_MULTIPLIERS):
+        shingles += padded[offset : offset + len(word_hashes)] * multiplier
+
+    short = counts[positions] < SHINGLE_WORDS
+    keep = short | (remaining >= SHINGLE_WORDS)
+    hashes = np.where(short, word_hashes, shingles)
+    return hashes[keep], positions[keep]
+
+
+def minhash_signatures(texts: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MinHash signature of each text, computed for the whole batch at once
+
+    Args:
+        texts (pd.Series): Post bodies
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: uint32 signatures of shape
+            (len(texts), NUM_PERMUTATIONS) and a mask of texts that had any
+            words (other rows are all zeros and must not be indexed)
+    """
+    signatures = np.zeros((len(texts), NUM_PERMUTATIONS), dtype=np.uint32)
+    has_words = np.zeros(len(texts), dtype=bool)
+
+    hashes, positions = shingle_hashes(texts)
+    if len(hashes) == 0:
+        return signatures, has_words
+
+    rows, segment_starts = np.unique(positions, return_index=True)
+    has_words[rows] = True
+    shift = np.uint64(32)
+    for i in range(NUM_PERMUTATIONS):
+        permuted = (hashes * _PERMUTATION_A[i] + _PERMUTATION_B[i]) >> shift
+        signatures[rows, i] = np.minimum.reduceat(permuted, segment_starts)
+    return signatures, has_words
+
+
+def band_buckets(signatures: np.ndarray) -> np.ndarray:
+    """
+    LSH bucket of each band of each signature
+
+    Args:
+        signatures (np.ndarray): uint32 array (n, NUM_PERMUTATIONS)
+
+    Returns:
+        np.ndarray: int64 array (n, BANDS); posts sharing any bucket in the
+            same band are near-duplicate candidates
+    """
+    bands = signatures.reshape(len(signatures), BANDS, ROWS_PER_BAND)
+    buckets = (bands.astype(np.uint64) * _BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+    return buckets.view(np.int64)
+
+
+def estimated_similarity(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of aligned signature rows"""
+    return (np.atleast_2d(left) == np.atleast_2d(right)).mean(axis=1)
+
+
+def signature_to_blob(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signatures_from_blobs(blobs) -> np.ndarray:
+    """Stack stored signature BLOBs into a (n, NUM_PERMUTATIONS) uint32 array"""
+    joined = b"".join(blobs)
+    return np.frombuffer(joined, dtype="<u4").reshape(-1, NUM_PERMUTATIONS)
@@ -3,30 +3,267 @@ Enhanced SQLite database system for MRPC forum data
 Clean migration from questions_with_clusters.csv with comprehensive tagging support
 """
 
+import re
 import sqlite3
+import numpy as np
 import pandas as pd
 import json
 import hashlib
-from typing import Dict, List, Optional
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from pathlib import Path
+from .column_conversion import (
+    as_sqlite_values,
+    to_boolean,
+    to_int,
+    to_likert,
+    to_timestamp,
+)
+from .connection_pool import get_connection_pool
+from .minhash import (
+    BANDS,
+    DEFAULT_THRESHOLD,
+    band_buckets,
+    estimated_similarity,
+    minhash_signatures,
+    signature_to_blob,
+    signatures_from_blobs,
+)
+from .write_queue import get_coalescing_buffer, get_write_queue
 
 
 class MRPCDatabase:
     # Current schema version - increment this when making schema changes
-    CURRENT_SCHEMA_VERSION = 3
-
-    def __init__(self, db_path: str = "data/mrpc_new.db"):
+    CURRENT_SCHEMA_VERSION = 12
+
+    # Storage profiles - pragmas applied once when a pooled connection is opened.
+    # Select with MRPCDatabase(storage_profile=...) or the MRPC_DB_PROFILE env var.
+    STORAGE_PROFILES = {
+        # Rollback journal, single process (development and tests)
+        "default": {
+            "pragmas": {
+                "temp_store": "MEMORY",
+                "cache_size": -8000,  # ~8MB page cache per connection
+            },
+            "write_queue": False,
+        },
+        # Multi-worker gunicorn: readers never block the writer and vice versa
+        "concurrent": {
+            "pragmas": {
+                "journal_mode": "WAL",
+                "synchronous": "NORMAL",  # Safe with WAL, fsync only at checkpoints
+                "mmap_size": 268435456,  # 256MB memory-mapped reads
+                "cache_size": -16000,  # ~16MB page cache per connection
+                "temp_store": "MEMORY",
+                "busy_timeout": 5000,  # ms to wait for another worker's write lock
+            },
+            "write_queue": True,
+        },
+    }
+
+    # Columns of the aggregated datatable rows and how filters compare them
+    DATATABLE_COLUMNS = {
+        "id": "text",
+        "forum": "text",
+        "post_type": "text",
+        "username": "text",
+        "llm_cluster_name": "text",
+        "original_title": "text",
+        "original_post": "text",
+        "post_url": "text",
+        "cluster": "numeric",
+        "cluster_label": "text",
+        "date_posted": "datetime",
+        "umap_1": "numeric",
+        "umap_2": "numeric",
+        "umap_3": "numeric",
+        "upload_id": "numeric",
+        "all_questions": "text",
+        "all_categories": "text",
+    }
+    DATATABLE_AGGREGATE_COLUMNS = {"all_questions", "all_categories"}
+
+    # bulk_apply_tags modes: merge into, overwrite or strip the posts' tags
+    BULK_TAG_MODES = ("add", "replace", "remove")
+
+    # Seed for cluster_tag_mappings: cluster -> initial group/subgroup/tag.
+    # Stored under DEFAULT_MAPPING_UPLOAD and applies to uploads without their own mapping.
+    DEFAULT_CLUSTER_TAG_MAPPINGS = {
+        0: {
+            "group": "Medical",
+            "subgroup": "Surgery Recovery",
+            "tag": "Hysterectomy Recovery",
+        },
+        1: {
+            "group": "Medical",
+            "subgroup": "Procedures",
+            "tag": "Gynecological Procedures",
+        },
+        2: {
+            "group": "Medical",
+            "subgroup": "Cancer Concerns",
+            "tag": "Ovarian Cancer Concerns",
+        },
+        3: {
+            "group": "Medical",
+            "subgroup": "Treatment Side Effects",
+            "tag": "Treatment Side Effects",
+        },
+        4: {
+            "group": "Medical",
+            "subgroup": "Diagnosis Process",
+            "tag": "Diagnostic Testing",
+        },
+        5: {
+            "group": "Medical",
+            "subgroup": "Cancer Experience",
+            "tag": "Gynecological Cancer Journeys",
+        },
+        6: {
+            "group": "Medical",
+            "subgroup": "Surgery Recovery",
+            "tag": "Post-Hysterectomy Issues",
+        },
+        7: {
+            "group": "Medical",
+            "subgroup": "Treatment Side Effects",
+            "tag": "Post-Treatment Bleeding",
+        },
+        8: {
+            "group": "Support",
+            "subgroup": "Emotional Support",
+            "tag": "Treatment & Coping",
+        },
+        9: {
+            "group": "Medical",
+            "subgroup": "Diagnosis Process",
+            "tag": "Diagnosis & Consultation",
+        },
+    }
+    DEFAULT_MAPPING_UPLOAD = 0
+
+    # One click of feedback: post_id is resolved from posts.id in the same statement.
+    # A text-only update keeps an existing rating; a rating keeps an existing comment.
+    INFERENCE_FEEDBACK_UPSERT = """
+        INSERT INTO inference_feedback
+            (post_id, inference_type, rating, feedback_text, response_id, user_id, updated_at)
+        SELECT post_id, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP FROM posts WHERE id = ?
+        ON CONFLICT(post_id, inference_type, response_id) DO UPDATE SET
+            rating = CASE
+                WHEN excluded.rating = 'text_update'
+                     AND inference_feedback.rating IN ('positive', 'negative')
+                THEN inference_feedback.rating
+                ELSE excluded.rating
+            END,
+            feedback_text = CASE
+                WHEN excluded.rating IN ('positive', 'negative')
+                     AND COALESCE(inference_feedback.feedback_text, '') != ''
+                THEN inference_feedback.feedback_text
+                ELSE excluded.feedback_text
+            END,
+            user_id = excluded.user_id,
+            updated_at = CURRENT_TIMESTAMP
+    """
+
+    # db_path -> file identity of databases already checked/migrated in this process
+    _initialized_databases: Dict[str, tuple] = {}
+    _init_lock = threading.RLock()
+
+    # db_path -> (tag_registry generation, sorted tag vocabulary) for get_available_tags
+    _tag_vocabulary_cache: Dict[str, tuple] = {}
+
+    def __init__(
+        self, db_path: str = "data/mrpc_new.db", storage_profile: Optional[str] = None
+    ):
         """Initialize MRPC SQLite database"""
         self.db_path = db_path
+        self.storage_profile = storage_profile or os.environ.get(
+            "MRPC_DB_PROFILE", "default"
+        )
+        if self.storage_profile not in self.STORAGE_PROFILES:
+            raise ValueError(
+                f"Unknown storage profile '{self.storage_profile}' "
+                f"(expected one of {sorted(self.STORAGE_PROFILES)})"
+            )
+        profile = self.STORAGE_PROFILES[self.storage_profile]
 
         # Ensure data directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialize database with migrations
-        self._init_database_with_migrations()
+        # Shared per-process pool - connections are reused across instances and threads
+        self._pool = get_connection_pool(db_path, pragmas=profile["pragmas"])
+
+        # Small writes from concurrent callbacks go through one writer thread
+        self._write_queue = (
+            get_write_queue(db_path, pragmas=profile["pragmas"])
+            if profile["write_queue"]
+            else None
+        )
+
+        # Initialize database with migrations (once per database file per process)
+        self._ensure_initialized()
 
         # print(f" MRPC Database initialized: {db_path}")
 
+    def _connect(self):
+        """Borrow a pooled connection (commits on success, rolls back on error)"""
+        return self._pool.connection()
+
+    def _run_write(self, write_fn):
+        """
+        Run a write against the database, via the single-writer queue when enabled
+
+        A write_fn that itself calls _run_write on the writer thread runs the
+        nested write inline, inside the same transaction.
+
+        Args:
+            write_fn: Callable taking a connection; must not depend on request context
+
+        Returns:
+            Whatever write_fn returns, once its transaction has committed
+        """
+        if self._write_queue is not None:
+            return self._write_queue.execute(write_fn)
+
+        with self._connect() as conn:
+            return write_fn(conn)
+
+    def _ensure_initialized(self):
+        """Run the schema/migration check only the first time this file is opened"""
+        key = os.path.abspath(self.db_path)
+        identity = self._pool.file_identity()
+
+        if identity is not None and self._initialized_databases.get(key) == identity:
+            return
+
+        with self._init_lock:
+            # Another thread may have finished the check while we waited
+            identity = self._pool.file_identity()
+            if (
+                identity is not None
+                and self._initialized_databases.get(key) == identity
+            ):
+                return
+
+            self._init_database_with_migrations()
+            self._initialized_databases[key] = self._pool.file_identity()
+
+    @classmethod
+    def reset_initialization_cache(cls, db_path: Optional[str] = None):
+        """
+        Forget which databases have been checked so the next instance re-runs migrations
+
+        Args:
+            db_path (str, optional): Only reset this database (default: reset all)
+        """
+        with cls._init_lock:
+            if db_path is None:
+                cls._initialized_databases.clear()
+            else:
+                cls._initialized_databases.pop(os.path.abspath(db_path), None)
+
     def _init_database_with_migrations(self):
         """Initialize database with proper migration handling"""
         # Check if database exists and get current version
@@ -57,7 +294,7 @@ class MRPCDatabase:
     def _get_schema_version(self) -> int:
         """Get current schema version from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Check if schema_version table exists
                 cursor = conn.execute("""
                     SELECT name FROM sqlite_master 
@@ -115,7 +352,7 @@ class MRPCDatabase:
 
     def _set_schema_version(self, version: int):
         """Set schema version in database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             # Check if schema_version table exists and has correct structure
             cursor = conn.execute("""
                 SELECT name FROM sqlite_master 
@@ -195,9 +432,63 @@ class MRPCDatabase:
             # The migration was run externally, just update the version
             self._set_schema_version(3)
 
+        # Migration from version 3 to 4: Full-text search index over posts and notes
+        if from_version < 4:
+            print("📋 Running migration: Add FTS5 post search index")
+            self._migration_v3_to_v4()
+            self._set_schema_version(4)
+
+        # Migration from version 4 to 5: Composite lookup indexes for hot queries
+        if from_version < 5:
+            print("📋 Running migration: Add composite post/upload lookup indexes")
+            self._migration_v4_to_v5()
+            self._set_schema_version(5)
+
+        # Migration from version 5 to 6: Stored per-user duplicate keys on posts
+        if from_version < 6:
+            print("📋 Running migration: Add posts.dedupe_key with a unique index")
+            self._migration_v5_to_v6()
+            self._set_schema_version(6)
+
+        # Migration from version 6 to 7: MinHash/LSH near-duplicate index
+        if from_version < 7:
+            print("📋 Running migration: Add MinHash near-duplicate index")
+            self._migration_v6_to_v7()
+            self._set_schema_version(7)
+
+        # Migration from version 7 to 8: Content hash of each uploaded file
+        if from_version < 8:
+            print("📋 Running migration: Add uploads.content_sha256 with an index")
+            self._migration_v7_to_v8()
+            self._set_schema_version(8)
+
+        # Migration from version 8 to 9: Trigger-maintained tag registry counts
+        if from_version < 9:
+            print("📋 Running migration: Maintain tag_registry with triggers")
+            self._migration_v8_to_v9()
+            self._set_schema_version(9)
+
+        # Migration from version 9 to 10: Generation counter for the tag vocabulary cache
+        if from_version < 10:
+            print("📋 Running migration: Add tag_registry_generation")
+            self._migration_v9_to_v10()
+            self._set_schema_version(10)
+
+        # Migration from version 10 to 11: Per-upload cluster -> tag mappings
+        if from_version < 11:
+            print("📋 Running migration: Add cluster_tag_mappings")
+            self._migration_v10_to_v11()
+            self._set_schema_version(11)
+
+        # Migration from version 11 to 12: Generation counter for cached credentials
+        if from_version < 12:
+            print("📋 Running migration: Add credentials_generation")
+            self._migration_v11_to_v12()
+            self._set_schema_version(12)
+
     def _migration_v1_to_v2(self):
         """Migration from v1 to v2: Add proper inference_feedback table"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             # Check if inference_feedback table exists
             cursor = conn.execute("""
                 SELECT name FROM sqlite_master 
@@ -229,6 +520,713 @@ class MRPCDatabase:
                 self._ensure_inference_feedback_table_correct(conn)
                 print("   Created inference_feedback table")
 
+    # Text gathered per post for full-text search; {post_id} is the post to (re)index
+    SEARCH_INDEX_ROW_SQL = """
+        SELECT p.post_id, p.original_title, p.original_post,
+               (SELECT GROUP_CONCAT(question_text, char(10))
+                FROM ai_questions WHERE post_id = p.post_id),
+               (SELECT GROUP_CONCAT(COALESCE(question_text, '') || ' ' ||
+                                    COALESCE(notes_text, ''), char(10))
+                FROM users_questions WHERE post_id = p.post_id),
+               (SELECT GROUP_CONCAT(notes_text, char(10))
+                FROM users_categories WHERE post_id = p.post_id)
+        FROM posts p
+    """
+
+    def _create_search_index(self, conn):
+        """
+        Create the post_search FTS5 index and the triggers that keep it in sync
+
+        One row per post (rowid = posts.post_id) holding the title, body, AI
+        questions, user questions/notes and user category notes. Triggers on
+        each source table re-index just the affected post.
+
+        Args:
+            conn: Open connection (the caller commits)
+        """
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS post_search USING fts5(
+                title, body, ai_questions, user_questions, user_notes,
+                tokenize = 'porter unicode61 remove_diacritics 2'
+            )
+        """)
+
+        self._create_search_triggers(conn)
+
+        # Backfill posts that existed before the index
+        conn.execute(f"""
+            INSERT INTO post_search
+                (rowid, title, body, ai_questions, user_questions, user_notes)
+            {self.SEARCH_INDEX_ROW_SQL}
+            WHERE p.post_id NOT IN (SELECT rowid FROM post_search)
+        """)
+
+    def _create_search_triggers(self, conn):
+        """
+        Create the triggers that re-index a post when it or its child rows change
+
+        Args:
+            conn: Open connection (the caller commits)
+        """
+        reindex = f"""
+            INSERT OR REPLACE INTO post_search
+                (rowid, title, body, ai_questions, user_questions, user_notes)
+            {self.SEARCH_INDEX_ROW_SQL} WHERE p.post_id = {{post_id}};
+        """
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS post_search_posts_ai
+            AFTER INSERT ON posts BEGIN
+                {reindex.format(post_id="NEW.post_id")}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS post_search_posts_au
+            AFTER UPDATE OF original_title, original_post ON posts BEGIN
+                {reindex.format(post_id="NEW.post_id")}
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS post_search_posts_ad
+            AFTER DELETE ON posts BEGIN
+                DELETE FROM post_search WHERE rowid = OLD.post_id;
+            END
+        """)
+
+        # Child tables: re-index the owning post on any change
+        for table in ("ai_questions", "users_questions", "users_categories"):
+            for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS post_search_{table}_{event.lower()}
+                    AFTER {event} ON {table} BEGIN
+                        {reindex.format(post_id=f"{row}.post_id")}
+                    END
+                """)
+            # A re-parented row also changes the post it used to belong to
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS post_search_{table}_move
+                AFTER UPDATE OF post_id ON {table}
+                WHEN OLD.post_id IS NOT NEW.post_id BEGIN
+                    {reindex.format(post_id="OLD.post_id")}
+                END
+            """)
+
+    def _migration_v3_to_v4(self):
+        """Migration from v3 to v4: Add the post_search FTS5 index"""
+        required = {
+            "posts": {"post_id", "original_title", "original_post"},
+            "ai_questions": {"post_id", "question_text"},
+            "users_questions": {"post_id", "question_text", "notes_text"},
+            "users_categories": {"post_id", "notes_text"},
+        }
+        with self._connect() as conn:
+            for table, columns in required.items():
+                existing = {
+                    row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                }
+                if not columns <= existing:
+                    print(
+                        f"  ⚠️ Skipping search index - {table} predates the current schema"
+                    )
+                    return
+
+            self._create_search_index(conn)
+            print("   Created post_search index")
+
+    def _create_lookup_indexes(self, conn):
+        """Create the composite indexes used by post-detail and datatable lookups.
+
+        post_url lookups resolve post_id from the index alone, and the
+        composite upload indexes supersede the single-column ones.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_post_url ON posts(post_url, post_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_upload_date ON posts(upload_id, date_posted)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_original_title ON posts(original_title)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_uploads_owner_status ON uploads(uploaded_by, status)"
+        )
+        conn.execute("DROP INDEX IF EXISTS idx_posts_upload_id")
+        conn.execute("DROP INDEX IF EXISTS idx_uploads_uploaded_by")
+
+    def _migration_v4_to_v5(self):
+        """Migration from v4 to v5: Add composite post/upload lookup indexes"""
+        required = {
+            "posts": {
+                "post_id",
+                "post_url",
+                "upload_id",
+                "date_posted",
+                "original_title",
+            },
+            "uploads": {"uploaded_by", "status"},
+        }
+        with self._connect() as conn:
+            for table, columns in required.items():
+                existing = {
+                    row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                }
+                if not columns <= existing:
+                    print(
+                        f"  ⚠️ Skipping lookup indexes - {table} predates the current schema"
+                    )
+                    return
+
+            self._create_lookup_indexes(conn)
+            conn.execute("ANALYZE")
+            print("   Created composite lookup indexes")
+
+    def _migration_v5_to_v6(self):
+        """Migration from v5 to v6: Add posts.dedupe_key and backfill it"""
+        required = {
+            "posts": {
+                "post_id",
+                "original_title",
+                "LLM_inferred_question",
+                "upload_id",
+            },
+            "uploads": {"id", "uploaded_by"},
+        }
+        with self._connect() as conn:
+            for table, columns in required.items():
+                existing = {
+                    row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                }
+                if not columns <= existing:
+                    print(
+                        f"  ⚠️ Skipping dedupe keys - {table} predates the current schema"
+                    )
+                    return
+
+            post_columns = {row[1] for row in conn.execute("PRAGMA table_info(posts)")}
+            if "dedupe_key" not in post_columns:
+                conn.execute("ALTER TABLE posts ADD COLUMN dedupe_key INTEGER")
+
+            backfilled = self._backfill_dedupe_keys(conn)
+            self._create_dedupe_index(conn)
+            print(f"   Backfilled {backfilled} dedupe keys")
+
+    def _backfill_dedupe_keys(self, conn) -> int:
+        """Compute dedupe_key for every uploaded post from its stored values
+
+        The question is the post's first AI question, falling back to
+        LLM_inferred_question. Where a user already has several posts with
+        the same key, only the oldest keeps it.
+
+        Args:
+            conn: Open connection; the caller commits
+
+        Returns:
+            int: Number of posts given a key
+        """
+        posts = pd.read_sql_query(
+            """
+            SELECT p.post_id,
+                   CAST(u.uploaded_by AS TEXT) AS owner,
+                   p.original_title,
+                   COALESCE(
+                       (SELECT aq.question_text FROM ai_questions aq
+                        WHERE aq.post_id = p.post_id AND aq.question_text IS NOT NULL
+                        ORDER BY aq.id LIMIT 1),
+                       p.LLM_inferred_question
+                   ) AS question
+            FROM posts p
+            INNER JOIN uploads u ON p.upload_id = u.id
+            ORDER BY p.post_id
+            """,
+            conn,
+        )
+        keys = self._dedupe_keys(
+            posts["original_title"], posts["question"], posts["owner"]
+        )
+        keys[keys.notna() & keys.duplicated()] = None
+        keyed = keys.notna()
+
+        conn.execute("DROP INDEX IF EXISTS idx_posts_dedupe_key")
+        conn.execute("UPDATE posts SET dedupe_key = NULL")
+        conn.executemany(
+            "UPDATE posts SET dedupe_key = ? WHERE post_id = ?",
+            zip(keys[keyed].tolist(), posts.loc[keyed, "post_id"].tolist()),
+        )
+        return int(keyed.sum())
+
+    def _migration_v6_to_v7(self):
+        """Migration from v6 to v7: Add the near-duplicate index and sign existing posts"""
+        with self._connect() as conn:
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(posts)")}
+            if not {"post_id", "original_post"} <= existing:
+                print(
+                    "  ⚠️ Skipping near-duplicate index - posts predates the current schema"
+                )
+                return
+
+            self._create_near_duplicate_index(conn)
+            indexed = 0
+            for batch in pd.read_sql_query(
+                """
+                SELECT post_id, original_post FROM posts
+                WHERE post_id NOT IN (SELECT post_id FROM post_minhash)
+                ORDER BY post_id
+                """,
+                conn,
+                chunksize=self.NEAR_DUPLICATE_BATCH_ROWS,
+            ):
+                signatures, has_words = minhash_signatures(batch["original_post"])
+                indexed += self._store_minhash_signatures(
+                    conn, batch["post_id"].to_numpy(), signatures, has_words
+                )
+            print(f"   Indexed {indexed} posts for near-duplicate detection")
+
+    def _create_near_duplicate_index(self, conn):
+        """Create the MinHash signature and LSH band tables
+
+        post_minhash holds one signature per post (and the post it was flagged
+        as a near duplicate of at upload time); post_lsh_bands maps each
+        (band, bucket) to the posts that hash there, so candidates are found
+        with index lookups rather than a scan of every post.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS post_minhash (
+                post_id INTEGER PRIMARY KEY,
+                signature BLOB NOT NULL,
+                near_duplicate_of INTEGER,
+                FOREIGN KEY (post_id) REFERENCES posts(post_id) ON DELETE CASCADE
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS post_lsh_bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                post_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, post_id)
+            ) WITHOUT ROWID
+        """)
+        # Foreign keys are not enforced, so deleted posts are unindexed explicitly.
+        # Their band rows are pruned in bulk when an upload is deleted; until
+        # then lookups skip them because they join posts (post_ids are never reused).
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS post_minhash_posts_ad
+            AFTER DELETE ON posts BEGIN
+                DELETE FROM post_minhash WHERE post_id = OLD.post_id;
+            END
+        """)
+
+    def _migration_v7_to_v8(self):
+        """Migration from v7 to v8: Add uploads.content_sha256
+
+        Earlier uploads keep a NULL hash (their files are not kept), so only
+        files uploaded from now on are recognised when uploaded again.
+        """
+        with self._connect() as conn:
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(uploads)")}
+            if not {"uploaded_by", "upload_type"} <= existing:
+                print(
+                    "  ⚠️ Skipping upload content hashes - uploads predates the current schema"
+                )
+                return
+
+            if "content_sha256" not in existing:
+                conn.execute("ALTER TABLE uploads ADD COLUMN content_sha256 TEXT")
+            self._create_upload_hash_index(conn)
+
+    def _migration_v8_to_v9(self):
+        """Migration from v8 to v9: Add the tag_registry triggers and rebuild the counts once"""
+        with self._connect() as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            if not {"ai_categories", "tag_registry"} <= tables:
+                print(
+                    "  ⚠️ Skipping tag registry triggers - ai_categories or tag_registry is missing"
+                )
+                return
+
+            self._create_tag_registry_triggers(conn)
+            corrected = self._reconcile_tag_registry(conn)
+            print(f"   Corrected {corrected} tag registry entries")
+
+    def _create_tag_registry_triggers(self, conn):
+        """Keep tag_registry.usage_count in step with ai_categories
+
+        Each inserted or deleted group/subgroup/tag row adjusts the count of
+        its own registry entry, so a tag edit costs work proportional to the
+        tags on the post rather than a rebuild over every category. Entries
+        whose count reaches zero are removed.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        increment = """
+            INSERT INTO tag_registry (tag_type, tag_value, usage_count)
+            VALUES (NEW.category_type, NEW.category_value, 1)
+            ON CONFLICT(tag_type, tag_value) DO UPDATE SET usage_count = usage_count + 1;
+        """
+        decrement = """
+            UPDATE tag_registry SET usage_count = usage_count - 1
+            WHERE tag_type = OLD.category_type AND tag_value = OLD.category_value;
+            DELETE FROM tag_registry
+            WHERE tag_type = OLD.category_type AND tag_value = OLD.category_value
+              AND usage_count <= 0;
+        """
+        tag_types = "('group', 'subgroup', 'tag')"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tag_registry_ai_categories_ai
+            AFTER INSERT ON ai_categories
+            WHEN NEW.category_type IN {tag_types}
+            BEGIN {increment} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tag_registry_ai_categories_ad
+            AFTER DELETE ON ai_categories
+            WHEN OLD.category_type IN {tag_types}
+            BEGIN {decrement} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tag_registry_ai_categories_au_old
+            AFTER UPDATE OF category_type, category_value ON ai_categories
+            WHEN OLD.category_type IN {tag_types}
+            BEGIN {decrement} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tag_registry_ai_categories_au_new
+            AFTER UPDATE OF category_type, category_value ON ai_categories
+            WHEN NEW.category_type IN {tag_types}
+            BEGIN {increment} END
+        """)
+
+    def _migration_v9_to_v10(self):
+        """Migration from v9 to v10: Add the tag vocabulary generation counter"""
+        with self._connect() as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            if "tag_registry" not in tables:
+                print(
+                    "  ⚠️ Skipping tag vocabulary generation - tag_registry is missing"
+                )
+                return
+
+            self._create_tag_registry_generation(conn)
+
+    def _create_tag_registry_generation(self, conn):
+        """Create the counter that changes whenever a tag_registry entry appears or disappears
+
+        get_available_tags caches the vocabulary per process and re-reads it
+        only when this value moves. Count-only changes (upserts that update
+        usage_count) leave it alone. It starts at a random value so a new
+        database at a reused path never matches an old cache entry.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tag_registry_generation (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                generation INTEGER NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT OR IGNORE INTO tag_registry_generation (id, generation) "
+            "VALUES (1, abs(random() % 4611686018427387904))"
+        )
+        for event in ("INSERT", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS tag_registry_generation_{event.lower()}
+                AFTER {event} ON tag_registry
+                BEGIN
+                    UPDATE tag_registry_generation SET generation = generation + 1;
+                END
+            """)
+
+    def _migration_v10_to_v11(self):
+        """Migration from v10 to v11: Store the initial cluster tag mappings in a table"""
+        with self._connect() as conn:
+            self._create_cluster_tag_mappings(conn)
+
+    def _migration_v11_to_v12(self):
+        """Migration from v11 to v12: Add the credentials generation counter"""
+        with self._connect() as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            if "users" not in tables:
+                print("  ⚠️ Skipping credentials generation - users is missing")
+                return
+
+            self._create_credentials_generation(conn)
+
+    def _create_credentials_generation(self, conn):
+        """Create the counter that changes whenever a user's credentials change
+
+        The Basic Auth credential cache (utilities.auth_cache) is per worker
+        process; it checks this value on every hit, so a password change,
+        deactivation or deletion in one worker revokes cached logins in all
+        of them. Like tag_registry_generation it starts at a random value.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS credentials_generation (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                generation INTEGER NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT OR IGNORE INTO credentials_generation (id, generation) "
+            "VALUES (1, abs(random() % 4611686018427387904))"
+        )
+        for name, event in (
+            ("update", "UPDATE OF email, password_hash, is_active"),
+            ("delete", "DELETE"),
+        ):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS credentials_generation_{name}
+                AFTER {event} ON users
+                BEGIN
+                    UPDATE credentials_generation SET generation = generation + 1;
+                END
+            """)
+
+    def get_credentials_generation(self) -> Optional[int]:
+        """
+        Current credentials generation, checked by the credential cache on every hit
+
+        Returns:
+            Optional[int]: Generation, or None if it cannot be read
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT generation FROM credentials_generation"
+                ).fetchone()
+                return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"❌ Error reading credentials generation: {e}")
+            return None
+
+    def _create_cluster_tag_mappings(self, conn):
+        """Create cluster_tag_mappings and seed the default mapping
+
+        Rows under DEFAULT_MAPPING_UPLOAD apply to every upload; rows under
+        an upload's own id override them cluster by cluster and tag type by
+        tag type.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cluster_tag_mappings (
+                upload_id INTEGER NOT NULL,
+                cluster INTEGER NOT NULL,
+                tag_type TEXT NOT NULL CHECK (tag_type IN ('group', 'subgroup', 'tag')),
+                tag_value TEXT NOT NULL,
+                PRIMARY KEY (upload_id, cluster, tag_type)
+            )
+        """)
+        conn.executemany(
+            "INSERT OR IGNORE INTO cluster_tag_mappings "
+            "(upload_id, cluster, tag_type, tag_value) VALUES (?, ?, ?, ?)",
+            self._cluster_mapping_rows(
+                self.DEFAULT_CLUSTER_TAG_MAPPINGS, self.DEFAULT_MAPPING_UPLOAD
+            ),
+        )
+
+    @staticmethod
+    def _cluster_mapping_rows(mappings: Dict, upload_id: int) -> List[tuple]:
+        """(upload_id, cluster, tag_type, tag_value) rows from {cluster: {tag_type: value}}"""
+        rows = []
+        for cluster, mapping in mappings.items():
+            for tag_type, value in mapping.items():
+                if tag_type not in ("group", "subgroup", "tag"):
+                    raise ValueError(f"Unknown tag type: {tag_type}")
+                value = str(value or "").strip()
+                if value:
+                    rows.append((upload_id, int(cluster), tag_type, value))
+        return rows
+
+    def get_cluster_tag_mappings(self, upload_id: int = None) -> Dict[int, Dict]:
+        """
+        Get the cluster -> {group, subgroup, tag} mapping an upload is tagged with
+
+        Args:
+            upload_id: Upload whose overrides to apply (default: the default mapping only)
+
+        Returns:
+            Dict[int, Dict]: {cluster: {tag_type: tag_value}}
+        """
+        upload_ids = [self.DEFAULT_MAPPING_UPLOAD]
+        if upload_id is not None:
+            upload_ids.append(upload_id)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT cluster, tag_type, tag_value FROM cluster_tag_mappings
+                WHERE upload_id IN ({", ".join("?" * len(upload_ids))})
+                ORDER BY upload_id = ?, cluster
+                """,
+                upload_ids + [self.DEFAULT_MAPPING_UPLOAD],
+            ).fetchall()
+
+        # Upload rows sort first; the default only fills what they leave open
+        mappings: Dict[int, Dict] = {}
+        for cluster, tag_type, tag_value in rows:
+            mappings.setdefault(cluster, {}).setdefault(tag_type, tag_value)
+        return dict(sorted(mappings.items()))
+
+    def set_cluster_tag_mappings(self, mappings: Dict, upload_id: int = None) -> bool:
+        """
+        Replace an upload's cluster -> tag mapping (or the default mapping)
+
+        Args:
+            mappings: {cluster: {"group": ..., "subgroup": ..., "tag": ...}};
+                tag types left out fall back to the default mapping
+            upload_id: Upload to configure (default: the default mapping)
+
+        Returns:
+            bool: True if the mapping was stored
+        """
+        if upload_id is None:
+            upload_id = self.DEFAULT_MAPPING_UPLOAD
+        try:
+            rows = self._cluster_mapping_rows(mappings or {}, upload_id)
+
+            def _write_mappings(conn):
+                conn.execute(
+                    "DELETE FROM cluster_tag_mappings WHERE upload_id = ?",
+                    (upload_id,),
+                )
+                conn.executemany(
+                    "INSERT INTO cluster_tag_mappings "
+                    "(upload_id, cluster, tag_type, tag_value) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+
+            self._run_write(_write_mappings)
+            print(f" Stored {len(rows)} cluster tag mappings for upload {upload_id}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error storing cluster tag mappings: {e}")
+            return False
+
+    def _reconcile_tag_registry(self, conn) -> int:
+        """
+        Set every tag_registry count that differs from ai_categories to the true count
+
+        Args:
+            conn: Open connection holding the write transaction
+
+        Returns:
+            int: Number of registry entries inserted, corrected or removed
+        """
+        drift = conn.execute("""
+            WITH expected AS (
+                SELECT category_type AS tag_type, category_value AS tag_value,
+                       COUNT(*) AS usage_count
+                FROM ai_categories
+                WHERE category_type IN ('group', 'subgroup', 'tag')
+                GROUP BY category_type, category_value
+            )
+            SELECT e.tag_type, e.tag_value, e.usage_count
+            FROM expected e
+            LEFT JOIN tag_registry r
+                ON r.tag_type = e.tag_type AND r.tag_value = e.tag_value
+            WHERE r.usage_count IS NOT e.usage_count
+            UNION ALL
+            SELECT r.tag_type, r.tag_value, 0
+            FROM tag_registry r
+            WHERE NOT EXISTS (
+                SELECT 1 FROM expected e
+                WHERE e.tag_type = r.tag_type AND e.tag_value = r.tag_value
+            )
+        """).fetchall()
+
+        conn.executemany(
+            "DELETE FROM tag_registry WHERE tag_type = ? AND tag_value = ?",
+            [(tag_type, value) for tag_type, value, count in drift if count == 0],
+        )
+        conn.executemany(
+            """
+            INSERT INTO tag_registry (tag_type, tag_value, usage_count)
+            VALUES (?, ?, ?)
+            ON CONFLICT(tag_type, tag_value) DO UPDATE SET usage_count = excluded.usage_count
+            """,
+            [row for row in drift if row[2] > 0],
+        )
+        return len(drift)
+
+    def reconcile_tag_registry(self) -> Dict:
+        """
+        Verify the trigger-maintained tag_registry counts and repair any drift
+
+        Run periodically (see utilities.maintenance); drift only appears if
+        ai_categories was changed with the triggers missing, e.g. by an
+        external tool working on a copy of the schema.
+
+        Returns:
+            Dict: success, corrected (entries fixed) and message
+        """
+        try:
+            corrected = self._run_write(self._reconcile_tag_registry)
+            if corrected:
+                print(f"⚠️ Tag registry drift: corrected {corrected} entries")
+            return {
+                "success": True,
+                "corrected": corrected,
+                "message": f"Tag registry verified, {corrected} entries corrected",
+            }
+
+        except Exception as e:
+            print(f"❌ Error reconciling tag registry: {e}")
+            return {
+                "success": False,
+                "corrected": 0,
+                "message": f"Error reconciling tag registry: {str(e)}",
+            }
+
+    def _create_upload_hash_index(self, conn):
+        """Create the index that finds a user's earlier upload of the same file
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_uploads_content_sha256 "
+            "ON uploads(content_sha256, uploaded_by)"
+        )
+
+    def _create_dedupe_index(self, conn):
+        """Create the unique index that makes duplicate uploads a key lookup
+
+        NULL keys (rows without a title or question) never conflict.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_dedupe_key ON posts(dedupe_key)"
+        )
+
     def _init_database(self):
         """Initialize the database with required tables - optimized for existing databases."""
         # Quick existence check - if posts table exists, likely all tables exist
@@ -241,7 +1239,7 @@ class MRPCDatabase:
     def _database_initialized(self):
         """Fast check if database is already initialized."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     "SELECT name FROM sqlite_master WHERE type='table' AND name='posts'"
                 )
@@ -251,7 +1249,7 @@ class MRPCDatabase:
 
     def _create_database_schema(self):
         """Create the full database schema - only called when needed."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             # Main forum posts table (new structure with post_id as PK)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS posts (
@@ -272,6 +1270,7 @@ class MRPCDatabase:
                     umap_2 REAL,
                     umap_3 REAL,
                     upload_id INTEGER,
+                    dedupe_key INTEGER,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
@@ -403,6 +1402,7 @@ class MRPCDatabase:
                     records_count INTEGER DEFAULT 0,
                     status TEXT DEFAULT 'active',  -- 'active', 'deleted'
                     upload_type TEXT DEFAULT 'forum_data',  -- 'forum_data' or 'transcription_data'
+                    content_sha256 TEXT,  -- SHA-256 of the raw uploaded file
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (uploaded_by) REFERENCES users(id)
                 )
@@ -458,9 +1458,6 @@ class MRPCDatabase:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_posts_cluster ON posts(cluster)"
             )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_posts_upload_id ON posts(upload_id)"
-            )
 
             # AI content indexes
             conn.execute(
@@ -504,9 +1501,6 @@ class MRPCDatabase:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
 
             # Upload indexes
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_uploads_uploaded_by ON uploads(uploaded_by)"
-            )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_uploads_status ON uploads(status)"
             )
@@ -523,6 +1517,28 @@ class MRPCDatabase:
                 "CREATE INDEX IF NOT EXISTS idx_transcriptions_participant ON transcriptions(participant_id)"
             )
 
+            # Composite lookups for post detail and datatable queries
+            self._create_lookup_indexes(conn)
+            # Per-user duplicate detection for uploads
+            self._create_dedupe_index(conn)
+            # Re-uploads of an identical file
+            self._create_upload_hash_index(conn)
+            # Incremental tag registry counts
+            self._create_tag_registry_triggers(conn)
+            # Version of the tag vocabulary cached by get_available_tags
+            self._create_tag_registry_generation(conn)
+            # Initial cluster -> tag mappings, default plus per-upload overrides
+            self._create_cluster_tag_mappings(conn)
+            # Revocation of cached Basic Auth credentials across workers
+            self._create_credentials_generation(conn)
+            # MinHash/LSH near-duplicate detection over post bodies
+            self._create_near_duplicate_index(conn)
+
+            # Full-text search over posts, AI questions and user notes
+            self._create_search_index(conn)
+            # Release the write lock before default users are created on another connection
+            conn.commit()
+
             # Initialize default users after schema creation
             self.initialize_default_users()
 
@@ -545,7 +1561,7 @@ class MRPCDatabase:
             print(f"🔄 Migrating data from {csv_path}...")
             df = pd.read_csv(csv_path)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Clear existing data
                 conn.execute("DELETE FROM posts")
                 conn.execute("DELETE FROM tags")
@@ -587,8 +1603,19 @@ class MRPCDatabase:
             print(f"❌ Error migrating from CSV: {e}")
             return False
 
-    def _create_initial_tag_mappings(self, conn, df):
-        """Create intelligent initial tag mappings from cluster data"""
+    def _create_initial_tag_mappings(self, conn, df, upload_id: int = None):
+        """
+        Tag posts with the group/subgroup/tag their cluster maps to
+
+        The mapping comes from cluster_tag_mappings: each row's upload
+        (df["upload_id"], else upload_id) overrides the default mapping. The
+        tag rows are built with one merge and written with one executemany.
+
+        Args:
+            conn: Open connection holding the write transaction
+            df (pd.DataFrame): Posts with "id" and "cluster" columns
+            upload_id: Upload to take mapping overrides from when df has no upload_id
+        """
 
         # Check if required columns exist
         if "id" not in df.columns:
@@ -602,127 +1629,73 @@ class MRPCDatabase:
             )
             return
 
-        # Define hierarchical mapping based on cluster analysis
-        cluster_mappings = {
-            0: {
-                "group": "Medical",
-                "subgroup": "Surgery Recovery",
-                "tag": "Hysterectomy Recovery",
-            },
-            1: {
-                "group": "Medical",
-                "subgroup": "Procedures",
-                "tag": "Gynecological Procedures",
-            },
-            2: {
-                "group": "Medical",
-                "subgroup": "Cancer Concerns",
-                "tag": "Ovarian Cancer Concerns",
-            },
-            3: {
-                "group": "Medical",
-                "subgroup": "Treatment Side Effects",
-                "tag": "Treatment Side Effects",
-            },
-            4: {
-                "group": "Medical",
-                "subgroup": "Diagnosis Process",
-                "tag": "Diagnostic Testing",
-            },
-            5: {
-                "group": "Medical",
-                "subgroup": "Cancer Experience",
-                "tag": "Gynecological Cancer Journeys",
-            },
-            6: {
-                "group": "Medical",
-                "subgroup": "Surgery Recovery",
-                "tag": "Post-Hysterectomy Issues",
-            },
-            7: {
-                "group": "Medical",
-                "subgroup": "Treatment Side Effects",
-                "tag": "Post-Treatment Bleeding",
-            },
-            8: {
-                "group": "Support",
-                "subgroup": "Emotional Support",
-                "tag": "Treatment & Coping",
-            },
-            9: {
-                "group": "Medical",
-                "subgroup": "Diagnosis Process",
-                "tag": "Diagnosis & Consultation",
-            },
-        }
-
-        # Apply tags to all posts based on their cluster
-        for _, row in df.iterrows():
-            item_id = row["id"]
-            cluster = row["cluster"]
-
-            if cluster in cluster_mappings:
-                mapping = cluster_mappings[cluster]
-
-                # Insert tags for this item (marked as AI-generated)
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO tags (item_id, tag_type, tag_value, source)
-                    VALUES (?, 'group', ?, 'ai')
-                """,
-                    (item_id, mapping["group"]),
-                )
-
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO tags (item_id, tag_type, tag_value, source)
-                    VALUES (?, 'subgroup', ?, 'ai')
-                """,
-                    (item_id, mapping["subgroup"]),
-                )
-
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO tags (item_id, tag_type, tag_value, source)
-                    VALUES (?, 'tag', ?, 'ai')
-                """,
-                    (item_id, mapping["tag"]),
-                )
-
-        # Update registry counts
-        self._update_registry_counts(conn)
+        items = pd.DataFrame(
+            {
+                "item_id": df["id"],
+                "cluster": pd.to_numeric(df["cluster"], errors="coerce"),
+                "upload_id": df["upload_id"] if "upload_id" in df.columns else upload_id,
+            }
+        ).dropna(subset=["item_id", "cluster"])
+        # Numeric before fillna - filling an object column would downcast implicitly
+        items["upload_id"] = (
+            pd.to_numeric(items["upload_id"], errors="coerce")
+            .fillna(self.DEFAULT_MAPPING_UPLOAD)
+            .astype("int64")
+        )
+        # Clusters like 2.5 map to nothing, as before
+        items = items[items["cluster"] % 1 == 0].astype({"cluster": "int64"})
+
+        upload_ids = sorted(set(items["upload_id"]) | {self.DEFAULT_MAPPING_UPLOAD})
+        mappings = pd.read_sql_query(
+            f"""
+            SELECT upload_id, cluster, tag_type, tag_value FROM cluster_tag_mappings
+            WHERE upload_id IN ({", ".join("?" * len(upload_ids))})
+            """,
+            conn,
+            params=[int(u) for u in upload_ids],
+        ).astype({"upload_id": "int64", "cluster": "int64"})
+        default = mappings["upload_id"] == self.DEFAULT_MAPPING_UPLOAD
+
+        # Upload-specific rows first, so they win the (item, tag type) dedupe
+        rows = pd.concat(
+            [
+                items.merge(mappings[~default], on=["upload_id", "cluster"]),
+                items.merge(
+                    mappings[default].drop(columns="upload_id"), on="cluster"
+                ),
+            ]
+        ).drop_duplicates(["item_id", "tag_type"])
+
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO tags (item_id, tag_type, tag_value, source)
+            VALUES (?, ?, ?, 'ai')
+            """,
+            self._sqlite_rows(rows[["item_id", "tag_type", "tag_value"]]),
+        )
 
-        print(" Created initial tag mappings based on cluster analysis")
+        # Bring tag_registry in line with ai_categories
+        self._reconcile_tag_registry(conn)
 
-    def _update_registry_counts(self, conn):
-        """Update the tag registry with current usage counts from ai_categories"""
-        conn.execute("DELETE FROM tag_registry")
-        conn.execute("""
-            INSERT INTO tag_registry (tag_type, tag_value, usage_count)
-            SELECT category_type as tag_type, category_value as tag_value, COUNT(*) as usage_count
-            FROM ai_categories
-            WHERE category_type IN ('group', 'subgroup', 'tag')
-            GROUP BY category_type, category_value
-        """)
+        print(
+            f" Created {len(rows)} initial tag mappings for {rows['item_id'].nunique()} posts"
+        )
 
     def get_tags_for_item(self, item_id: str) -> Dict[str, List[Dict]]:
         """Get all tags for a specific item with source information from new schema"""
-        # Convert item_id (old id) to post_id (new PK)
-        post_id = self._get_post_id_from_id(item_id)
-        if post_id is None:
-            return {"groups": [], "subgroups": [], "tags": []}
-
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
+            # One query: item_id (old id) is resolved to post_id (new PK) by the join
             cursor.execute(
                 """
-                SELECT category_type as tag_type, category_value as tag_value, 
-                       CASE WHEN model_version LIKE '%user%' THEN 'user' ELSE 'ai' END as source
-                FROM ai_categories 
-                WHERE post_id = ? AND category_type IN ('group', 'subgroup', 'tag')
-                ORDER BY category_type, category_value
+                SELECT ac.category_type as tag_type, ac.category_value as tag_value,
+                       CASE WHEN ac.model_version LIKE '%user%' THEN 'user' ELSE 'ai' END as source
+                FROM posts p
+                JOIN ai_categories ac ON ac.post_id = p.post_id
+                WHERE p.id = ? AND ac.category_type IN ('group', 'subgroup', 'tag')
+                ORDER BY ac.category_type, ac.category_value
             """,
-                (post_id,),
+                (item_id,),
             )
 
             results = cursor.fetchall()
@@ -751,7 +1724,7 @@ class MRPCDatabase:
                 print(f"❌ Could not find post_id for item_id: {item_id}")
                 return False
 
-            with sqlite3.connect(self.db_path) as conn:
+            def _write_tags(conn):
                 # Delete existing AI categories for this post
                 conn.execute(
                     "DELETE FROM ai_categories WHERE post_id = ? AND category_type IN ('group', 'subgroup', 'tag')",
@@ -787,43 +1760,58 @@ class MRPCDatabase:
                                 (post_id, db_type, value, model_version),
                             )
 
-                # Update registry counts
-                self._update_registry_counts(conn)
+            # tag_registry counts are adjusted by the ai_categories triggers
+            self._run_write(_write_tags)
 
-                print(f" Saved tags for {item_id} (post_id {post_id}): {tags_data}")
-                return True
+            print(f" Saved tags for {item_id} (post_id {post_id}): {tags_data}")
+            return True
 
         except Exception as e:
             print(f"❌ Error saving tags for {item_id}: {e}")
             return False
 
     def get_available_tags(self) -> Dict[str, List[str]]:
-        """Get all available tags from AI categories table (new schema)"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Get unique tag values from ai_categories table
-            cursor.execute("""
-                SELECT DISTINCT category_type as tag_type, category_value as tag_value
-                FROM ai_categories
-                WHERE category_type IN ('group', 'subgroup', 'tag')
-                ORDER BY category_type, category_value
-            """)
-
-            results = cursor.fetchall()
+        """
+        Get all group, subgroup and tag values in use, each list sorted
 
-            # Organize by type (simple string format for dropdown compatibility)
-            available = {"groups": [], "subgroups": [], "tags": []}
+        The vocabulary comes from tag_registry (kept in step with
+        ai_categories by triggers) and is cached per process. A call costs a
+        one-row read of tag_registry_generation; the registry is only read
+        again after an entry has been added or removed.
 
-            for tag_type, tag_value in results:
-                if tag_type == "group":
-                    available["groups"].append(tag_value)
-                elif tag_type == "subgroup":
-                    available["subgroups"].append(tag_value)
-                elif tag_type == "tag":
-                    available["tags"].append(tag_value)
+        Returns:
+            Dict[str, List[str]]: groups, subgroups and tags (fresh lists)
+        """
+        key = os.path.abspath(self.db_path)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT generation FROM tag_registry_generation"
+            ).fetchone()
+            generation = row[0] if row else None
+            cached = self._tag_vocabulary_cache.get(key)
+
+            if generation is not None and cached and cached[0] == generation:
+                vocabulary = cached[1]
+            else:
+                # Registry primary key order: already sorted by type, then value
+                results = conn.execute("""
+                    SELECT tag_type, tag_value FROM tag_registry
+                    WHERE tag_type IN ('group', 'subgroup', 'tag')
+                    ORDER BY tag_type, tag_value
+                """).fetchall()
+
+                # Organize by type (simple string format for dropdown compatibility)
+                vocabulary = {"groups": [], "subgroups": [], "tags": []}
+                for tag_type, tag_value in results:
+                    vocabulary[f"{tag_type}s"].append(tag_value)
+                vocabulary = {
+                    kind: tuple(values) for kind, values in vocabulary.items()
+                }
+                if generation is not None:
+                    # Generation read first: a concurrent change only makes this entry stale
+                    self._tag_vocabulary_cache[key] = (generation, vocabulary)
 
-            return available
+        return {kind: list(values) for kind, values in vocabulary.items()}
 
     def get_all_posts_as_dataframe(
         self,
@@ -848,63 +1836,31 @@ class MRPCDatabase:
         """
         from utilities.auth import get_current_user_id
 
-        with sqlite3.connect(self.db_path) as conn:
+        # Resolve ownership filter before building the query
+        params = [status_filter]
+        user_filter = ""
+        if not include_all_users:
+            # Use provided user_id or get current authenticated user
+            filter_user_id = user_id if user_id is not None else get_current_user_id()
+
+            if filter_user_id is not None:
+                user_filter = " AND u.uploaded_by = ?"
+                params.append(str(filter_user_id))  # Convert to string for consistency
+            else:
+                # No authenticated user and no admin override - return empty DataFrame
+                return pd.DataFrame()
+        else:
+            # Admin override requested - verify admin privileges
+            from utilities.auth import require_admin
+
+            require_admin()  # Raises exception if not admin (User ID 1)
+
+        with self._connect() as conn:
             if datatable_format:
-                # Enhanced query that aggregates all questions and categories per POST TITLE
-                # This groups posts with the same title together
-                query = """
-                    SELECT 
-                        MIN(p.id) as id,
-                        p.forum, 
-                        MIN(p.post_type) as post_type,
-                        MIN(p.username) as username,
-                        MIN(p.llm_cluster_name) as llm_cluster_name,
-                        p.original_title,
-                        MIN(p.original_post) as original_post,
-                        MIN(p.post_url) as post_url,
-                        MIN(p.cluster) as cluster,
-                        MIN(p.cluster_label) as cluster_label,
-                        MIN(p.date_posted) as date_posted,
-                        MIN(p.umap_1) as umap_1, 
-                        MIN(p.umap_2) as umap_2, 
-                        MIN(p.umap_3) as umap_3,
-                        MIN(p.upload_id) as upload_id,
-                        
-                        -- Aggregate all questions (AI + User) with newline separation
-                        (CASE 
-                            WHEN GROUP_CONCAT(aq.question_text, char(10)) IS NOT NULL 
-                                 AND GROUP_CONCAT(uq.question_text, char(10)) IS NOT NULL THEN
-                                GROUP_CONCAT(aq.question_text, char(10)) || char(10) || GROUP_CONCAT(uq.question_text, char(10))
-                            WHEN GROUP_CONCAT(aq.question_text, char(10)) IS NOT NULL THEN
-                                GROUP_CONCAT(aq.question_text, char(10))
-                            WHEN GROUP_CONCAT(uq.question_text, char(10)) IS NOT NULL THEN
-                                GROUP_CONCAT(uq.question_text, char(10))
-                            ELSE ''
-                        END) as all_questions,
-                        
-                        -- Aggregate all categories (AI categories + User notes) with newline separation  
-                        (CASE 
-                            WHEN GROUP_CONCAT(ac.category_value, char(10)) IS NOT NULL 
-                                 AND GROUP_CONCAT(uc.notes_text, char(10)) IS NOT NULL THEN
-                                GROUP_CONCAT(ac.category_value, char(10)) || char(10) || GROUP_CONCAT(uc.notes_text, char(10))
-                            WHEN GROUP_CONCAT(ac.category_value, char(10)) IS NOT NULL THEN
-                                GROUP_CONCAT(ac.category_value, char(10))
-                            WHEN GROUP_CONCAT(uc.notes_text, char(10)) IS NOT NULL THEN
-                                GROUP_CONCAT(uc.notes_text, char(10))
-                            ELSE ''
-                        END) as all_categories
-                        
-                    FROM posts p
-                    INNER JOIN uploads u ON p.upload_id = u.id
-                    LEFT JOIN ai_questions aq ON p.post_id = aq.post_id
-                    LEFT JOIN ai_categories ac ON p.post_id = ac.post_id
-                    LEFT JOIN users_questions uq ON p.post_id = uq.post_id
-                    LEFT JOIN users_categories uc ON p.post_id = uc.post_id
-                    WHERE u.status = ?
-                """
+                query = self._datatable_aggregation_query(user_filter)
             else:
                 # Legacy query for backward compatibility
-                query = """
+                query = f"""
                     SELECT p.id, p.forum, p.post_type, p.username, p.original_title, p.original_post, 
                            p.post_url, 
                            COALESCE(aq.question_text, '') as LLM_inferred_question,
@@ -914,61 +1870,571 @@ class MRPCDatabase:
                     FROM posts p
                     INNER JOIN uploads u ON p.upload_id = u.id
                     LEFT JOIN ai_questions aq ON p.post_id = aq.post_id
-                    WHERE u.status = ?
+                    WHERE u.status = ?{user_filter}
+                    ORDER BY p.date_posted DESC
                 """
-            params = [status_filter]
 
-            # Apply user filtering unless admin override is enabled
-            if not include_all_users:
-                # Use provided user_id or get current authenticated user
-                filter_user_id = (
-                    user_id if user_id is not None else get_current_user_id()
+            df = pd.read_sql_query(query, conn, params=params)
+
+            # Child rows are already de-duplicated per title in SQL; this only
+            # normalises multi-line notes (strip, drop blanks and repeated lines)
+            if datatable_format and len(df) > 0:
+                df["all_questions"] = df["all_questions"].apply(self._normalize_lines)
+                df["all_categories"] = df["all_categories"].apply(self._normalize_lines)
+
+            return df
+
+    @staticmethod
+    def _normalize_lines(text) -> str:
+        """Strip lines, dropping blanks and repeats while preserving order"""
+        if not text or pd.isna(text):
+            return ""
+        seen = set()
+        unique_lines = []
+        for line in text.split("\n"):
+            line = line.strip()
+            if line and line not in seen:
+                seen.add(line)
+                unique_lines.append(line)
+        return "\n".join(unique_lines)
+
+    @staticmethod
+    def _datatable_title_ctes(user_filter: str = "") -> str:
+        """visible_posts and the per-title post columns (title_posts) CTEs"""
+        return f"""
+            WITH visible_posts AS (
+                SELECT p.*
+                FROM posts p
+                INNER JOIN uploads u ON p.upload_id = u.id
+                WHERE u.status = ?{user_filter}
+            ),
+            title_posts AS (
+                SELECT 
+                    MIN(id) as id,
+                    forum, 
+                    MIN(post_type) as post_type,
+                    MIN(username) as username,
+                    MIN(llm_cluster_name) as llm_cluster_name,
+                    original_title,
+                    MIN(original_post) as original_post,
+                    MIN(post_url) as post_url,
+                    MIN(cluster) as cluster,
+                    MIN(cluster_label) as cluster_label,
+                    MIN(date_posted) as date_posted,
+                    MIN(umap_1) as umap_1, 
+                    MIN(umap_2) as umap_2, 
+                    MIN(umap_3) as umap_3,
+                    MIN(upload_id) as upload_id
+                FROM visible_posts
+                GROUP BY original_title
+            )"""
+
+    @classmethod
+    def _datatable_aggregation_query(
+        cls,
+        user_filter: str = "",
+        title_filter: str = "",
+        order_by: str = "date_posted DESC",
+        paginate: bool = False,
+    ) -> str:
+        """
+        Build the per-title datatable query
+
+        Each child table is reduced to distinct lines per title in its own CTE
+        before being joined back once, so rows never multiply across
+        ai_questions x ai_categories x users_questions x users_categories.
+
+        Args:
+            user_filter: Extra SQL condition on uploads (alias u), e.g. " AND u.uploaded_by = ?"
+            title_filter: SQL condition on per-title post columns (paginate only)
+            order_by: ORDER BY expressions over the output columns
+            paginate: Pick one page of titles first and aggregate children for those only
+
+        Returns:
+            str: SQL taking the upload status (and user filter) as parameters,
+            followed by the title filter params, LIMIT and OFFSET when paginating
+        """
+        if paginate:
+            page_ctes = f"""
+            page_titles AS (
+                SELECT * FROM title_posts
+                WHERE {title_filter or "1"}
+                ORDER BY {order_by}
+                LIMIT ? OFFSET ?
+            ),
+            -- Only posts under the titles on this page need their children aggregated
+            child_posts AS (
+                SELECT vp.* FROM visible_posts vp
+                WHERE EXISTS (
+                    SELECT 1 FROM page_titles pt
+                    WHERE pt.original_title IS vp.original_title
+                )
+            ),"""
+            titles, child_posts = "page_titles", "child_posts"
+        else:
+            page_ctes = ""
+            titles, child_posts = "title_posts", "visible_posts"
+
+        return f"""{cls._datatable_title_ctes(user_filter)},{page_ctes}
+            -- AI questions first, then user questions, each once per title
+            question_lines AS (
+                SELECT vp.original_title, aq.question_text AS line,
+                       MIN(vp.post_id) AS post_order, 0 AS source_order, MIN(aq.id) AS line_order
+                FROM {child_posts} vp
+                JOIN ai_questions aq ON aq.post_id = vp.post_id
+                WHERE aq.question_text IS NOT NULL
+                GROUP BY vp.original_title, aq.question_text
+                UNION ALL
+                SELECT vp.original_title, uq.question_text,
+                       MIN(vp.post_id), 1, MIN(uq.id)
+                FROM {child_posts} vp
+                JOIN users_questions uq ON uq.post_id = vp.post_id
+                WHERE uq.question_text IS NOT NULL
+                GROUP BY vp.original_title, uq.question_text
+            ),
+            title_questions AS (
+                SELECT original_title, GROUP_CONCAT(line, char(10)) AS all_questions
+                FROM (
+                    SELECT * FROM question_lines
+                    ORDER BY original_title, source_order, post_order, line_order
+                )
+                GROUP BY original_title
+            ),
+            -- AI categories first, then user category notes, each once per title
+            category_lines AS (
+                SELECT vp.original_title, ac.category_value AS line,
+                       MIN(vp.post_id) AS post_order, 0 AS source_order, MIN(ac.id) AS line_order
+                FROM {child_posts} vp
+                JOIN ai_categories ac ON ac.post_id = vp.post_id
+                WHERE ac.category_value IS NOT NULL
+                GROUP BY vp.original_title, ac.category_value
+                UNION ALL
+                SELECT vp.original_title, uc.notes_text,
+                       MIN(vp.post_id), 1, MIN(uc.id)
+                FROM {child_posts} vp
+                JOIN users_categories uc ON uc.post_id = vp.post_id
+                WHERE uc.notes_text IS NOT NULL
+                GROUP BY vp.original_title, uc.notes_text
+            ),
+            title_categories AS (
+                SELECT original_title, GROUP_CONCAT(line, char(10)) AS all_categories
+                FROM (
+                    SELECT * FROM category_lines
+                    ORDER BY original_title, source_order, post_order, line_order
                 )
+                GROUP BY original_title
+            )
+            SELECT * FROM (
+                SELECT tp.*,
+                       COALESCE(tq.all_questions, '') as all_questions,
+                       COALESCE(tc.all_categories, '') as all_categories
+                FROM {titles} tp
+                LEFT JOIN title_questions tq ON tq.original_title IS tp.original_title
+                LEFT JOIN title_categories tc ON tc.original_title IS tp.original_title
+            )
+            ORDER BY {order_by}
+        """
 
-                if filter_user_id is not None:
-                    query += " AND u.uploaded_by = ?"
-                    params.append(
-                        str(filter_user_id)
-                    )  # Convert to string for consistency
+    def _datatable_filter(
+        self,
+        filter_query: str = "",
+        forum: str = "all",
+        topics: Optional[List[str]] = None,
+        search: str = "",
+        user_id: int = None,
+        status_filter: str = "active",
+    ) -> Tuple[str, List, Set[str]]:
+        """
+        Combine the forum/topic selectors, search box and DataTable filter into one condition
+
+        The search box only filters: rows keep the DataTable's sort order
+        rather than search_posts' BM25 ranking.
+
+        Args:
+            filter_query: DataTable filter_query string
+            forum: Forum to restrict to ('all' for every forum)
+            topics: llm_cluster_name values to restrict to (None/'all' for every topic)
+            search: Free text matched against the search index
+            user_id: Uploader whose posts the search is matched in
+            status_filter: Upload status of the posts the search is matched in
+
+        Returns:
+            Tuple[str, List, Set[str]]: SQL condition on datatable columns, its
+            parameters and the datatable columns the filter query refers to
+
+        Raises:
+            FilterQuerySyntaxError: If filter_query cannot be parsed
+        """
+        from utilities.filter_query import compile_filter_query, quote_identifier
+
+        conditions, params = [], []
+        if forum and forum != "all":
+            conditions.append(f"{quote_identifier('forum')} = ?")
+            params.append(forum)
+        if isinstance(topics, str):
+            topics = None if topics == "all" else [topics]
+        if topics:
+            placeholders = ", ".join("?" * len(topics))
+            conditions.append(
+                f"{quote_identifier('llm_cluster_name')} IN ({placeholders})"
+            )
+            params.extend(topics)
+
+        match = self._fts_match_query(search)
+        if match:
+            # Scoped like visible_posts, so other users' matches are never collected
+            user_filter = " AND u.uploaded_by = ?" if user_id is not None else ""
+            conditions.append(f"""{quote_identifier("original_title")} IN (
+                SELECT p.original_title FROM post_search
+                JOIN posts p ON p.post_id = post_search.rowid
+                JOIN uploads u ON u.id = p.upload_id
+                WHERE post_search MATCH ? AND u.status = ?{user_filter}
+            )""")
+            params.extend([match, status_filter])
+            if user_id is not None:
+                params.append(str(user_id))
+
+        compiled = compile_filter_query(filter_query, self.DATATABLE_COLUMNS)
+        if compiled:
+            conditions.append(compiled.sql)
+            params.extend(compiled.params)
+        return " AND ".join(conditions) or "1", params, set(compiled.columns)
+
+    def get_datatable_filter_options(
+        self, user_id: int = None, status_filter: str = "active"
+    ) -> Dict[str, List[str]]:
+        """
+        Distinct forums and topics of the posts the datatable can show
+
+        Args:
+            user_id: Filter by specific user (default: current authenticated user)
+            status_filter: Filter by upload status (default: 'active')
+
+        Returns:
+            Dict[str, List[str]]: sorted "forums" and "topics" (llm_cluster_name)
+        """
+        from utilities.auth import get_current_user_id
+
+        options = {"forums": [], "topics": []}
+        filter_user_id = user_id if user_id is not None else get_current_user_id()
+        if filter_user_id is None:
+            return options
+
+        visible = """
+            FROM posts p
+            INNER JOIN uploads u ON p.upload_id = u.id
+            WHERE u.status = ? AND u.uploaded_by = ?
+        """
+        params = (status_filter, str(filter_user_id))
+        try:
+            with self._connect() as conn:
+                for key, column in (
+                    ("forums", "forum"),
+                    ("topics", "llm_cluster_name"),
+                ):
+                    options[key] = [
+                        row[0]
+                        for row in conn.execute(
+                            f"SELECT DISTINCT p.{column} {visible} "
+                            f"AND p.{column} IS NOT NULL ORDER BY p.{column}",
+                            params,
+                        )
+                    ]
+        except sqlite3.Error as e:
+            print(f"❌ Error getting datatable filter options: {e}")
+        return options
+
+    def get_datatable_page(
+        self,
+        page_current: int = 0,
+        page_size: Optional[int] = 50,
+        filter_query: str = "",
+        sort_by: Optional[List[Dict]] = None,
+        forum: str = "all",
+        topics: Optional[List[str]] = None,
+        user_id: int = None,
+        status_filter: str = "active",
+        search: str = "",
+    ) -> Dict:
+        """
+        Get one page of the aggregated datatable, filtered and sorted in SQL
+
+        Filters and sorts on per-title post columns run before the child tables
+        are aggregated, so only the requested page is ever aggregated. Filtering or
+        sorting on all_questions / all_categories falls back to aggregating every
+        visible title and paging the result.
+
+        Args:
+            page_current: Zero-based page number (clamped to the last page)
+            page_size: Rows per page (None returns every matching row as one page)
+            filter_query: DataTable filter_query string
+            sort_by: DataTable sort_by list
+            forum: Forum to restrict to ('all' for every forum)
+            topics: llm_cluster_name values to restrict to (None/'all' for every topic)
+            user_id: Filter by specific user (default: current authenticated user)
+            status_filter: Filter by upload status (default: 'active')
+            search: Free text; keeps titles with a post matching it in the search index
+
+        Returns:
+            Dict: {"data": DataFrame for the page, "total_rows": int,
+                   "page_count": int, "page_current": int}
+        """
+        from utilities.auth import get_current_user_id
+        from utilities.filter_query import FilterQuerySyntaxError, sort_by_to_sql
+
+        empty = {
+            "data": pd.DataFrame(),
+            "total_rows": 0,
+            "page_count": 1,
+            "page_current": 0,
+        }
+
+        filter_user_id = user_id if user_id is not None else get_current_user_id()
+        if filter_user_id is None:
+            return empty
+        base_params = [status_filter, str(filter_user_id)]
+        user_filter = " AND u.uploaded_by = ?"
+
+        try:
+            where, params, filter_columns = self._datatable_filter(
+                filter_query, forum, topics, search, filter_user_id, status_filter
+            )
+        except FilterQuerySyntaxError as e:
+            # Half-typed filters are common - show the unfiltered table meanwhile
+            print(f"⚠️ Ignoring invalid filter query {filter_query!r}: {e}")
+            where, params, filter_columns = self._datatable_filter(
+                "", forum, topics, search, filter_user_id, status_filter
+            )
+
+        order_sql, sort_columns = sort_by_to_sql(sort_by, self.DATATABLE_COLUMNS)
+        # original_title is unique per row, which keeps page boundaries stable
+        order_by = f"{order_sql or 'date_posted DESC'}, original_title"
+
+        needs_aggregates = bool(
+            (filter_columns | sort_columns) & self.DATATABLE_AGGREGATE_COLUMNS
+        )
+
+        try:
+            with self._connect() as conn:
+                if needs_aggregates:
+                    full_query = self._datatable_aggregation_query(user_filter)
+                    count_query = f"SELECT COUNT(*) FROM ({full_query}) WHERE {where}"
                 else:
-                    # No authenticated user and no admin override - return empty DataFrame
-                    return pd.DataFrame()
-            else:
-                # Admin override requested - verify admin privileges
-                from utilities.auth import require_admin
+                    count_query = (
+                        self._datatable_title_ctes(user_filter)
+                        + f" SELECT COUNT(*) FROM title_posts WHERE {where}"
+                    )
+                row = conn.execute(count_query, base_params + params).fetchone()
+                total_rows = row[0]
+
+                page_size = max(1, int(page_size or total_rows or 1))
+                page_count = max(1, -(-total_rows // page_size))
+                page_current = min(max(0, int(page_current or 0)), page_count - 1)
+                page_params = [page_size, page_current * page_size]
+
+                if needs_aggregates:
+                    query = (
+                        f"SELECT * FROM ({full_query}) WHERE {where} "
+                        f"ORDER BY {order_by} LIMIT ? OFFSET ?"
+                    )
+                else:
+                    query = self._datatable_aggregation_query(
+                        user_filter, where, order_by, paginate=True
+                    )
+                df = pd.read_sql_query(
+                    query, conn, params=base_params + params + page_params
+                )
+        except Exception as e:
+            print(f"❌ Error loading datatable page: {e}")
+            return empty
+
+        for column in self.DATATABLE_AGGREGATE_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].apply(self._normalize_lines)
+
+        return {
+            "data": df,
+            "total_rows": total_rows,
+            "page_count": page_count,
+            "page_current": page_current,
+        }
 
-                require_admin()  # Raises exception if not admin (User ID 1)
+    @staticmethod
+    def _bulk_tag_pairs(tags: Dict) -> List[Tuple[str, str]]:
+        """(category_type, value) pairs from a {"groups": [...], "subgroups": [...], "tags": [...]} dict"""
+        pairs = []
+        for tag_type, values in (tags or {}).items():
+            db_type = tag_type.rstrip("s")  # groups -> group, tags -> tag
+            if db_type not in ("group", "subgroup", "tag"):
+                raise ValueError(f"Unknown tag type: {tag_type}")
+            for tag_value in values or []:
+                if isinstance(tag_value, dict):
+                    value = str(tag_value.get("value", "")).strip()
+                else:
+                    value = str(tag_value).strip()
+                if value and (db_type, value) not in pairs:
+                    pairs.append((db_type, value))
+        return pairs
 
-            # Add appropriate ending based on query type
-            if datatable_format:
-                query += " GROUP BY p.original_title ORDER BY MIN(p.date_posted) DESC"
-            else:
-                query += " ORDER BY p.date_posted DESC"
+    def bulk_apply_tags(
+        self,
+        filter_spec: Dict,
+        tags: Dict,
+        mode: str = "add",
+        user_id: int = None,
+    ) -> Dict:
+        """
+        Tag every post behind the datatable rows matching a filter, in one transaction
 
-            df = pd.read_sql_query(query, conn, params=params)
+        The matching post_ids are collected into a temp table with the same
+        conditions get_datatable_page uses, then each mode is a single
+        INSERT ... SELECT and/or DELETE over that set. tag_registry follows
+        through the ai_categories triggers.
 
-            # Post-process datatable format to remove duplicates in aggregated fields
-            if datatable_format and len(df) > 0:
+        Args:
+            filter_spec: get_datatable_page filter arguments - filter_query,
+                forum, topics, search and status_filter (missing keys match everything)
+            tags: {"groups": [...], "subgroups": [...], "tags": [...]} values
+            mode: 'add' (keep existing tags), 'replace' (these become the posts'
+                only group/subgroup/tag values) or 'remove' (delete these values)
+            user_id: Tag this user's posts (default: current authenticated user)
 
-                def deduplicate_lines(text):
-                    """Remove duplicate lines while preserving order"""
-                    if not text or pd.isna(text):
-                        return ""
-                    lines = text.split("\n")
-                    seen = set()
-                    unique_lines = []
-                    for line in lines:
-                        line = line.strip()
-                        if line and line not in seen:
-                            seen.add(line)
-                            unique_lines.append(line)
-                    return "\n".join(unique_lines)
-
-                # Deduplicate questions and categories
-                df["all_questions"] = df["all_questions"].apply(deduplicate_lines)
-                df["all_categories"] = df["all_categories"].apply(deduplicate_lines)
+        Returns:
+            Dict: success, posts_matched, tags_added, tags_removed and message
+        """
+        from utilities.auth import get_current_user_id
+        from utilities.filter_query import FilterQuerySyntaxError
 
-            return df
+        result = {
+            "success": False,
+            "posts_matched": 0,
+            "tags_added": 0,
+            "tags_removed": 0,
+        }
+
+        filter_user_id = user_id if user_id is not None else get_current_user_id()
+        if filter_user_id is None:
+            return {**result, "message": "Not authenticated"}
+
+        filter_spec = filter_spec or {}
+        status_filter = filter_spec.get("status_filter") or "active"
+        try:
+            if mode not in self.BULK_TAG_MODES:
+                raise ValueError(f"Unknown bulk tag mode: {mode}")
+            pairs = self._bulk_tag_pairs(tags)
+            # Unlike the table view, a broken filter must not widen to every row
+            where, params, filter_columns = self._datatable_filter(
+                filter_spec.get("filter_query") or "",
+                filter_spec.get("forum") or "all",
+                filter_spec.get("topics"),
+                filter_spec.get("search") or "",
+                filter_user_id,
+                status_filter,
+            )
+        except (ValueError, FilterQuerySyntaxError) as e:
+            print(f"❌ Error applying tags: {e}")
+            return {**result, "message": f"Error applying tags: {str(e)}"}
+
+        user_filter = " AND u.uploaded_by = ?"
+        base_params = [status_filter, str(filter_user_id)]
+        if filter_columns & self.DATATABLE_AGGREGATE_COLUMNS:
+            titles_sql = (
+                f"SELECT original_title FROM "
+                f"({self._datatable_aggregation_query(user_filter)}) WHERE {where}"
+            )
+            params = base_params + params
+        else:
+            titles_sql = f"SELECT original_title FROM title_posts WHERE {where}"
+        tags_json = json.dumps(pairs)
+        model_version = "user_migrated"
+
+        def _apply(conn):
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS bulk_tag_posts (post_id INTEGER PRIMARY KEY)"
+            )
+            conn.execute("DELETE FROM temp.bulk_tag_posts")
+            try:
+                # Datatable rows are titles: tag every visible post under a matching title
+                conn.execute(
+                    f"""{self._datatable_title_ctes(user_filter)},
+                    matched_titles AS ({titles_sql})
+                    INSERT INTO temp.bulk_tag_posts (post_id)
+                    SELECT vp.post_id FROM visible_posts vp
+                    WHERE vp.original_title IN (SELECT original_title FROM matched_titles)
+                       OR (vp.original_title IS NULL AND EXISTS (
+                           SELECT 1 FROM matched_titles WHERE original_title IS NULL
+                       ))
+                    """,
+                    base_params + params,
+                )
+                matched = conn.execute(
+                    "SELECT COUNT(*) FROM temp.bulk_tag_posts"
+                ).fetchone()[0]
+
+                removed = 0
+                if mode == "replace":
+                    removed = conn.execute(
+                        """
+                        DELETE FROM ai_categories
+                        WHERE post_id IN (SELECT post_id FROM temp.bulk_tag_posts)
+                          AND category_type IN ('group', 'subgroup', 'tag')
+                        """
+                    ).rowcount
+                elif mode == "remove":
+                    removed = conn.execute(
+                        """
+                        DELETE FROM ai_categories
+                        WHERE post_id IN (SELECT post_id FROM temp.bulk_tag_posts)
+                          AND (category_type, category_value) IN (
+                              SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]')
+                              FROM json_each(?)
+                          )
+                        """,
+                        (tags_json,),
+                    ).rowcount
+
+                added = 0
+                if mode in ("add", "replace"):
+                    added = conn.execute(
+                        """
+                        INSERT INTO ai_categories (post_id, category_type, category_value, model_version)
+                        SELECT b.post_id, t.tag_type, t.tag_value, ?
+                        FROM temp.bulk_tag_posts b
+                        CROSS JOIN (
+                            SELECT json_extract(value, '$[0]') AS tag_type,
+                                   json_extract(value, '$[1]') AS tag_value
+                            FROM json_each(?)
+                        ) t
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM ai_categories ac
+                            WHERE ac.post_id = b.post_id
+                              AND ac.category_type = t.tag_type
+                              AND ac.category_value = t.tag_value
+                        )
+                        """,
+                        (model_version, tags_json),
+                    ).rowcount
+            finally:
+                conn.execute("DROP TABLE IF EXISTS temp.bulk_tag_posts")
+            return matched, added, removed
+
+        try:
+            matched, added, removed = self._run_write(_apply)
+        except Exception as e:
+            print(f"❌ Error applying tags: {e}")
+            return {**result, "message": f"Error applying tags: {str(e)}"}
+
+        message = (
+            f"Tagged {matched} posts ({mode}): {added} tags added, {removed} removed"
+        )
+        print(f" {message}")
+        return {
+            "success": True,
+            "posts_matched": matched,
+            "tags_added": added,
+            "tags_removed": removed,
+            "message": message,
+        }
 
     def get_all_posts_as_dataframe_admin(self) -> pd.DataFrame:
         """
@@ -980,7 +2446,7 @@ class MRPCDatabase:
         # Check admin privileges - raises exception if not admin
         require_admin()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             query = """
                 SELECT 
                     p.id,
@@ -1073,7 +2539,7 @@ class MRPCDatabase:
         """
         from utilities.auth import get_current_user_id
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             query = """
                 SELECT p.* FROM posts p
                 INNER JOIN uploads u ON p.upload_id = u.id
@@ -1125,7 +2591,7 @@ class MRPCDatabase:
         """
         from utilities.auth import get_current_user_id
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             query = """
                 SELECT p.* FROM posts p
                 INNER JOIN uploads u ON p.upload_id = u.id
@@ -1159,6 +2625,85 @@ class MRPCDatabase:
             df = pd.read_sql_query(query, conn, params=params)
             return df
 
+    @staticmethod
+    def _fts_match_query(text: str) -> str:
+        """
+        Turn free text from a search box into a safe FTS5 MATCH expression
+
+        Every word becomes a quoted term (all must match) and the last one is a
+        prefix, so results update as the user types. FTS5 operators typed by the
+        user are treated as plain words.
+
+        Args:
+            text: Raw search text
+
+        Returns:
+            str: MATCH expression, or "" when there is nothing to search for
+        """
+        words = re.findall(r"\w+", text or "")
+        if not words:
+            return ""
+        terms = [f'"{word}"' for word in words]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search_posts(
+        self,
+        query: str,
+        user_id: int = None,
+        forum: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        status_filter: str = "active",
+    ) -> List[Dict]:
+        """
+        Full-text search over post titles/bodies, AI questions and user notes
+
+        Args:
+            query: Free text typed by the user
+            user_id: Search this user's uploads (default: current authenticated user)
+            forum: Restrict to one forum (None or 'all' for every forum)
+            limit: Maximum results to return
+            offset: Results to skip (for paging)
+            status_filter: Filter by upload status (default: 'active')
+
+        Returns:
+            List[Dict]: Posts ordered by BM25 relevance (best first), each with
+            'score' and a highlighted 'snippet' of the best-matching field
+        """
+        from utilities.auth import get_current_user_id
+
+        match = self._fts_match_query(query)
+        filter_user_id = user_id if user_id is not None else get_current_user_id()
+        if not match or filter_user_id is None:
+            return []
+
+        sql = """
+            SELECT p.post_id, p.id, p.forum, p.original_title, p.post_url,
+                   p.date_posted, p.upload_id,
+                   bm25(post_search, 5.0, 1.0, 2.0, 2.0, 2.0) AS score,
+                   snippet(post_search, -1, '<mark>', '</mark>', '…', 12) AS snippet
+            FROM post_search
+            JOIN posts p ON p.post_id = post_search.rowid
+            JOIN uploads u ON u.id = p.upload_id
+            WHERE post_search MATCH ? AND u.status = ? AND u.uploaded_by = ?
+        """
+        params = [match, status_filter, str(filter_user_id)]
+        if forum and forum != "all":
+            sql += " AND p.forum = ?"
+            params.append(forum)
+        sql += " ORDER BY score LIMIT ? OFFSET ?"
+        params.extend([max(0, int(limit)), max(0, int(offset))])
+
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(sql, params)
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Error searching posts: {e}")
+            return []
+
     def get_posts_by_tag(self, tag_type: str, tag_value: str) -> List[str]:
         """Get post IDs that have a specific tag
 
@@ -1169,7 +2714,7 @@ class MRPCDatabase:
         Returns:
             List of post IDs that have this tag
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Map plural forms to database column names
@@ -1198,7 +2743,7 @@ class MRPCDatabase:
             print(f"📥 Appending data from {csv_path}...")
             new_df = pd.read_csv(csv_path)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Get existing IDs to avoid duplicates
                 existing_ids = pd.read_sql_query("SELECT id FROM posts", conn)[
                     "id"
@@ -1228,7 +2773,7 @@ class MRPCDatabase:
 
     def get_post_by_id(self, item_id: str) -> Optional[Dict]:
         """Get a specific post by ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM posts WHERE id = ?", (item_id,))
             result = cursor.fetchone()
@@ -1240,7 +2785,7 @@ class MRPCDatabase:
 
     def get_posts_summary(self) -> Dict:
         """Get summary statistics about posts"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Total posts
@@ -1278,8 +2823,8 @@ class MRPCDatabase:
                 print(f"❌ Could not find post_id for item_id: {item_id}")
                 return False
 
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
+            self._run_write(
+                lambda conn: conn.execute(
                     """
                     INSERT OR REPLACE INTO users_questions 
                     (post_id, question_id, question_text, notes_text, updated_at)
@@ -1287,6 +2832,7 @@ class MRPCDatabase:
                 """,
                     (post_id, question_id, question_text, notes_text),
                 )
+            )
 
             print(
                 f" Saved user question {question_id} for item {item_id} (post_id {post_id})"
@@ -1300,7 +2846,7 @@ class MRPCDatabase:
     def get_user_questions(self, item_id: str) -> List[Dict]:
         """Get all user questions for a specific item by URL (same behavior as get_ai_questions)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 # First get the URL for this post
                 cursor.execute(
@@ -1311,35 +2857,34 @@ class MRPCDatabase:
                 if not url_result or not url_result[0]:
                     return []
 
-                post_url = url_result[0]
-
-                # Now get ALL user questions from users_questions table for ALL posts with this URL
-                cursor.execute(
-                    """
-                    SELECT uq.question_id, uq.question_text, uq.notes_text, uq.created_at, uq.updated_at
-                    FROM users_questions uq
-                    JOIN posts p ON uq.post_id = p.post_id
-                    WHERE p.post_url = ?
-                    ORDER BY uq.created_at ASC
-                """,
-                    (post_url,),
-                )
-
-                results = cursor.fetchall()
-                columns = [
-                    "question_id",
-                    "question_text",
-                    "notes_text",
-                    "created_at",
-                    "updated_at",
-                ]
-
-                return [dict(zip(columns, row)) for row in results]
+                return self._fetch_user_questions(cursor, url_result[0])
 
         except Exception as e:
             print(f"❌ Error getting user questions: {e}")
             return []
 
+    def _fetch_user_questions(self, cursor, post_url: str) -> List[Dict]:
+        """User questions for ALL posts sharing post_url, on the caller's cursor"""
+        cursor.execute(
+            """
+            SELECT uq.question_id, uq.question_text, uq.notes_text, uq.created_at, uq.updated_at
+            FROM users_questions uq
+            JOIN posts p ON uq.post_id = p.post_id
+            WHERE p.post_url = ?
+            ORDER BY uq.created_at ASC
+        """,
+            (post_url,),
+        )
+
+        columns = [
+            "question_id",
+            "question_text",
+            "notes_text",
+            "created_at",
+            "updated_at",
+        ]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
     def delete_user_question(self, item_id: str, question_id: str) -> bool:
         """Delete a specific user question"""
         try:
@@ -1349,7 +2894,7 @@ class MRPCDatabase:
                 print(f"❌ Could not find post_id for item_id: {item_id}")
                 return False
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1382,7 +2927,7 @@ class MRPCDatabase:
             # if post_id is None:
             #     return []
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 # First get the URL for this post
                 cursor.execute(
@@ -1393,41 +2938,40 @@ class MRPCDatabase:
                 if not url_result or not url_result[0]:
                     return []
 
-                post_url = url_result[0]
-
-                # Now get the LLM_inferred_question from posts table using the URL
-                cursor.execute(
-                    """
-                    SELECT id as id, LLM_inferred_question as question_text, 
-                           NULL as confidence_score, 'Gemini' as model_version, 
-                           'A long time ago' as created_at, NULL as updated_at
-                    FROM posts 
-                    WHERE post_url = ?
-                    ORDER BY created_at ASC
-                """,
-                    (post_url,),
-                )
-
-                results = cursor.fetchall()
-                columns = [
-                    "id",
-                    "question_text",
-                    "confidence_score",
-                    "model_version",
-                    "created_at",
-                    "updated_at",
-                ]
-
-                return [dict(zip(columns, row)) for row in results]
+                return self._fetch_ai_questions(cursor, url_result[0])
 
         except Exception as e:
             print(f"❌ Error getting AI questions: {e}")
             return []
 
+    def _fetch_ai_questions(self, cursor, post_url: str) -> List[Dict]:
+        """LLM-inferred questions for ALL posts sharing post_url, on the caller's cursor"""
+        cursor.execute(
+            """
+            SELECT id as id, LLM_inferred_question as question_text, 
+                   NULL as confidence_score, 'Gemini' as model_version, 
+                   'A long time ago' as created_at, NULL as updated_at
+            FROM posts 
+            WHERE post_url = ?
+            ORDER BY created_at ASC
+        """,
+            (post_url,),
+        )
+
+        columns = [
+            "id",
+            "question_text",
+            "confidence_score",
+            "model_version",
+            "created_at",
+            "updated_at",
+        ]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
     def get_ai_categories(self, item_id: str) -> List[Dict]:
         """Get all AI categories for a specific item by URL (same behavior as get_ai_questions)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 # First get the URL for this post
                 cursor.execute(
@@ -1438,39 +2982,36 @@ class MRPCDatabase:
                 if not url_result or not url_result[0]:
                     return []
 
-                post_url = url_result[0]
-
-                # Now get ALL categories from ai_categories table for ALL posts with this URL
-                cursor.execute(
-                    """
-                    SELECT ac.id, ac.category_type, ac.category_value, ac.confidence_score, 
-                           ac.model_version, ac.created_at, ac.updated_at
-                    FROM ai_categories ac
-                    JOIN posts p ON ac.post_id = p.post_id
-                    WHERE p.post_url = ?
-                    ORDER BY ac.created_at ASC
-                """,
-                    (post_url,),
-                )
-
-                results = cursor.fetchall()
-                columns = [
-                    "id",
-                    "category_type",
-                    "category_value",
-                    "confidence_score",
-                    "model_version",
-                    "created_at",
-                    "updated_at",
-                ]
-
-                return [dict(zip(columns, row)) for row in results]
+                return self._fetch_ai_categories(cursor, url_result[0])
 
         except Exception as e:
             print(f"❌ Error getting AI categories: {e}")
             return []
-            print(f"❌ Error getting AI categories: {e}")
-            return []
+
+    def _fetch_ai_categories(self, cursor, post_url: str) -> List[Dict]:
+        """AI categories for ALL posts sharing post_url, on the caller's cursor"""
+        cursor.execute(
+            """
+            SELECT ac.id, ac.category_type, ac.category_value, ac.confidence_score, 
+                   ac.model_version, ac.created_at, ac.updated_at
+            FROM ai_categories ac
+            JOIN posts p ON ac.post_id = p.post_id
+            WHERE p.post_url = ?
+            ORDER BY ac.created_at ASC
+        """,
+            (post_url,),
+        )
+
+        columns = [
+            "id",
+            "category_type",
+            "category_value",
+            "confidence_score",
+            "model_version",
+            "created_at",
+            "updated_at",
+        ]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
     def save_category_note(
         self, item_id: str, note_id: str, notes_text: str = ""
@@ -1483,8 +3024,8 @@ class MRPCDatabase:
                 print(f"❌ Could not find post_id for item_id: {item_id}")
                 return False
 
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
+            self._run_write(
+                lambda conn: conn.execute(
                     """
                     INSERT OR REPLACE INTO users_categories 
                     (post_id, note_id, notes_text, updated_at)
@@ -1492,6 +3033,7 @@ class MRPCDatabase:
                 """,
                     (post_id, note_id, notes_text),
                 )
+            )
 
             print(
                 f" Saved category note {note_id} for item {item_id} (post_id {post_id})"
@@ -1505,7 +3047,7 @@ class MRPCDatabase:
     def get_category_notes(self, item_id: str) -> List[Dict]:
         """Get all category notes for a specific item by URL (same behavior as get_ai_categories)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 # First get the URL for this post
                 cursor.execute(
@@ -1516,29 +3058,28 @@ class MRPCDatabase:
                 if not url_result or not url_result[0]:
                     return []
 
-                post_url = url_result[0]
-
-                # Now get ALL user category notes from users_categories table for ALL posts with this URL
-                cursor.execute(
-                    """
-                    SELECT uc.note_id, uc.notes_text, uc.created_at, uc.updated_at
-                    FROM users_categories uc
-                    JOIN posts p ON uc.post_id = p.post_id
-                    WHERE p.post_url = ?
-                    ORDER BY uc.created_at ASC
-                """,
-                    (post_url,),
-                )
-
-                results = cursor.fetchall()
-                columns = ["note_id", "notes_text", "created_at", "updated_at"]
-
-                return [dict(zip(columns, row)) for row in results]
+                return self._fetch_category_notes(cursor, url_result[0])
 
         except Exception as e:
             print(f"❌ Error getting category notes: {e}")
             return []
 
+    def _fetch_category_notes(self, cursor, post_url: str) -> List[Dict]:
+        """User category notes for ALL posts sharing post_url, on the caller's cursor"""
+        cursor.execute(
+            """
+            SELECT uc.note_id, uc.notes_text, uc.created_at, uc.updated_at
+            FROM users_categories uc
+            JOIN posts p ON uc.post_id = p.post_id
+            WHERE p.post_url = ?
+            ORDER BY uc.created_at ASC
+        """,
+            (post_url,),
+        )
+
+        columns = ["note_id", "notes_text", "created_at", "updated_at"]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
     def delete_category_note(self, item_id: str, note_id: str) -> bool:
         """Delete a specific category note"""
         try:
@@ -1548,7 +3089,7 @@ class MRPCDatabase:
                 print(f"❌ Could not find post_id for item_id: {item_id}")
                 return False
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1576,7 +3117,7 @@ class MRPCDatabase:
     def _get_post_id_from_id(self, data_id: str) -> Optional[int]:
         """Helper method to get post_id from the original id field"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT post_id FROM posts WHERE id = ?", (data_id,))
                 result = cursor.fetchone()
@@ -1584,6 +3125,31 @@ class MRPCDatabase:
         except Exception:
             return None
 
+    @classmethod
+    def _flush_feedback_rows(cls, db_path: str, rows: List[tuple]):
+        """Write a batch of coalesced feedback clicks to the database at db_path"""
+        db = cls(db_path)
+        db._run_write(lambda conn: conn.executemany(cls.INFERENCE_FEEDBACK_UPSERT, rows))
+
+    def _feedback_buffer(self):
+        """This database's shared buffer of coalesced feedback clicks"""
+        # Flushes go through db_path, not through whichever instance created the buffer
+        db_path = self.db_path
+        return get_coalescing_buffer(
+            db_path,
+            "inference_feedback",
+            lambda rows: type(self)._flush_feedback_rows(db_path, rows),
+        )
+
+    def flush_inference_feedback(self) -> int:
+        """
+        Write any coalesced feedback clicks now
+
+        Returns:
+            int: Number of clicks written
+        """
+        return self._feedback_buffer().flush()
+
     def save_inference_feedback(
         self,
         data_id: str,
@@ -1592,8 +3158,27 @@ class MRPCDatabase:
         feedback_text: str,
         response_id: str,
         user_id: int = None,
+        coalesce: bool = False,
     ) -> bool:
-        """Save or update inference feedback with user information"""
+        """
+        Save or update inference feedback with user information
+
+        Args:
+            data_id: Post id (posts.id)
+            inference_type: Which inference the feedback is about
+            rating: 'positive', 'negative' or 'text_update' (keeps the existing rating)
+            feedback_text: Comment; kept as-is when only a rating is given
+            response_id: Response the feedback refers to
+            user_id: Author (default: current authenticated user)
+            coalesce: Buffer the write and commit it with other clicks arriving
+                within a short window. Returns True once queued; the row is not
+                visible until flushed, and a post that does not exist is skipped.
+                For scripted bulk feedback that calls flush_inference_feedback();
+                request handlers should save directly so failures reach the user.
+
+        Returns:
+            bool: True if saved (or queued)
+        """
         try:
             # Get current user_id if not provided
             if user_id is None:
@@ -1601,83 +3186,27 @@ class MRPCDatabase:
 
                 user_id = get_current_user_id()
 
-            # Convert data_id (old id) to post_id (new PK)
-            post_id = self._get_post_id_from_id(data_id)
-            if post_id is None:
-                print(f"❌ Could not find post_id for data_id: {data_id}")
-                return False
+            row = (inference_type, rating, feedback_text, response_id, user_id, data_id)
+            buffer = self._feedback_buffer()
+            if coalesce:
+                buffer.add(row)
+                return True
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            # Earlier coalesced clicks must land before this write
+            if buffer.pending:
+                buffer.flush()
 
-                # Check if a record already exists
-                cursor.execute(
-                    """
-                    SELECT rating, feedback_text FROM inference_feedback 
-                    WHERE post_id = ? AND inference_type = ? AND response_id = ?
-                    """,
-                    (post_id, inference_type, response_id),
-                )
-                existing_record = cursor.fetchone()
-
-                if existing_record:
-                    # Update existing record, preserving rating if only adding text
-                    existing_rating, existing_text = existing_record
-
-                    # Determine final rating and text to preserve existing data
-                    if rating == "text_update" and existing_rating in [
-                        "positive",
-                        "negative",
-                    ]:
-                        # Text-only update: preserve existing rating
-                        final_rating = existing_rating
-                        final_text = feedback_text  # Use new text
-                    elif rating in ["positive", "negative"] and existing_text:
-                        # Rating update with existing comment: preserve existing text
-                        final_rating = rating  # Use new rating
-                        final_text = existing_text  # Preserve existing comment
-                    else:
-                        # New rating without existing comment, or text update without existing rating
-                        final_rating = rating
-                        final_text = feedback_text
-
-                    cursor.execute(
-                        """
-                        UPDATE inference_feedback 
-                        SET rating = ?, feedback_text = ?, user_id = ?, updated_at = CURRENT_TIMESTAMP
-                        WHERE post_id = ? AND inference_type = ? AND response_id = ?
-                        """,
-                        (
-                            final_rating,
-                            final_text,
-                            user_id,
-                            post_id,
-                            inference_type,
-                            response_id,
-                        ),
-                    )
-                else:
-                    # Insert new record
-                    cursor.execute(
-                        """
-                        INSERT INTO inference_feedback 
-                        (post_id, inference_type, rating, feedback_text, response_id, user_id, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """,
-                        (
-                            post_id,
-                            inference_type,
-                            rating,
-                            feedback_text,
-                            response_id,
-                            user_id,
-                        ),
-                    )
+            saved = self._run_write(
+                lambda conn: conn.execute(self.INFERENCE_FEEDBACK_UPSERT, row).rowcount
+            )
+            if not saved:
+                print(f"❌ Could not find post_id for data_id: {data_id}")
+                return False
 
-                print(
-                    f" Saved inference feedback: {rating} for {inference_type} on data_id {data_id} (post_id {post_id}) by user_id {user_id}"
-                )
-                return True
+            print(
+                f" Saved inference feedback: {rating} for {inference_type} on data_id {data_id} by user_id {user_id}"
+            )
+            return True
 
         except Exception as e:
             print(f"❌ Error saving inference feedback: {e}")
@@ -1693,7 +3222,7 @@ class MRPCDatabase:
             if post_id is None:
                 return None
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1713,55 +3242,136 @@ class MRPCDatabase:
                 result = cursor.fetchone()
 
                 if result:
-                    columns = [
-                        "data_id",
-                        "inference_type",
-                        "rating",
-                        "feedback_text",
-                        "response_id",
-                        "created_at",
-                        "updated_at",
-                        "user_id",
-                        "user_first_name",
-                        "user_last_name",
-                        "user_email",
-                    ]
-                    feedback = dict(zip(columns, result))
+                    return self._format_inference_feedback(result)
+                else:
+                    return None
 
-                    # Add formatted time for display
-                    if feedback["updated_at"]:
-                        try:
-                            from datetime import datetime
+        except Exception as e:
+            print(f"❌ Error getting inference feedback: {e}")
+            return None
 
-                            dt = datetime.fromisoformat(feedback["updated_at"])
-                            feedback["formatted_time"] = dt.strftime(
-                                "%B %d, %Y at %H:%M"
-                            )
-                        except Exception:
-                            feedback["formatted_time"] = feedback["updated_at"]
+    @staticmethod
+    def _format_inference_feedback(row) -> Dict:
+        """Turn a feedback row (joined to posts and users) into the display dict"""
+        columns = [
+            "data_id",
+            "inference_type",
+            "rating",
+            "feedback_text",
+            "response_id",
+            "created_at",
+            "updated_at",
+            "user_id",
+            "user_first_name",
+            "user_last_name",
+            "user_email",
+        ]
+        feedback = dict(zip(columns, row))
+
+        # Add formatted time for display
+        if feedback["updated_at"]:
+            try:
+                from datetime import datetime
+
+                dt = datetime.fromisoformat(feedback["updated_at"])
+                feedback["formatted_time"] = dt.strftime("%B %d, %Y at %H:%M")
+            except Exception:
+                feedback["formatted_time"] = feedback["updated_at"]
+
+        # Add user display name
+        if feedback["user_first_name"] and feedback["user_last_name"]:
+            feedback["user_display_name"] = (
+                f"{feedback['user_first_name']} {feedback['user_last_name']}"
+            )
+        elif feedback["user_email"]:
+            feedback["user_display_name"] = feedback["user_email"]
+        else:
+            feedback["user_display_name"] = "Unknown User"
+
+        return feedback
+
+    def get_post_detail_bundle(self, data_id: str) -> Dict:
+        """
+        Load everything the post detail sidebar shows in one round trip
+
+        Resolves the post once and reads AI questions, AI categories, user
+        questions, category notes and the latest feedback per inference type
+        on a single connection.
+
+        Args:
+            data_id: The post's original id (DataTable/customdata id)
+
+        Returns:
+            Dict with post_id, post_url, ai_questions, ai_categories,
+            user_questions, category_notes and feedback (inference_type ->
+            feedback dict). Lists are empty and post_id is None when the post
+            does not exist.
+        """
+        bundle = {
+            "post_id": None,
+            "post_url": None,
+            "ai_questions": [],
+            "ai_categories": [],
+            "user_questions": [],
+            "category_notes": [],
+            "feedback": {},
+        }
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT post_id, post_url FROM posts WHERE id = ?", (data_id,)
+                )
+                post = cursor.fetchone()
+                if not post:
+                    return bundle
+
+                bundle["post_id"], bundle["post_url"] = post
+
+                # Child content is shared by every post with the same URL
+                if bundle["post_url"]:
+                    post_url = bundle["post_url"]
+                    bundle["ai_questions"] = self._fetch_ai_questions(cursor, post_url)
+                    bundle["ai_categories"] = self._fetch_ai_categories(
+                        cursor, post_url
+                    )
+                    bundle["user_questions"] = self._fetch_user_questions(
+                        cursor, post_url
+                    )
+                    bundle["category_notes"] = self._fetch_category_notes(
+                        cursor, post_url
+                    )
 
-                    # Add user display name
-                    if feedback["user_first_name"] and feedback["user_last_name"]:
-                        feedback["user_display_name"] = (
-                            f"{feedback['user_first_name']} {feedback['user_last_name']}"
+                # Feedback belongs to this post; keep the newest row per type
+                cursor.execute(
+                    """
+                    SELECT p.id, f.inference_type, f.rating, f.feedback_text, f.response_id, 
+                           f.created_at, f.updated_at, f.user_id,
+                           u.first_name, u.last_name, u.email
+                    FROM inference_feedback f
+                    LEFT JOIN users u ON f.user_id = u.id
+                    LEFT JOIN posts p ON f.post_id = p.post_id
+                    WHERE f.post_id = ?
+                    ORDER BY f.updated_at DESC
+                """,
+                    (bundle["post_id"],),
+                )
+                for row in cursor.fetchall():
+                    if row[1] not in bundle["feedback"]:
+                        bundle["feedback"][row[1]] = self._format_inference_feedback(
+                            row
                         )
-                    elif feedback["user_email"]:
-                        feedback["user_display_name"] = feedback["user_email"]
-                    else:
-                        feedback["user_display_name"] = "Unknown User"
 
-                    return feedback
-                else:
-                    return None
+            return bundle
 
         except Exception as e:
-            print(f"❌ Error getting inference feedback: {e}")
-            return None
+            print(f"❌ Error getting post detail bundle: {e}")
+            return bundle
 
     def get_all_inference_feedback(self, data_id: str) -> List[Dict]:
         """Get all inference feedback for a specific data point"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1796,7 +3406,7 @@ class MRPCDatabase:
     ) -> bool:
         """Delete specific inference feedback"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1831,7 +3441,7 @@ class MRPCDatabase:
             # Hash the password
             password_hash = hashlib.sha256(password.encode()).hexdigest()
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1857,7 +3467,7 @@ class MRPCDatabase:
             # Hash the provided password
             password_hash = hashlib.sha256(password.encode()).hexdigest()
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1887,7 +3497,7 @@ class MRPCDatabase:
     def get_all_users(self) -> List[Dict]:
         """Get all users (without password hashes)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -1916,6 +3526,69 @@ class MRPCDatabase:
             print(f"❌ Error getting users: {e}")
             return []
 
+    def update_user_password(self, user_id: int, new_password: str) -> bool:
+        """
+        Change a user's password and drop their cached credentials
+
+        Other workers see the credentials generation move and stop accepting
+        the old password on their next request.
+
+        Args:
+            user_id (int): User whose password is changing
+            new_password (str): New plain-text password (stored hashed)
+
+        Returns:
+            bool: True if the user was updated
+        """
+        try:
+            password_hash = hashlib.sha256(new_password.encode()).hexdigest()
+
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "UPDATE users SET password_hash = ? WHERE id = ?",
+                    (password_hash, user_id),
+                )
+                updated = cursor.rowcount > 0
+
+            if updated:
+                from utilities.auth_cache import credential_cache
+
+                credential_cache.invalidate_user(user_id)
+            return updated
+
+        except Exception as e:
+            print(f"❌ Error updating password: {e}")
+            return False
+
+    def set_user_active(self, user_id: int, is_active: bool) -> bool:
+        """
+        Activate or deactivate a user and drop their cached credentials
+
+        Args:
+            user_id (int): User to update
+            is_active (bool): False to deactivate the account
+
+        Returns:
+            bool: True if the user was updated
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "UPDATE users SET is_active = ? WHERE id = ?",
+                    (1 if is_active else 0, user_id),
+                )
+                updated = cursor.rowcount > 0
+
+            if updated:
+                from utilities.auth_cache import credential_cache
+
+                credential_cache.invalidate_user(user_id)
+            return updated
+
+        except Exception as e:
+            print(f"❌ Error updating user status: {e}")
+            return False
+
     def initialize_default_users(self) -> bool:
         """Initialize the system with default users"""
         default_users = [
@@ -1929,373 +3602,883 @@ class MRPCDatabase:
             if self.create_user(first_name, last_name, email, password):
                 success_count += 1
 
-        print(
-            f" Successfully created {success_count}/{len(default_users)} default users"
+        print(
+            f" Successfully created {success_count}/{len(default_users)} default users"
+        )
+        return success_count == len(default_users)
+
+    # ========================================
+    # Upload Management Methods
+    # ========================================
+
+    def create_upload_record(
+        self,
+        filename: str,
+        user_readable_name: str,
+        uploaded_by: int,
+        comment: str = None,
+        upload_type: str = "forum_data",
+        content_sha256: str = None,
+    ) -> int:
+        """
+        Create a new upload record in the database
+
+        Args:
+            filename (str): Name of the uploaded file
+            user_readable_name (str): Human-readable name for the upload
+            uploaded_by (int): User ID of the uploader
+            comment (str, optional): Comment about the upload
+            upload_type (str, optional): Type of upload ('forum_data' or 'transcription_data')
+            content_sha256 (str, optional): Hex SHA-256 of the raw file
+
+        Returns:
+            int: The ID of the created upload record
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO uploads (filename, user_readable_name, comment, uploaded_by,
+                                         upload_type, content_sha256, status)
+                    VALUES (?, ?, ?, ?, ?, ?, 'active')
+                """,
+                    (
+                        filename,
+                        user_readable_name,
+                        comment,
+                        uploaded_by,
+                        upload_type,
+                        content_sha256,
+                    ),
+                )
+
+                upload_id = cursor.lastrowid
+                print(
+                    f" Created upload record {upload_id}: {filename} ({user_readable_name})"
+                )
+                return upload_id
+
+        except Exception as e:
+            print(f"❌ Error creating upload record: {e}")
+            raise
+
+    # posts columns populated from an upload (LLM data kept for backward compatibility)
+    UPLOAD_POSTS_COLUMNS = [
+        "forum",
+        "post_type",
+        "username",
+        "original_title",
+        "original_post",
+        "post_url",
+        "LLM_inferred_question",  # Include in posts table for compatibility
+        "cluster",
+        "cluster_label",
+        "llm_cluster_name",  # Include LLM cluster name for categorization
+        "date_posted",
+        "umap_1",
+        "umap_2",
+        "umap_3",
+        "upload_id",
+    ]
+
+    # Upload-time handling of posts whose body resembles one the user already
+    # has: 'off' only indexes them, 'flag' records the earlier post in
+    # post_minhash.near_duplicate_of, 'skip' leaves them out of the upload
+    NEAR_DUPLICATE_MODES = ("off", "flag", "skip")
+    NEAR_DUPLICATE_BATCH_ROWS = 5000
+
+    # Status of an upload whose chunks are still being committed; reads only
+    # show 'active' uploads, so its rows stay hidden until it is published
+    UPLOAD_PROCESSING_STATUS = "processing"
+
+    def upload_csv_data(
+        self,
+        upload_id: int,
+        csv_data: pd.DataFrame,
+        user_id: int,
+        near_duplicates: str = "flag",
+    ) -> Dict:
+        """
+        Process and store CSV data from an upload with duplicate prevention
+
+        Args:
+            upload_id (int): ID of the upload record
+            csv_data (pd.DataFrame): Pandas DataFrame containing the CSV data
+            near_duplicates (str): One of NEAR_DUPLICATE_MODES
+
+        Returns:
+            Dict: Result with success status, counts, and messages
+        """
+        return self.upload_csv_stream(
+            upload_id, [csv_data], user_id, near_duplicates=near_duplicates
+        )
+
+    def upload_csv_stream(
+        self,
+        upload_id: int,
+        chunks: Iterable[pd.DataFrame],
+        user_id: int,
+        near_duplicates: str = "flag",
+        skip_duplicates: bool = True,
+    ) -> Dict:
+        """
+        Store an upload delivered as DataFrame chunks, all-or-nothing
+
+        Each chunk is committed in its own short write, so the write lock is
+        released between chunks and only one chunk is held in memory at a
+        time. The upload stays in UPLOAD_PROCESSING_STATUS, which every read
+        filtering on 'active' ignores, until a final write publishes it with
+        its records_count. An exception raised by the chunk iterator (e.g. a
+        chunk failing validation or the upload being cancelled) deletes every
+        row already committed along with the upload record.
+
+        Args:
+            upload_id (int): ID of the upload record
+            chunks (Iterable[pd.DataFrame]): CSV rows, e.g. read_csv(chunksize=...)
+            user_id (int): Uploading user; a row is a duplicate if this user
+                already has a post with the same title and inferred question
+            near_duplicates (str): One of NEAR_DUPLICATE_MODES, for rows whose
+                original_post resembles one of the user's posts (or an earlier row)
+            skip_duplicates (bool): False to insert every row without a dedupe
+                key, e.g. when an admin forces a file to be ingested again
+
+        Returns:
+            Dict: Result with success status, counts, and messages
+        """
+        started = False
+        try:
+            if near_duplicates not in self.NEAR_DUPLICATE_MODES:
+                raise ValueError(f"Unknown near-duplicate mode '{near_duplicates}'")
+
+            self._run_write(
+                lambda conn: conn.execute(
+                    "UPDATE uploads SET status = ? WHERE id = ?",
+                    (self.UPLOAD_PROCESSING_STATUS, upload_id),
+                )
+            )
+            started = True
+
+            counts = {"new": 0, "duplicates": 0, "near_duplicates": 0}
+            total_processed = 0
+            duplicate_titles = []
+
+            for chunk in chunks:
+                csv_data = self._prepare_upload_frame(chunk, upload_id)
+                csv_data["dedupe_key"] = (
+                    self._dedupe_keys(
+                        csv_data["original_title"],
+                        csv_data["LLM_inferred_question"],
+                        user_id,
+                    )
+                    if skip_duplicates
+                    else None
+                )
+                total_processed += len(csv_data)
+                if len(csv_data) == 0:
+                    continue
+
+                signatures, has_words = minhash_signatures(csv_data["original_post"])
+
+                def write_chunk(
+                    conn, csv_data=csv_data, signatures=signatures, has_words=has_words
+                ):
+                    with self._search_index_deferred(conn):
+                        return self._insert_upload_chunk(
+                            conn,
+                            csv_data,
+                            signatures,
+                            has_words,
+                            user_id,
+                            near_duplicates,
+                        )
+
+                chunk_counts, chunk_duplicates = self._run_write(write_chunk)
+                for key, value in chunk_counts.items():
+                    counts[key] += value
+                duplicate_titles.extend(chunk_duplicates[: 5 - len(duplicate_titles)])
+
+            new_count = counts["new"]
+            duplicates_count = counts["duplicates"]
+            near_duplicates_count = counts["near_duplicates"]
+
+            if duplicates_count > 0:
+                print(
+                    f"⚠️ Found {duplicates_count} duplicate record(s) based on composite key"
+                )
+                print(f"   Sample duplicate titles: {duplicate_titles}")
+
+            # Publish the upload and its count together
+            self._run_write(
+                lambda conn: conn.execute(
+                    """
+                    UPDATE uploads 
+                    SET records_count = ?, status = 'active'
+                    WHERE id = ?
+                """,
+                    (new_count, upload_id),
+                )
+            )
+
+            result_message = f"Added {new_count} new records"
+            if duplicates_count > 0:
+                result_message += f", skipped {duplicates_count} duplicates"
+            if near_duplicates_count > 0:
+                result_message += (
+                    f", skipped {near_duplicates_count} near-duplicates"
+                    if near_duplicates == "skip"
+                    else f", flagged {near_duplicates_count} possible near-duplicates"
+                )
+
+            print(f" Successfully processed upload {upload_id}: {result_message}")
+
+            return {
+                "success": True,
+                "new_records": new_count,
+                "duplicates_skipped": duplicates_count,
+                "near_duplicates": near_duplicates_count,
+                "total_processed": total_processed,
+                "message": result_message,
+            }
+
+        except Exception as e:
+            print(f"❌ Error uploading CSV data for upload {upload_id}: {e}")
+            if started:
+                self._discard_processing_upload(upload_id)
+            return {
+                "success": False,
+                "new_records": 0,
+                "duplicates_skipped": 0,
+                "near_duplicates": 0,
+                "total_processed": 0,
+                "message": f"Upload failed: {str(e)}",
+            }
+
+    def _insert_upload_chunk(
+        self, conn, csv_data, signatures, has_words, user_id, near_duplicates
+    ):
+        """
+        Insert one prepared chunk of an upload and its MinHash signatures
+
+        Args:
+            conn: Open connection; the caller commits
+            csv_data (pd.DataFrame): Chunk from _prepare_upload_frame with dedupe_key
+            signatures, has_words: minhash_signatures of the chunk's original_post
+            user_id (int): Uploading user
+            near_duplicates (str): One of NEAR_DUPLICATE_MODES
+
+        Returns:
+            Tuple[Dict, List[str]]: new/duplicates/near_duplicates counts and
+            the titles of rows skipped as duplicates
+        """
+        counts = {"new": 0, "duplicates": 0, "near_duplicates": 0}
+        similar_post, similar_row = self._near_duplicate_matches(
+            conn, signatures, has_words, user_id
+        )
+        if near_duplicates == "skip":
+            keep = (similar_post == 0) & (similar_row < 0)
+            counts["near_duplicates"] += int((~keep).sum())
+            csv_data = csv_data[keep]
+            signatures, has_words = signatures[keep], has_words[keep]
+
+        # Rows whose key the user already has are skipped by the
+        # unique index, so no existing rows are read here
+        post_ids = self._bulk_insert_posts(
+            conn,
+            csv_data[["id"] + self.UPLOAD_POSTS_COLUMNS + ["dedupe_key"]],
+        )
+        duplicate_mask = post_ids.isna()
+        counts["new"] += int((~duplicate_mask).sum())
+        counts["duplicates"] += int(duplicate_mask.sum())
+        duplicate_titles = csv_data.loc[duplicate_mask, "original_title"].tolist()[:5]
+
+        inserted = ~duplicate_mask.to_numpy()
+        post_id_values = post_ids.to_numpy(dtype=float)
+        near_duplicate_of = None
+        if near_duplicates == "flag":
+            # Earlier rows of this chunk are flagged by their new post_id
+            near_duplicate_of = np.where(
+                similar_post > 0,
+                similar_post,
+                post_id_values[np.maximum(similar_row, 0)],
+            )
+            near_duplicate_of[(similar_post == 0) & (similar_row < 0)] = np.nan
+            counts["near_duplicates"] += int(
+                (inserted & ~np.isnan(near_duplicate_of)).sum()
+            )
+            near_duplicate_of = near_duplicate_of[inserted]
+        self._store_minhash_signatures(
+            conn,
+            post_id_values[inserted],
+            signatures[inserted],
+            has_words[inserted],
+            near_duplicate_of,
+        )
+        return counts, duplicate_titles
+
+    def _discard_processing_upload(self, upload_id: int):
+        """
+        Delete a failed upload's record and the rows it committed
+
+        Nothing of the upload is left to appear in the user's list or to match
+        a later upload of the same file.
+
+        Args:
+            upload_id (int): Upload still in UPLOAD_PROCESSING_STATUS
+        """
+
+        def discard(conn):
+            conn.execute("DELETE FROM posts WHERE upload_id = ?", (upload_id,))
+            self._prune_near_duplicate_index(conn)
+            conn.execute(
+                "DELETE FROM uploads WHERE id = ? AND status = ?",
+                (upload_id, self.UPLOAD_PROCESSING_STATUS),
+            )
+
+        try:
+            self._run_write(discard)
+        except Exception as e:
+            print(f"❌ Error discarding rows of upload {upload_id}: {e}")
+
+    def _prepare_upload_frame(
+        self, csv_data: pd.DataFrame, upload_id: int
+    ) -> pd.DataFrame:
+        """
+        Map one chunk of CSV rows onto the posts schema
+
+        Args:
+            csv_data (pd.DataFrame): Rows as read from the CSV
+            upload_id (int): ID of the upload record
+
+        Returns:
+            pd.DataFrame: New frame with posts columns and a fresh unique id per row
+        """
+        import uuid
+
+        # Rename only UMAP columns to match database schema (LLM_inferred_question stays as-is).
+        # rename() returns a new frame, so the caller's DataFrame is never modified.
+        csv_data = csv_data.rename(
+            columns={"umap_x": "umap_1", "umap_y": "umap_2", "umap_z": "umap_3"}
+        )
+        csv_data["upload_id"] = upload_id
+
+        # Add missing posts columns with None values
+        for col in self.UPLOAD_POSTS_COLUMNS:
+            if col not in csv_data.columns:
+                csv_data[col] = None
+
+        # Generate unique IDs for each record
+        csv_data["id"] = [str(uuid.uuid4()) for _ in range(len(csv_data))]
+        return csv_data
+
+    @staticmethod
+    def _dedupe_keys(titles: pd.Series, questions: pd.Series, owners) -> pd.Series:
+        """
+        Hash (owner, original_title, question) into the posts.dedupe_key value
+
+        The hash is computed column-wise with pandas' stable 64-bit hashing and
+        stored as a signed integer. The owner is part of the key, so the unique
+        index on dedupe_key only rejects duplicates within one user's uploads.
+        Rows missing a title or a question get no key and are never duplicates.
+
+        Args:
+            titles (pd.Series): original_title values
+            questions (pd.Series): Inferred question values, aligned with titles
+            owners: Uploading user id, or a Series of ids aligned with titles
+
+        Returns:
+            pd.Series: Python ints, or None where the row has no key
+        """
+        keys = pd.Series(None, index=titles.index, dtype=object)
+        keyed = titles.notna() & questions.notna()
+        if not keyed.any():
+            return keys
+
+        if not isinstance(owners, pd.Series):
+            owners = pd.Series(owners, index=titles.index)
+        parts = pd.DataFrame(
+            {
+                "owner": owners[keyed].astype(str),
+                "title": titles[keyed].astype(str),
+                "question": questions[keyed].astype(str),
+            }
+        )
+        hashes = pd.util.hash_pandas_object(parts, index=False).to_numpy()
+        keys[keyed] = hashes.view(np.int64).tolist()
+        return keys
+
+    @staticmethod
+    def _sqlite_rows(frame: pd.DataFrame) -> List[tuple]:
+        """DataFrame rows as tuples of Python values, with missing values as None"""
+        values = frame.astype(object).where(frame.notna(), None)
+        return list(values.itertuples(index=False, name=None))
+
+    def _bulk_insert_posts(self, conn, records: pd.DataFrame) -> pd.Series:
+        """
+        Insert posts plus their AI questions and categories in one batch each
+
+        Posts go in with a single executemany; their generated post_ids are
+        read back in one query and the child rows are built column-wise.
+        Records carrying a "dedupe_key" column are skipped when the key is
+        already stored.
+
+        Args:
+            conn: Open connection holding the write transaction
+            records (pd.DataFrame): Rows to insert, columns named as in posts
+                (must include the unique "id")
+
+        Returns:
+            pd.Series: post_id for each record, aligned with records.index;
+                NaN where a "dedupe_key" column is given and the key already exists
+        """
+        max_before = conn.execute(
+            "SELECT COALESCE(MAX(post_id), 0) FROM posts"
+        ).fetchone()[0]
+
+        columns = list(records.columns)
+        # Only the dedupe key conflict is skipped; other constraint errors still raise
+        on_conflict = (
+            " ON CONFLICT(dedupe_key) DO NOTHING" if "dedupe_key" in columns else ""
+        )
+        conn.executemany(
+            f"INSERT INTO posts ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))}){on_conflict}",
+            self._sqlite_rows(records),
+        )
+
+        # The write lock is held, so every post_id above max_before is ours
+        generated = dict(
+            conn.execute(
+                "SELECT id, post_id FROM posts WHERE post_id > ?", (max_before,)
+            ).fetchall()
+        )
+        post_ids = records["id"].map(generated)
+
+        children = (
+            (
+                "LLM_inferred_question",
+                """
+                INSERT INTO ai_questions (post_id, question_text, confidence_score, model_version)
+                VALUES (?, ?, NULL, 'upload_v1')
+                """,
+            ),
+            (
+                # Stored as 'group' (standard category type)
+                "llm_cluster_name",
+                """
+                INSERT INTO ai_categories
+                    (post_id, category_type, category_value, confidence_score, model_version)
+                VALUES (?, 'group', ?, NULL, 'upload_v1')
+                """,
+            ),
         )
-        return success_count == len(default_users)
+        for column, insert_sql in children:
+            if column not in records.columns:
+                continue
+            present = records[column].notna() & post_ids.notna()
+            if present.any():
+                conn.executemany(
+                    insert_sql,
+                    zip(
+                        post_ids[present].astype(int).tolist(),
+                        records.loc[present, column].tolist(),
+                    ),
+                )
 
-    # ========================================
-    # Upload Management Methods
-    # ========================================
+        return post_ids
 
-    def create_upload_record(
+    def _near_duplicate_matches(
         self,
-        filename: str,
-        user_readable_name: str,
-        uploaded_by: int,
-        comment: str = None,
-        upload_type: str = "forum_data",
-    ) -> int:
+        conn,
+        signatures: np.ndarray,
+        has_words: np.ndarray,
+        user_id: int,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Create a new upload record in the database
+        Find the closest earlier post for each row of an upload chunk
+
+        Candidates are the user's posts sharing an LSH bucket (looked up in
+        post_lsh_bands by key) and earlier rows of the same chunk sharing a
+        bucket; they are kept when the estimated Jaccard
+        similarity of the signatures reaches threshold.
 
         Args:
-            filename (str): Name of the uploaded file
-            user_readable_name (str): Human-readable name for the upload
-            uploaded_by (int): User ID of the uploader
-            comment (str, optional): Comment about the upload
-            upload_type (str, optional): Type of upload ('forum_data' or 'transcription_data')
+            conn: Open connection holding the write transaction
+            signatures (np.ndarray): MinHash signatures of the chunk rows
+            has_words (np.ndarray): Rows that have text to compare
+            user_id (int): Owner whose posts are compared against
+            threshold (float): Minimum estimated similarity
 
         Returns:
-            int: The ID of the created upload record
+            Tuple[np.ndarray, np.ndarray]: Per row, the post_id of the most
+                similar stored post (0 if none) and the position of the first
+                similar earlier row in the chunk (-1 if none)
         """
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
+        similar_post = np.zeros(len(signatures), dtype=np.int64)
+        similar_row = np.full(len(signatures), -1, dtype=np.int64)
+        rows = np.flatnonzero(has_words)
+        if len(rows) == 0:
+            return similar_post, similar_row
+
+        probe = pd.DataFrame(
+            {
+                "row": np.repeat(rows, BANDS),
+                "band": np.tile(np.arange(BANDS), len(rows)),
+                "bucket": band_buckets(signatures[rows]).ravel(),
+            }
+        )
+
+        # One index probe per band; json_each drives the join so only the
+        # chunk's buckets are looked up
+        found = []
+        for band, buckets in probe.groupby("band")["bucket"]:
+            found.extend(
+                (band, bucket, post_id)
+                for bucket, post_id in conn.execute(
                     """
-                    INSERT INTO uploads (filename, user_readable_name, comment, uploaded_by, upload_type, status)
-                    VALUES (?, ?, ?, ?, ?, 'active')
-                """,
-                    (filename, user_readable_name, comment, uploaded_by, upload_type),
+                    SELECT b.bucket, b.post_id
+                    FROM json_each(?) AS probe
+                    CROSS JOIN post_lsh_bands b
+                        ON b.band = ? AND b.bucket = probe.value
+                    JOIN posts p ON p.post_id = b.post_id
+                    JOIN uploads u ON u.id = p.upload_id
+                    WHERE u.uploaded_by = ?
+                    """,
+                    (json.dumps(buckets.unique().tolist()), band, str(user_id)),
                 )
+            )
 
-                upload_id = cursor.lastrowid
-                print(
-                    f" Created upload record {upload_id}: {filename} ({user_readable_name})"
+        if found:
+            matches = probe.merge(
+                pd.DataFrame(found, columns=["band", "bucket", "post_id"]),
+                on=["band", "bucket"],
+            )[["row", "post_id"]].drop_duplicates()
+            stored = dict(
+                conn.execute(
+                    "SELECT post_id, signature FROM post_minhash "
+                    "WHERE post_id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(matches["post_id"].unique().tolist()),),
+                ).fetchall()
+            )
+            matches["similarity"] = estimated_similarity(
+                signatures[matches["row"].to_numpy()],
+                signatures_from_blobs(stored[p] for p in matches["post_id"]),
+            )
+            best = (
+                matches[matches["similarity"] >= threshold]
+                .sort_values(
+                    ["row", "similarity", "post_id"], ascending=[True, False, True]
                 )
-                return upload_id
+                .drop_duplicates("row")
+            )
+            similar_post[best["row"].to_numpy()] = best["post_id"].to_numpy()
+
+        # Within the chunk, compare each row with the first row of its buckets
+        first = probe.groupby(["band", "bucket"])["row"].transform("min")
+        pairs = (
+            pd.DataFrame({"row": probe["row"], "earlier": first})
+            .loc[first < probe["row"]]
+            .drop_duplicates()
+        )
+        if len(pairs) > 0:
+            similarity = estimated_similarity(
+                signatures[pairs["row"].to_numpy()],
+                signatures[pairs["earlier"].to_numpy()],
+            )
+            best = (
+                pairs[similarity >= threshold]
+                .sort_values(["row", "earlier"])
+                .drop_duplicates("row")
+            )
+            similar_row[best["row"].to_numpy()] = best["earlier"].to_numpy()
 
-        except Exception as e:
-            print(f"❌ Error creating upload record: {e}")
-            raise
+        return similar_post, similar_row
 
-    def upload_csv_data(
+    def _store_minhash_signatures(
         self,
-        upload_id: int,
-        csv_data: pd.DataFrame,
-        user_id: int,
-    ) -> Dict:
+        conn,
+        post_ids: np.ndarray,
+        signatures: np.ndarray,
+        has_words: np.ndarray,
+        near_duplicate_of: Optional[np.ndarray] = None,
+    ) -> int:
         """
-        Process and store CSV data from an upload with duplicate prevention
+        Store signatures and LSH band rows for newly inserted posts
 
         Args:
-            upload_id (int): ID of the upload record
-            csv_data (pd.DataFrame): Pandas DataFrame containing the CSV data
+            conn: Open connection; the caller commits
+            post_ids (np.ndarray): post_id of each signature
+            signatures (np.ndarray): MinHash signatures, aligned with post_ids
+            has_words (np.ndarray): Posts with text; others are not indexed
+            near_duplicate_of (np.ndarray, optional): Flagged earlier post_id
+                per post, NaN where none
 
         Returns:
-            Dict: Result with success status, counts, and messages
+            int: Number of posts indexed
         """
-        try:
-            import uuid
+        ids = post_ids[has_words].astype(np.int64)
+        signatures = signatures[has_words]
+        if len(ids) == 0:
+            return 0
 
-            # Make a copy to avoid SettingWithCopyWarning
-            csv_data = csv_data.copy()
+        flagged = [None] * len(ids)
+        if near_duplicate_of is not None:
+            flagged = [
+                None if np.isnan(value) else int(value)
+                for value in near_duplicate_of[has_words]
+            ]
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO post_minhash (post_id, signature, near_duplicate_of) "
+            "VALUES (?, ?, ?)",
+            zip(ids.tolist(), map(signature_to_blob, signatures), flagged),
+        )
 
-            with sqlite3.connect(self.db_path) as conn:
-                # Add upload_id to each row
-                csv_data["upload_id"] = upload_id
+        # Inserting in key order keeps the band B-tree writes local
+        bands = np.tile(np.arange(BANDS), len(ids))
+        buckets = band_buckets(signatures).ravel()
+        order = np.lexsort((buckets, bands))
+        conn.executemany(
+            "INSERT OR IGNORE INTO post_lsh_bands (band, bucket, post_id) VALUES (?, ?, ?)",
+            zip(
+                bands[order].tolist(),
+                buckets[order].tolist(),
+                np.repeat(ids, BANDS)[order].tolist(),
+            ),
+        )
+        return len(ids)
 
-                # Handle column name mapping from CSV to database schema
-                # Note: Database uses original CSV column names, not normalized ones
-                column_mappings = {
-                    "umap_x": "umap_1",
-                    "umap_y": "umap_2",
-                    "umap_z": "umap_3",
-                }
+    def _prune_near_duplicate_index(self, conn):
+        """Drop band rows left behind by deleted posts
 
-                # Rename only UMAP columns to match database schema (LLM_inferred_question stays as-is)
-                for csv_col, db_col in column_mappings.items():
-                    if csv_col in csv_data.columns:
-                        csv_data = csv_data.rename(columns={csv_col: db_col})
-
-                # Separate data for posts table vs. AI tables
-                # Posts table columns (including LLM data for backward compatibility)
-                posts_columns = [
-                    "forum",
-                    "post_type",
-                    "username",
-                    "original_title",
-                    "original_post",
-                    "post_url",
-                    "LLM_inferred_question",  # Include in posts table for compatibility
-                    "cluster",
-                    "cluster_label",
-                    "llm_cluster_name",  # Include LLM cluster name for categorization
-                    "date_posted",
-                    "umap_1",
-                    "umap_2",
-                    "umap_3",
-                    "upload_id",
-                ]
+        Args:
+            conn: Open connection; the caller commits
+        """
+        conn.execute(
+            "DELETE FROM post_lsh_bands "
+            "WHERE post_id NOT IN (SELECT post_id FROM post_minhash)"
+        )
 
-                # Add missing posts columns with None values
-                for col in posts_columns:
-                    if col not in csv_data.columns:
-                        csv_data[col] = None
+    def find_near_duplicates(
+        self,
+        post_id: int,
+        user_id: int = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        limit: int = 20,
+        status_filter: str = "active",
+    ) -> List[Dict]:
+        """
+        Posts whose original_post is nearly the same as the given post's
 
-                # Generate unique IDs for each record
-                csv_data["id"] = [str(uuid.uuid4()) for _ in range(len(csv_data))]
+        Candidates come from the LSH band index, so the cost depends on the
+        number of similar posts rather than the size of the corpus.
 
-                # Check for duplicates using composite key (original_title + ai_question_text)
-                # Query existing data from normalized tables
-                existing_composites = set()
-                cursor = conn.execute(
-                    """
-                    SELECT p.original_title, COALESCE(aq.question_text, '') as question_text
-                    FROM posts p
-                    LEFT JOIN ai_questions aq ON p.post_id = aq.post_id
-                    INNER JOIN uploads u ON p.upload_id = u.id
-                    WHERE p.original_title IS NOT NULL 
-                    AND aq.question_text IS NOT NULL
-                                      AND u.uploaded_by = ?
-                """,
-                    (user_id,),
-                )
-                existing_composites = {
-                    (row[0], row[1]) for row in cursor.fetchall() if row[0] and row[1]
-                }
+        Args:
+            post_id: posts.post_id of the post to compare
+            user_id: Search this user's uploads (default: current authenticated user)
+            threshold: Minimum estimated Jaccard similarity of the shingle sets
+            limit: Maximum results to return
+            status_filter: Filter by upload status (default: 'active')
 
-                # Create composite keys for new data using AI question data
-                csv_data["composite_key"] = csv_data.apply(
-                    lambda row: (
-                        row["original_title"],
-                        row.get("LLM_inferred_question", ""),
-                    )
-                    if pd.notna(row["original_title"])
-                    and pd.notna(row.get("LLM_inferred_question"))
-                    else None,
-                    axis=1,
-                )
-
-                # Separate new records from duplicates based on composite key
-                if existing_composites:
-                    mask = ~csv_data["composite_key"].isin(existing_composites)
-                    new_records = csv_data[mask]
-                    duplicate_records = csv_data[~mask]
-                    duplicates_count = len(duplicate_records)
-
-                    if duplicates_count > 0:
-                        duplicate_titles = duplicate_records["original_title"].tolist()[
-                            :5
-                        ]  # Show first 5
-                        print(
-                            f"⚠️ Found {duplicates_count} duplicate record(s) based on composite key"
-                        )
-                        print(f"   Sample duplicate titles: {duplicate_titles}")
-                else:
-                    new_records = csv_data
-                    duplicates_count = 0
-
-                # Remove the temporary composite_key column before insertion
-                new_records = new_records.drop("composite_key", axis=1)
-
-                # Insert new data into posts table first (without AI data)
-                new_count = len(new_records)
-                if new_count > 0:
-                    # Prepare posts data (exclude AI columns)
-                    posts_data = new_records[["id"] + posts_columns]
-                    posts_data.to_sql("posts", conn, if_exists="append", index=False)
-
-                    # Get the post_ids for the inserted records
-                    post_ids = []
-                    for _, row in new_records.iterrows():
-                        cursor = conn.execute(
-                            "SELECT post_id FROM posts WHERE id = ?", (row["id"],)
-                        )
-                        result = cursor.fetchone()
-                        if result:
-                            post_ids.append(result[0])
-
-                    # Insert AI questions if available
-                    if "LLM_inferred_question" in new_records.columns:
-                        ai_questions = []
-                        for idx, (_, row) in enumerate(new_records.iterrows()):
-                            if pd.notna(row.get("LLM_inferred_question")) and idx < len(
-                                post_ids
-                            ):
-                                ai_questions.append(
-                                    {
-                                        "post_id": post_ids[idx],
-                                        "question_text": row["LLM_inferred_question"],
-                                        "confidence_score": None,
-                                        "model_version": "upload_v1",
-                                    }
-                                )
-
-                        if ai_questions:
-                            ai_questions_df = pd.DataFrame(ai_questions)
-                            ai_questions_df.to_sql(
-                                "ai_questions", conn, if_exists="append", index=False
-                            )
+        Returns:
+            List[Dict]: Posts ordered by 'similarity' (highest first)
+        """
+        from utilities.auth import get_current_user_id
 
-                    # Insert AI categories if available
-                    if "llm_cluster_name" in new_records.columns:
-                        ai_categories = []
-                        for idx, (_, row) in enumerate(new_records.iterrows()):
-                            if pd.notna(row.get("llm_cluster_name")) and idx < len(
-                                post_ids
-                            ):
-                                # Store as 'group' (standard category type)
-                                ai_categories.append(
-                                    {
-                                        "post_id": post_ids[idx],
-                                        "category_type": "group",
-                                        "category_value": row["llm_cluster_name"],
-                                        "confidence_score": None,
-                                        "model_version": "upload_v1",
-                                    }
-                                )
-
-                        if ai_categories:
-                            ai_categories_df = pd.DataFrame(ai_categories)
-                            ai_categories_df.to_sql(
-                                "ai_categories", conn, if_exists="append", index=False
-                            )
+        filter_user_id = user_id if user_id is not None else get_current_user_id()
+        if filter_user_id is None:
+            return []
 
-                # Update upload record with count
-                conn.execute(
+        try:
+            with self._connect() as conn:
+                stored = conn.execute(
                     """
-                    UPDATE uploads 
-                    SET records_count = ?
-                    WHERE id = ?
-                """,
-                    (new_count, upload_id),
+                    SELECT m.signature FROM post_minhash m
+                    JOIN posts p ON p.post_id = m.post_id
+                    JOIN uploads u ON u.id = p.upload_id
+                    WHERE m.post_id = ? AND u.uploaded_by = ?
+                    """,
+                    (int(post_id), str(filter_user_id)),
+                ).fetchone()
+                if not stored:
+                    return []
+
+                signature = signatures_from_blobs([stored[0]])
+                params = []
+                for band, bucket in enumerate(band_buckets(signature)[0].tolist()):
+                    params.extend([band, bucket])
+                params.extend([int(post_id), str(filter_user_id), status_filter])
+                cursor = conn.execute(
+                    f"""
+                    SELECT DISTINCT p.post_id, p.id, p.forum, p.original_title,
+                           p.post_url, p.upload_id, m.signature
+                    FROM (VALUES {", ".join(["(?, ?)"] * BANDS)}) AS probe
+                    CROSS JOIN post_lsh_bands b
+                        ON b.band = probe.column1 AND b.bucket = probe.column2
+                    JOIN post_minhash m ON m.post_id = b.post_id
+                    JOIN posts p ON p.post_id = b.post_id
+                    JOIN uploads u ON u.id = p.upload_id
+                    WHERE b.post_id != ? AND u.uploaded_by = ? AND u.status = ?
+                    """,
+                    params,
                 )
+                columns = [column[0] for column in cursor.description][:-1]
+                rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"❌ Error finding near duplicates of post {post_id}: {e}")
+            return []
 
-                result_message = f"Added {new_count} new records"
-                if duplicates_count > 0:
-                    result_message += f", skipped {duplicates_count} duplicates"
+        if not rows:
+            return []
 
-                print(f" Successfully processed upload {upload_id}: {result_message}")
+        similarity = estimated_similarity(
+            signature, signatures_from_blobs(row[-1] for row in rows)
+        )
+        results = [
+            {**dict(zip(columns, row[:-1])), "similarity": float(score)}
+            for row, score in zip(rows, similarity)
+            if score >= threshold
+        ]
+        results.sort(key=lambda result: (-result["similarity"], result["post_id"]))
+        return results[: max(0, int(limit))]
 
-                return {
-                    "success": True,
-                    "new_records": new_count,
-                    "duplicates_skipped": duplicates_count,
-                    "total_processed": len(csv_data),
-                    "message": result_message,
-                }
+    @contextmanager
+    def _search_index_deferred(self, conn):
+        """
+        Index posts inserted inside this block in one pass instead of per row
 
-        except Exception as e:
-            print(f"❌ Error uploading CSV data for upload {upload_id}: {e}")
-            return {
-                "success": False,
-                "new_records": 0,
-                "duplicates_skipped": 0,
-                "total_processed": 0,
-                "message": f"Upload failed: {str(e)}",
-            }
+        The post_search triggers are dropped for the duration and recreated
+        afterwards on the same connection, then new posts are indexed with a
+        single INSERT ... SELECT. The caller's transaction makes this atomic:
+        other connections never see the triggers missing.
+
+        Args:
+            conn: Open connection; the caller commits
+        """
+        has_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_search'"
+        ).fetchone()
+        if not has_index:
+            yield
+            return
+
+        # DDL would autocommit outside a transaction, so open one explicitly
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+
+        max_before = conn.execute(
+            "SELECT COALESCE(MAX(post_id), 0) FROM posts"
+        ).fetchone()[0]
+        triggers = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE 'post_search_%'"
+            ).fetchall()
+        ]
+        for trigger in triggers:
+            conn.execute(f"DROP TRIGGER {trigger}")
+
+        yield
+
+        self._create_search_triggers(conn)
+        conn.execute(
+            f"""
+            INSERT OR REPLACE INTO post_search
+                (rowid, title, body, ai_questions, user_questions, user_notes)
+            {self.SEARCH_INDEX_ROW_SQL}
+            WHERE p.post_id > ?
+        """,
+            (max_before,),
+        )
+
+    # transcriptions columns in insert order, with the converter for each CSV
+    # column (None = stored as given)
+    TRANSCRIPTION_COLUMNS = {
+        "session_id": None,
+        "participant_id": None,
+        "session_date": to_timestamp,
+        "session_duration": to_int,
+        "transcription_text": None,
+        "zoom_ease": to_boolean,
+        "poll_usability": to_likert,
+        "resource_access": to_boolean,
+        "presession_anxiety": to_likert,
+        "reassurance_provided": to_likert,
+        "info_useful": to_likert,
+        "info_missing": to_boolean,
+        "info_takeaway_desired": to_boolean,
+        "exercise_engaged": to_boolean,
+        "lifestyle_change": to_boolean,
+        "postop_adherence": to_boolean,
+        "family_involved": to_boolean,
+        "support_needed": to_boolean,
+    }
 
     def save_transcription_data(self, df: pd.DataFrame, upload_id: int) -> Dict:
         """
         Save transcription data to database
 
+        Columns are converted whole (booleans and Likert scores strictly) and
+        inserted with one executemany. Any value that cannot be converted
+        fails the upload, with the failures counted per column.
+
         Args:
             df (pd.DataFrame): Transcription data DataFrame
             upload_id (int): Upload ID to associate with transcriptions
 
         Returns:
             Dict: Result with success status, message, and records_saved count
+                (plus conversion_errors, column -> invalid count, on failure)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                records_saved = 0
-
-                for _, row in df.iterrows():
-                    # Map CSV columns to database columns with type conversion
-                    transcription_data = {
-                        "upload_id": upload_id,
-                        "session_id": row.get("session_id"),
-                        "participant_id": row.get("participant_id"),
-                        "session_date": self._convert_to_timestamp(
-                            row.get("session_date")
-                        ),
-                        "session_duration": self._convert_to_int(
-                            row.get("session_duration")
-                        ),
-                        "transcription_text": row.get("transcription_text"),
-                        # Convert boolean columns (handle various formats)
-                        "zoom_ease": self._convert_to_boolean(row.get("zoom_ease")),
-                        "resource_access": self._convert_to_boolean(
-                            row.get("resource_access")
-                        ),
-                        "info_missing": self._convert_to_boolean(
-                            row.get("info_missing")
-                        ),
-                        "info_takeaway_desired": self._convert_to_boolean(
-                            row.get("info_takeaway_desired")
-                        ),
-                        "exercise_engaged": self._convert_to_boolean(
-                            row.get("exercise_engaged")
-                        ),
-                        "lifestyle_change": self._convert_to_boolean(
-                            row.get("lifestyle_change")
-                        ),
-                        "postop_adherence": self._convert_to_boolean(
-                            row.get("postop_adherence")
-                        ),
-                        "family_involved": self._convert_to_boolean(
-                            row.get("family_involved")
-                        ),
-                        "support_needed": self._convert_to_boolean(
-                            row.get("support_needed")
-                        ),
-                        # Convert Likert scale columns
-                        "poll_usability": self._convert_to_likert(
-                            row.get("poll_usability")
-                        ),
-                        "presession_anxiety": self._convert_to_likert(
-                            row.get("presession_anxiety")
-                        ),
-                        "reassurance_provided": self._convert_to_likert(
-                            row.get("reassurance_provided")
-                        ),
-                        "info_useful": self._convert_to_likert(row.get("info_useful")),
-                    }
+            columns, conversion_errors, examples = self._convert_transcription_columns(
+                df
+            )
+            if conversion_errors:
+                details = "; ".join(
+                    f"{column}: {count} invalid values (e.g. '{examples[column]}')"
+                    for column, count in conversion_errors.items()
+                )
+                print(
+                    f"❌ Invalid transcription values for upload {upload_id}: {details}"
+                )
+                return {
+                    "success": False,
+                    "message": f"Error saving transcription data: invalid values - {details}",
+                    "records_saved": 0,
+                    "conversion_errors": conversion_errors,
+                }
 
-                    # Insert transcription record
-                    conn.execute(
-                        """
-                        INSERT INTO transcriptions (
-                            upload_id, session_id, participant_id, session_date, session_duration, 
-                            transcription_text, zoom_ease, poll_usability, resource_access,
-                            presession_anxiety, reassurance_provided, info_useful, info_missing,
-                            info_takeaway_desired, exercise_engaged, lifestyle_change,
-                            postop_adherence, family_involved, support_needed
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        tuple(transcription_data.values()),
-                    )
+            rows = list(zip([upload_id] * len(df), *columns.values()))
 
-                    records_saved += 1
+            with self._connect() as conn:
+                conn.executemany(
+                    f"""
+                    INSERT INTO transcriptions (upload_id, {", ".join(columns)})
+                    VALUES ({", ".join("?" * (len(columns) + 1))})
+                """,
+                    rows,
+                )
 
                 # Update upload record with actual record count
                 conn.execute(
                     """
                     UPDATE uploads SET records_count = ? WHERE id = ?
                 """,
-                    (records_saved, upload_id),
+                    (len(rows), upload_id),
                 )
 
-                print(
-                    f" Successfully saved {records_saved} transcription records for upload {upload_id}"
-                )
+            records_saved = len(rows)
+            print(
+                f" Successfully saved {records_saved} transcription records for upload {upload_id}"
+            )
 
-                return {
-                    "success": True,
-                    "message": f"Successfully saved {records_saved} transcription records",
-                    "records_saved": records_saved,
-                }
+            return {
+                "success": True,
+                "message": f"Successfully saved {records_saved} transcription records",
+                "records_saved": records_saved,
+            }
 
         except Exception as e:
             print(f"❌ Error saving transcription data for upload {upload_id}: {e}")
@@ -2305,93 +4488,43 @@ class MRPCDatabase:
                 "records_saved": 0,
             }
 
-    def _convert_to_boolean(self, value) -> bool:
-        """Convert boolean representations to Python bool - STRICT: Only True/False accepted"""
-        if pd.isna(value):
-            return None
-        if isinstance(value, bool):
-            return value  # Already a proper boolean
-        if isinstance(value, str):
-            lower_val = value.lower().strip()
-            if lower_val == "true":
-                return True
-            elif lower_val == "false":
-                return False
-            elif lower_val == "1":
-                return True
-            elif lower_val == "0":
-                return False
-            else:
-                # Strict mode: Only accept True/False/1/0, reject all other formats
-                raise ValueError(
-                    f"Invalid boolean value '{value}' - only 'True'/'False'/'1'/'0' accepted"
-                )
-        if isinstance(value, int):
-            if value == 1:
-                return True
-            elif value == 0:
-                return False
-            else:
-                raise ValueError(f"Invalid boolean value '{value}' - only 0/1 accepted")
-        if isinstance(value, float):
-            # Reject all floats for strict validation
-            raise ValueError(f"Invalid boolean value '{value}' - floats not accepted")
-        raise ValueError(
-            f"Invalid boolean value '{value}' (type: {type(value)}) - only True/False accepted"
-        )
-
-    def _convert_to_likert(self, value) -> int:
-        """Validate Likert scale values - MUST be integers 1-5, no conversion"""
-        if pd.isna(value):
-            return None
-
-        # Explicitly reject boolean values (even though True/False could be int 1/0)
-        if isinstance(value, bool):
-            raise ValueError(
-                f"Boolean value '{value}' not allowed for Likert scale - must be integer 1-5"
-            )
+    def _convert_transcription_columns(
+        self, df: pd.DataFrame
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        Convert every transcriptions column of an upload to SQLite-ready values
 
-        # Assert it's already an integer in the correct range
-        if isinstance(value, int) and 1 <= value <= 5:
-            return value
+        Args:
+            df (pd.DataFrame): Transcription data DataFrame
 
-        # If it's a string representation of a valid integer, accept it
-        if isinstance(value, str):
-            try:
-                int_val = int(value)
-                if 1 <= int_val <= 5:
-                    return int_val
-                else:
-                    raise ValueError(
-                        f"Likert value '{value}' out of range - must be integer 1-5"
-                    )
-            except ValueError:
-                raise ValueError(
-                    f"Invalid Likert value '{value}' - could not be converted to integer"
+        Returns:
+            Tuple[Dict, Dict, Dict]: (column -> object array with None for empty cells,
+                    column -> invalid value count, column -> first invalid value)
+        """
+        columns = {}
+        conversion_errors = {}
+        examples = {}
+
+        for column, converter in self.TRANSCRIPTION_COLUMNS.items():
+            if column not in df.columns:
+                columns[column] = np.full(len(df), None, dtype=object)
+                continue
+
+            series = df[column]
+            if converter is None:
+                columns[column] = (
+                    series.astype(object).where(series.notna(), None).to_numpy()
                 )
+                continue
 
-        # Reject any other type or value
-        raise ValueError(
-            f"Invalid Likert value '{value}' (type: {type(value)}) - must be integer 1-5"
-        )
-
-    def _convert_to_timestamp(self, value) -> str:
-        """Convert timestamp values to ISO format string"""
-        if pd.isna(value):
-            return None
-        try:
-            return pd.to_datetime(value).isoformat()
-        except Exception:
-            return str(value) if value else None
+            conversion = converter(series)
+            invalid = conversion[2]
+            if invalid.any():
+                conversion_errors[column] = int(invalid.sum())
+                examples[column] = series[invalid].iloc[0]
+            columns[column] = as_sqlite_values(conversion)
 
-    def _convert_to_int(self, value) -> int:
-        """Convert values to integer"""
-        if pd.isna(value):
-            return None
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return None
+        return columns, conversion_errors, examples
 
     def get_all_uploads(
         self, user_id: int = None, status: str = None, upload_type: str = None
@@ -2408,7 +4541,7 @@ class MRPCDatabase:
             List[Dict]: List of upload records with user information
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Build query with optional filters
@@ -2456,6 +4589,7 @@ class MRPCDatabase:
                         "active": {"color": "success", "icon": ""},
                         "archived": {"color": "warning", "icon": ""},
                         "deleted": {"color": "danger", "icon": "🗑️"},
+                        self.UPLOAD_PROCESSING_STATUS: {"color": "info", "icon": "⏳"},
                     }
                     upload["status_style"] = status_styles.get(
                         upload["status"], {"color": "secondary", "icon": "❓"}
@@ -2469,6 +4603,53 @@ class MRPCDatabase:
             print(f"❌ Error getting uploads: {e}")
             return []
 
+    def find_upload_by_content(
+        self, content_sha256: str, user_id: int, upload_type: str = None
+    ) -> Optional[Dict]:
+        """
+        Find the user's most recent upload of a file with the same content
+
+        Deleted uploads are ignored, so a file can be uploaded again after
+        its earlier upload was deleted, and so are uploads still (or, after a
+        worker died, forever) in UPLOAD_PROCESSING_STATUS, which never published.
+
+        Args:
+            content_sha256 (str): Hex SHA-256 of the raw file
+            user_id (int): Uploading user
+            upload_type (str, optional): Only match uploads of this type
+
+        Returns:
+            Optional[Dict]: id, user_readable_name, filename, upload_date,
+                upload_type, status and records_count, or None
+        """
+        try:
+            with self._connect() as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute(
+                    """
+                    SELECT id, user_readable_name, filename, upload_date, upload_type,
+                           status, records_count
+                    FROM uploads
+                    WHERE content_sha256 = ? AND uploaded_by = ?
+                      AND status NOT IN ('deleted', ?)
+                      AND (? IS NULL OR upload_type = ?)
+                    ORDER BY id DESC
+                    LIMIT 1
+                """,
+                    (
+                        content_sha256,
+                        user_id,
+                        self.UPLOAD_PROCESSING_STATUS,
+                        upload_type,
+                        upload_type,
+                    ),
+                ).fetchone()
+                return dict(row) if row else None
+
+        except Exception as e:
+            print(f"❌ Error looking up upload by content: {e}")
+            return None
+
     def get_upload_by_id(self, upload_id: int) -> Dict:
         """
         Get a specific upload record by ID
@@ -2480,7 +4661,7 @@ class MRPCDatabase:
             Dict: Upload record with user information, or None if not found
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 cursor = conn.execute(
@@ -2522,7 +4703,7 @@ class MRPCDatabase:
             bool: True if deletion was successful, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Check if upload exists and user has permission
                 if user_id:
                     check_cursor = conn.execute(
@@ -2554,6 +4735,7 @@ class MRPCDatabase:
 
                 # Delete associated posts first (foreign key constraint)
                 conn.execute("DELETE FROM posts WHERE upload_id = ?", (upload_id,))
+                self._prune_near_duplicate_index(conn)
 
                 # Delete upload record
                 conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
@@ -2589,7 +4771,7 @@ class MRPCDatabase:
                     "top_uploaders": [],
                 }
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 stats = {}
@@ -2707,7 +4889,7 @@ class MRPCDatabase:
             Dict: Result with success status, message, and details
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Check if upload exists and get details
@@ -2780,7 +4962,7 @@ class MRPCDatabase:
             Dict: Result with success status, message, and details
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Check if upload exists and get details
@@ -2853,7 +5035,7 @@ class MRPCDatabase:
             Dict: Result with success status, message, and details
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Check if upload exists and get details
@@ -2926,7 +5108,7 @@ class MRPCDatabase:
             Dict: Result with success status, message, and details
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Check if upload exists and get details
@@ -2973,6 +5155,7 @@ class MRPCDatabase:
 
                 # Permanently delete associated posts first (foreign key constraint)
                 conn.execute("DELETE FROM posts WHERE upload_id = ?", (upload_id,))
+                self._prune_near_duplicate_index(conn)
 
                 # Permanently delete upload record
                 conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
@@ -3004,7 +5187,7 @@ class MRPCDatabase:
             List[Dict]: List of transcription records with all experimental fields
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Check if transcriptions table exists
@@ -3089,7 +5272,7 @@ class MRPCDatabase:
                     return []
                 user_id = current_user.get("id")
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Check if transcriptions table exists
@@ -3159,6 +5342,39 @@ class MRPCDatabase:
 
 
 # Dash callback functions (compatible with existing app structure)
+_shared_databases: Dict[str, MRPCDatabase] = {}
+_shared_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str = "data/mrpc_new.db") -> MRPCDatabase:
+    """
+    Get the process-wide shared MRPCDatabase for a database file
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        MRPCDatabase: Shared instance (created and migrated on first use)
+    """
+    key = os.path.abspath(db_path)
+    with _shared_databases_lock:
+        db = _shared_databases.get(key)
+        if db is None:
+            db = MRPCDatabase(db_path)
+            _shared_databases[key] = db
+    # Re-validate in case the file was replaced since the instance was cached
+    db._ensure_initialized()
+    return db
+
+
+def reset_database_cache():
+    """Drop shared instances and the one-time migration state (for tests)"""
+    with _shared_databases_lock:
+        _shared_databases.clear()
+    MRPCDatabase.reset_initialization_cache()
+    MRPCDatabase._tag_vocabulary_cache.clear()
+
+
 def setup_mrpc_database_callbacks(app):
     """Setup Dash callbacks for MRPC database system"""
     from dash import Input, Output, State, no_update
@@ -3171,68 +5387,33 @@ def setup_mrpc_database_callbacks(app):
         [
             Output(
                 {"type": "sidebar-group-dropdown", "item_id": dash.dependencies.MATCH},
-                "value",
+                "options",
             ),
             Output(
                 {
                     "type": "sidebar-subgroup-dropdown",
                     "item_id": dash.dependencies.MATCH,
                 },
-                "value",
+                "options",
             ),
             Output(
                 {"type": "sidebar-tags-dropdown", "item_id": dash.dependencies.MATCH},
-                "value",
+                "options",
             ),
-        ],
-        [
-            Input(
-                {"type": "sidebar-group-dropdown", "item_id": dash.dependencies.MATCH},
-                "id",
-            )
-        ],
-        prevent_initial_call=False,
-    )
-    def populate_dropdown_values(dropdown_id):
-        """Populate dropdown values when sidebar opens"""
-        if not dropdown_id:
-            return no_update, no_update, no_update
-
-        item_id = dropdown_id["item_id"]
-        tags_data = db.get_tags_for_item(item_id)
-
-        # Extract just the values for dropdowns (they expect strings, not dicts)
-        groups = [
-            tag.get("value", tag) if isinstance(tag, dict) else tag
-            for tag in tags_data.get("groups", [])
-        ]
-        subgroups = [
-            tag.get("value", tag) if isinstance(tag, dict) else tag
-            for tag in tags_data.get("subgroups", [])
-        ]
-        tags = [
-            tag.get("value", tag) if isinstance(tag, dict) else tag
-            for tag in tags_data.get("tags", [])
-        ]
-
-        return (groups, subgroups, tags)
-
-    @app.callback(
-        [
             Output(
                 {"type": "sidebar-group-dropdown", "item_id": dash.dependencies.MATCH},
-                "options",
+                "value",
             ),
             Output(
                 {
                     "type": "sidebar-subgroup-dropdown",
                     "item_id": dash.dependencies.MATCH,
                 },
-                "options",
+                "value",
             ),
             Output(
                 {"type": "sidebar-tags-dropdown", "item_id": dash.dependencies.MATCH},
-                "options",
+                "value",
             ),
         ],
         [
@@ -3244,16 +5425,16 @@ def setup_mrpc_database_callbacks(app):
         prevent_initial_call=False,
     )
     def populate_dropdown_options(dropdown_id):
-        """Populate dropdown options with source-based styling for this specific item"""
+        """Populate dropdown options (with source-based styling) and values when the sidebar opens"""
         if not dropdown_id:
-            return [], [], []
+            return [], [], [], no_update, no_update, no_update
 
         item_id = dropdown_id["item_id"]
 
-        # Get available options (all possible tags)
+        # Get available options (all possible tags) from the cached vocabulary
         available = db.get_available_tags()
 
-        # Get existing tags for this specific item (with source info)
+        # Get existing tags for this specific item (with source info) - the only per-item query
         existing_tags = db.get_tags_for_item(item_id)
 
         # Create source lookup for this specific item
@@ -3316,7 +5497,15 @@ def setup_mrpc_database_callbacks(app):
         )
         tag_options = create_styled_options(available.get("tags", []), tags_sources)
 
-        return group_options, subgroup_options, tag_options
+        # Selected values are the item's own tags (dropdowns expect strings, not dicts)
+        return (
+            group_options,
+            subgroup_options,
+            tag_options,
+            list(groups_sources),
+            list(subgroups_sources),
+            list(tags_sources),
+        )
 
     @app.callback(
         Output(
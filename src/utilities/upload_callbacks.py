@@ -7,6 +7,8 @@ from dash import Input, Output, State, no_update, ALL, ctx
 import dash_bootstrap_components as dbc
 from dash import html
 from utilities.upload_service import upload_service
+from utilities.upload_jobs import TERMINAL_JOB_STATUSES, upload_job_runner
+from utilities.upload_spool import upload_spool
 
 
 def create_upload_type_badge(upload_type):
@@ -384,34 +386,209 @@ def create_upload_preview_card(filename, validation_result, detected_type=None):
     )
 
 
+def create_upload_result_alert(result, selected_type):
+    """Create the success or failure alert for a processed upload"""
+    if result.get("already_uploaded"):
+        return dbc.Alert(
+            [
+                html.H4("📁 File Already Uploaded", className="alert-heading"),
+                html.P(result["message"]),
+                html.Small(
+                    f"Upload ID: {result.get('upload_id', 'Unknown')}",
+                    className="text-muted",
+                ),
+            ],
+            color="info",
+            dismissable=True,
+        )
+
+    if result["success"]:
+        # Enhanced success message based on upload type
+        if selected_type == "transcription_data":
+            success_icon = "🧪"
+            success_title = "Transcription Data Upload Successful!"
+            data_info = f"Experimental session data processed with {result.get('new_records', 0)} records"
+        else:
+            success_icon = "📊"
+            success_title = "Forum Data Upload Successful!"
+            data_info = f"Forum analysis data processed with {result.get('new_records', 0)} records"
+
+        alert = dbc.Alert(
+            [
+                html.H4(f"{success_icon} {success_title}", className="alert-heading"),
+                html.P(data_info),
+                html.Hr(),
+                html.P(
+                    [
+                        f"Upload ID: {result.get('upload_id', 'Unknown')} | ",
+                        f"Data Type: {selected_type.replace('_', ' ').title()} | ",
+                        f"New Records: {result.get('new_records', 0)} | ",
+                        f"Duplicates Skipped: {result.get('duplicates_skipped', 0)}",
+                    ],
+                    className="mb-0",
+                ),
+            ],
+            color="success",
+            dismissable=True,
+        )
+    else:
+        # Enhanced error message based on upload type
+        if selected_type == "transcription_data":
+            error_icon = "🧪❌"
+            error_title = "Transcription Data Validation Failed"
+            error_context = "Please ensure all 15 experimental fields are present and correctly formatted."
+        else:
+            error_icon = "📊❌"
+            error_title = "Forum Data Validation Failed"
+            error_context = "Please check the required forum data columns and format."
+
+        alert = dbc.Alert(
+            [
+                html.H4(f"{error_icon} {error_title}", className="alert-heading"),
+                html.P(error_context),
+                html.Hr(),
+                html.P(result["message"]),
+                html.Small(
+                    f"Selected Type: {selected_type.replace('_', ' ').title()}",
+                    className="text-muted",
+                ),
+            ],
+            color="danger",
+            dismissable=True,
+        )
+
+    return alert
+
+
+def create_upload_job_progress(job):
+    """Create the live progress card for a queued or running upload job"""
+    progress = job.get("progress") or 0
+    total_rows = job.get("total_rows")
+    rows_text = f"{job.get('rows_processed') or 0:,}"
+    if total_rows:
+        rows_text += f" of ~{total_rows:,}"
+
+    return dbc.Alert(
+        [
+            html.H6(
+                f"⏳ Processing {job.get('filename') or 'upload'}"
+                if job["status"] == "running"
+                else f"🕒 Queued {job.get('filename') or 'upload'}",
+                className="alert-heading",
+            ),
+            dbc.Progress(
+                value=progress,
+                label=f"{progress:.0f}%",
+                striped=True,
+                animated=job["status"] == "running",
+                className="mb-2",
+            ),
+            html.Small(f"Rows processed: {rows_text}", className="d-block mb-2"),
+            dbc.Button(
+                "Cancel Upload",
+                id="upload-job-cancel-btn",
+                color="secondary",
+                size="sm",
+                outline=True,
+                disabled=bool(job.get("cancel_requested")),
+            ),
+        ],
+        color="info",
+    )
+
+
 def register_upload_callbacks(app):
     """Register all upload page callbacks"""
 
+    # Send the selected file to /api/uploads as multipart in the browser, so
+    # only the returned token (never the file contents) reaches the callbacks.
+    # A failed send is stored as {success: false, message} for the preview to show
+    app.clientside_callback(
+        """
+        async function(contents, filename) {
+            if (!contents) {
+                return null;
+            }
+            try {
+                const blob = await (await fetch(contents)).blob();
+                const form = new FormData();
+                form.append('file', blob, filename);
+                const response = await fetch('/api/uploads', {
+                    method: 'POST',
+                    body: form,
+                    credentials: 'same-origin',
+                });
+                let result = null;
+                try {
+                    result = await response.json();
+                } catch (e) {
+                    // e.g. the HTML page of a 413 Request Entity Too Large
+                }
+                if (!response.ok || !result || !result.success) {
+                    return {
+                        success: false,
+                        filename: filename,
+                        message: (result && result.message)
+                            || (response.status === 413
+                                ? 'File is too large to upload'
+                                : `Upload failed (HTTP ${response.status})`),
+                    };
+                }
+                return result;
+            } catch (e) {
+                return {
+                    success: false,
+                    filename: filename,
+                    message: `Could not send file: ${e.message}`,
+                };
+            }
+        }
+        """,
+        Output("upload-token", "data"),
+        Input("upload-data", "contents"),
+        State("upload-data", "filename"),
+        prevent_initial_call=True,
+    )
+
     @app.callback(
         [
             Output("upload-form-container", "style"),
             Output("upload-type-container", "style"),
+            Output("upload-preview", "children"),
         ],
-        [Input("upload-data", "contents")],
-        [State("upload-data", "filename")],
+        [Input("upload-token", "data")],
     )
-    def handle_file_upload(contents, filename):
+    def handle_file_upload(spooled):
         """Handle file upload and show preview with type detection"""
-        if contents is None:
-            return {"display": "none"}, {"display": "none"}
+        if not spooled:
+            return {"display": "none"}, {"display": "none"}, None
+
+        if not spooled.get("success", True):
+            return (
+                {"display": "none"},
+                {"display": "none"},
+                dbc.Alert(
+                    [
+                        html.H6("❌ Error Sending File"),
+                        html.P(spooled.get("message") or "Upload failed"),
+                    ],
+                    color="danger",
+                ),
+            )
 
         try:
-            # Preview the uploaded file
-            preview_result = upload_service.preview_csv(contents, rows=3)
+            # Preview the spooled file
+            preview_result = upload_service.preview_spooled_upload(
+                spooled.get("token"), rows=3
+            )
 
             if preview_result["success"]:
                 # Auto-detect upload type
-                df = upload_service._parse_csv_contents(contents)
-                detected_type = upload_service.detect_upload_type(df)
+                detected_type = preview_result["detected_type"]
 
                 # Create enhanced preview card with type detection
                 preview_card = create_upload_preview_card(
-                    filename, preview_result, detected_type
+                    preview_result["filename"], preview_result, detected_type
                 )
 
                 # Show upload type selector and form
@@ -419,11 +596,13 @@ def register_upload_callbacks(app):
                 form_style = {"display": "block"}
             else:
                 # Show error
-                preview_card = create_upload_preview_card(filename, preview_result)
+                preview_card = create_upload_preview_card(
+                    spooled.get("filename"), preview_result
+                )
                 type_container_style = {"display": "none"}
                 form_style = {"display": "none"}
 
-            return form_style, type_container_style
+            return form_style, type_container_style, preview_card
 
         except Exception as e:
             error_card = dbc.Alert(
@@ -431,7 +610,7 @@ def register_upload_callbacks(app):
                 color="danger",
             )
 
-            return {"display": "none"}, error_card, {"display": "none"}
+            return {"display": "none"}, {"display": "none"}, error_card
 
     @app.callback(
         Output("upload-type-info", "children"),
@@ -494,96 +673,42 @@ def register_upload_callbacks(app):
         return ""
 
     @app.callback(
-        Output("upload-alerts", "children"),
+        [
+            Output("upload-alerts", "children"),
+            Output("upload-job-id", "data"),
+            Output("upload-job-poll", "disabled"),
+        ],
         [Input("upload-submit-btn", "n_clicks")],
         [
-            State("upload-data", "contents"),
-            State("upload-data", "filename"),
+            State("upload-token", "data"),
             State("upload-name", "value"),
             State("upload-comment", "value"),
             State("upload-type-selector", "value"),
+            State("upload-force-reingest", "value"),
         ],
         prevent_initial_call=True,
     )
     def process_upload(
-        n_clicks, contents, filename, upload_name, comment, selected_type
+        n_clicks, spooled, upload_name, comment, selected_type, force_reingest
     ):
-        """Process the actual file upload with type selection"""
-        if not n_clicks or not contents or not upload_name:
-            return no_update
+        """Queue the spooled file for background processing with type selection"""
+        if not n_clicks or not spooled or not upload_name:
+            return no_update, no_update, no_update
 
         try:
-            # Process the upload with explicit type selection
-            result = upload_service.process_file_upload(
-                contents=contents,
-                filename=filename,
+            # Processing happens on a job worker; progress is polled below
+            result = upload_job_runner.submit(
+                token=spooled.get("token"),
                 user_readable_name=upload_name,
                 comment=comment or "",
                 expected_type=selected_type,  # Pass the user-selected type
+                force=bool(force_reingest),  # Honoured for admins only
             )
 
             if result["success"]:
-                # Enhanced success message based on upload type
-                if selected_type == "transcription_data":
-                    success_icon = "🧪"
-                    success_title = "Transcription Data Upload Successful!"
-                    data_info = f"Experimental session data processed with {result.get('new_records', 0)} records"
-                else:
-                    success_icon = "📊"
-                    success_title = "Forum Data Upload Successful!"
-                    data_info = f"Forum analysis data processed with {result.get('new_records', 0)} records"
+                return "", result["job_id"], False
 
-                alert = dbc.Alert(
-                    [
-                        html.H4(
-                            f"{success_icon} {success_title}", className="alert-heading"
-                        ),
-                        html.P(data_info),
-                        html.Hr(),
-                        html.P(
-                            [
-                                f"Upload ID: {result.get('upload_id', 'Unknown')} | ",
-                                f"Data Type: {selected_type.replace('_', ' ').title()} | ",
-                                f"New Records: {result.get('new_records', 0)} | ",
-                                f"Duplicates Skipped: {result.get('duplicates_skipped', 0)}",
-                            ],
-                            className="mb-0",
-                        ),
-                    ],
-                    color="success",
-                    dismissable=True,
-                )
-            else:
-                # Enhanced error message based on upload type
-                if selected_type == "transcription_data":
-                    error_icon = "🧪❌"
-                    error_title = "Transcription Data Validation Failed"
-                    error_context = "Please ensure all 15 experimental fields are present and correctly formatted."
-                else:
-                    error_icon = "📊❌"
-                    error_title = "Forum Data Validation Failed"
-                    error_context = (
-                        "Please check the required forum data columns and format."
-                    )
-
-                alert = dbc.Alert(
-                    [
-                        html.H4(
-                            f"{error_icon} {error_title}", className="alert-heading"
-                        ),
-                        html.P(error_context),
-                        html.Hr(),
-                        html.P(result["message"]),
-                        html.Small(
-                            f"Selected Type: {selected_type.replace('_', ' ').title()}",
-                            className="text-muted",
-                        ),
-                    ],
-                    color="danger",
-                    dismissable=True,
-                )
-
-            return alert
+            return create_upload_result_alert(result, selected_type), None, True
 
         except Exception as e:
             error_alert = dbc.Alert(
@@ -599,7 +724,55 @@ def register_upload_callbacks(app):
                 dismissable=True,
             )
 
-            return error_alert
+            return error_alert, None, True
+
+    @app.callback(
+        [
+            Output("upload-job-progress", "children"),
+            Output("upload-alerts", "children", allow_duplicate=True),
+            Output("upload-job-poll", "disabled", allow_duplicate=True),
+        ],
+        [Input("upload-job-poll", "n_intervals")],
+        [State("upload-job-id", "data"), State("upload-type-selector", "value")],
+        prevent_initial_call=True,
+    )
+    def poll_upload_job(n_intervals, job_id, selected_type):
+        """Show live job progress, then the final result once the job finishes"""
+        if not job_id:
+            return "", no_update, True
+
+        job = upload_job_runner.get_job(job_id)
+        if not job:
+            return "", dbc.Alert("Upload job not found", color="warning"), True
+
+        if job["status"] not in TERMINAL_JOB_STATUSES:
+            return create_upload_job_progress(job), no_update, False
+
+        if job["status"] == "cancelled":
+            alert = dbc.Alert(
+                "Upload cancelled - no records were saved",
+                color="secondary",
+                dismissable=True,
+            )
+        else:
+            result = job["result"] or {"success": False, "message": job["message"]}
+            alert = create_upload_result_alert(
+                result, job["expected_type"] or selected_type
+            )
+        return "", alert, True
+
+    @app.callback(
+        Output("upload-job-cancel-btn", "disabled"),
+        [Input("upload-job-cancel-btn", "n_clicks")],
+        [State("upload-job-id", "data")],
+        prevent_initial_call=True,
+    )
+    def cancel_upload_job(n_clicks, job_id):
+        """Ask the worker to stop the running upload at its next chunk"""
+        if not n_clicks or not job_id:
+            return no_update
+
+        return upload_job_runner.cancel(job_id)
 
     @app.callback(
         [
@@ -608,16 +781,21 @@ def register_upload_callbacks(app):
             Output("upload-name", "value"),
             Output("upload-comment", "value"),
             Output("upload-type-selector", "value"),
+            Output("upload-token", "data", allow_duplicate=True),
         ],
         [Input("upload-cancel-btn", "n_clicks")],
+        [State("upload-token", "data")],
         prevent_initial_call=True,
     )
-    def cancel_upload(n_clicks):
-        """Cancel the upload and reset form"""
+    def cancel_upload(n_clicks, spooled):
+        """Cancel the upload, drop the spooled file and reset form"""
         if not n_clicks:
             return no_update
 
-        return {"display": "none"}, {"display": "none"}, "", "", "forum_data"
+        if spooled:
+            upload_spool.discard(spooled.get("token"))
+
+        return {"display": "none"}, {"display": "none"}, "", "", "forum_data", None
 
     @app.callback(
         [
@@ -0,0 +1,526 @@
+"""
+Background Upload Jobs
+SQLite-backed job queue and worker threads that ingest spooled uploads off the request path
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from .auth import get_current_user_id
+from .connection_pool import get_connection_pool
+from .upload_service import UploadService, upload_service
+from .upload_spool import upload_spool
+
+TERMINAL_JOB_STATUSES = ("completed", "failed", "cancelled")
+
+
+class UploadCancelled(Exception):
+    """Raised from the progress callback to abort a running upload"""
+
+
+def jobs_db_path(db_path: str) -> str:
+    """Job queue database kept next to the main database (e.g. data/mrpc_new_jobs.db)"""
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}_jobs.db"))
+
+
+def count_data_rows(path: str, filename: str = None) -> int:
+    """Data rows of a spooled file (see UploadService.count_upload_rows)"""
+    return UploadService.count_upload_rows(path, filename or path)
+
+
+class UploadJobStore:
+    """Upload job table in its own SQLite file
+
+    Ingestion takes the main database's write lock for every chunk, so job
+    progress lives in a separate small database that stays writable (and
+    readable by every worker process) while an upload is running.
+    """
+
+    PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000}
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_connection_pool(db_path, max_idle=4, pragmas=self.PRAGMAS)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._pool.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS upload_jobs (
+                    id TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    spool_token TEXT NOT NULL,
+                    filename TEXT,
+                    user_readable_name TEXT NOT NULL,
+                    comment TEXT,
+                    expected_type TEXT,
+                    force INTEGER DEFAULT 0,  -- re-ingest a file uploaded before (admins)
+                    status TEXT NOT NULL DEFAULT 'queued',  -- queued, running, completed, failed, cancelled
+                    progress REAL DEFAULT 0,  -- percent
+                    rows_processed INTEGER DEFAULT 0,
+                    total_rows INTEGER,
+                    message TEXT,
+                    result TEXT,  -- JSON result of the finished upload
+                    upload_id INTEGER,
+                    attempts INTEGER DEFAULT 0,
+                    cancel_requested INTEGER DEFAULT 0,
+                    worker TEXT,
+                    heartbeat_at REAL,  -- unix time of the last progress report
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            """)
+            # Job databases created before jobs could be forced
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(upload_jobs)")}
+            if "force" not in columns:
+                conn.execute(
+                    "ALTER TABLE upload_jobs ADD COLUMN force INTEGER DEFAULT 0"
+                )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_upload_jobs_status ON upload_jobs(status, created_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_upload_jobs_user ON upload_jobs(user_id, created_at)"
+            )
+
+    def create_job(
+        self,
+        user_id: int,
+        spool_token: str,
+        filename: str,
+        user_readable_name: str,
+        comment: str = None,
+        expected_type: str = None,
+        total_rows: int = None,
+        force: bool = False,
+    ) -> str:
+        """
+        Queue a job for a spooled upload
+
+        Returns:
+            str: The new job ID
+        """
+        job_id = uuid.uuid4().hex
+        with self._pool.connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO upload_jobs
+                    (id, user_id, spool_token, filename, user_readable_name, comment,
+                     expected_type, total_rows, force)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    job_id,
+                    user_id,
+                    spool_token,
+                    filename,
+                    user_readable_name,
+                    comment,
+                    expected_type,
+                    total_rows,
+                    int(force),
+                ),
+            )
+        return job_id
+
+    def claim_next_job(
+        self, worker: str, stale_after: float, max_attempts: int
+    ) -> Optional[Dict]:
+        """
+        Atomically take the oldest queued job, or a running job whose worker stopped reporting
+
+        Nothing is claimed while another job is running with a fresh heartbeat,
+        so only one ingest at a time contends for the main database's write
+        lock, however many worker processes poll this table.
+
+        Args:
+            worker (str): Identifier of the claiming worker
+            stale_after (float): Seconds without a heartbeat before a running job is reclaimed
+            max_attempts (int): Interrupted jobs that already ran this often are failed instead
+
+        Returns:
+            Optional[Dict]: The claimed job, or None if there is nothing to do
+        """
+        now = time.time()
+        with self._pool.connection() as conn:
+            conn.row_factory = _dict_row
+            # Jobs whose worker died: give up on repeat offenders, honour pending cancels
+            conn.execute(
+                """
+                UPDATE upload_jobs
+                SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'failed' END,
+                    message = CASE WHEN cancel_requested THEN 'Upload cancelled'
+                                   ELSE 'Upload was interrupted too many times' END,
+                    finished_at = CURRENT_TIMESTAMP
+                WHERE status = 'running' AND heartbeat_at < ?
+                  AND (cancel_requested OR attempts >= ?)
+            """,
+                (now - stale_after, max_attempts),
+            )
+            claimed = conn.execute(
+                """
+                UPDATE upload_jobs
+                SET status = 'running', worker = ?, heartbeat_at = ?,
+                    attempts = attempts + 1,
+                    started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+                WHERE id = (
+                    SELECT id FROM upload_jobs
+                    WHERE (status = 'queued'
+                           OR (status = 'running' AND heartbeat_at < ?))
+                      AND NOT EXISTS (
+                          SELECT 1 FROM upload_jobs
+                          WHERE status = 'running' AND heartbeat_at >= ?
+                      )
+                    ORDER BY created_at, rowid
+                    LIMIT 1
+                )
+                RETURNING *
+            """,
+                (worker, now, now - stale_after, now - stale_after),
+            ).fetchall()
+        return claimed[0] if claimed else None
+
+    def report_progress(
+        self, job_id: str, rows_processed: int, upload_id: int = None
+    ) -> bool:
+        """
+        Record progress (and a heartbeat) for a running job
+
+        Returns:
+            bool: True if the user has asked for the job to be cancelled
+        """
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                """
+                UPDATE upload_jobs
+                SET rows_processed = ?,
+                    progress = CASE WHEN total_rows > 0
+                                    THEN MIN(99.0, 100.0 * ? / total_rows) ELSE progress END,
+                    upload_id = COALESCE(?, upload_id),
+                    heartbeat_at = ?
+                WHERE id = ?
+                RETURNING cancel_requested
+            """,
+                (rows_processed, rows_processed, upload_id, time.time(), job_id),
+            ).fetchall()
+        return bool(rows and rows[0][0])
+
+    def heartbeat(self, job_id: str):
+        """Mark a running job as alive without changing its progress"""
+        with self._pool.connection() as conn:
+            conn.execute(
+                "UPDATE upload_jobs SET heartbeat_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                (time.time(), job_id),
+            )
+
+    def finish_job(
+        self, job_id: str, status: str, message: str, result: Dict = None
+    ) -> None:
+        """Mark a job completed, failed or cancelled"""
+        with self._pool.connection() as conn:
+            conn.execute(
+                """
+                UPDATE upload_jobs
+                SET status = ?, message = ?, result = ?,
+                    progress = CASE WHEN ? = 'completed' THEN 100 ELSE progress END,
+                    finished_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                (
+                    status,
+                    message,
+                    json.dumps(result) if result is not None else None,
+                    status,
+                    job_id,
+                ),
+            )
+
+    def request_cancel(self, job_id: str, user_id: int) -> bool:
+        """
+        Cancel a job: queued jobs stop immediately, running jobs at their next chunk
+
+        Returns:
+            bool: True if the job was found (and owned by user_id) and not already finished
+        """
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE upload_jobs
+                SET cancel_requested = 1,
+                    status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                    message = CASE WHEN status = 'queued' THEN 'Upload cancelled' ELSE message END,
+                    finished_at = CASE WHEN status = 'queued' THEN CURRENT_TIMESTAMP
+                                       ELSE finished_at END
+                WHERE id = ? AND user_id = ? AND status IN ('queued', 'running')
+            """,
+                (job_id, user_id),
+            )
+            return cursor.rowcount > 0
+
+    def get_job(self, job_id: str, user_id: int = None) -> Optional[Dict]:
+        """
+        Get a job by ID, optionally only if it belongs to user_id
+
+        Returns:
+            Optional[Dict]: Job row with 'result' decoded, or None if not found
+        """
+        with self._pool.connection() as conn:
+            conn.row_factory = _dict_row
+            job = conn.execute(
+                "SELECT * FROM upload_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+
+        if not job or (user_id is not None and str(job["user_id"]) != str(user_id)):
+            return None
+        if job["result"]:
+            job["result"] = json.loads(job["result"])
+        return job
+
+
+def _dict_row(cursor, row) -> Dict:
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+class UploadJobRunner:
+    """Pool of worker threads processing queued upload jobs
+
+    Jobs are claimed from the shared job table, so any worker process can run
+    any job, and a job left 'running' by a worker that died is picked up again
+    once its heartbeat goes stale. An interrupted upload was never published,
+    so its committed chunks are deleted and it is re-run from the spooled file.
+    Only one job runs at a time across all processes (see claim_next_job).
+    """
+
+    WORKERS = 1
+    POLL_SECONDS = 1.0
+    # A timer thread heartbeats for the whole of run_job, including the
+    # search indexing and commit after the last chunk; a silent job's worker is gone
+    HEARTBEAT_SECONDS = 15
+    STALE_SECONDS = 120
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, service=None, store: UploadJobStore = None, workers: int = None):
+        self.service = service or upload_service
+        self._store = store
+        self.workers = workers or self.WORKERS
+        self.worker_name = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._threads = []
+        self._pid = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> UploadJobStore:
+        """Job store for the service's database, created on first use"""
+        if self._store is None:
+            self._store = UploadJobStore(jobs_db_path(self.service.db.db_path))
+        return self._store
+
+    def start(self):
+        """Start the worker threads in this process (again after a fork)"""
+        with self._lock:
+            if self._pid == os.getpid() and any(t.is_alive() for t in self._threads):
+                return
+            self._pid = os.getpid()
+            self.worker_name = f"{socket.gethostname()}:{self._pid}"
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(
+                    target=self._worker_loop, name=f"upload-job-{i}", daemon=True
+                )
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker threads after their current job"""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(
+        self,
+        token: str,
+        user_readable_name: str,
+        comment: str = None,
+        expected_type: str = None,
+        user_id: int = None,
+        force: bool = False,
+    ) -> Dict:
+        """
+        Queue processing of a spooled upload and return immediately
+
+        Args:
+            token (str): Upload token returned by the spool route
+            user_readable_name (str): Human-readable name for the upload
+            comment (str, optional): User comment about the upload
+            expected_type (str, optional): Expected upload type ('forum_data' or 'transcription_data')
+            user_id (int, optional): Uploading user (default: current authenticated user)
+            force (bool, optional): Ingest the file even if the user uploaded it
+                before (honoured for admins only)
+
+        Returns:
+            Dict: success, message and job_id
+        """
+        try:
+            user_id = user_id or get_current_user_id()
+            if not user_id:
+                return {
+                    "success": False,
+                    "message": "Authentication required to upload files",
+                }
+
+            spooled = upload_spool.resolve(token, user_id)
+            if not spooled:
+                return {
+                    "success": False,
+                    "message": "Uploaded file not found or expired - please select the file again",
+                }
+
+            job_id = self.store.create_job(
+                user_id,
+                token,
+                spooled["filename"],
+                user_readable_name,
+                comment=comment,
+                expected_type=expected_type,
+                total_rows=count_data_rows(spooled["path"], spooled["filename"]),
+                force=force,
+            )
+            self.start()
+            self._wake.set()
+            return {"success": True, "message": "Upload queued", "job_id": job_id}
+
+        except Exception as e:
+            print(f"❌ Error queueing upload job: {e}")
+            return {"success": False, "message": f"Error queueing upload: {str(e)}"}
+
+    def get_job(self, job_id: str, user_id: int = None) -> Optional[Dict]:
+        """Job status for the current (or given) user"""
+        # Polling pages also revive workers lost to a fork or restart
+        self.start()
+        return self.store.get_job(job_id, user_id or get_current_user_id())
+
+    def cancel(self, job_id: str, user_id: int = None) -> bool:
+        """Request cancellation of one of the current (or given) user's jobs"""
+        return self.store.request_cancel(job_id, user_id or get_current_user_id())
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim_next_job(
+                    self.worker_name, self.STALE_SECONDS, self.MAX_ATTEMPTS
+                )
+            except Exception as e:
+                print(f"⚠️ Upload job worker could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                self._wake.wait(self.POLL_SECONDS)
+                self._wake.clear()
+                continue
+
+            self.run_job(job)
+
+    def run_job(self, job: Dict):
+        """
+        Process one claimed job and record its outcome, heartbeating throughout
+
+        Args:
+            job (Dict): Row returned by UploadJobStore.claim_next_job
+        """
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(job["id"], stop),
+            name=f"upload-job-heartbeat-{job['id']}",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            self._run_job(job)
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def _heartbeat_loop(self, job_id: str, stop: threading.Event):
+        while not stop.wait(self.HEARTBEAT_SECONDS):
+            try:
+                self.store.heartbeat(job_id)
+            except Exception as e:
+                print(f"⚠️ Upload job {job_id} heartbeat failed: {e}")
+
+    def _run_job(self, job: Dict):
+        store = self.store
+        cancelled = []
+
+        if job["attempts"] > 1 and job["upload_id"]:
+            # A previous attempt died mid-ingest: its unpublished rows are
+            # deleted with the upload record - unless it had in fact published
+            if not self._discard_empty_upload(job["upload_id"], job["user_id"]):
+                store.finish_job(
+                    job["id"], "completed", "Upload completed before a worker restart"
+                )
+                return
+
+        created = []
+
+        def progress(rows_processed, upload_id):
+            # The first call comes as soon as the upload record is created, so
+            # a retry after a crash knows which upload to discard
+            created[:] = [upload_id]
+            if store.report_progress(job["id"], rows_processed, upload_id):
+                cancelled.append(upload_id)
+                raise UploadCancelled("Upload cancelled")
+
+        try:
+            result = self.service.process_spooled_upload(
+                job["spool_token"],
+                job["user_readable_name"],
+                comment=job["comment"],
+                expected_type=job["expected_type"],
+                user_id=job["user_id"],
+                progress_callback=progress,
+                force=bool(job["force"]),
+            )
+        except Exception as e:
+            result = {"success": False, "message": f"Unexpected error: {str(e)}"}
+
+        if cancelled:
+            # The ingest deleted its rows; don't leave an empty upload behind
+            self._discard_empty_upload(cancelled[0], job["user_id"])
+            store.finish_job(job["id"], "cancelled", "Upload cancelled")
+        elif result["success"]:
+            store.finish_job(job["id"], "completed", result["message"], result)
+        else:
+            if created:
+                self._discard_empty_upload(created[0], job["user_id"])
+            store.finish_job(job["id"], "failed", result["message"], result)
+
+    def _discard_empty_upload(self, upload_id: int, user_id: int) -> bool:
+        """Delete an upload that was never published; False if it has data"""
+        upload = self.service.db.get_upload_by_id(upload_id)
+        if upload and upload.get("records_count"):
+            return False
+        if upload:
+            self.service.db.delete_upload_and_data(upload_id, user_id)
+        return True
+
+
+# Global instance used by the upload callbacks
+upload_job_runner = UploadJobRunner()
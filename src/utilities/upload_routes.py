@@ -0,0 +1,91 @@
+"""
+Upload Routes
+Flask endpoint that streams multipart uploads to the upload spool
+"""
+
+import os
+
+from .auth import get_current_user_id
+from .upload_spool import upload_spool
+
+# Largest request body /api/uploads accepts before answering 413
+MAX_UPLOAD_BYTES = int(os.environ.get("MRPC_MAX_UPLOAD_BYTES", 512 * 1024 * 1024))
+
+
+def register_upload_routes(app):
+    """Register the file upload endpoint on the Dash app's Flask server"""
+
+    @app.server.route("/api/uploads", methods=["POST"])
+    def spool_upload():
+        """
+        Accept a multipart upload (field 'file') and spool it to disk
+
+        The body is parsed straight into a file in the spool directory, so the
+        upload is written once and never held in memory or sent back through
+        a Dash callback. Callbacks reference it by the returned token. Bodies
+        over MAX_UPLOAD_BYTES are refused with 413.
+        """
+        from flask import jsonify, request
+        from werkzeug.exceptions import RequestEntityTooLarge
+        from werkzeug.formparser import parse_form_data
+
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify(
+                {"success": False, "message": "Authentication required to upload files"}
+            ), 401
+
+        limit_mb = MAX_UPLOAD_BYTES // (1024 * 1024)
+        too_large = (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"File is too large to upload (limit {limit_mb} MB)",
+                }
+            ),
+            413,
+        )
+        if (request.content_length or 0) > MAX_UPLOAD_BYTES:
+            return too_large
+
+        incoming = []
+
+        def stream_factory(
+            total_content_length, content_type, filename, content_length=None
+        ):
+            handle = upload_spool.incoming_file()
+            incoming.append(handle)
+            return handle
+
+        try:
+            _, _, files = parse_form_data(
+                request.environ,
+                stream_factory=stream_factory,
+                max_content_length=MAX_UPLOAD_BYTES,
+            )
+            upload = files.get("file")
+            if upload is None or not upload.filename:
+                return jsonify(
+                    {"success": False, "message": "No file in upload request"}
+                ), 400
+
+            upload.stream.close()
+            result = upload_spool.register(upload.stream.name, upload.filename, user_id)
+            upload_spool.purge_expired()
+            return jsonify({"success": True, **result})
+
+        except RequestEntityTooLarge:
+            return too_large
+
+        except Exception as e:
+            print(f"❌ Error spooling upload: {e}")
+            return jsonify(
+                {"success": False, "message": f"Error receiving file: {str(e)}"}
+            ), 500
+
+        finally:
+            # Anything not registered under a token (extra parts, failed requests)
+            for handle in incoming:
+                handle.close()
+                if os.path.exists(handle.name):
+                    os.remove(handle.name)
@@ -6,28 +6,107 @@ Handles CSV file uploads with authentication and validation
 import pandas as pd
 import io
 import base64
-from typing import Dict, List, Tuple
+import hashlib
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .arrow_upload import arrow_format, count_rows, iter_record_batches, read_head
+from .arrow_upload import to_frame as arrow_to_frame
 from .mrpc_database import MRPCDatabase
-from .auth import get_current_user_id
+from .auth import get_current_user_id, is_admin
+from .upload_spool import upload_spool
+
+
+class _Base64Reader(io.RawIOBase):
+    """Raw stream that decodes a base64 string one block at a time"""
+
+    # Multiple of 4 so every block decodes on its own
+    BLOCK_CHARS = 4 * 16384
+
+    def __init__(self, encoded: str):
+        self._encoded = encoded
+        self._position = 0
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and self._position < len(self._encoded):
+            block = self._encoded[self._position : self._position + self.BLOCK_CHARS]
+            self._position += len(block)
+            self._pending = base64.b64decode(block)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def count_csv_rows(stream) -> int:
+    """
+    Estimate CSV data rows by counting newlines (quoted multi-line fields overcount)
+
+    Args:
+        stream: Binary file object, read in 1MB blocks
+
+    Returns:
+        int: Lines after the header, counting an unterminated last line
+    """
+    lines = 0
+    last = b"\n"
+    for block in iter(lambda: stream.read(1 << 20), b""):
+        lines += block.count(b"\n")
+        last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def file_sha256(stream) -> str:
+    """Hex SHA-256 of a binary stream, read in 1MB blocks"""
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(1 << 20), b""):
+        digest.update(block)
+    return digest.hexdigest()
 
 
 class UploadService:
     """Service class for handling CSV uploads with authentication"""
 
+    # Rows parsed, validated and inserted at a time when streaming a forum upload
+    CSV_CHUNK_ROWS = 5000
+
+    # Rows parsed from the head of a file to validate it and detect its type
+    # when previewing; the whole file is still validated when it is uploaded
+    PREVIEW_SAMPLE_ROWS = 1000
+
+    # What to do with forum posts whose body nearly matches one the uploader
+    # already has (see MRPCDatabase.NEAR_DUPLICATE_MODES)
+    NEAR_DUPLICATE_MODE = "flag"
+
     def __init__(self):
         self.db = MRPCDatabase()
 
-    def validate_csv_structure(self, df: pd.DataFrame) -> Tuple[bool, List[str]]:
+    @staticmethod
+    def _column_names(data) -> List[str]:
+        """Column names of a DataFrame or a pyarrow Table/RecordBatch"""
+        names = getattr(data, "column_names", None)
+        return list(names) if names is not None else list(data.columns)
+
+    def validate_csv_structure(self, df) -> Tuple[bool, List[str]]:
         """
         Validate that CSV has required columns and structure
 
+        Only column names and the row count are checked, so Arrow data is
+        validated from its schema without converting it to pandas.
+
         Args:
-            df (pd.DataFrame): DataFrame to validate
+            df (pd.DataFrame | pa.Table | pa.RecordBatch): Data to validate
 
         Returns:
             Tuple[bool, List[str]]: (is_valid, list_of_errors)
         """
         errors = []
+        columns = self._column_names(df)
 
         # Required columns for forum data (id column is always missing and will be auto-generated)
         # Note: llm_cluster_name, date_posted may also be missing and will be set to None
@@ -42,18 +121,17 @@ class UploadService:
         }
 
         # Check for required columns
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in required_columns if col not in columns]
         if missing_columns:
             errors.append(f"Missing required columns: {', '.join(missing_columns)}")
 
         # Check if expected columns are present (with mappings)
         has_inference_question = any(
-            col in df.columns
-            for col in ["LLM_inferred_question", "llm_inferred_question"]
+            col in columns for col in ["LLM_inferred_question", "llm_inferred_question"]
         )
         has_umap_coords = all(
-            col in df.columns for col in ["umap_x", "umap_y", "umap_z"]
-        ) or all(col in df.columns for col in ["umap_1", "umap_2", "umap_3"])
+            col in columns for col in ["umap_x", "umap_y", "umap_z"]
+        ) or all(col in columns for col in ["umap_1", "umap_2", "umap_3"])
 
         if not has_inference_question:
             errors.append(
@@ -74,12 +152,12 @@ class UploadService:
 
         return len(errors) == 0, errors
 
-    def detect_upload_type(self, df: pd.DataFrame) -> str:
+    def detect_upload_type(self, df) -> str:
         """
         Detect whether upload is forum data or transcription data based on CSV columns
 
         Args:
-            df (pd.DataFrame): DataFrame to analyze
+            df (pd.DataFrame | pa.Table | pa.RecordBatch): Data to analyze
 
         Returns:
             str: 'forum_data' or 'transcription_data'
@@ -111,14 +189,15 @@ class UploadService:
         ]
 
         # Handle empty dataframes
-        if df.empty:
+        columns = self._column_names(df)
+        if len(df) == 0 or not columns:
             return "unknown"
 
         # Count how many indicator columns are present
         transcription_score = sum(
-            1 for col in transcription_indicators if col in df.columns
+            1 for col in transcription_indicators if col in columns
         )
-        forum_score = sum(1 for col in forum_indicators if col in df.columns)
+        forum_score = sum(1 for col in forum_indicators if col in columns)
 
         # Decision logic: transcription data needs multiple transcription indicators
         # and minimal forum indicators
@@ -241,6 +320,24 @@ class UploadService:
         decoded = base64.b64decode(content_string)
         return pd.read_csv(io.StringIO(decoded.decode("utf-8")))
 
+    def _open_csv_stream(self, contents: str) -> io.TextIOWrapper:
+        """
+        Open base64 encoded upload contents as a text stream, decoded lazily
+
+        Avoids holding the decoded bytes and a decoded copy of the text in
+        memory alongside the base64 string.
+
+        Args:
+            contents (str): Base64 encoded file contents (data URL)
+
+        Returns:
+            io.TextIOWrapper: UTF-8 text stream over the decoded file
+        """
+        content_type, content_string = contents.split(",", 1)
+        return io.TextIOWrapper(
+            io.BufferedReader(_Base64Reader(content_string)), encoding="utf-8"
+        )
+
     def process_file_upload(
         self,
         contents: str,
@@ -248,16 +345,21 @@ class UploadService:
         user_readable_name: str,
         comment: str = None,
         expected_type: str = None,
+        force: bool = False,
     ) -> Dict:
         """
         Process an uploaded CSV file
 
+        A file the user has already uploaded (same bytes) is not parsed again;
+        see _find_identical_upload.
+
         Args:
             contents (str): Base64 encoded file contents
             filename (str): Original filename
             user_readable_name (str): Human-readable name for the upload
             comment (str, optional): User comment about the upload
             expected_type (str, optional): Expected upload type ('forum_data' or 'transcription_data')
+            force (bool, optional): Ingest an identical file again (admins only)
 
         Returns:
             Dict: Result with success status, message, and optional upload_id
@@ -271,106 +373,521 @@ class UploadService:
                     "message": "Authentication required to upload files",
                 }
 
-            # Decode file contents
-            content_type, content_string = contents.split(",")
-            decoded = base64.b64decode(content_string)
+            force = force and is_admin(user_id)
+            content_type, content_string = contents.split(",", 1)
+            content_sha256 = file_sha256(
+                io.BufferedReader(_Base64Reader(content_string), 1 << 20)
+            )
+            identical = self._find_identical_upload(
+                content_sha256, user_id, expected_type, force
+            )
+            if identical:
+                return identical
+
+            return self.process_csv_stream(
+                self._open_csv_stream(contents),
+                filename,
+                user_readable_name,
+                user_id,
+                comment=comment,
+                expected_type=expected_type,
+                content_sha256=content_sha256,
+                skip_duplicates=not force,
+            )
+
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error during upload: {str(e)}",
+            }
 
-            # Read CSV data
-            try:
-                df = pd.read_csv(io.StringIO(decoded.decode("utf-8")))
-            except Exception as e:
+    def process_spooled_upload(
+        self,
+        token: str,
+        user_readable_name: str,
+        comment: str = None,
+        expected_type: str = None,
+        user_id: int = None,
+        progress_callback: Callable[[int, int], None] = None,
+        force: bool = False,
+    ) -> Dict:
+        """
+        Process a file previously spooled to disk by the /api/uploads route
+
+        The spooled file is removed once it has been stored; a failed upload
+        keeps it so the user can fix the form (e.g. the data type) and retry.
+        A file the user has already uploaded (same bytes) is not parsed again;
+        see _find_identical_upload.
+
+        Args:
+            token (str): Upload token returned by the spool route
+            user_readable_name (str): Human-readable name for the upload
+            comment (str, optional): User comment about the upload
+            expected_type (str, optional): Expected upload type ('forum_data' or 'transcription_data')
+            user_id (int, optional): Uploading user (default: current authenticated user)
+            progress_callback (callable, optional): Passed through to process_csv_stream
+                (or process_arrow_upload for .parquet/.arrow/.feather files)
+            force (bool, optional): Ingest an identical file again (admins only)
+
+        Returns:
+            Dict: Result with success status, message, and optional upload_id
+        """
+        try:
+            user_id = user_id or get_current_user_id()
+            if not user_id:
                 return {
                     "success": False,
-                    "message": f"Error reading CSV file: {str(e)}",
+                    "message": "Authentication required to upload files",
                 }
 
-            # Determine upload type - use expected_type if provided, otherwise auto-detect
-            if expected_type:
-                upload_type = expected_type
-                # Verify the expected type matches the data
-                detected_type = self.detect_upload_type(df)
-                if detected_type != expected_type:
-                    return {
-                        "success": False,
-                        "message": f"Data type mismatch: Selected '{expected_type.replace('_', ' ').title()}' but data appears to be '{detected_type.replace('_', ' ').title()}'. Please check your file or change the data type selection.",
-                    }
-            else:
-                # Fallback to auto-detection for backward compatibility
-                upload_type = self.detect_upload_type(df)
+            spooled = upload_spool.resolve(token, user_id)
+            if not spooled:
+                return {
+                    "success": False,
+                    "message": "Uploaded file not found or expired - please select the file again",
+                }
 
-            # Validate CSV structure based on determined type
-            if upload_type == "transcription_data":
-                is_valid, errors = self.validate_transcription_csv(df)
+            force = force and is_admin(user_id)
+            with open(spooled["path"], "rb") as f:
+                content_sha256 = file_sha256(f)
+            identical = self._find_identical_upload(
+                content_sha256, user_id, expected_type, force
+            )
+            if identical:
+                upload_spool.discard(token)
+                return identical
+
+            file_format = arrow_format(spooled["filename"])
+            if file_format:
+                result = self.process_arrow_upload(
+                    spooled["path"],
+                    file_format,
+                    spooled["filename"],
+                    user_readable_name,
+                    user_id,
+                    comment=comment,
+                    expected_type=expected_type,
+                    progress_callback=progress_callback,
+                    content_sha256=content_sha256,
+                    skip_duplicates=not force,
+                )
             else:
-                is_valid, errors = self.validate_csv_structure(df)
-
-            if not is_valid:
-                error_details = []
-                if upload_type == "transcription_data":
-                    error_details.append("❌ Transcription Data Validation Failed")
-                    error_details.append(
-                        "Required: ALL 15 experimental fields must be present and properly formatted"
-                    )
-                    error_details.append("Validation Errors:")
-                    error_details.extend([f"  • {error}" for error in errors])
-                    error_details.append(
-                        "\nTip: Check the Data Type Selection guide above for field requirements"
+                with open(spooled["path"], encoding="utf-8") as source:
+                    result = self.process_csv_stream(
+                        source,
+                        spooled["filename"],
+                        user_readable_name,
+                        user_id,
+                        comment=comment,
+                        expected_type=expected_type,
+                        progress_callback=progress_callback,
+                        content_sha256=content_sha256,
+                        skip_duplicates=not force,
                     )
-                else:
-                    error_details.append("❌ Forum Data Validation Failed")
-                    error_details.extend([f"  • {error}" for error in errors])
 
+            if result["success"]:
+                upload_spool.discard(token)
+            return result
+
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error during upload: {str(e)}",
+            }
+
+    def process_csv_stream(
+        self,
+        source,
+        filename: str,
+        user_readable_name: str,
+        user_id: int,
+        comment: str = None,
+        expected_type: str = None,
+        chunksize: int = None,
+        progress_callback: Callable[[int, int], None] = None,
+        near_duplicates: str = None,
+        content_sha256: str = None,
+        skip_duplicates: bool = True,
+    ) -> Dict:
+        """
+        Parse, validate and store a CSV upload chunk by chunk
+
+        Forum data is read with read_csv(chunksize=...), each chunk is
+        validated and committed on its own while the upload stays hidden as
+        'processing', so peak memory is bounded by the chunk size rather than
+        the file size. A chunk that fails validation or parsing deletes the
+        rows already stored.
+        Transcription uploads are small and are still validated as a whole.
+
+        Args:
+            source: CSV path or text file object
+            filename (str): Original filename
+            user_readable_name (str): Human-readable name for the upload
+            user_id (int): Authenticated uploading user
+            comment (str, optional): User comment about the upload
+            expected_type (str, optional): Expected upload type ('forum_data' or 'transcription_data')
+            chunksize (int, optional): Rows per chunk (defaults to CSV_CHUNK_ROWS)
+            progress_callback (callable, optional): Called as (rows_processed, upload_id)
+                once the upload record exists and after each stored chunk;
+                raising from it aborts the upload and deletes what was stored
+            near_duplicates (str, optional): 'off', 'flag' or 'skip' for near-duplicate
+                posts (defaults to NEAR_DUPLICATE_MODE)
+            content_sha256 (str, optional): Hex SHA-256 of the raw file, stored on
+                the upload record
+            skip_duplicates (bool, optional): False to insert rows the user
+                already has (a forced re-ingest)
+
+        Returns:
+            Dict: Result with success status, message, and optional upload_id
+        """
+        # Read CSV data
+        try:
+            reader = pd.read_csv(source, chunksize=chunksize or self.CSV_CHUNK_ROWS)
+            first_chunk = next(reader, None)
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Error reading CSV file: {str(e)}",
+            }
+        if first_chunk is None:
+            first_chunk = pd.DataFrame()
+
+        return self._store_chunks(
+            first_chunk,
+            reader,
+            filename,
+            user_readable_name,
+            user_id,
+            comment=comment,
+            expected_type=expected_type,
+            progress_callback=progress_callback,
+            near_duplicates=near_duplicates,
+            content_sha256=content_sha256,
+            skip_duplicates=skip_duplicates,
+        )
+
+    def process_arrow_upload(
+        self,
+        path: str,
+        file_format: str,
+        filename: str,
+        user_readable_name: str,
+        user_id: int,
+        comment: str = None,
+        expected_type: str = None,
+        chunksize: int = None,
+        progress_callback: Callable[[int, int], None] = None,
+        near_duplicates: str = None,
+        content_sha256: str = None,
+        skip_duplicates: bool = True,
+    ) -> Dict:
+        """
+        Validate and store a Parquet or Arrow IPC (Feather) upload batch by batch
+
+        Type detection and forum validation read the Arrow schema, so a batch
+        is only converted to pandas once it is about to be inserted. Typed
+        columns (umap_* floats, timestamps) are stored without a round trip
+        through CSV text.
+
+        Args:
+            path (str): File on disk
+            file_format (str): 'parquet' or 'ipc' (see arrow_upload.arrow_format)
+            filename (str): Original filename
+            user_readable_name (str): Human-readable name for the upload
+            user_id (int): Authenticated uploading user
+            comment (str, optional): User comment about the upload
+            expected_type (str, optional): Expected upload type ('forum_data' or 'transcription_data')
+            chunksize (int, optional): Rows per record batch (defaults to CSV_CHUNK_ROWS)
+            progress_callback (callable, optional): As for process_csv_stream
+            near_duplicates (str, optional): As for process_csv_stream
+            content_sha256 (str, optional): As for process_csv_stream
+            skip_duplicates (bool, optional): As for process_csv_stream
+
+        Returns:
+            Dict: Result with success status, message, and optional upload_id
+        """
+        try:
+            batches = iter_record_batches(
+                path, file_format, chunksize or self.CSV_CHUNK_ROWS
+            )
+            first_batch = next(batches, None)
+            if first_batch is None:
+                first_batch = read_head(path, file_format, 0)
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Error reading {file_format.title()} file: {str(e)}",
+            }
+
+        return self._store_chunks(
+            first_batch,
+            batches,
+            filename,
+            user_readable_name,
+            user_id,
+            comment=comment,
+            expected_type=expected_type,
+            progress_callback=progress_callback,
+            near_duplicates=near_duplicates,
+            content_sha256=content_sha256,
+            skip_duplicates=skip_duplicates,
+            to_frame=arrow_to_frame,
+            file_label=f"{file_format.title()} file",
+        )
+
+    def _store_chunks(
+        self,
+        first_chunk,
+        reader,
+        filename: str,
+        user_readable_name: str,
+        user_id: int,
+        comment: str = None,
+        expected_type: str = None,
+        progress_callback: Callable[[int, int], None] = None,
+        near_duplicates: str = None,
+        content_sha256: str = None,
+        skip_duplicates: bool = True,
+        to_frame: Callable = None,
+        file_label: str = "CSV file",
+    ) -> Dict:
+        """
+        Detect, validate and store an upload read as a sequence of chunks
+
+        Shared by process_csv_stream and process_arrow_upload; arguments not
+        listed here are as for process_csv_stream.
+
+        Args:
+            first_chunk: First DataFrame chunk or Arrow record batch
+            reader: Iterator over the remaining chunks
+            to_frame (callable, optional): Converts a chunk to a DataFrame for
+                insertion (chunks are DataFrames already when omitted)
+            file_label (str): Name of the file kind used in read error messages
+
+        Returns:
+            Dict: Result with success status, message, and optional upload_id
+        """
+        to_frame = to_frame or (lambda chunk: chunk)
+
+        # Determine upload type - use expected_type if provided, otherwise auto-detect
+        if expected_type:
+            upload_type = expected_type
+            # Verify the expected type matches the data
+            detected_type = self.detect_upload_type(first_chunk)
+            if detected_type != expected_type:
                 return {
                     "success": False,
-                    "message": "\n".join(error_details),
+                    "message": f"Data type mismatch: Selected '{expected_type.replace('_', ' ').title()}' but data appears to be '{detected_type.replace('_', ' ').title()}'. Please check your file or change the data type selection.",
                 }
+        else:
+            # Fallback to auto-detection for backward compatibility
+            upload_type = self.detect_upload_type(first_chunk)
 
-            # Create upload record with determined type
-            upload_id = self.db.create_upload_record(
-                filename=filename,
-                user_readable_name=user_readable_name,
-                uploaded_by=user_id,
-                comment=comment,
-                upload_type=upload_type,
+        if upload_type == "transcription_data":
+            try:
+                df = pd.concat(
+                    [to_frame(chunk) for chunk in (first_chunk, *reader)],
+                    ignore_index=True,
+                )
+            except Exception as e:
+                return {
+                    "success": False,
+                    "message": f"Error reading {file_label}: {str(e)}",
+                }
+            is_valid, errors = self.validate_transcription_csv(df)
+        else:
+            is_valid, errors = self.validate_csv_structure(first_chunk)
+
+        if not is_valid:
+            return {
+                "success": False,
+                "message": self._format_validation_errors(upload_type, errors),
+            }
+
+        # Create upload record with determined type
+        upload_id = self.db.create_upload_record(
+            filename=filename,
+            user_readable_name=user_readable_name,
+            uploaded_by=user_id,
+            comment=comment,
+            upload_type=upload_type,
+            content_sha256=content_sha256,
+        )
+        if progress_callback:
+            # Lets a background job record its upload before any row is stored
+            progress_callback(0, upload_id)
+
+        # Process the data based on upload type
+        if upload_type == "transcription_data":
+            upload_result = self.db.save_transcription_data(df, upload_id)
+        else:
+            chunk_errors = []
+            upload_result = self.db.upload_csv_stream(
+                upload_id,
+                self._validated_chunks(
+                    first_chunk,
+                    reader,
+                    chunk_errors,
+                    progress=(
+                        (lambda rows: progress_callback(rows, upload_id))
+                        if progress_callback
+                        else None
+                    ),
+                    to_frame=to_frame,
+                    file_label=file_label,
+                ),
+                user_id,
+                near_duplicates=near_duplicates or self.NEAR_DUPLICATE_MODE,
+                skip_duplicates=skip_duplicates,
             )
+            if chunk_errors:
+                upload_result["message"] = self._format_validation_errors(
+                    upload_type, chunk_errors
+                )
 
-            # Process the data based on upload type
+        if upload_result["success"]:
             if upload_type == "transcription_data":
-                upload_result = self.db.save_transcription_data(df, upload_id)
-            else:
-                upload_result = self.db.upload_csv_data(upload_id, df, user_id)
-
-            if upload_result["success"]:
-                if upload_type == "transcription_data":
-                    return {
-                        "success": True,
-                        "message": upload_result["message"],
-                        "upload_id": upload_id,
-                        "upload_type": upload_type,
-                        "records_saved": upload_result.get("records_saved", 0),
-                    }
-                else:
-                    return {
-                        "success": True,
-                        "message": upload_result["message"],
-                        "upload_id": upload_id,
-                        "upload_type": upload_type,
-                        "new_records": upload_result["new_records"],
-                        "duplicates_skipped": upload_result["duplicates_skipped"],
-                        "total_processed": upload_result["total_processed"],
-                    }
+                return {
+                    "success": True,
+                    "message": upload_result["message"],
+                    "upload_id": upload_id,
+                    "upload_type": upload_type,
+                    "records_saved": upload_result.get("records_saved", 0),
+                }
             else:
                 return {
-                    "success": False,
+                    "success": True,
                     "message": upload_result["message"],
+                    "upload_id": upload_id,
+                    "upload_type": upload_type,
+                    "new_records": upload_result["new_records"],
+                    "duplicates_skipped": upload_result["duplicates_skipped"],
+                    "near_duplicates": upload_result["near_duplicates"],
+                    "total_processed": upload_result["total_processed"],
                 }
-
-        except Exception as e:
+        else:
+            # A failed ingest must not be mistaken for an earlier upload of the
+            # same file (upload_csv_stream has already removed its own record)
+            if self.db.get_upload_by_id(upload_id):
+                self.db.delete_upload_and_data(upload_id, user_id)
             return {
                 "success": False,
-                "message": f"Unexpected error during upload: {str(e)}",
+                "message": upload_result["message"],
             }
 
+    def _find_identical_upload(
+        self, content_sha256: str, user_id: int, expected_type: str, force: bool
+    ) -> Optional[Dict]:
+        """
+        Result for a file the user has already uploaded, without parsing it
+
+        Every row of an identical file would be skipped as a duplicate, so the
+        earlier upload is reported instead. Admins can pass force to ingest it
+        again (e.g. after changing the ingest code); callers drop force for
+        other users and store a forced file with skip_duplicates=False.
+
+        Args:
+            content_sha256 (str): Hex SHA-256 of the raw file
+            user_id (int): Uploading user
+            expected_type (str): Selected upload type, or None to match any type
+            force (bool): Re-ingest even if the file was uploaded before
+
+        Returns:
+            Optional[Dict]: Successful "already uploaded" result, or None to
+                process the file
+        """
+        if force:
+            return None
+
+        existing = self.db.find_upload_by_content(
+            content_sha256, user_id, expected_type
+        )
+        if not existing:
+            return None
+
+        archived = " (archived)" if existing["status"] == "archived" else ""
+        return {
+            "success": True,
+            "message": f"This file was already uploaded as '{existing['user_readable_name']}'{archived} on {existing['upload_date']} - nothing new to process",
+            "upload_id": existing["id"],
+            "upload_type": existing["upload_type"],
+            "already_uploaded": True,
+            "new_records": 0,
+            "duplicates_skipped": existing["records_count"] or 0,
+            "total_processed": 0,
+        }
+
+    def _validated_chunks(
+        self,
+        first_chunk: pd.DataFrame,
+        reader,
+        errors: List[str],
+        progress: Callable[[int], None] = None,
+        to_frame: Callable = None,
+        file_label: str = "CSV file",
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield forum chunks after validating each one
+
+        Parse or validation problems are appended to errors and raised, which
+        makes the database roll back the chunks already inserted.
+
+        Args:
+            first_chunk: Chunk already read (and validated) for type detection
+            reader: Remaining read_csv chunk (or Arrow record batch) iterator
+            errors (List[str]): Collects the problems that stopped the upload
+            progress (callable, optional): Called with the rows stored so far once
+                the consumer has inserted each chunk
+            to_frame (callable, optional): Converts a validated chunk to a DataFrame
+            file_label (str): Name of the file kind used in read error messages
+        """
+        to_frame = to_frame or (lambda chunk: chunk)
+        yield to_frame(first_chunk)
+        start_row = len(first_chunk)
+        if progress:
+            progress(start_row)
+
+        while True:
+            try:
+                chunk = next(reader, None)
+            except Exception as e:
+                errors.append(f"Error reading {file_label} after row {start_row}: {e}")
+                raise ValueError(errors[-1])
+            if chunk is None:
+                return
+
+            is_valid, chunk_errors = self.validate_csv_structure(chunk)
+            if not is_valid:
+                errors.extend(
+                    f"Rows {start_row + 1}-{start_row + len(chunk)}: {error}"
+                    for error in chunk_errors
+                )
+                raise ValueError(errors[-1])
+
+            yield to_frame(chunk)
+            start_row += len(chunk)
+            if progress:
+                progress(start_row)
+
+    def _format_validation_errors(self, upload_type: str, errors: List[str]) -> str:
+        """Build the user-facing validation failure message for an upload type"""
+        error_details = []
+        if upload_type == "transcription_data":
+            error_details.append("❌ Transcription Data Validation Failed")
+            error_details.append(
+                "Required: ALL 15 experimental fields must be present and properly formatted"
+            )
+            error_details.append("Validation Errors:")
+            error_details.extend([f"  • {error}" for error in errors])
+            error_details.append(
+                "\nTip: Check the Data Type Selection guide above for field requirements"
+            )
+        else:
+            error_details.append("❌ Forum Data Validation Failed")
+            error_details.extend([f"  • {error}" for error in errors])
+
+        return "\n".join(error_details)
+
     def get_user_uploads(
         self, status: str = None, upload_type: str = None
     ) -> List[Dict]:
@@ -595,10 +1112,114 @@ class UploadService:
         """
         return self.db.get_upload_statistics()
 
+    def preview_spooled_upload(self, token: str, rows: int = 5) -> Dict:
+        """
+        Preview a file spooled by the /api/uploads route without saving
+
+        Only the head of the file is parsed; the row count comes from a
+        newline scan (or the Parquet/Arrow metadata).
+
+        Args:
+            token (str): Upload token returned by the spool route
+            rows (int): Number of rows to preview
+
+        Returns:
+            Dict: Preview data, validation results, filename and detected_type
+        """
+        try:
+            spooled = upload_spool.resolve(token, get_current_user_id())
+            if not spooled:
+                return {
+                    "success": False,
+                    "message": "Uploaded file not found or expired",
+                }
+
+            file_format = arrow_format(spooled["filename"])
+            try:
+                if file_format:
+                    sample = arrow_to_frame(
+                        read_head(
+                            spooled["path"], file_format, self.PREVIEW_SAMPLE_ROWS
+                        )
+                    )
+                else:
+                    sample = pd.read_csv(
+                        spooled["path"], nrows=self.PREVIEW_SAMPLE_ROWS
+                    )
+            except Exception as e:
+                file_label = file_format.title() if file_format else "CSV"
+                return {
+                    "success": False,
+                    "message": f"Error reading {file_label} file: {str(e)}",
+                }
+
+            total_rows = self.count_upload_rows(spooled["path"], spooled["filename"])
+
+            return {
+                **self._build_preview(sample, rows, total_rows),
+                "filename": spooled["filename"],
+            }
+
+        except Exception as e:
+            return {"success": False, "message": f"Error previewing CSV: {str(e)}"}
+
+    @staticmethod
+    def count_upload_rows(path: str, filename: str) -> int:
+        """
+        Data rows of a spooled upload
+
+        Parquet and Arrow files report their row count in metadata; CSV rows
+        are estimated from newlines (quoted multi-line fields overcount).
+
+        Args:
+            path (str): Spooled file on disk
+            filename (str): Original filename (selects the format)
+
+        Returns:
+            int: Number of data rows
+        """
+        file_format = arrow_format(filename)
+        if file_format:
+            return count_rows(path, file_format)
+        with open(path, "rb") as f:
+            return count_csv_rows(f)
+
+    def _build_preview(self, sample: pd.DataFrame, rows: int, total_rows: int) -> Dict:
+        """
+        Preview payload shared by preview_csv and preview_spooled_upload
+
+        Args:
+            sample (pd.DataFrame): First PREVIEW_SAMPLE_ROWS rows of the file
+            rows (int): Number of rows to preview
+            total_rows (int): Data rows in the whole file
+
+        Returns:
+            Dict: Preview data, validation results and detected_type
+        """
+        # Validate the sample with the validator for its detected type
+        detected_type = self.detect_upload_type(sample)
+        if detected_type == "transcription_data":
+            is_valid, errors = self.validate_transcription_csv(sample)
+        else:
+            is_valid, errors = self.validate_csv_structure(sample)
+
+        return {
+            "success": True,
+            "total_rows": total_rows,
+            "columns": list(sample.columns),
+            "preview_data": sample.head(rows).to_dict("records"),
+            "is_valid": is_valid,
+            "validation_errors": errors if not is_valid else [],
+            "detected_type": detected_type,
+        }
+
     def preview_csv(self, contents: str, rows: int = 5) -> Dict:
         """
         Preview first few rows of uploaded CSV without saving
 
+        Only the head of the file is decoded and parsed; the row count comes
+        from a newline scan over the decoded bytes.
+
         Args:
             contents (str): Base64 encoded file contents
             rows (int): Number of rows to preview
@@ -607,33 +1228,23 @@ class UploadService:
             Dict: Preview data and validation results
         """
         try:
-            # Decode file contents
-            content_type, content_string = contents.split(",")
-            decoded = base64.b64decode(content_string)
+            content_type, content_string = contents.split(",", 1)
 
-            # Read CSV data
+            # Read the head of the CSV data
             try:
-                df = pd.read_csv(io.StringIO(decoded.decode("utf-8")))
+                sample = pd.read_csv(
+                    self._open_csv_stream(contents), nrows=self.PREVIEW_SAMPLE_ROWS
+                )
             except Exception as e:
                 return {
                     "success": False,
                     "message": f"Error reading CSV file: {str(e)}",
                 }
 
-            # Validate structure
-            is_valid, errors = self.validate_csv_structure(df)
-
-            # Get preview data
-            preview_df = df.head(rows)
-
-            return {
-                "success": True,
-                "total_rows": len(df),
-                "columns": list(df.columns),
-                "preview_data": preview_df.to_dict("records"),
-                "is_valid": is_valid,
-                "validation_errors": errors if not is_valid else [],
-            }
+            total_rows = count_csv_rows(
+                io.BufferedReader(_Base64Reader(content_string), 1 << 20)
+            )
+            return self._build_preview(sample, rows, total_rows)
 
         except Exception as e:
             return {"success": False, "message": f"Error previewing CSV: {str(e)}"}
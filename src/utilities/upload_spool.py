@@ -0,0 +1,143 @@
+"""
+Upload Spool for MRPC Data Uploads
+Keeps uploaded files on disk under an opaque token so callbacks never carry file bytes
+"""
+
+import json
+import os
+import re
+import secrets
+import tempfile
+import time
+from typing import Dict, IO, Optional
+
+
+class UploadSpool:
+    """Uploaded files parked on disk until a callback processes them
+
+    Each upload is stored as <token>.upload next to a <token>.json sidecar
+    holding the owner, original filename and size. Keeping the metadata on
+    disk (rather than in a dict) lets any worker process sharing the spool
+    directory resolve a token issued by another.
+    """
+
+    # Spooled files nobody processed are removed after this long
+    MAX_AGE_SECONDS = 24 * 60 * 60
+
+    _TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{32}$")
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or os.environ.get(
+            "MRPC_UPLOAD_SPOOL_DIR",
+            os.path.join(tempfile.gettempdir(), "mrpc_uploads"),
+        )
+
+    def _path(self, token: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{token}{suffix}")
+
+    def incoming_file(self) -> IO[bytes]:
+        """
+        Open a new temporary file in the spool directory for an upload in flight
+
+        Returns:
+            IO[bytes]: Writable binary file; register() takes ownership of it by path
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        return tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix="incoming-", suffix=".part", delete=False
+        )
+
+    def register(self, temp_path: str, filename: str, user_id: int) -> Dict:
+        """
+        Move a fully written incoming file under a new token
+
+        Args:
+            temp_path (str): Path returned by incoming_file()
+            filename (str): Original client filename
+            user_id (int): Uploading user, the only one allowed to resolve the token
+
+        Returns:
+            Dict: token, filename and size of the spooled upload
+        """
+        token = secrets.token_urlsafe(24)
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, self._path(token, ".upload"))
+
+        metadata = {
+            "user_id": user_id,
+            "filename": os.path.basename(filename or "upload.csv"),
+            "size": size,
+            "created": time.time(),
+        }
+        with open(self._path(token, ".json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+        return {"token": token, "filename": metadata["filename"], "size": size}
+
+    def resolve(self, token: str, user_id: int) -> Optional[Dict]:
+        """
+        Look up a spooled upload owned by user_id
+
+        Args:
+            token (str): Token returned when the file was spooled
+            user_id (int): User asking for the file
+
+        Returns:
+            Optional[Dict]: Metadata plus the on-disk 'path', or None if unknown or not theirs
+        """
+        if not token or not self._TOKEN_PATTERN.match(token):
+            return None
+
+        try:
+            with open(self._path(token, ".json"), encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        path = self._path(token, ".upload")
+        if str(metadata.get("user_id")) != str(user_id) or not os.path.exists(path):
+            return None
+
+        return {**metadata, "token": token, "path": path}
+
+    def discard(self, token: str):
+        """Remove a spooled upload and its metadata (missing files are ignored)"""
+        if not token or not self._TOKEN_PATTERN.match(token):
+            return
+        for suffix in (".upload", ".json"):
+            try:
+                os.remove(self._path(token, suffix))
+            except FileNotFoundError:
+                pass
+
+    def purge_expired(self, max_age: float = None) -> int:
+        """
+        Delete spool files older than max_age seconds
+
+        Args:
+            max_age (float, optional): Age limit (defaults to MAX_AGE_SECONDS)
+
+        Returns:
+            int: Number of files removed
+        """
+        cutoff = time.time() - (
+            max_age if max_age is not None else self.MAX_AGE_SECONDS
+        )
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0
+
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+# Global instance shared by the upload route and callbacks
+upload_spool = UploadSpool()
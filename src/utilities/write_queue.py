@@ -0,0 +1,339 @@
+"""
+Single-writer queue for the MRPC SQLite database
+Serializes small writes from many threads and commits them in batched transactions
+"""
+
+import atexit
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .connection_pool import SQLiteConnectionPool
+
+
+class WriteQueue:
+    """Funnel writes for one database file through a single writer thread
+
+    Each submitted job is a callable taking a sqlite3 connection. The writer
+    thread collects whatever jobs arrive within max_delay (up to max_batch),
+    runs them inside one BEGIN IMMEDIATE transaction with a savepoint per job,
+    and commits once - so a burst of feedback clicks costs a single fsync and
+    never competes with other threads for the write lock.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pragmas: Optional[Dict[str, object]] = None,
+        max_batch: int = 64,
+        max_delay: float = 0.002,
+    ):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        # Dedicated connection, kept apart from the reader pool
+        self._pool = SQLiteConnectionPool(db_path, max_idle=1, pragmas=pragmas)
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+        # Connection of the batch being written, only set on the writer thread
+        self._batch_conn = None
+        self.stats = {"jobs": 0, "batches": 0, "failed": 0}
+
+    def _ensure_thread(self):
+        """Start the writer thread on first use"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="mrpc-sqlite-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, job: Callable) -> Future:
+        """
+        Queue a write job
+
+        Args:
+            job: Callable receiving a sqlite3.Connection; its return value is the result
+
+        Returns:
+            Future: Resolves once the batch containing the job has committed
+        """
+        if self._closed:
+            raise RuntimeError("Write queue is closed")
+
+        future = Future()
+        self._jobs.put((job, future))
+        self._ensure_thread()
+        return future
+
+    def execute(self, job: Callable, timeout: Optional[float] = 30.0):
+        """Queue a write job and wait for its committed result (re-raises job errors)
+
+        Called from inside a job, the nested job runs inline on the batch's
+        connection - queueing it would wait on the writer thread itself.
+        """
+        if self.in_writer_thread():
+            return job(self._batch_conn)
+        return self.submit(job).result(timeout=timeout)
+
+    def in_writer_thread(self) -> bool:
+        """True while the current thread is this queue's writer running a batch"""
+        return (
+            self._batch_conn is not None
+            and threading.current_thread() is self._thread
+        )
+
+    def _next_batch(self):
+        """Block for one job, then gather any others that arrive within max_delay"""
+        first = self._jobs.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        while len(batch) < self.max_batch:
+            try:
+                item = self._jobs.get(timeout=self.max_delay)
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown requested - finish this batch first
+                self._jobs.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        """Writer thread main loop"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        """Run a batch of jobs in one transaction and resolve their futures"""
+        results = []
+        conn = None
+        try:
+            conn = self._pool.acquire()
+            conn.execute("BEGIN IMMEDIATE")
+            self._batch_conn = conn
+
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT mrpc_write")
+                try:
+                    result = job(conn)
+                except Exception as e:
+                    # Undo only this job; the rest of the batch still commits
+                    conn.execute("ROLLBACK TO mrpc_write")
+                    conn.execute("RELEASE mrpc_write")
+                    future.set_exception(e)
+                    self.stats["failed"] += 1
+                else:
+                    conn.execute("RELEASE mrpc_write")
+                    results.append((future, result))
+
+            conn.commit()
+        except Exception as e:
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            # The whole transaction is gone - fail every job that hasn't already failed
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+                    self.stats["failed"] += 1
+            results = []
+        finally:
+            self._batch_conn = None
+            if conn is not None:
+                self._pool.release(conn)
+
+        # Only report success once the data is durable
+        for future, result in results:
+            future.set_result(result)
+        # Completed jobs only - failures are counted in stats["failed"]
+        self.stats["jobs"] += len(results)
+        self.stats["batches"] += 1
+
+    def close(self, timeout: float = 5.0):
+        """Drain outstanding jobs, stop the writer thread and close its connection"""
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join(timeout)
+        self._pool.close()
+
+
+class CoalescingBuffer:
+    """Hold small writes for a short window and hand them over as one batch
+
+    Items are passed to flush_fn in arrival order once max_delay has passed
+    since the first pending item, or as soon as max_items are pending.
+    flush_fn is expected to write the whole batch in one transaction, so a
+    burst of clicks becomes one commit instead of one per click. Pending
+    items are not visible to readers until the batch is flushed.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List], object],
+        max_items: int = 100,
+        max_delay: float = 0.25,
+    ):
+        self.flush_fn = flush_fn
+        self.max_items = max_items
+        self.max_delay = max_delay
+
+        self._items: List = []
+        self._lock = threading.Lock()
+        # Serializes flushes so batches are written in the order they were taken
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self.stats = {"items": 0, "flushes": 0, "failed": 0}
+
+    def add(self, item):
+        """Queue an item, flushing right away if the buffer is full"""
+        with self._lock:
+            self._items.append(item)
+            self.stats["items"] += 1
+            full = len(self._items) >= self.max_items
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write every pending item now (re-raises flush_fn errors)
+
+        Returns:
+            int: Number of items flushed
+        """
+        with self._flush_lock:
+            with self._lock:
+                items, self._items = self._items, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not items:
+                return 0
+            try:
+                self.flush_fn(items)
+            except Exception:
+                self.stats["failed"] += len(items)
+                raise
+            self.stats["flushes"] += 1
+            return len(items)
+
+    def _flush_on_timer(self):
+        """Timer thread entry point - there is no caller to raise to"""
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"❌ Error flushing coalesced writes: {e}")
+
+    @property
+    def pending(self) -> int:
+        """Number of items waiting to be flushed"""
+        with self._lock:
+            return len(self._items)
+
+
+_queues: Dict[str, WriteQueue] = {}
+_queues_lock = threading.Lock()
+_queues_pid = os.getpid()
+
+
+def get_write_queue(db_path: str, **queue_options) -> WriteQueue:
+    """
+    Get the shared write queue for a database file in the current process
+
+    Args:
+        db_path (str): Path to the SQLite database file
+        **queue_options: Options passed to WriteQueue when the queue is first created
+
+    Returns:
+        WriteQueue: The writer for this database in this process
+    """
+    global _queues_pid
+
+    key = os.path.abspath(db_path)
+    with _queues_lock:
+        if _queues_pid != os.getpid():
+            # Writer threads don't survive fork - start fresh in each worker
+            _queues.clear()
+            _queues_pid = os.getpid()
+
+        write_queue = _queues.get(key)
+        if write_queue is None:
+            write_queue = WriteQueue(db_path, **queue_options)
+            _queues[key] = write_queue
+        return write_queue
+
+
+def close_all_write_queues():
+    """Stop every writer thread in this process (used by tests and shutdown hooks)"""
+    with _queues_lock:
+        for write_queue in _queues.values():
+            write_queue.close()
+        _queues.clear()
+
+
+_buffers: Dict[Tuple[str, str], CoalescingBuffer] = {}
+_buffers_pid = os.getpid()
+
+
+def get_coalescing_buffer(
+    db_path: str, name: str, flush_fn: Callable[[List], object], **buffer_options
+) -> CoalescingBuffer:
+    """
+    Get the shared coalescing buffer for one kind of write to a database file
+
+    Args:
+        db_path (str): Path to the SQLite database file
+        name (str): Kind of write the buffer holds, e.g. "inference_feedback"
+        flush_fn: Writes a batch of items; only used when the buffer is first created
+        **buffer_options: Options passed to CoalescingBuffer when it is first created
+
+    Returns:
+        CoalescingBuffer: The buffer for this database and write kind in this process
+    """
+    global _buffers_pid
+
+    key = (os.path.abspath(db_path), name)
+    with _queues_lock:
+        if _buffers_pid != os.getpid():
+            # Pending items belong to the parent - the child starts empty
+            _buffers.clear()
+            _buffers_pid = os.getpid()
+
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = CoalescingBuffer(flush_fn, **buffer_options)
+            _buffers[key] = buffer
+        return buffer
+
+
+def flush_all_coalescing_buffers():
+    """Write out every pending coalesced item in this process (run at exit)"""
+    with _queues_lock:
+        buffers = list(_buffers.values()) if _buffers_pid == os.getpid() else []
+    for buffer in buffers:
+        try:
+            buffer.flush()
+        except Exception as e:
+            print(f"❌ Error flushing coalesced writes: {e}")
+
+
+atexit.register(flush_all_coalescing_buffers)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Datatable Aggregation Benchmark for MRPC - Test Module
+
+Compares the original 4-way LEFT JOIN datatable query (whose row count grows
+with the product of child rows) against the per-table pre-aggregation used by
+get_all_posts_as_dataframe(datatable_format=True), as users add questions and
+notes to popular titles.
+
+Usage:
+    # Run as pytest
+    pytest tests/benchmarking/test_datatable_aggregation.py -v -s
+
+    # Run standalone
+    python tests/benchmarking/test_datatable_aggregation.py
+"""
+
+import time
+import statistics
+import sys
+import sqlite3
+import tempfile
+import pytest
+import pandas as pd
+from pathlib import Path
+from contextlib import contextmanager
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from utilities.connection_pool import close_all_pools
+from utilities.mrpc_database import MRPCDatabase
+
+
+# The pre-rewrite query, kept here as the baseline for comparison
+FAN_OUT_QUERY = """
+    SELECT
+        MIN(p.id) as id, p.forum, MIN(p.post_type) as post_type,
+        MIN(p.username) as username, MIN(p.llm_cluster_name) as llm_cluster_name,
+        p.original_title, MIN(p.original_post) as original_post,
+        MIN(p.post_url) as post_url, MIN(p.cluster) as cluster,
+        MIN(p.cluster_label) as cluster_label, MIN(p.date_posted) as date_posted,
+        MIN(p.umap_1) as umap_1, MIN(p.umap_2) as umap_2, MIN(p.umap_3) as umap_3,
+        MIN(p.upload_id) as upload_id,
+        (CASE
+            WHEN GROUP_CONCAT(aq.question_text, char(10)) IS NOT NULL
+                 AND GROUP_CONCAT(uq.question_text, char(10)) IS NOT NULL THEN
+                GROUP_CONCAT(aq.question_text, char(10)) || char(10) || GROUP_CONCAT(uq.question_text, char(10))
+            WHEN GROUP_CONCAT(aq.question_text, char(10)) IS NOT NULL THEN
+                GROUP_CONCAT(aq.question_text, char(10))
+            WHEN GROUP_CONCAT(uq.question_text, char(10)) IS NOT NULL THEN
+                GROUP_CONCAT(uq.question_text, char(10))
+            ELSE ''
+        END) as all_questions,
+        (CASE
+            WHEN GROUP_CONCAT(ac.category_value, char(10)) IS NOT NULL
+                 AND GROUP_CONCAT(uc.notes_text, char(10)) IS NOT NULL THEN
+                GROUP_CONCAT(ac.category_value, char(10)) || char(10) || GROUP_CONCAT(uc.notes_text, char(10))
+            WHEN GROUP_CONCAT(ac.category_value, char(10)) IS NOT NULL THEN
+                GROUP_CONCAT(ac.category_value, char(10))
+            WHEN GROUP_CONCAT(uc.notes_text, char(10)) IS NOT NULL THEN
+                GROUP_CONCAT(uc.notes_text, char(10))
+            ELSE ''
+        END) as all_categories
+    FROM posts p
+    INNER JOIN uploads u ON p.upload_id = u.id
+    LEFT JOIN ai_questions aq ON p.post_id = aq.post_id
+    LEFT JOIN ai_categories ac ON p.post_id = ac.post_id
+    LEFT JOIN users_questions uq ON p.post_id = uq.post_id
+    LEFT JOIN users_categories uc ON p.post_id = uc.post_id
+    WHERE u.status = ? AND u.uploaded_by = ?
+    GROUP BY p.original_title ORDER BY MIN(p.date_posted) DESC
+"""
+
+
+def deduplicate_lines(text):
+    """Python-side clean-up the fan-out query depended on"""
+    if not text or pd.isna(text):
+        return ""
+    seen = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if line and line not in seen:
+            seen.append(line)
+    return "\n".join(seen)
+
+
+class DatatableAggregationBenchmark:
+    """Scaling benchmark for the datatable aggregation query"""
+
+    def __init__(
+        self,
+        titles=100,
+        posts_per_title=3,
+        popular_titles=10,
+        annotation_levels=(0, 5, 10, 20),
+        iterations=5,
+    ):
+        self.titles = titles
+        self.posts_per_title = posts_per_title
+        self.popular_titles = popular_titles
+        self.annotation_levels = annotation_levels
+        self.iterations = iterations
+        self.results = {}
+        self.row_counts = {}
+
+    @contextmanager
+    def timer(self, operation_name):
+        """Context manager to time operations"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            duration = (end - start) * 1000  # Convert to milliseconds
+
+            if operation_name not in self.results:
+                self.results[operation_name] = []
+            self.results[operation_name].append(duration)
+
+    def seed_database(self, db_path):
+        """Posts with a few AI questions/categories each, grouped into shared titles"""
+        db = MRPCDatabase(db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO uploads (id, filename, user_readable_name, uploaded_by, status) "
+                "VALUES (1, 'bench.csv', 'Benchmark', '1', 'active')"
+            )
+            conn.executemany(
+                """
+                INSERT INTO posts (id, forum, original_title, post_url, date_posted, upload_id)
+                VALUES (?, 'cervical', ?, ?, '2025-01-01', 1)
+                """,
+                [
+                    (f"bench_{t}_{n}", f"Title {t}", f"http://example.com/{t}/{n}")
+                    for t in range(self.titles)
+                    for n in range(self.posts_per_title)
+                ],
+            )
+            for n in range(3):
+                conn.execute(
+                    "INSERT INTO ai_questions (post_id, question_text) "
+                    "SELECT post_id, 'AI question ' || ? FROM posts",
+                    (n,),
+                )
+                conn.execute(
+                    "INSERT INTO ai_categories (post_id, category_type, category_value) "
+                    "SELECT post_id, 'tag', 'tag ' || ? FROM posts",
+                    (n,),
+                )
+        return db
+
+    def add_annotations(self, db_path, start, end):
+        """Raise every popular post from `start` to `end` user questions and notes"""
+        with sqlite3.connect(db_path) as conn:
+            popular = [f"Title {t}" for t in range(self.popular_titles)]
+            placeholders = ",".join("?" * len(popular))
+            post_ids = [
+                row[0]
+                for row in conn.execute(
+                    f"SELECT post_id FROM posts WHERE original_title IN ({placeholders})",
+                    popular,
+                )
+            ]
+            conn.executemany(
+                "INSERT INTO users_questions (post_id, question_id, question_text) "
+                "VALUES (?, ?, ?)",
+                [
+                    (post_id, f"uq_{i}", f"User question {i}")
+                    for post_id in post_ids
+                    for i in range(start, end)
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO users_categories (post_id, note_id, notes_text) "
+                "VALUES (?, ?, ?)",
+                [
+                    (post_id, f"note_{i}", f"User note {i}")
+                    for post_id in post_ids
+                    for i in range(start, end)
+                ],
+            )
+
+    def run_fan_out_query(self, db_path):
+        """Original query plus the Python de-duplication it needed"""
+        with sqlite3.connect(db_path) as conn:
+            df = pd.read_sql_query(FAN_OUT_QUERY, conn, params=["active", "1"])
+        df["all_questions"] = df["all_questions"].apply(deduplicate_lines)
+        df["all_categories"] = df["all_categories"].apply(deduplicate_lines)
+        return df
+
+    def count_joined_rows(self, db_path):
+        """Rows the fan-out query feeds into GROUP BY vs rows after pre-aggregation"""
+        with sqlite3.connect(db_path) as conn:
+            fan_out = conn.execute("""
+                SELECT COUNT(*) FROM posts p
+                LEFT JOIN ai_questions aq ON p.post_id = aq.post_id
+                LEFT JOIN ai_categories ac ON p.post_id = ac.post_id
+                LEFT JOIN users_questions uq ON p.post_id = uq.post_id
+                LEFT JOIN users_categories uc ON p.post_id = uc.post_id
+            """).fetchone()[0]
+            child_rows = sum(
+                conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in (
+                    "ai_questions",
+                    "ai_categories",
+                    "users_questions",
+                    "users_categories",
+                )
+            )
+        return fan_out, child_rows
+
+    def run_full_benchmark(self):
+        """Benchmark both queries at each annotation level"""
+        print("🚀 Starting Datatable Aggregation Benchmark")
+        print("=" * 70)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = str(Path(temp_dir) / "aggregation.db")
+            db = self.seed_database(db_path)
+            added = 0
+
+            try:
+                for level in self.annotation_levels:
+                    if level > added:
+                        self.add_annotations(db_path, added, level)
+                        added = level
+
+                    print(
+                        f"📊 {level} user questions/notes per popular post "
+                        f"({self.iterations} iterations)..."
+                    )
+                    self.row_counts[level] = self.count_joined_rows(db_path)
+
+                    for _ in range(self.iterations):
+                        with self.timer(f"fan_out_{level}"):
+                            legacy = self.run_fan_out_query(db_path)
+                        with self.timer(f"pre_aggregated_{level}"):
+                            current = db.get_all_posts_as_dataframe(
+                                user_id=1, datatable_format=True
+                            )
+
+                    self.check_equivalent(legacy, current)
+            finally:
+                close_all_pools()
+
+        print("\n Benchmark complete!")
+        self.print_results()
+        return self.results
+
+    @staticmethod
+    def check_equivalent(legacy, current):
+        """Both queries must produce the same aggregated text per title"""
+        legacy = legacy.set_index("original_title").sort_index()
+        current = current.set_index("original_title").sort_index()
+        for column in ("all_questions", "all_categories"):
+            mismatched = (legacy[column] != current[column]).sum()
+            assert mismatched == 0, f"{mismatched} titles differ in {column}"
+
+    def calculate_statistics(self, operation_name):
+        """Calculate comprehensive statistics for an operation"""
+        if operation_name not in self.results:
+            return None
+
+        data = self.results[operation_name]
+        return {
+            "mean": statistics.mean(data),
+            "median": statistics.median(data),
+            "min": min(data),
+            "max": max(data),
+            "stdev": statistics.stdev(data) if len(data) > 1 else 0,
+            "count": len(data),
+        }
+
+    def print_results(self):
+        """Print timings and joined-row counts at each annotation level"""
+        print("\n📈 DATATABLE AGGREGATION RESULTS")
+        print("=" * 70)
+        print(
+            f"{'Annotations':>12} {'Fan-out rows':>13} {'Child rows':>11} "
+            f"{'Fan-out ms':>11} {'Pre-agg ms':>11} {'Speedup':>8}"
+        )
+
+        for level in self.annotation_levels:
+            fan_out = self.calculate_statistics(f"fan_out_{level}")
+            pre_agg = self.calculate_statistics(f"pre_aggregated_{level}")
+            if not (fan_out and pre_agg):
+                continue
+            joined, child_rows = self.row_counts[level]
+            speedup = fan_out["median"] / pre_agg["median"] if pre_agg["median"] else 0
+            print(
+                f"{level:>12} {joined:>13} {child_rows:>11} "
+                f"{fan_out['median']:>11.2f} {pre_agg['median']:>11.2f} {speedup:>7.1f}x"
+            )
+
+
+# Pytest test functions
+class TestDatatableAggregation:
+    """Pytest test class for datatable aggregation benchmarking"""
+
+    def test_datatable_aggregation_quick(self):
+        """Quick run for CI - results match the original query"""
+        benchmark = DatatableAggregationBenchmark(
+            titles=30, popular_titles=5, annotation_levels=(0, 5), iterations=2
+        )
+        results = benchmark.run_full_benchmark()
+
+        assert "pre_aggregated_5" in results
+        assert "fan_out_5" in results
+
+    @pytest.mark.slow
+    def test_datatable_aggregation_comprehensive(self):
+        """Pre-aggregation should win once popular titles carry annotations"""
+        benchmark = DatatableAggregationBenchmark()
+        benchmark.run_full_benchmark()
+
+        top_level = benchmark.annotation_levels[-1]
+        fan_out = benchmark.calculate_statistics(f"fan_out_{top_level}")
+        pre_agg = benchmark.calculate_statistics(f"pre_aggregated_{top_level}")
+        assert pre_agg["median"] < fan_out["median"], (
+            f"Pre-aggregation ({pre_agg['median']:.2f}ms) should beat "
+            f"fan-out ({fan_out['median']:.2f}ms) at {top_level} annotations per post"
+        )
+
+
+def main():
+    """Main function for standalone execution"""
+    print("🎯 MRPC Datatable Aggregation Benchmark")
+    print("=======================================\n")
+
+    benchmark = DatatableAggregationBenchmark()
+    benchmark.run_full_benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Mixed Read/Write Load Benchmark for MRPC - Test Module
+
+Measures read and write latency when datatable reads run concurrently with
+bursts of small feedback/question saves, for each MRPCDatabase storage profile.
+
+Usage:
+    # Run as pytest
+    pytest tests/benchmarking/test_mixed_load.py -v -s
+
+    # Run standalone
+    python tests/benchmarking/test_mixed_load.py
+"""
+
+import time
+import statistics
+import sys
+import sqlite3
+import tempfile
+import threading
+import pytest
+from pathlib import Path
+from contextlib import contextmanager
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from utilities.connection_pool import close_all_pools
+from utilities.mrpc_database import MRPCDatabase
+from utilities.write_queue import close_all_write_queues
+
+
+class MixedLoadBenchmark:
+    """Concurrent reader/writer benchmark across storage profiles"""
+
+    def __init__(
+        self,
+        post_count=500,
+        readers=4,
+        writers=8,
+        reads_per_thread=10,
+        writes_per_thread=25,
+    ):
+        self.post_count = post_count
+        self.readers = readers
+        self.writers = writers
+        self.reads_per_thread = reads_per_thread
+        self.writes_per_thread = writes_per_thread
+        self.results = {}
+        self.failures = {}
+        self._results_lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, operation_name):
+        """Context manager to time operations (thread-safe)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = (time.perf_counter() - start) * 1000  # Convert to milliseconds
+            with self._results_lock:
+                self.results.setdefault(operation_name, []).append(duration)
+
+    def seed_database(self, db_path, profile):
+        """Create a database with one active upload of post_count posts"""
+        db = MRPCDatabase(db_path, storage_profile=profile)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO uploads (id, filename, user_readable_name, uploaded_by, status) "
+                "VALUES (1, 'bench.csv', 'Benchmark', '1', 'active')"
+            )
+            conn.executemany(
+                """
+                INSERT INTO posts (id, forum, original_title, original_post, post_url,
+                                   cluster, date_posted, upload_id)
+                VALUES (?, 'cervical', ?, ?, ?, ?, '2025-01-01', 1)
+                """,
+                [
+                    (
+                        f"bench_{i}",
+                        f"Title {i}",
+                        f"Post body {i} " * 20,
+                        f"http://example.com/{i}",
+                        i % 10,
+                    )
+                    for i in range(self.post_count)
+                ],
+            )
+            conn.execute("""
+                INSERT INTO ai_questions (post_id, question_text)
+                SELECT post_id, 'Question for ' || id FROM posts
+            """)
+            conn.execute("""
+                INSERT INTO ai_categories (post_id, category_type, category_value)
+                SELECT post_id, 'tag', 'tag_' || cluster FROM posts
+            """)
+        return db
+
+    def run_profile(self, profile):
+        """Run concurrent readers and writers against one storage profile"""
+        print(
+            f"⚖️  Mixed load '{profile}': {self.readers} readers x {self.reads_per_thread}, "
+            f"{self.writers} writers x {self.writes_per_thread}..."
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = str(Path(temp_dir) / f"mixed_{profile}.db")
+            db = self.seed_database(db_path, profile)
+            failures = []
+            start = threading.Event()
+
+            def reader():
+                start.wait()
+                for _ in range(self.reads_per_thread):
+                    with self.timer(f"{profile}_read"):
+                        df = db.get_all_posts_as_dataframe(datatable_format=True)
+                    if len(df) != self.post_count:
+                        failures.append("read")
+
+            def writer(worker_id):
+                start.wait()
+                for i in range(self.writes_per_thread):
+                    item_id = f"bench_{(worker_id * self.writes_per_thread + i) % self.post_count}"
+                    with self.timer(f"{profile}_write"):
+                        if i % 2:
+                            ok = db.save_user_question(
+                                item_id, f"q_{worker_id}_{i}", "Benchmark question"
+                            )
+                        else:
+                            ok = db.save_inference_feedback(
+                                item_id, "question", "positive", "", "r1", user_id=1
+                            )
+                    if not ok:
+                        failures.append("write")
+
+            try:
+                with patch("utilities.auth.get_current_user_id", return_value=1):
+                    threads = [
+                        threading.Thread(target=reader) for _ in range(self.readers)
+                    ] + [
+                        threading.Thread(target=writer, args=(w,))
+                        for w in range(self.writers)
+                    ]
+                    for t in threads:
+                        t.start()
+                    with self.timer(f"{profile}_wall"):
+                        start.set()
+                        for t in threads:
+                            t.join()
+            finally:
+                close_all_write_queues()
+                close_all_pools()
+
+            self.failures[profile] = len(failures)
+
+    def calculate_statistics(self, operation_name):
+        """Calculate comprehensive statistics for an operation"""
+        if operation_name not in self.results:
+            return None
+
+        data = sorted(self.results[operation_name])
+        return {
+            "mean": statistics.mean(data),
+            "median": statistics.median(data),
+            "p95": data[min(len(data) - 1, int(len(data) * 0.95))],
+            "min": min(data),
+            "max": max(data),
+            "count": len(data),
+        }
+
+    def print_results(self):
+        """Print read/write latency per profile"""
+        print("\n📈 MIXED LOAD RESULTS")
+        print("=" * 70)
+
+        for profile in self.failures:
+            print(
+                f"\n🔸 Profile '{profile}' (failed operations: {self.failures[profile]})"
+            )
+            for kind in ("read", "write"):
+                stats = self.calculate_statistics(f"{profile}_{kind}")
+                if stats:
+                    print(
+                        f"   {kind.title():5}  mean {stats['mean']:.2f}ms  "
+                        f"median {stats['median']:.2f}ms  p95 {stats['p95']:.2f}ms  "
+                        f"max {stats['max']:.2f}ms"
+                    )
+            wall = self.calculate_statistics(f"{profile}_wall")
+            if wall:
+                print(f"   Wall clock: {wall['mean']:.1f}ms")
+
+    def run_full_benchmark(self, profiles=("default", "concurrent")):
+        """Run the mixed load against each storage profile"""
+        print("🚀 Starting Mixed Read/Write Load Benchmark")
+        print("=" * 70)
+
+        for profile in profiles:
+            self.run_profile(profile)
+
+        print("\n Benchmark complete!")
+        self.print_results()
+        return self.results
+
+
+# Pytest test functions
+class TestMixedLoad:
+    """Pytest test class for mixed read/write load benchmarking"""
+
+    def test_mixed_load_quick(self):
+        """Quick mixed-load run for CI - no operation may fail under contention"""
+        benchmark = MixedLoadBenchmark(
+            post_count=200,
+            readers=2,
+            writers=4,
+            reads_per_thread=3,
+            writes_per_thread=10,
+        )
+        benchmark.run_full_benchmark()
+
+        for profile in ("default", "concurrent"):
+            assert benchmark.failures[profile] == 0, (
+                f"{benchmark.failures[profile]} operations failed under '{profile}'"
+            )
+            assert benchmark.calculate_statistics(f"{profile}_write")["count"] == 40
+
+    @pytest.mark.slow
+    def test_mixed_load_comprehensive(self):
+        """Full mixed-load comparison of storage profiles"""
+        benchmark = MixedLoadBenchmark()
+        benchmark.run_full_benchmark()
+
+        assert benchmark.failures["concurrent"] == 0
+        concurrent_write = benchmark.calculate_statistics("concurrent_write")
+        assert concurrent_write["p95"] < 1000, (
+            f"Write p95 under mixed load too slow: {concurrent_write['p95']:.1f}ms"
+        )
+
+
+def main():
+    """Main function for standalone execution"""
+    print("🎯 MRPC Mixed Load Benchmark")
+    print("============================\n")
+
+    benchmark = MixedLoadBenchmark()
+    benchmark.run_full_benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Upload Ingestion Throughput Benchmark for MRPC - Test Module
+
+Compares the original row-at-a-time upload path (to_sql, then one post_id
+lookup per row and iterrows-built child tables, with the search index updated
+by per-row triggers) against the bulk path in MRPCDatabase.upload_csv_data,
+and reports ingestion throughput in rows per second.
+
+Usage:
+    # Run as pytest
+    pytest tests/benchmarking/test_upload_ingestion.py -v -s
+
+    # Run standalone
+    python tests/benchmarking/test_upload_ingestion.py
+"""
+
+import time
+import statistics
+import sys
+import sqlite3
+import tempfile
+import uuid
+import pytest
+import pandas as pd
+from pathlib import Path
+from contextlib import contextmanager
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from utilities.connection_pool import close_all_pools
+from utilities.mrpc_database import MRPCDatabase
+
+POSTS_COLUMNS = [
+    "forum",
+    "post_type",
+    "username",
+    "original_title",
+    "original_post",
+    "post_url",
+    "LLM_inferred_question",
+    "cluster",
+    "cluster_label",
+    "llm_cluster_name",
+    "date_posted",
+    "umap_1",
+    "umap_2",
+    "umap_3",
+    "upload_id",
+]
+
+
+def legacy_insert(conn, csv_data, upload_id):
+    """The pre-bulk insert loop, kept here as the baseline for comparison"""
+    csv_data = csv_data.copy()
+    csv_data["upload_id"] = upload_id
+    csv_data = csv_data.rename(
+        columns={"umap_x": "umap_1", "umap_y": "umap_2", "umap_z": "umap_3"}
+    )
+    for col in POSTS_COLUMNS:
+        if col not in csv_data.columns:
+            csv_data[col] = None
+    csv_data["id"] = [str(uuid.uuid4()) for _ in range(len(csv_data))]
+
+    csv_data[["id"] + POSTS_COLUMNS].to_sql(
+        "posts", conn, if_exists="append", index=False
+    )
+
+    post_ids = []
+    for _, row in csv_data.iterrows():
+        result = conn.execute(
+            "SELECT post_id FROM posts WHERE id = ?", (row["id"],)
+        ).fetchone()
+        if result:
+            post_ids.append(result[0])
+
+    ai_questions = []
+    ai_categories = []
+    for idx, (_, row) in enumerate(csv_data.iterrows()):
+        if pd.notna(row.get("LLM_inferred_question")):
+            ai_questions.append(
+                {
+                    "post_id": post_ids[idx],
+                    "question_text": row["LLM_inferred_question"],
+                    "model_version": "upload_v1",
+                }
+            )
+        if pd.notna(row.get("llm_cluster_name")):
+            ai_categories.append(
+                {
+                    "post_id": post_ids[idx],
+                    "category_type": "group",
+                    "category_value": row["llm_cluster_name"],
+                    "model_version": "upload_v1",
+                }
+            )
+    pd.DataFrame(ai_questions).to_sql(
+        "ai_questions", conn, if_exists="append", index=False
+    )
+    pd.DataFrame(ai_categories).to_sql(
+        "ai_categories", conn, if_exists="append", index=False
+    )
+
+
+def make_upload_frame(rows, seed=0):
+    """Synthetic forum upload with questions on most rows"""
+    return pd.DataFrame(
+        {
+            "forum": ["cervical" if i % 2 else "ovarian" for i in range(rows)],
+            "post_type": "question",
+            "username": [f"user{i % 50}" for i in range(rows)],
+            "original_title": [f"Run {seed} title {i}" for i in range(rows)],
+            "original_post": [
+                f"Post {i} about smear tests and colposcopy follow-up"
+                for i in range(rows)
+            ],
+            "post_url": [f"http://example.com/{seed}/{i}" for i in range(rows)],
+            "LLM_inferred_question": [
+                f"Question {i}?" if i % 4 else None for i in range(rows)
+            ],
+            "cluster": [i % 12 for i in range(rows)],
+            "llm_cluster_name": [f"Topic {i % 12}" for i in range(rows)],
+            "date_posted": "2025-01-01",
+            "umap_x": [i / rows for i in range(rows)],
+            "umap_y": 0.5,
+            "umap_z": 0.25,
+        }
+    )
+
+
+class UploadIngestionBenchmark:
+    """Throughput benchmark for upload_csv_data"""
+
+    def __init__(self, sizes=(1000, 5000, 20000), iterations=3):
+        self.sizes = sizes
+        self.iterations = iterations
+        self.results = {}
+
+    @contextmanager
+    def timer(self, operation_name):
+        """Context manager to time operations"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            duration = (end - start) * 1000  # Convert to milliseconds
+
+            if operation_name not in self.results:
+                self.results[operation_name] = []
+            self.results[operation_name].append(duration)
+
+    @staticmethod
+    def fresh_database(db_path):
+        """New database with one active upload owned by user 1"""
+        db = MRPCDatabase(db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO uploads (id, filename, user_readable_name, uploaded_by, status) "
+                "VALUES (1, 'bench.csv', 'Benchmark', '1', 'active')"
+            )
+        return db
+
+    def run_full_benchmark(self):
+        """Ingest each upload size with both paths"""
+        print("🚀 Starting Upload Ingestion Benchmark")
+        print("=" * 70)
+
+        try:
+            for size in self.sizes:
+                print(f"📥 {size} rows ({self.iterations} iterations)...")
+                for run in range(self.iterations):
+                    frame = make_upload_frame(size, seed=run)
+
+                    with tempfile.TemporaryDirectory() as temp_dir:
+                        db_path = str(Path(temp_dir) / "legacy.db")
+                        self.fresh_database(db_path)
+                        with sqlite3.connect(db_path) as conn:
+                            with self.timer(f"legacy_{size}"):
+                                legacy_insert(conn, frame, 1)
+
+                    with tempfile.TemporaryDirectory() as temp_dir:
+                        db_path = str(Path(temp_dir) / "bulk.db")
+                        db = self.fresh_database(db_path)
+                        with self.timer(f"bulk_{size}"):
+                            result = db.upload_csv_data(1, frame, 1)
+                        assert result["success"], result["message"]
+                        self.check_ingested(db_path, frame)
+                        close_all_pools()
+        finally:
+            close_all_pools()
+
+        print("\n Benchmark complete!")
+        self.print_results()
+        return self.results
+
+    @staticmethod
+    def check_ingested(db_path, frame):
+        """Every row, child row and search entry made it in"""
+        with sqlite3.connect(db_path) as conn:
+            counts = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("posts", "ai_questions", "ai_categories", "post_search")
+            }
+        assert counts["posts"] == counts["post_search"] == len(frame)
+        assert counts["ai_questions"] == frame["LLM_inferred_question"].notna().sum()
+        assert counts["ai_categories"] == len(frame)
+
+    def calculate_statistics(self, operation_name):
+        """Calculate comprehensive statistics for an operation"""
+        if operation_name not in self.results:
+            return None
+
+        data = self.results[operation_name]
+        return {
+            "mean": statistics.mean(data),
+            "median": statistics.median(data),
+            "min": min(data),
+            "max": max(data),
+            "stdev": statistics.stdev(data) if len(data) > 1 else 0,
+            "count": len(data),
+        }
+
+    def rows_per_second(self, operation_name, size):
+        """Median ingestion throughput for an operation"""
+        stats = self.calculate_statistics(operation_name)
+        return size / (stats["median"] / 1000) if stats and stats["median"] else 0
+
+    def print_results(self):
+        """Print median time and rows/second for each size"""
+        print("\n📈 UPLOAD INGESTION RESULTS")
+        print("=" * 70)
+        print(
+            f"{'Rows':>8} {'Legacy ms':>11} {'Bulk ms':>10} "
+            f"{'Legacy rows/s':>14} {'Bulk rows/s':>12} {'Speedup':>8}"
+        )
+
+        for size in self.sizes:
+            legacy = self.calculate_statistics(f"legacy_{size}")
+            bulk = self.calculate_statistics(f"bulk_{size}")
+            if not (legacy and bulk):
+                continue
+            speedup = legacy["median"] / bulk["median"] if bulk["median"] else 0
+            print(
+                f"{size:>8} {legacy['median']:>11.1f} {bulk['median']:>10.1f} "
+                f"{self.rows_per_second(f'legacy_{size}', size):>14.0f} "
+                f"{self.rows_per_second(f'bulk_{size}', size):>12.0f} {speedup:>7.1f}x"
+            )
+
+
+# Pytest test functions
+class TestUploadIngestion:
+    """Pytest test class for upload ingestion benchmarking"""
+
+    def test_upload_ingestion_quick(self):
+        """Quick run for CI - bulk path ingests everything"""
+        benchmark = UploadIngestionBenchmark(sizes=(500,), iterations=1)
+        results = benchmark.run_full_benchmark()
+
+        assert "bulk_500" in results
+        assert benchmark.rows_per_second("bulk_500", 500) > 0
+
+    @pytest.mark.slow
+    def test_upload_ingestion_comprehensive(self):
+        """The bulk path should out-ingest the row-at-a-time path"""
+        benchmark = UploadIngestionBenchmark(sizes=(1000, 5000), iterations=2)
+        benchmark.run_full_benchmark()
+
+        size = benchmark.sizes[-1]
+        assert benchmark.rows_per_second(f"bulk_{size}", size) > (
+            benchmark.rows_per_second(f"legacy_{size}", size)
+        )
+
+
+def main():
+    """Main function for standalone execution"""
+    print("🎯 MRPC Upload Ingestion Benchmark")
+    print("==================================\n")
+
+    benchmark = UploadIngestionBenchmark()
+    benchmark.run_full_benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import pytest
 import tempfile
 import os
 import shutil
+import sqlite3
 import pandas as pd
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -90,6 +91,36 @@ def temp_database():
             os.unlink(db_path)
 
 
+@pytest.fixture
+def upload_database(tmp_path):
+    """
+    Factory for a temporary database holding active uploads
+
+    Call as upload_database("name.db", {upload_id: owner_id, ...}); by default
+    the database has upload 1 owned by user 1.
+    """
+
+    def _create(name="uploads.db", owners=None):
+        db = MRPCDatabase(str(tmp_path / name))
+        with sqlite3.connect(db.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO uploads (id, filename, user_readable_name, uploaded_by, status) "
+                "VALUES (?, ?, ?, ?, 'active')",
+                [
+                    (
+                        upload_id,
+                        f"upload_{upload_id}.csv",
+                        f"Upload {upload_id}",
+                        str(owner),
+                    )
+                    for upload_id, owner in (owners or {1: 1}).items()
+                ],
+            )
+        return db
+
+    return _create
+
+
 @pytest.fixture
 def temp_database_with_data(temp_database, sample_forum_data):
     """Fixture providing a temporary database with sample data using proper upload service"""
@@ -169,6 +200,16 @@ def reset_environment():
     os.environ.update(original_env)
 
 
+@pytest.fixture(autouse=True)
+def reset_credential_cache():
+    """Start every test with an empty credential cache"""
+    from utilities.auth_cache import credential_cache
+
+    credential_cache.clear()
+    yield
+    credential_cache.clear()
+
+
 # Performance testing utilities
 @pytest.fixture
 def benchmark_database_ops(temp_database_with_data):
@@ -0,0 +1,164 @@
+"""
+Arrow Upload Test Suite
+
+Covers Parquet and Arrow IPC (Feather) uploads: schema-only type detection
+and validation, record-batch ingestion through the spool with typed columns
+preserved, and previews that count rows from file metadata.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+
+from utilities.arrow_upload import arrow_format, to_frame
+from utilities.mrpc_database import MRPCDatabase
+from utilities.upload_jobs import count_data_rows
+from utilities.upload_service import UploadService
+from utilities.upload_spool import UploadSpool
+
+
+def forum_table(rows):
+    """Forum upload as an Arrow table with float umap and timestamp columns"""
+    return pa.table(
+        {
+            "forum": ["cervical"] * rows,
+            "original_title": [f"Title {i}" for i in range(rows)],
+            "original_post": [f"Body {i}" for i in range(rows)],
+            "LLM_inferred_question": [f"Question {i}?" for i in range(rows)],
+            "date_posted": pa.array(
+                [
+                    pd.Timestamp("2025-03-01 10:30:15.250") + pd.Timedelta(days=i)
+                    for i in range(rows)
+                ],
+                pa.timestamp("ms"),
+            ),
+            "umap_x": pa.array([0.1 + i for i in range(rows)], pa.float32()),
+            "umap_y": [0.123456789012345] * rows,
+            "umap_z": [-2.5] * rows,
+        }
+    )
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    monkeypatch.setattr("utilities.upload_service.upload_spool", spool)
+    return spool
+
+
+@pytest.fixture
+def service(tmp_path, spool, monkeypatch):
+    monkeypatch.setattr("utilities.upload_service.get_current_user_id", lambda: 1)
+    service = UploadService()
+    service.db = MRPCDatabase(str(tmp_path / "arrow.db"))
+    return service
+
+
+def spool_table(spool, table, filename):
+    """Write table in the format named by filename and spool it for user 1"""
+    with spool.incoming_file() as handle:
+        path = handle.name
+    if filename.endswith(".parquet"):
+        pq.write_table(table, path, row_group_size=4)
+    else:
+        feather.write_feather(table, path, chunksize=4)
+    return spool.register(path, filename, 1)["token"]
+
+
+def stored_posts(service):
+    with sqlite3.connect(service.db.db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        return [
+            dict(row)
+            for row in conn.execute(
+                "SELECT original_title, date_posted, umap_1, umap_2, umap_3 "
+                "FROM posts ORDER BY post_id"
+            )
+        ]
+
+
+class TestArrowSchemaChecks:
+    """Tests for detection and validation on Arrow data"""
+
+    def test_tables_and_record_batches(self):
+        """Tables and record batches are checked by column name only"""
+        service = UploadService.__new__(UploadService)
+        table = forum_table(3)
+
+        assert service.detect_upload_type(table) == "forum_data"
+        assert service.validate_csv_structure(table.to_batches()[0]) == (True, [])
+        assert service.detect_upload_type(table.slice(0, 0)) == "unknown"
+        is_valid, errors = service.validate_csv_structure(table.drop(["forum"]))
+        assert not is_valid and "forum" in errors[0]
+
+    def test_arrow_format_and_timestamps(self):
+        assert arrow_format("data.PARQUET") == "parquet"
+        assert arrow_format("data.feather") == arrow_format("x.arrow") == "ipc"
+        assert arrow_format("data.csv") is None
+
+        frame = to_frame(forum_table(2))
+        assert frame["date_posted"].tolist() == [
+            "2025-03-01 10:30:15",
+            "2025-03-02 10:30:15",
+        ]
+        assert frame["umap_y"].dtype == "float64"
+
+
+class TestArrowUpload:
+    """Tests for ingesting spooled Parquet and Feather files"""
+
+    @pytest.mark.parametrize("filename", ["posts.parquet", "posts.feather"])
+    def test_ingests_record_batches(self, service, spool, filename):
+        """Every batch is stored with floats and timestamps intact"""
+        token = spool_table(spool, forum_table(10), filename)
+        progress = []
+        service.CSV_CHUNK_ROWS = 4
+
+        result = service.process_spooled_upload(
+            token,
+            "Arrow",
+            expected_type="forum_data",
+            progress_callback=lambda rows, upload_id: progress.append(rows),
+        )
+
+        assert result["success"], result["message"]
+        assert result["new_records"] == 10
+        assert progress == [4, 8, 10]
+        posts = stored_posts(service)
+        assert [p["original_title"] for p in posts] == [f"Title {i}" for i in range(10)]
+        assert posts[2]["date_posted"] == "2025-03-03 10:30:15"
+        assert posts[2]["umap_1"] == pytest.approx(2.1)
+        assert posts[2]["umap_2"] == 0.123456789012345
+        assert posts[2]["umap_3"] == -2.5
+        assert spool.resolve(token, 1) is None
+
+    def test_type_mismatch_stores_nothing(self, service, spool, monkeypatch):
+        """The type is detected from the schema, before any batch is converted"""
+
+        def no_pandas(batch):
+            raise AssertionError("converted to pandas")
+
+        monkeypatch.setattr("utilities.upload_service.arrow_to_frame", no_pandas)
+        token = spool_table(spool, forum_table(3), "posts.parquet")
+
+        result = service.process_spooled_upload(
+            token, "Wrong", expected_type="transcription_data"
+        )
+
+        assert result["success"] is False and "mismatch" in result["message"]
+        assert stored_posts(service) == []
+
+    def test_preview_counts_rows_from_metadata(self, service, spool):
+        token = spool_table(spool, forum_table(9), "posts.parquet")
+
+        preview = service.preview_spooled_upload(token, rows=2)
+
+        assert preview["success"] and preview["is_valid"]
+        assert preview["total_rows"] == 9
+        assert preview["detected_type"] == "forum_data"
+        assert preview["preview_data"][1]["date_posted"] == "2025-03-02 10:30:15"
+        assert count_data_rows(spool.resolve(token, 1)["path"], "posts.parquet") == 9
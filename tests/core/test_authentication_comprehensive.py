@@ -15,6 +15,7 @@ Created: 2025-01-25 (Consolidated from multiple auth test files)
 import pytest
 import sqlite3
 import base64
+import hashlib
 from unittest.mock import patch, MagicMock
 import pandas as pd
 from utilities.mrpc_database import MRPCDatabase
@@ -1190,6 +1191,140 @@ class TestCompletenesAndIntegration:
                 assert not expected, f"Unexpected exception for user_id {user_id}"
 
 
+# ============================================================================
+# CREDENTIAL CACHE TESTS
+# ============================================================================
+
+
+class TestCredentialCache:
+    """Test caching of verified credentials and per-request memoization."""
+
+    CACHED_USER = {
+        "id": 2,
+        "first_name": "Cache",
+        "last_name": "User",
+        "email": "cache@example.com",
+        "is_active": 1,
+    }
+
+    def test_repeated_authentication_hits_cache(self):
+        """Only the first authentication reaches the database."""
+        from utilities.auth import get_auth_cache_stats
+
+        with patch.object(
+            MRPCDatabase, "verify_user", return_value=dict(self.CACHED_USER)
+        ) as mock_verify:
+            for _ in range(5):
+                user = authenticate_user("cache@example.com", "secret")
+                assert user["id"] == 2
+
+        mock_verify.assert_called_once()
+        stats = get_auth_cache_stats()
+        assert stats["hits"] == 4
+        assert stats["misses"] == 1
+
+    def test_failed_authentication_is_not_cached(self):
+        """Invalid credentials are re-checked every time."""
+        with patch.object(MRPCDatabase, "verify_user", return_value=None) as mock:
+            assert authenticate_user("nobody@example.com", "wrong") is None
+            assert authenticate_user("nobody@example.com", "wrong") is None
+
+        assert mock.call_count == 2
+
+    def test_entries_expire_after_ttl(self):
+        """Expired entries count as misses."""
+        from utilities.auth_cache import CredentialCache
+
+        cache = CredentialCache(ttl_seconds=60)
+        cache.set("key", self.CACHED_USER)
+
+        with patch("utilities.auth_cache.time.monotonic", return_value=1e12):
+            assert cache.get("key") is None
+        assert cache.stats["misses"] == 1
+
+    def test_cache_size_is_bounded(self):
+        """Least recently used entries are evicted beyond max_size."""
+        from utilities.auth_cache import CredentialCache
+
+        cache = CredentialCache(max_size=2)
+        for i in range(3):
+            cache.set(f"key{i}", {"id": i})
+
+        assert cache.get("key0") is None
+        assert cache.get("key2") == {"id": 2}
+        assert cache.stats["evictions"] == 1
+
+    def test_password_change_and_deactivation_invalidate(self, tmp_path):
+        """Changing a password or deactivating a user drops cached credentials."""
+        from utilities.auth_cache import credential_cache, credential_key
+
+        db = MRPCDatabase(str(tmp_path / "auth_cache.db"))
+        db.create_user("Cache", "User", "cache@example.com", "secret")
+        user = db.verify_user("cache@example.com", "secret")
+        key = credential_key("cache@example.com", "secret")
+
+        credential_cache.set(key, user)
+        assert db.update_user_password(user["id"], "newsecret")
+        assert credential_cache.get(key) is None
+        assert db.verify_user("cache@example.com", "newsecret") is not None
+
+        credential_cache.set(key, user)
+        assert db.set_user_active(user["id"], False)
+        assert credential_cache.get(key) is None
+        assert db.verify_user("cache@example.com", "newsecret") is None
+
+    def test_change_in_another_worker_revokes_cached_login(self, tmp_path):
+        """A password change or deactivation written by another process is seen on the next hit."""
+        db = MRPCDatabase(str(tmp_path / "auth_workers.db"))
+        db.create_user("Cache", "User", "cache@example.com", "secret")
+
+        with patch("utilities.auth.MRPCDatabase", return_value=db):
+            assert authenticate_user("cache@example.com", "secret") is not None
+            assert authenticate_user("cache@example.com", "secret") is not None
+
+            # Another worker: its own connection, no access to this cache
+            with sqlite3.connect(db.db_path) as conn:
+                conn.execute(
+                    "UPDATE users SET password_hash = 'changed' "
+                    "WHERE email = 'cache@example.com'"
+                )
+            assert authenticate_user("cache@example.com", "secret") is None
+
+            # Restored password: verified against the database and cached again
+            with sqlite3.connect(db.db_path) as conn:
+                conn.execute(
+                    "UPDATE users SET password_hash = ? "
+                    "WHERE email = 'cache@example.com'",
+                    (hashlib.sha256(b"secret").hexdigest(),),
+                )
+            assert authenticate_user("cache@example.com", "secret") is not None
+            with sqlite3.connect(db.db_path) as conn:
+                conn.execute(
+                    "UPDATE users SET is_active = 0 WHERE email = 'cache@example.com'"
+                )
+            assert authenticate_user("cache@example.com", "secret") is None
+
+    def test_current_user_memoized_per_request(self):
+        """get_current_user authenticates once per Flask request."""
+        from flask import Flask
+        from utilities.auth import get_current_user
+
+        app = Flask(__name__)
+        header = "Basic " + base64.b64encode(b"cache@example.com:secret").decode()
+
+        with patch(
+            "utilities.auth.authenticate_user", return_value=dict(self.CACHED_USER)
+        ) as mock_auth:
+            with app.test_request_context(headers={"Authorization": header}):
+                assert get_current_user()["id"] == 2
+                assert get_current_user()["id"] == 2
+            assert mock_auth.call_count == 1
+
+            with app.test_request_context(headers={"Authorization": header}):
+                get_current_user()
+            assert mock_auth.call_count == 2
+
+
 # ============================================================================
 # VALIDATION HELPER FUNCTIONS
 # ============================================================================
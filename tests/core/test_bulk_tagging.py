@@ -0,0 +1,176 @@
+"""
+Bulk Tagging Test Suite
+
+Covers MRPCDatabase.bulk_apply_tags: resolving the posts behind the
+datatable rows a filter matches and adding, replacing or removing their
+tags in one set-based transaction.
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+
+def build_db(upload_database, name, titles):
+    """Two posts per title across two forums, each grouped 'Screening'; one post of user 2"""
+    db = upload_database(name, {1: 1, 2: 2})
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany(
+            "INSERT INTO posts (id, forum, original_title, llm_cluster_name, upload_id) "
+            "VALUES (?, ?, ?, ?, 1)",
+            [
+                (
+                    f"bulk_{t}_{n}",
+                    "cervical" if t % 2 else "ovarian",
+                    f"Title {t:04d}",
+                    f"Topic {t % 3}",
+                )
+                for t in range(titles)
+                for n in range(2)
+            ],
+        )
+        conn.execute(
+            "INSERT INTO posts (id, forum, original_title, upload_id) "
+            "VALUES ('other_0', 'cervical', 'Title 0001', 2)"
+        )
+        conn.execute(
+            "INSERT INTO ai_categories (post_id, category_type, category_value) "
+            "SELECT post_id, 'group', 'Screening' FROM posts"
+        )
+    return db
+
+
+@pytest.fixture
+def bulk_db(upload_database):
+    return build_db(upload_database, "bulk.db", 10)
+
+
+def categories(db, where="1"):
+    with sqlite3.connect(db.db_path) as conn:
+        return sorted(
+            conn.execute(
+                "SELECT p.id, ac.category_type, ac.category_value FROM ai_categories ac "
+                f"JOIN posts p ON p.post_id = ac.post_id WHERE {where}"
+            ).fetchall()
+        )
+
+
+def registry(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return dict(
+            ((tag_type, value), count)
+            for tag_type, value, count in conn.execute(
+                "SELECT tag_type, tag_value, usage_count FROM tag_registry"
+            )
+        )
+
+
+class TestBulkApplyTags:
+    """Tests for the add/replace/remove modes"""
+
+    def test_add_tags_every_post_of_matching_titles(self, bulk_db):
+        result = bulk_db.bulk_apply_tags(
+            {"forum": "cervical", "filter_query": '{original_title} contains "000"'},
+            {"tags": ["Colposcopy", "Colposcopy"], "subgroups": ["Results"]},
+            user_id=1,
+        )
+
+        assert result["success"], result["message"]
+        # Titles 0001, 0003, ... 0009 in the cervical forum, two posts each
+        assert result["posts_matched"] == 10
+        assert result["tags_added"] == 20
+        assert categories(bulk_db, "p.id = 'bulk_1_1'") == [
+            ("bulk_1_1", "group", "Screening"),
+            ("bulk_1_1", "subgroup", "Results"),
+            ("bulk_1_1", "tag", "Colposcopy"),
+        ]
+        assert (
+            categories(bulk_db, "ac.category_type = 'tag' AND p.forum = 'ovarian'")
+            == []
+        )
+        # Another user's post under the same title is left alone
+        assert categories(bulk_db, "p.id = 'other_0'") == [
+            ("other_0", "group", "Screening")
+        ]
+        assert registry(bulk_db)[("tag", "Colposcopy")] == 10
+
+        # Adding again finds nothing missing
+        again = bulk_db.bulk_apply_tags(
+            {"forum": "cervical"}, {"tags": ["Colposcopy"]}, user_id=1
+        )
+        assert again["posts_matched"] == 10 and again["tags_added"] == 0
+
+    def test_replace_and_remove(self, bulk_db):
+        replaced = bulk_db.bulk_apply_tags(
+            {"topics": ["Topic 0"]}, {"groups": ["Treatment"]}, "replace", user_id=1
+        )
+
+        # Titles 0, 3, 6 and 9
+        assert replaced["posts_matched"] == 8
+        assert replaced["tags_removed"] == 8 and replaced["tags_added"] == 8
+        assert registry(bulk_db) == {
+            ("group", "Screening"): 13,
+            ("group", "Treatment"): 8,
+        }
+
+        removed = bulk_db.bulk_apply_tags(
+            {}, {"groups": ["Screening"], "tags": ["Unused"]}, "remove", user_id=1
+        )
+
+        assert removed["posts_matched"] == 20 and removed["tags_removed"] == 12
+        assert registry(bulk_db) == {
+            ("group", "Screening"): 1,
+            ("group", "Treatment"): 8,
+        }
+        assert bulk_db.reconcile_tag_registry()["corrected"] == 0
+
+    def test_filters_on_aggregated_columns(self, bulk_db):
+        bulk_db.bulk_apply_tags(
+            {"filter_query": '{original_title} eq "Title 0002"'},
+            {"tags": ["Flagged"]},
+            user_id=1,
+        )
+
+        result = bulk_db.bulk_apply_tags(
+            {"filter_query": '{all_categories} contains "Flagged"'},
+            {"tags": ["Reviewed"]},
+            user_id=1,
+        )
+
+        assert result["posts_matched"] == 2
+        assert [
+            row[0] for row in categories(bulk_db, "category_value = 'Reviewed'")
+        ] == [
+            "bulk_2_0",
+            "bulk_2_1",
+        ]
+
+    @pytest.mark.parametrize(
+        "filter_spec, tags, mode",
+        [
+            ({"filter_query": "{original_title} contains"}, {"tags": ["X"]}, "add"),
+            ({}, {"tags": ["X"]}, "merge"),
+            ({}, {"labels": ["X"]}, "add"),
+        ],
+    )
+    def test_invalid_requests_change_nothing(self, bulk_db, filter_spec, tags, mode):
+        """A broken filter fails rather than widening to every row"""
+        before = categories(bulk_db)
+
+        result = bulk_db.bulk_apply_tags(filter_spec, tags, mode, user_id=1)
+
+        assert result["success"] is False and result["posts_matched"] == 0
+        assert categories(bulk_db) == before
+
+    def test_thousands_of_posts_well_under_a_second(self, upload_database):
+        db = build_db(upload_database, "large.db", 2500)
+
+        started = time.perf_counter()
+        result = db.bulk_apply_tags(
+            {}, {"groups": ["Follow-up"], "tags": ["Bulk"]}, "replace", user_id=1
+        )
+        elapsed = time.perf_counter() - started
+
+        assert result["posts_matched"] == 5000 and result["tags_added"] == 10000
+        assert elapsed < 1.0, elapsed
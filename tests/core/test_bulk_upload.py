@@ -0,0 +1,175 @@
+"""
+Bulk Upload Ingestion Test Suite
+
+Covers the set-based insert path behind MRPCDatabase.upload_csv_data: post_id
+mapping of child rows, duplicate skipping through the stored dedupe_key and
+deferred search indexing.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def upload_db(upload_database):
+    """Empty database with one active upload owned by user 1"""
+    return upload_database("bulk.db")
+
+
+@pytest.fixture
+def upload_frame():
+    """Four rows with gaps in the AI columns and CSV-style UMAP names"""
+    return pd.DataFrame(
+        {
+            "forum": ["cervical", "cervical", "ovarian", "ovarian"],
+            "original_title": ["Smear", "Biopsy", "CA125", None],
+            "original_post": ["colposcopy booked", "waiting", "bloods", "no title"],
+            "post_url": [f"http://example.com/{i}" for i in range(4)],
+            "LLM_inferred_question": ["When?", None, "Normal?", "Why?"],
+            "llm_cluster_name": ["Screening", "Results", None, "Other"],
+            "cluster": [1, 2, 3, 4],
+            "umap_x": [0.1, 0.2, 0.3, 0.4],
+        }
+    )
+
+
+def fetch(db, sql):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+class TestBulkUpload:
+    """Tests for the bulk upload_csv_data path"""
+
+    def test_child_rows_follow_their_posts(self, upload_db, upload_frame):
+        """AI questions and categories land on the post they came from"""
+        result = upload_db.upload_csv_data(1, upload_frame, 1)
+
+        assert result["success"] and result["new_records"] == 4
+        questions = fetch(
+            upload_db,
+            "SELECT p.post_url, q.question_text, q.model_version FROM ai_questions q "
+            "JOIN posts p ON p.post_id = q.post_id ORDER BY p.post_url",
+        )
+        assert questions == [
+            ("http://example.com/0", "When?", "upload_v1"),
+            ("http://example.com/2", "Normal?", "upload_v1"),
+            ("http://example.com/3", "Why?", "upload_v1"),
+        ]
+        categories = fetch(
+            upload_db,
+            "SELECT p.post_url, c.category_type, c.category_value FROM ai_categories c "
+            "JOIN posts p ON p.post_id = c.post_id ORDER BY p.post_url",
+        )
+        assert [c[2] for c in categories] == ["Screening", "Results", "Other"]
+        assert {c[1] for c in categories} == {"group"}
+        assert fetch(upload_db, "SELECT umap_1 FROM posts ORDER BY post_id")[0] == (
+            0.1,
+        )
+
+    def test_reupload_skips_composite_duplicates(self, upload_db, upload_frame):
+        """Rows with an existing (title, question) pair are skipped on re-upload"""
+        upload_db.upload_csv_data(1, upload_frame, 1)
+        result = upload_db.upload_csv_data(1, upload_frame, 1)
+
+        # Rows missing a title or question are never treated as duplicates
+        assert result["duplicates_skipped"] == 2
+        assert result["new_records"] == 2
+        assert fetch(upload_db, "SELECT COUNT(*) FROM posts") == [(6,)]
+
+    def test_search_index_built_and_triggers_restored(self, upload_db, upload_frame):
+        """New posts are searchable and later edits are still indexed"""
+        upload_db.upload_csv_data(1, upload_frame, 1)
+
+        assert [
+            r["original_title"] for r in upload_db.search_posts("colposcopy", 1)
+        ] == ["Smear"]
+        assert [r["original_title"] for r in upload_db.search_posts("normal", 1)] == [
+            "CA125"
+        ]
+
+        with sqlite3.connect(upload_db.db_path) as conn:
+            conn.execute(
+                "UPDATE posts SET original_post = 'ultrasound' WHERE original_title = 'Biopsy'"
+            )
+        assert [
+            r["original_title"] for r in upload_db.search_posts("ultrasound", 1)
+        ] == ["Biopsy"]
+
+    def test_failed_insert_rolls_back(self, upload_db, upload_frame):
+        """A failing batch leaves no posts behind and the triggers in place"""
+        triggers_before = fetch(
+            upload_db, "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'"
+        )
+        upload_frame["forum"] = None  # posts.forum is NOT NULL
+
+        result = upload_db.upload_csv_data(1, upload_frame, 1)
+
+        assert result["success"] is False
+        assert fetch(upload_db, "SELECT COUNT(*) FROM posts") == [(0,)]
+        assert (
+            fetch(
+                upload_db, "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'"
+            )
+            == triggers_before
+        )
+
+
+class TestDedupeKeys:
+    """Tests for the stored per-user dedupe_key on posts"""
+
+    def test_duplicates_are_per_user(self, upload_db, upload_frame):
+        """Another user's upload of the same rows is not a duplicate"""
+        with sqlite3.connect(upload_db.db_path) as conn:
+            conn.execute(
+                "INSERT INTO uploads (id, filename, user_readable_name, uploaded_by, status) "
+                "VALUES (2, 'bulk.csv', 'Bulk', '2', 'active')"
+            )
+        upload_db.upload_csv_data(1, upload_frame, 1)
+
+        result = upload_db.upload_csv_data(2, upload_frame, 2)
+
+        assert result["new_records"] == 4 and result["duplicates_skipped"] == 0
+
+    def test_repeated_rows_within_one_upload(self, upload_db, upload_frame):
+        """A row repeated inside the same file is only stored once"""
+        frame = pd.concat([upload_frame, upload_frame.iloc[[0]]], ignore_index=True)
+
+        result = upload_db.upload_csv_data(1, frame, 1)
+
+        assert result["new_records"] == 4 and result["duplicates_skipped"] == 1
+        assert fetch(upload_db, "SELECT COUNT(*) FROM ai_questions") == [(3,)]
+
+    def test_keys_only_for_rows_with_title_and_question(self, upload_db, upload_frame):
+        upload_db.upload_csv_data(1, upload_frame, 1)
+
+        keys = fetch(upload_db, "SELECT dedupe_key FROM posts ORDER BY post_id")
+
+        assert [key is not None for (key,) in keys] == [True, False, True, False]
+
+    def test_migration_backfills_existing_posts(self, upload_db, upload_frame):
+        """Upgrading keys the oldest of any duplicate posts already stored"""
+        upload_db.upload_csv_data(1, upload_frame, 1)
+        with sqlite3.connect(upload_db.db_path) as conn:
+            conn.execute("DROP INDEX idx_posts_dedupe_key")
+            conn.execute("UPDATE posts SET dedupe_key = NULL")
+            # A duplicate stored before keys existed
+            conn.execute(
+                "INSERT INTO posts (id, forum, original_title, LLM_inferred_question, upload_id) "
+                "VALUES ('dup', 'cervical', 'Smear', 'When?', 1)"
+            )
+
+        upload_db._migration_v5_to_v6()
+
+        keyed = fetch(
+            upload_db,
+            "SELECT original_title FROM posts WHERE dedupe_key IS NOT NULL ORDER BY post_id",
+        )
+        assert keyed == [("Smear",), ("CA125",)]
+        assert fetch(upload_db, "SELECT dedupe_key FROM posts WHERE id = 'dup'") == [
+            (None,)
+        ]
+        result = upload_db.upload_csv_data(1, upload_frame, 1)
+        assert result["duplicates_skipped"] == 2
@@ -0,0 +1,137 @@
+"""
+Cluster Tag Mapping Test Suite
+
+Covers the cluster_tag_mappings table behind _create_initial_tag_mappings:
+the seeded default mapping, per-upload overrides and the single-batch
+write of the initial tag rows.
+"""
+
+import sqlite3
+import warnings
+
+import pandas as pd
+import pytest
+
+from utilities.mrpc_database import MRPCDatabase
+
+
+@pytest.fixture
+def mapping_db(tmp_path):
+    return MRPCDatabase(str(tmp_path / "mappings.db"))
+
+
+def legacy_tags(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return sorted(conn.execute("SELECT item_id, tag_type, tag_value FROM tags"))
+
+
+def apply_mappings(db, df, upload_id=None):
+    with sqlite3.connect(db.db_path) as conn:
+        db._create_initial_tag_mappings(conn, df, upload_id)
+
+
+class TestClusterTagMappings:
+    """Tests for storing and resolving the mappings"""
+
+    def test_default_mapping_is_seeded(self, mapping_db):
+        mappings = mapping_db.get_cluster_tag_mappings()
+
+        assert mappings == MRPCDatabase.DEFAULT_CLUSTER_TAG_MAPPINGS
+
+    def test_upload_overrides_fall_back_to_default(self, mapping_db):
+        assert mapping_db.set_cluster_tag_mappings(
+            {2: {"tag": "BRCA Questions"}, 12: {"group": "Other"}}, upload_id=7
+        )
+
+        mappings = mapping_db.get_cluster_tag_mappings(upload_id=7)
+
+        assert mappings[2] == {
+            "group": "Medical",
+            "subgroup": "Cancer Concerns",
+            "tag": "BRCA Questions",
+        }
+        assert mappings[12] == {"group": "Other"}
+        assert mapping_db.get_cluster_tag_mappings()[2]["tag"] == (
+            "Ovarian Cancer Concerns"
+        )
+
+    def test_unknown_tag_type_is_rejected(self, mapping_db):
+        assert not mapping_db.set_cluster_tag_mappings(
+            {1: {"label": "X"}}, upload_id=3
+        )
+        assert mapping_db.get_cluster_tag_mappings(upload_id=3) == (
+            MRPCDatabase.DEFAULT_CLUSTER_TAG_MAPPINGS
+        )
+
+
+class TestInitialTagMappings:
+    """Tests for tagging posts from their cluster"""
+
+    def test_posts_get_their_clusters_tags(self, mapping_db):
+        mapping_db.set_cluster_tag_mappings({8: {"tag": "Peer Support"}}, upload_id=5)
+        df = pd.DataFrame(
+            {
+                "id": ["a", "b", "c", "d"],
+                "cluster": [8, 8.0, None, 42],
+                "upload_id": [5, 6, 5, 5],
+            }
+        )
+
+        apply_mappings(mapping_db, df)
+
+        assert legacy_tags(mapping_db) == [
+            ("a", "group", "Support"),
+            ("a", "subgroup", "Emotional Support"),
+            ("a", "tag", "Peer Support"),
+            ("b", "group", "Support"),
+            ("b", "subgroup", "Emotional Support"),
+            ("b", "tag", "Treatment & Coping"),
+        ]
+
+    def test_upload_id_argument_when_frame_has_none(self, mapping_db):
+        mapping_db.set_cluster_tag_mappings({0: {"group": "Surgery"}}, upload_id=9)
+
+        apply_mappings(mapping_db, pd.DataFrame({"id": ["x"], "cluster": [0]}), 9)
+
+        assert ("x", "group", "Surgery") in legacy_tags(mapping_db)
+
+    def test_large_frame_is_one_batch(self, mapping_db):
+        df = pd.DataFrame(
+            {
+                "id": [f"post_{i}" for i in range(5000)],
+                "cluster": [i % 10 for i in range(5000)],
+            }
+        )
+
+        apply_mappings(mapping_db, df)
+
+        assert len(legacy_tags(mapping_db)) == 15000
+
+    def test_missing_cluster_column_is_a_no_op(self, mapping_db):
+        apply_mappings(mapping_db, pd.DataFrame({"id": ["a"]}))
+
+        assert legacy_tags(mapping_db) == []
+
+    def test_migration_creates_and_seeds_table(self, mapping_db):
+        with sqlite3.connect(mapping_db.db_path) as conn:
+            conn.execute("DROP TABLE cluster_tag_mappings")
+
+        mapping_db._migration_v10_to_v11()
+
+        assert (
+            mapping_db.get_cluster_tag_mappings()
+            == MRPCDatabase.DEFAULT_CLUSTER_TAG_MAPPINGS
+        )
+
+    def test_object_upload_ids_do_not_warn(self, mapping_db):
+        """Missing upload ids in an object column fall back without a FutureWarning"""
+        df = pd.DataFrame(
+            {"id": ["a", "b"], "cluster": [1, 1], "upload_id": [None, "4"]},
+            dtype=object,
+        )
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            apply_mappings(mapping_db, df)
+
+        assert len(legacy_tags(mapping_db)) == 6
@@ -0,0 +1,155 @@
+"""
+SQLite Connection Pool Test Suite
+
+Covers connection reuse, pragma setup, thread safety and the handling of
+database files that are replaced underneath the pool.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from utilities.connection_pool import (
+    SQLiteConnectionPool,
+    close_all_pools,
+    get_connection_pool,
+)
+from utilities.mrpc_database import MRPCDatabase
+
+
+@pytest.fixture
+def db_path():
+    """Temporary database path, cleaned up with any pools pointing at it"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield str(Path(temp_dir) / "pool_test.db")
+        close_all_pools()
+
+
+class TestSQLiteConnectionPool:
+    """Unit tests for SQLiteConnectionPool"""
+
+    def test_connection_is_reused(self, db_path):
+        """A released connection is handed out again instead of reconnecting"""
+        pool = SQLiteConnectionPool(db_path)
+
+        with pool.connection() as conn:
+            first = conn
+        with pool.connection() as conn:
+            second = conn
+
+        assert first is second
+        assert pool.stats["created"] == 1
+        assert pool.stats["reused"] == 1
+
+    def test_pragmas_applied_once(self, db_path):
+        """Pragmas are set when the connection is opened"""
+        pool = SQLiteConnectionPool(db_path, pragmas={"temp_store": "MEMORY"})
+
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+    def test_row_factory_reset_on_release(self, db_path):
+        """Per-call row_factory changes don't leak to the next borrower"""
+        pool = SQLiteConnectionPool(db_path)
+
+        with pool.connection() as conn:
+            conn.row_factory = sqlite3.Row
+        with pool.connection() as conn:
+            assert conn.row_factory is None
+
+    def test_commit_and_rollback_semantics(self, db_path):
+        """Matches `with sqlite3.connect(...)`: commit on success, rollback on error"""
+        pool = SQLiteConnectionPool(db_path)
+
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+
+        with pytest.raises(ValueError):
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise ValueError("boom")
+
+        with sqlite3.connect(db_path) as check:
+            assert check.execute("SELECT v FROM t").fetchall() == [(1,)]
+
+    def test_idle_connections_are_bounded(self, db_path):
+        """Concurrent checkouts beyond max_idle are closed when returned"""
+        pool = SQLiteConnectionPool(db_path, max_idle=2)
+
+        conns = [pool.acquire() for _ in range(4)]
+        for conn in conns:
+            pool.release(conn)
+
+        assert pool.stats["created"] == 4
+        assert pool.stats["discarded"] == 2
+
+    def test_replaced_database_file_is_detected(self, db_path):
+        """Pooled connections are dropped when the file is deleted and recreated"""
+        pool = SQLiteConnectionPool(db_path)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE old_table (v INTEGER)")
+
+        os.unlink(db_path)
+        with sqlite3.connect(db_path) as fresh:
+            fresh.execute("CREATE TABLE new_table (v INTEGER)")
+
+        with pool.connection() as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                )
+            }
+        assert tables == {"new_table"}
+
+    def test_concurrent_threads(self, db_path):
+        """Many threads can borrow and return connections safely"""
+        pool = SQLiteConnectionPool(db_path, max_idle=4)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE counter (v INTEGER)")
+
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    with pool.connection() as conn:
+                        conn.execute("INSERT INTO counter VALUES (1)")
+            except Exception as e:  # pragma: no cover - surfaced by assertion
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM counter").fetchone()[0] == 160
+
+
+class TestSharedPools:
+    """Tests for the process-wide pool registry and MRPCDatabase integration"""
+
+    def test_same_path_shares_pool(self, db_path):
+        """Pools are shared per absolute database path"""
+        assert get_connection_pool(db_path) is get_connection_pool(db_path)
+
+    def test_database_instances_share_connections(self, db_path):
+        """Separate MRPCDatabase instances draw from the same pool"""
+        db_a = MRPCDatabase(db_path)
+        db_b = MRPCDatabase(db_path)
+
+        assert db_a._pool is db_b._pool
+
+        created_before = db_a._pool.stats["created"]
+        db_a.get_posts_summary()
+        db_b.get_posts_summary()
+        db_a.get_all_users()
+        assert db_a._pool.stats["created"] == created_before
@@ -208,6 +208,61 @@ class TestDatabaseMigrationSystem:
                 assert final_count == initial_count
 
 
+class TestOneTimeMigrationCheck:
+    """Test that the schema/migration check runs once per database per process."""
+
+    def test_migration_check_runs_once_per_database(self):
+        """Repeated instances skip the schema version lookup."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = str(Path(temp_dir) / "once.db")
+            MRPCDatabase(db_path)
+
+            with patch.object(
+                MRPCDatabase, "_init_database_with_migrations"
+            ) as mock_init:
+                for _ in range(5):
+                    MRPCDatabase(db_path)
+                mock_init.assert_not_called()
+
+    def test_reset_forces_recheck(self):
+        """reset_initialization_cache makes the next instance run the check again."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = str(Path(temp_dir) / "reset.db")
+            MRPCDatabase(db_path)
+
+            MRPCDatabase.reset_initialization_cache(db_path)
+            with patch.object(
+                MRPCDatabase, "_init_database_with_migrations"
+            ) as mock_init:
+                MRPCDatabase(db_path)
+                MRPCDatabase(db_path)
+                mock_init.assert_called_once()
+
+    def test_replaced_database_file_is_migrated(self):
+        """A database file recreated at the same path gets its schema again."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = str(Path(temp_dir) / "replaced.db")
+            MRPCDatabase(db_path)
+            os.unlink(db_path)
+
+            db = MRPCDatabase(db_path)
+            assert db._get_schema_version() == MRPCDatabase.CURRENT_SCHEMA_VERSION
+
+    def test_get_database_returns_shared_instance(self):
+        """get_database hands out one instance per database path."""
+        from utilities.mrpc_database import get_database, reset_database_cache
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = str(Path(temp_dir) / "shared.db")
+            try:
+                assert get_database(db_path) is get_database(db_path)
+
+                reset_database_cache()
+                assert get_database(db_path) is not None
+            finally:
+                reset_database_cache()
+
+
 class TestInferenceFeedbackTable:
     """Test the inference_feedback table operations specifically."""
 
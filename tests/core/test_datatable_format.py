@@ -4,6 +4,7 @@ This file tests the new aggregated datatable format to identify and fix issues
 """
 
 import pytest
+import sqlite3
 import pandas as pd
 from unittest.mock import patch
 from utilities.mrpc_database import MRPCDatabase
@@ -155,6 +156,63 @@ class TestDatatableFormat:
                 value = sample[col]
                 print(f"{col}: {type(value)} - {repr(str(value)[:50])}")
 
+    def test_datatable_aggregation_has_no_fan_out(self, upload_database):
+        """Each child row appears once per title however many siblings it has"""
+        db = upload_database("fan_out.db")
+
+        with sqlite3.connect(db.db_path) as conn:
+            for i in range(2):
+                conn.execute(
+                    "INSERT INTO posts (id, forum, original_title, post_url, date_posted, upload_id) "
+                    "VALUES (?, 'cervical', 'Shared title', ?, '2025-01-01', 1)",
+                    (f"fan_{i}", f"http://example.com/{i}"),
+                )
+                post_id = conn.execute(
+                    "SELECT post_id FROM posts WHERE id = ?", (f"fan_{i}",)
+                ).fetchone()[0]
+                for n in range(3):
+                    conn.execute(
+                        "INSERT INTO ai_questions (post_id, question_text) VALUES (?, ?)",
+                        (post_id, f"AI question {n}"),
+                    )
+                    conn.execute(
+                        "INSERT INTO ai_categories (post_id, category_type, category_value) "
+                        "VALUES (?, 'tag', ?)",
+                        (post_id, f"tag {n}"),
+                    )
+                    conn.execute(
+                        "INSERT INTO users_questions (post_id, question_id, question_text) "
+                        "VALUES (?, ?, ?)",
+                        (post_id, f"uq_{i}_{n}", f"User question {i}-{n}"),
+                    )
+                conn.execute(
+                    "INSERT INTO users_categories (post_id, note_id, notes_text) "
+                    "VALUES (?, 'note', 'Shared note')",
+                    (post_id,),
+                )
+
+        df = db.get_all_posts_as_dataframe(user_id=1, datatable_format=True)
+
+        assert len(df) == 1
+        row = df.iloc[0]
+        assert row["all_questions"].split("\n") == [
+            "AI question 0",
+            "AI question 1",
+            "AI question 2",
+            "User question 0-0",
+            "User question 0-1",
+            "User question 0-2",
+            "User question 1-0",
+            "User question 1-1",
+            "User question 1-2",
+        ]
+        assert row["all_categories"].split("\n") == [
+            "tag 0",
+            "tag 1",
+            "tag 2",
+            "Shared note",
+        ]
+
 
 if __name__ == "__main__":
     # Run tests directly for debugging
@@ -0,0 +1,177 @@
+"""
+Server-side Datatable Paging Test Suite
+
+Covers translation of the DataTable filter_query / sort_by into SQL and
+MRPCDatabase.get_datatable_page, which returns one page plus the total count.
+"""
+
+import sqlite3
+
+import pytest
+
+from utilities.filter_query import filter_query_to_sql, sort_by_to_sql
+
+
+@pytest.fixture
+def paged_db(upload_database):
+    """25 titles across two forums, two posts per title, each with an AI question"""
+    db = upload_database("paging.db", {1: 1, 2: 2})
+
+    with sqlite3.connect(db.db_path) as conn:
+        for t in range(25):
+            for n in range(2):
+                conn.execute(
+                    """
+                    INSERT INTO posts (id, forum, original_title, post_url, cluster,
+                                       llm_cluster_name, date_posted, upload_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                    """,
+                    (
+                        f"page_{t}_{n}",
+                        "cervical" if t % 2 else "ovarian",
+                        f"Title {t:02d}",
+                        f"http://example.com/{t}/{n}",
+                        t % 5,
+                        f"Topic {t % 3}",
+                        f"2025-01-{t + 1:02d}",
+                    ),
+                )
+        conn.execute(
+            "INSERT INTO posts (id, forum, original_title, post_url, date_posted, upload_id) "
+            "VALUES ('other_0', 'cervical', 'Someone else', 'http://example.com/x', "
+            "'2025-02-01', 2)"
+        )
+        conn.execute(
+            "INSERT INTO ai_questions (post_id, question_text) "
+            "SELECT post_id, 'Question about ' || original_title FROM posts"
+        )
+    return db
+
+
+class TestFilterQueryTranslation:
+    """Unit tests for the filter_query / sort_by translation"""
+
+    def test_contains_is_parameterized(self):
+        """Values are bound, never interpolated into the SQL"""
+        sql, params, used = filter_query_to_sql(
+            '{original_title} contains "x\' OR 1=1 --"', ["original_title"]
+        )
+
+        assert "OR 1=1" not in sql
+        assert params == ["x' OR 1=1 --"]
+        assert used == {"original_title"}
+
+    def test_unknown_columns_are_ignored(self):
+        """Columns outside the whitelist never reach the SQL"""
+        sql, params, used = filter_query_to_sql(
+            '{password_hash} eq "x" && {forum} eq "cervical"', ["forum"]
+        )
+
+        assert "password_hash" not in sql
+        assert params == ["cervical"]
+        assert used == {"forum"}
+
+    def test_sort_by_whitelists_columns_and_directions(self):
+        """Only known columns are sorted, with NULLs last"""
+        order, used = sort_by_to_sql(
+            [
+                {"column_id": "date_posted", "direction": "asc"},
+                {"column_id": "1; DROP TABLE posts", "direction": "desc"},
+            ],
+            ["date_posted"],
+        )
+
+        assert order == '"date_posted" ASC NULLS LAST'
+        assert used == {"date_posted"}
+
+
+class TestDatatablePage:
+    """Tests for MRPCDatabase.get_datatable_page"""
+
+    def test_returns_one_page_and_total(self, paged_db):
+        """Only page_size rows come back, with the real total and page count"""
+        page = paged_db.get_datatable_page(page_current=0, page_size=10, user_id=1)
+
+        assert len(page["data"]) == 10
+        assert page["total_rows"] == 25
+        assert page["page_count"] == 3
+        # Default order is newest first
+        assert page["data"]["original_title"].iloc[0] == "Title 24"
+
+        last = paged_db.get_datatable_page(page_current=2, page_size=10, user_id=1)
+        assert len(last["data"]) == 5
+
+    def test_pages_cover_every_title_once(self, paged_db):
+        """Walking all pages returns each title exactly once"""
+        titles = []
+        for page_current in range(3):
+            page = paged_db.get_datatable_page(
+                page_current=page_current,
+                page_size=10,
+                sort_by=[{"column_id": "cluster", "direction": "asc"}],
+                user_id=1,
+            )
+            titles.extend(page["data"]["original_title"])
+
+        assert sorted(titles) == [f"Title {t:02d}" for t in range(25)]
+
+    def test_page_rows_match_full_aggregation(self, paged_db):
+        """Aggregated questions on a page match the unpaged query"""
+        full = paged_db.get_all_posts_as_dataframe(user_id=1, datatable_format=True)
+        page = paged_db.get_datatable_page(page_current=1, page_size=7, user_id=1)
+
+        expected = full.set_index("original_title")["all_questions"]
+        for _, row in page["data"].iterrows():
+            assert row["all_questions"] == expected[row["original_title"]]
+
+    def test_filter_forum_and_topic(self, paged_db):
+        """Forum, topic and filter_query conditions combine"""
+        page = paged_db.get_datatable_page(
+            page_size=50,
+            forum="cervical",
+            topics=["Topic 1"],
+            filter_query="{cluster} ge 2",
+            user_id=1,
+        )
+
+        df = page["data"]
+        assert page["total_rows"] == len(df) > 0
+        assert set(df["forum"]) == {"cervical"}
+        assert set(df["llm_cluster_name"]) == {"Topic 1"}
+        assert (df["cluster"] >= 2).all()
+
+    def test_filter_on_aggregated_column(self, paged_db):
+        """Filtering on all_questions searches the aggregated text"""
+        page = paged_db.get_datatable_page(
+            filter_query='{all_questions} contains "title 07"', user_id=1
+        )
+
+        assert page["total_rows"] == 1
+        assert page["data"]["original_title"].tolist() == ["Title 07"]
+
+    def test_page_clamped_and_user_scoped(self, paged_db):
+        """Out-of-range pages return the last page; other users' rows never appear"""
+        page = paged_db.get_datatable_page(page_current=99, page_size=10, user_id=1)
+
+        assert page["page_current"] == 2
+        assert "Someone else" not in page["data"]["original_title"].tolist()
+
+    def test_unpaged_export(self, paged_db):
+        """page_size=None returns every matching row"""
+        page = paged_db.get_datatable_page(page_size=None, forum="ovarian", user_id=1)
+
+        assert len(page["data"]) == page["total_rows"] == 13
+        assert page["page_count"] == 1
+
+    def test_filter_options_are_distinct_and_user_scoped(self, paged_db):
+        """Dropdown options come from SELECT DISTINCT over the user's visible posts"""
+        options = paged_db.get_datatable_filter_options(user_id=1)
+
+        assert options == {
+            "forums": ["cervical", "ovarian"],
+            "topics": ["Topic 0", "Topic 1", "Topic 2"],
+        }
+        assert paged_db.get_datatable_filter_options(user_id=2) == {
+            "forums": ["cervical"],
+            "topics": [],
+        }
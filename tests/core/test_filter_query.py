@@ -0,0 +1,179 @@
+"""
+DataTable filter_query Compiler Test Suite
+
+Covers parsing of the Dash filter grammar, the compiled-predicate cache and
+agreement between the SQL and pandas-mask evaluations of the same query.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utilities.connection_pool import register_sql_functions
+from utilities.filter_query import (
+    FilterQuerySyntaxError,
+    compile_filter_query,
+    parse_filter_query,
+)
+
+COLUMNS = {
+    "title": "text",
+    "forum": "text",
+    "cluster": "numeric",
+    "date_posted": "datetime",
+}
+
+
+@pytest.fixture
+def frame():
+    """Small frame with text, numeric and date columns, including missing values"""
+    return pd.DataFrame(
+        {
+            "title": ["HPV results", "Smear test", None, "hpv vaccine", "Biopsy"],
+            "forum": ["cervical", "Cervical", "ovarian", "cervical", "ovarian"],
+            "cluster": [1, 2, 3, None, 10],
+            "date_posted": [
+                "2025-01-05 10:00:00",
+                "2025-02-10",
+                "2025-03-01 08:30:00",
+                None,
+                "2024-12-31",
+            ],
+        }
+    )
+
+
+def sql_matches(frame, query):
+    """Row positions selected by the compiled SQL condition"""
+    compiled = compile_filter_query(query, COLUMNS)
+    with sqlite3.connect(":memory:") as conn:
+        register_sql_functions(conn)
+        conn.execute(
+            "CREATE TABLE t (pos INTEGER, title TEXT, forum TEXT, "
+            "cluster INTEGER, date_posted TIMESTAMP)"
+        )
+        rows = frame.astype(object).where(frame.notna(), None)
+        conn.executemany(
+            "INSERT INTO t VALUES (?, ?, ?, ?, ?)",
+            [(i, *row) for i, row in enumerate(rows.itertuples(index=False))],
+        )
+        where = compiled.sql or "1"
+        return [
+            row[0]
+            for row in conn.execute(
+                f"SELECT pos FROM t WHERE {where} ORDER BY pos", compiled.params
+            )
+        ]
+
+
+def mask_matches(frame, query):
+    """Row positions selected by the compiled pandas mask"""
+    mask = compile_filter_query(query, COLUMNS).mask(frame)
+    return [i for i, keep in enumerate(mask) if keep]
+
+
+class TestParsing:
+    """Tests for the filter grammar"""
+
+    def test_and_binds_tighter_than_or(self):
+        """a || b && c parses as a || (b && c)"""
+        tree = parse_filter_query("{a} eq 1 || {b} eq 2 && {c} eq 3")
+
+        assert tree[0] == "or"
+        assert tree[1][1][0] == "and"
+
+    def test_symbols_quotes_and_case_prefixes(self):
+        """Symbolic operators, quoted values and s/i prefixes are understood"""
+        tree = parse_filter_query(
+            "{title} icontains 'smear test' && {cluster} >= 2 && {forum} s= `x`"
+        )
+
+        assert tree == (
+            "and",
+            [
+                ("cmp", "title", "contains", "smear test"),
+                ("cmp", "cluster", "ge", "2"),
+                ("cmp", "forum", "eq", "x"),
+            ],
+        )
+
+    @pytest.mark.parametrize(
+        "query", ['{title} contains "open', "{title} frobnicates 1", "({a} eq 1"]
+    )
+    def test_malformed_queries_raise(self, query):
+        """Malformed queries raise FilterQuerySyntaxError"""
+        with pytest.raises(FilterQuerySyntaxError):
+            parse_filter_query(query)
+
+    def test_compiled_filters_are_cached(self):
+        """The same query and columns reuse one compiled predicate"""
+        first = compile_filter_query("{cluster} gt 1", COLUMNS)
+        second = compile_filter_query("{cluster} gt 1", dict(COLUMNS))
+
+        assert first is second
+
+    def test_unknown_columns_are_dropped(self):
+        """Comparisons on unlisted columns never reach SQL"""
+        compiled = compile_filter_query(
+            '{password_hash} eq "x" && {forum} eq cervical', COLUMNS
+        )
+
+        assert "password_hash" not in compiled.sql
+        assert compiled.columns == {"forum"}
+
+
+class TestEvaluation:
+    """SQL and mask evaluation give the same rows"""
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ('{title} contains "hpv"', [0, 3]),
+            ("{title} scontains HPV", [0, 3]),
+            ("{forum} eq cervical", [0, 1, 3]),
+            ("{forum} ne cervical", [2, 4]),
+            ("{cluster} gt 2", [2, 4]),
+            ("{cluster} le 2", [0, 1]),
+            ("{cluster} ne 2", [0, 2, 3, 4]),
+            ("{date_posted} ge 2025-02-01", [1, 2]),
+            ("{date_posted} lt 2025-01-05T12:00", [0, 4]),
+            ("{date_posted} datestartswith 2025-0", [0, 1, 2]),
+            ("{forum} eq ovarian || {title} contains smear", [1, 2, 4]),
+            ("!({forum} eq cervical) && {cluster} lt 5", [2]),
+            ("{title} gt M", [1, 3]),
+        ],
+    )
+    def test_sql_and_mask_agree(self, frame, query, expected):
+        """Both evaluations select the expected rows"""
+        assert mask_matches(frame, query) == expected
+        assert sql_matches(frame, query) == expected
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ('{title} contains "é"', [0, 1]),
+            ('{title} contains "ÉCHO"', [0]),
+            ("{forum} eq ÉTÉ", [1]),
+        ],
+    )
+    def test_non_ascii_case_folding_agrees(self, query, expected):
+        """SQL folds non-ASCII case the same way as the pandas mask"""
+        frame = pd.DataFrame(
+            {
+                "title": ["Écho results", "résumé", "Echo"],
+                "forum": ["cervical", "été", "ovarian"],
+                "cluster": [1, 2, 3],
+                "date_posted": [None, None, None],
+            }
+        )
+
+        assert mask_matches(frame, query) == expected
+        assert sql_matches(frame, query) == expected
+
+    def test_empty_query_matches_everything(self, frame):
+        """An empty query compiles to a falsy, match-all filter"""
+        compiled = compile_filter_query("", COLUMNS)
+
+        assert not compiled
+        assert compiled.mask(frame).all()
@@ -0,0 +1,114 @@
+"""
+Inference Feedback Upsert Test Suite
+
+Covers save_inference_feedback as a single INSERT ... ON CONFLICT statement
+(the preserve-rating / preserve-comment rules now live in SQL) and the
+optional coalescing of bursts of rating clicks.
+"""
+
+import sqlite3
+
+import pytest
+
+from utilities.mrpc_database import MRPCDatabase
+
+
+@pytest.fixture
+def feedback_db(tmp_path):
+    db_path = str(tmp_path / "feedback.db")
+    db = MRPCDatabase(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO posts (id, forum, original_title) VALUES (?, 'cervical', ?)",
+            [("post1", "First"), ("post2", "Second")],
+        )
+    yield db
+    db.flush_inference_feedback()
+
+
+def stored(db, response_id="resp1"):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute(
+            "SELECT rating, feedback_text, user_id FROM inference_feedback "
+            "WHERE response_id = ?",
+            (response_id,),
+        ).fetchall()
+
+
+def save(db, rating, text, data_id="post1", user_id=1, **kwargs):
+    return db.save_inference_feedback(
+        data_id, "llm_question", rating, text, "resp1", user_id=user_id, **kwargs
+    )
+
+
+class TestFeedbackUpsert:
+    """Tests for the merge rules applied by the upsert"""
+
+    def test_comment_keeps_rating_and_rating_keeps_comment(self, feedback_db):
+        assert save(feedback_db, "positive", "")
+        assert save(feedback_db, "text_update", "Helpful", user_id=2)
+        assert stored(feedback_db) == [("positive", "Helpful", 2)]
+
+        assert save(feedback_db, "negative", "")
+        assert stored(feedback_db) == [("negative", "Helpful", 1)]
+
+        assert save(feedback_db, "text_update", "Changed my mind")
+        assert stored(feedback_db) == [("negative", "Changed my mind", 1)]
+
+    def test_comment_before_any_rating(self, feedback_db):
+        assert save(feedback_db, "text_update", "First thoughts")
+        assert save(feedback_db, "text_update", "Second thoughts")
+
+        assert stored(feedback_db) == [("text_update", "Second thoughts", 1)]
+
+    def test_unknown_post_is_not_saved(self, feedback_db):
+        assert save(feedback_db, "positive", "", data_id="missing") is False
+        assert stored(feedback_db) == []
+
+
+class TestFeedbackCoalescing:
+    """Tests for buffered rating clicks"""
+
+    def test_burst_of_clicks_is_one_flush(self, feedback_db):
+        for rating in ("positive", "negative", "positive"):
+            assert save(feedback_db, rating, "", coalesce=True)
+        for data_id in ("post1", "post2"):
+            feedback_db.save_inference_feedback(
+                data_id, "llm_category", "negative", "", "resp2", 1, coalesce=True
+            )
+        assert stored(feedback_db) == []
+
+        assert feedback_db.flush_inference_feedback() == 5
+
+        assert stored(feedback_db) == [("positive", "", 1)]
+        assert len(stored(feedback_db, "resp2")) == 2
+        assert feedback_db._feedback_buffer().stats["flushes"] == 1
+
+    def test_direct_save_lands_after_pending_clicks(self, feedback_db):
+        save(feedback_db, "text_update", "Useful", coalesce=True)
+        save(feedback_db, "negative", "", coalesce=True)
+
+        assert save(feedback_db, "text_update", "Not that useful")
+
+        assert feedback_db._feedback_buffer().pending == 0
+        assert stored(feedback_db) == [("negative", "Not that useful", 1)]
+
+    def test_buffer_is_shared_across_instances(self, feedback_db):
+        other = MRPCDatabase(feedback_db.db_path)
+
+        save(other, "positive", "", coalesce=True)
+
+        assert feedback_db.flush_inference_feedback() == 1
+        assert stored(feedback_db) == [("positive", "", 1)]
+
+    def test_flush_does_not_use_the_creating_instance(self, feedback_db, monkeypatch):
+        creator = MRPCDatabase(feedback_db.db_path)
+        save(creator, "positive", "", coalesce=True)
+
+        def broken(write_fn):
+            raise AssertionError("flushed through the creating instance")
+
+        monkeypatch.setattr(creator, "_run_write", broken)
+
+        assert feedback_db.flush_inference_feedback() == 1
+        assert stored(feedback_db) == [("positive", "", 1)]
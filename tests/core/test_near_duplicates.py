@@ -0,0 +1,197 @@
+"""
+Near-Duplicate Detection Test Suite
+
+Covers the NumPy MinHash signatures, the SQLite LSH band index kept for every
+uploaded post, the upload-time flag/skip modes and find_near_duplicates.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+
+from utilities.minhash import band_buckets, estimated_similarity, minhash_signatures
+
+SMEAR = (
+    "I had my smear test last week and the results came back showing abnormal "
+    "cells, the nurse said I need a colposcopy and I am really worried about "
+    "what this means for me and whether it could be cancer"
+)
+SMEAR_REPOST = SMEAR.replace("last week", "on monday")
+CA125 = (
+    "My CA125 blood test came back slightly raised and my GP has referred me "
+    "for an ultrasound scan, has anyone else been through this and what happened"
+)
+
+
+def forum_frame(posts, prefix="Title"):
+    return pd.DataFrame(
+        {
+            "forum": "cervical",
+            "original_title": [f"{prefix} {i}" for i in range(len(posts))],
+            "original_post": posts,
+            "LLM_inferred_question": [
+                f"{prefix} question {i}?" for i in range(len(posts))
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def near_db(upload_database):
+    """Database with active uploads 1 and 2 owned by user 1 and upload 3 by user 2"""
+    return upload_database("near.db", {1: 1, 2: 1, 3: 2})
+
+
+def post_id(db, title):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute(
+            "SELECT post_id FROM posts WHERE original_title = ?", (title,)
+        ).fetchone()[0]
+
+
+def fetch(db, sql):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+class TestMinHash:
+    """Tests for the signature and banding functions"""
+
+    def test_similar_texts_share_buckets(self):
+        signatures, has_words = minhash_signatures(
+            pd.Series([SMEAR, SMEAR_REPOST, CA125, None, "  "])
+        )
+
+        assert has_words.tolist() == [True, True, True, False, False]
+        assert estimated_similarity(signatures[0], signatures[1])[0] > 0.6
+        assert estimated_similarity(signatures[0], signatures[2])[0] < 0.1
+        buckets = band_buckets(signatures)
+        assert (buckets[0] == buckets[1]).any()
+        assert not (buckets[0] == buckets[2]).any()
+
+    def test_signatures_do_not_depend_on_batch(self):
+        """A post signs the same alone as in a batch, so stored signatures compare"""
+        batch, _ = minhash_signatures(pd.Series([CA125, SMEAR, "short post"]))
+        alone, _ = minhash_signatures(pd.Series([SMEAR]))
+        short, _ = minhash_signatures(pd.Series(["Short POST"]))
+
+        assert (batch[1] == alone[0]).all()
+        assert (batch[2] == short[0]).all()
+
+
+class TestUploadNearDuplicates:
+    """Tests for the upload-time near-duplicate modes"""
+
+    def test_flag_mode_records_earlier_post(self, near_db):
+        """A re-scraped body with a new title is stored but flagged"""
+        near_db.upload_csv_data(1, forum_frame([SMEAR, CA125]), 1)
+
+        result = near_db.upload_csv_data(2, forum_frame([SMEAR_REPOST], "New"), 1)
+
+        assert result["new_records"] == 1 and result["near_duplicates"] == 1
+        assert "flagged 1 possible near-duplicates" in result["message"]
+        flagged = fetch(
+            near_db,
+            "SELECT p.original_title, m.near_duplicate_of FROM post_minhash m "
+            "JOIN posts p ON p.post_id = m.post_id WHERE m.near_duplicate_of IS NOT NULL",
+        )
+        assert flagged == [("New 0", post_id(near_db, "Title 0"))]
+
+    def test_skip_mode_leaves_near_duplicates_out(self, near_db):
+        near_db.upload_csv_data(1, forum_frame([SMEAR]), 1)
+
+        result = near_db.upload_csv_data(
+            2, forum_frame([SMEAR_REPOST, CA125], "New"), 1, near_duplicates="skip"
+        )
+
+        assert result["new_records"] == 1 and result["near_duplicates"] == 1
+        assert fetch(near_db, "SELECT COUNT(*) FROM posts") == [(2,)]
+
+    def test_rows_within_one_upload(self, near_db):
+        """A later row resembling an earlier row of the same file is caught"""
+        result = near_db.upload_csv_data(
+            1, forum_frame([SMEAR, CA125, SMEAR_REPOST]), 1, near_duplicates="skip"
+        )
+
+        assert result["new_records"] == 2 and result["near_duplicates"] == 1
+
+    def test_other_users_posts_are_not_compared(self, near_db):
+        near_db.upload_csv_data(1, forum_frame([SMEAR]), 1)
+
+        result = near_db.upload_csv_data(3, forum_frame([SMEAR_REPOST], "New"), 2)
+
+        assert result["near_duplicates"] == 0
+
+    def test_unknown_mode_fails(self, near_db):
+        result = near_db.upload_csv_data(1, forum_frame([SMEAR]), 1, "drop")
+
+        assert result["success"] is False
+        assert fetch(near_db, "SELECT COUNT(*) FROM posts") == [(0,)]
+
+
+class TestFindNearDuplicates:
+    """Tests for MRPCDatabase.find_near_duplicates"""
+
+    def test_returns_similar_posts_only(self, near_db):
+        near_db.upload_csv_data(1, forum_frame([SMEAR, CA125]), 1)
+        near_db.upload_csv_data(2, forum_frame([SMEAR_REPOST], "New"), 1)
+        near_db.upload_csv_data(3, forum_frame([SMEAR], "Other"), 2)
+
+        matches = near_db.find_near_duplicates(post_id(near_db, "Title 0"), user_id=1)
+
+        assert [m["original_title"] for m in matches] == ["New 0"]
+        assert 0.6 < matches[0]["similarity"] < 1
+        assert (
+            near_db.find_near_duplicates(post_id(near_db, "Title 1"), user_id=1) == []
+        )
+        # Posts of another user cannot be looked up
+        assert (
+            near_db.find_near_duplicates(post_id(near_db, "Title 0"), user_id=2) == []
+        )
+
+    def test_candidates_come_from_band_index(self, near_db, monkeypatch):
+        """The lookup searches post_lsh_bands by key instead of scanning it"""
+        near_db.upload_csv_data(1, forum_frame([SMEAR, SMEAR_REPOST]), 1)
+        statements = []
+        pooled_connect = near_db._connect
+
+        @contextmanager
+        def tracing_connect():
+            with pooled_connect() as conn:
+                conn.set_trace_callback(statements.append)
+                yield conn
+                conn.set_trace_callback(None)
+
+        monkeypatch.setattr(near_db, "_connect", tracing_connect)
+        near_db.find_near_duplicates(post_id(near_db, "Title 0"), user_id=1)
+
+        candidate_sql = next(s for s in statements if "post_lsh_bands" in s)
+        with sqlite3.connect(near_db.db_path) as conn:
+            plan = [
+                row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {candidate_sql}")
+            ]
+        assert any(step.startswith("SEARCH b USING PRIMARY KEY") for step in plan), plan
+        assert not any(step.startswith("SCAN b") for step in plan), plan
+
+    def test_deleted_posts_leave_the_index(self, near_db):
+        near_db.upload_csv_data(1, forum_frame([SMEAR, CA125]), 1)
+
+        near_db.delete_upload_and_data(1, user_id=1)
+
+        assert fetch(near_db, "SELECT COUNT(*) FROM post_lsh_bands") == [(0,)]
+        assert fetch(near_db, "SELECT COUNT(*) FROM post_minhash") == [(0,)]
+
+    def test_migration_indexes_existing_posts(self, near_db):
+        with sqlite3.connect(near_db.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO posts (id, forum, original_title, original_post, upload_id) "
+                "VALUES (?, 'cervical', ?, ?, 1)",
+                [("a", "Old", SMEAR), ("b", "Older", SMEAR_REPOST)],
+            )
+
+        near_db._migration_v6_to_v7()
+
+        matches = near_db.find_near_duplicates(post_id(near_db, "Old"), user_id=1)
+        assert [m["original_title"] for m in matches] == ["Older"]
@@ -0,0 +1,113 @@
+"""
+Post Detail Bundle Test Suite
+
+Covers MRPCDatabase.get_post_detail_bundle, which loads everything the post
+detail sidebar shows on one connection.
+"""
+
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def detail_db(upload_database):
+    """Two posts sharing a URL, with AI, user and feedback rows"""
+    db = upload_database("detail.db")
+
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO posts (id, forum, original_title, post_url, LLM_inferred_question, upload_id)
+            VALUES (?, 'cervical', 'Thread', 'http://example.com/t', ?, 1)
+            """,
+            [("d1", "What next?"), ("d2", "Is this normal?")],
+        )
+        conn.execute(
+            "INSERT INTO ai_categories (post_id, category_type, category_value) "
+            "SELECT post_id, 'topic', 'Screening' FROM posts WHERE id = 'd2'"
+        )
+        conn.execute(
+            "INSERT INTO users_questions (post_id, question_id, question_text) "
+            "SELECT post_id, 'q1', 'Ask the nurse' FROM posts WHERE id = 'd1'"
+        )
+        conn.execute(
+            "INSERT INTO users_categories (post_id, note_id, notes_text) "
+            "SELECT post_id, 'n1', 'Follow-up' FROM posts WHERE id = 'd2'"
+        )
+        conn.executemany(
+            """
+            INSERT INTO inference_feedback
+                (post_id, inference_type, rating, feedback_text, response_id, user_id, updated_at)
+            SELECT post_id, ?, ?, ?, ?, 1, ? FROM posts WHERE id = 'd1'
+            """,
+            [
+                (
+                    "LLM_inferred_question",
+                    "negative",
+                    "old",
+                    "r1",
+                    "2025-01-01 09:00:00",
+                ),
+                (
+                    "LLM_inferred_question",
+                    "positive",
+                    "new",
+                    "r2",
+                    "2025-01-02 09:00:00",
+                ),
+                ("llm_cluster_name", "positive", "", "r3", "2025-01-01 09:00:00"),
+            ],
+        )
+    return db
+
+
+class TestPostDetailBundle:
+    """Tests for MRPCDatabase.get_post_detail_bundle"""
+
+    def test_matches_individual_getters(self, detail_db):
+        """The bundle returns the same rows as the per-section getters"""
+        bundle = detail_db.get_post_detail_bundle("d1")
+
+        assert bundle["post_url"] == "http://example.com/t"
+        assert bundle["ai_questions"] == detail_db.get_ai_questions("d1")
+        assert bundle["ai_categories"] == detail_db.get_ai_categories("d1")
+        assert bundle["user_questions"] == detail_db.get_user_questions("d1")
+        assert bundle["category_notes"] == detail_db.get_category_notes("d1")
+        # Child content is shared across posts with the same URL
+        assert len(bundle["ai_questions"]) == 2
+        assert bundle["ai_categories"][0]["category_value"] == "Screening"
+
+    def test_latest_feedback_per_type(self, detail_db):
+        """Feedback is keyed by inference type and matches get_inference_feedback"""
+        feedback = detail_db.get_post_detail_bundle("d1")["feedback"]
+
+        assert set(feedback) == {"LLM_inferred_question", "llm_cluster_name"}
+        assert feedback["LLM_inferred_question"]["response_id"] == "r2"
+        assert feedback["LLM_inferred_question"] == detail_db.get_inference_feedback(
+            "d1", "LLM_inferred_question"
+        )
+        # Feedback belongs to the clicked post, not every post with its URL
+        assert detail_db.get_post_detail_bundle("d2")["feedback"] == {}
+
+    def test_uses_one_connection(self, detail_db, monkeypatch):
+        """The whole bundle is read on a single borrowed connection"""
+        borrowed = []
+        pooled_connect = detail_db._connect
+
+        def counting_connect():
+            borrowed.append(1)
+            return pooled_connect()
+
+        monkeypatch.setattr(detail_db, "_connect", counting_connect)
+        detail_db.get_post_detail_bundle("d1")
+
+        assert len(borrowed) == 1
+
+    def test_unknown_post(self, detail_db):
+        """Unknown ids return an empty bundle"""
+        bundle = detail_db.get_post_detail_bundle("missing")
+
+        assert bundle["post_id"] is None
+        assert bundle["ai_questions"] == bundle["user_questions"] == []
+        assert bundle["feedback"] == {}
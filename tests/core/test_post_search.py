@@ -0,0 +1,184 @@
+"""
+Full-text Post Search Test Suite
+
+Covers the post_search FTS5 index (trigger sync and v3 -> v4 migration
+backfill) and MRPCDatabase.search_posts.
+"""
+
+import sqlite3
+
+import pytest
+
+from utilities.mrpc_database import MRPCDatabase
+
+
+@pytest.fixture
+def search_db(upload_database):
+    """Database with posts for two users across two forums"""
+    db = upload_database("search.db", {1: 1, 2: 2})
+
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO posts (id, forum, original_title, original_post, post_url, upload_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    "s1",
+                    "cervical",
+                    "Smear test results",
+                    "Waiting for my colposcopy appointment",
+                    "http://example.com/1",
+                    1,
+                ),
+                (
+                    "s2",
+                    "cervical",
+                    "Feeling anxious",
+                    "My smear came back with abnormal cells",
+                    "http://example.com/2",
+                    1,
+                ),
+                (
+                    "s3",
+                    "ovarian",
+                    "CA125 levels",
+                    "Blood tests every month",
+                    "http://example.com/3",
+                    1,
+                ),
+                (
+                    "s4",
+                    "cervical",
+                    "Smear worries",
+                    "Another user's post",
+                    "http://example.com/4",
+                    2,
+                ),
+            ],
+        )
+    return db
+
+
+def post_id_for(db, item_id):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute(
+            "SELECT post_id FROM posts WHERE id = ?", (item_id,)
+        ).fetchone()[0]
+
+
+def search_ids(db, query, **kwargs):
+    return [r["id"] for r in db.search_posts(query, user_id=1, **kwargs)]
+
+
+class TestSearchIndexSync:
+    """Triggers keep post_search in step with the source tables"""
+
+    def test_new_posts_are_searchable(self, search_db):
+        """Inserted posts are indexed by title and body"""
+        assert search_ids(search_db, "colposcopy") == ["s1"]
+
+    def test_child_text_is_indexed(self, search_db):
+        """AI questions, user questions/notes and category notes are searchable"""
+        post_id = post_id_for(search_db, "s3")
+        with sqlite3.connect(search_db.db_path) as conn:
+            conn.execute(
+                "INSERT INTO ai_questions (post_id, question_text) VALUES (?, ?)",
+                (post_id, "What does a rising marker mean?"),
+            )
+            conn.execute(
+                "INSERT INTO users_questions (post_id, question_id, question_text, notes_text) "
+                "VALUES (?, 'q1', 'Ask about scans', 'oncologist follow-up')",
+                (post_id,),
+            )
+            conn.execute(
+                "INSERT INTO users_categories (post_id, note_id, notes_text) "
+                "VALUES (?, 'n1', 'Tumour marker discussion')",
+                (post_id,),
+            )
+
+        assert search_ids(search_db, "rising marker") == ["s3"]
+        assert search_ids(search_db, "oncologist") == ["s3"]
+        assert search_ids(search_db, "tumour") == ["s3"]
+
+        with sqlite3.connect(search_db.db_path) as conn:
+            conn.execute("DELETE FROM users_categories WHERE post_id = ?", (post_id,))
+        assert search_ids(search_db, "tumour") == []
+
+    def test_updates_and_deletes_are_reflected(self, search_db):
+        """Editing or deleting a post updates the index"""
+        with sqlite3.connect(search_db.db_path) as conn:
+            conn.execute(
+                "UPDATE posts SET original_title = 'HPV vaccine' WHERE id = 's3'"
+            )
+            conn.execute("DELETE FROM posts WHERE id = 's1'")
+
+        assert search_ids(search_db, "vaccine") == ["s3"]
+        assert search_ids(search_db, "colposcopy") == []
+
+    def test_migration_backfills_existing_posts(self, search_db):
+        """A v3 database gets the index and its existing posts on upgrade"""
+        with sqlite3.connect(search_db.db_path) as conn:
+            triggers = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                    "AND name LIKE 'post_search_%'"
+                )
+            ]
+            for trigger in triggers:
+                conn.execute(f"DROP TRIGGER {trigger}")
+            conn.execute("DROP TABLE post_search")
+            conn.execute("INSERT INTO schema_version (version) VALUES (3)")
+
+        MRPCDatabase.reset_initialization_cache(search_db.db_path)
+        db = MRPCDatabase(search_db.db_path)
+
+        assert db._get_schema_version() == MRPCDatabase.CURRENT_SCHEMA_VERSION
+        assert search_ids(db, "colposcopy") == ["s1"]
+
+
+class TestSearchPosts:
+    """Tests for MRPCDatabase.search_posts"""
+
+    def test_ranked_with_snippets(self, search_db):
+        """Title matches outrank body matches and snippets highlight the term"""
+        results = search_db.search_posts("smear", user_id=1)
+
+        assert [r["id"] for r in results] == ["s1", "s2"]
+        assert results[0]["score"] <= results[1]["score"]
+        assert "<mark>" in results[1]["snippet"]
+
+    def test_scoped_to_user_and_forum(self, search_db):
+        """Other users' posts and other forums are excluded"""
+        assert "s4" not in search_ids(search_db, "smear")
+        assert search_ids(search_db, "test", forum="ovarian") == ["s3"]
+
+    def test_prefix_and_paging(self, search_db):
+        """The last word matches as a prefix; limit/offset page the results"""
+        assert search_ids(search_db, "colpo") == ["s1"]
+        assert search_ids(search_db, "smear", limit=1, offset=1) == ["s2"]
+
+    @pytest.mark.parametrize("query", ['smear"', "smear AND OR NOT", "(smear", ""])
+    def test_user_input_never_breaks_match_syntax(self, search_db, query):
+        """FTS5 operators and stray quotes are treated as plain text"""
+        assert isinstance(search_db.search_posts(query, user_id=1), list)
+
+    def test_datatable_page_search(self, search_db):
+        """The table's search box narrows the paged datatable to matching titles"""
+        page = search_db.get_datatable_page(search="abnormal", user_id=1)
+
+        assert page["data"]["original_title"].tolist() == ["Feeling anxious"]
+
+    def test_datatable_search_ignores_other_users_matches(self, search_db):
+        """Another user's matching post does not pull in a title both users have"""
+        with sqlite3.connect(search_db.db_path) as conn:
+            conn.execute(
+                "INSERT INTO posts (id, forum, original_title, original_post, upload_id) "
+                "VALUES ('s5', 'ovarian', 'CA125 levels', 'Abnormal result', 2)"
+            )
+
+        page = search_db.get_datatable_page(search="abnormal", user_id=1)
+
+        assert page["data"]["original_title"].tolist() == ["Feeling anxious"]
@@ -0,0 +1,167 @@
+"""
+Query Plan Regression Test Suite
+
+Runs EXPLAIN QUERY PLAN over the SQL the hot lookup methods actually issue
+and asserts they search the composite indexes added in schema v5.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+from utilities.mrpc_database import MRPCDatabase
+
+LOOKUP_INDEXES = {
+    "idx_posts_post_url",
+    "idx_posts_upload_date",
+    "idx_posts_original_title",
+    "idx_uploads_owner_status",
+}
+
+
+@pytest.fixture
+def plan_db(upload_database):
+    """Database with one upload, two posts sharing a URL, and child rows"""
+    db = upload_database("plans.db")
+
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany(
+            "INSERT INTO posts (id, forum, original_title, post_url, date_posted, upload_id) "
+            "VALUES (?, 'cervical', 'Same thread', 'http://example.com/t', ?, 1)",
+            [("plan_1", "2025-01-01"), ("plan_2", "2025-01-02")],
+        )
+        conn.execute(
+            "INSERT INTO ai_questions (post_id, question_text) "
+            "SELECT post_id, 'Question' FROM posts"
+        )
+        conn.execute(
+            "INSERT INTO ai_categories (post_id, category_type, category_value) "
+            "SELECT post_id, 'topic', 'Screening' FROM posts"
+        )
+        conn.execute(
+            "INSERT INTO users_questions (post_id, question_id, question_text) "
+            "SELECT post_id, 'q_' || id, 'Mine' FROM posts"
+        )
+    return db
+
+
+def captured_statements(db, monkeypatch, call):
+    """SELECT statements (with bound values) issued while running call()"""
+    statements = []
+    pooled_connect = db._connect
+
+    @contextmanager
+    def tracing_connect():
+        with pooled_connect() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    monkeypatch.setattr(db, "_connect", tracing_connect)
+    call()
+    return [s for s in statements if s.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def query_plan(db, sql):
+    with sqlite3.connect(db.db_path) as conn:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def post_url_join_plans(db, monkeypatch, call):
+    """Plans of the statements that filter on post_url"""
+    statements = captured_statements(db, monkeypatch, call)
+    plans = [query_plan(db, s) for s in statements if "post_url =" in s]
+    assert plans, "expected a post_url lookup"
+    return plans
+
+
+class TestLookupIndexes:
+    """The v5 indexes exist and replace the single-column ones"""
+
+    def test_indexes_created(self, plan_db):
+        """New databases get all composite lookup indexes"""
+        with sqlite3.connect(plan_db.db_path) as conn:
+            indexes = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+
+        assert LOOKUP_INDEXES <= indexes
+        assert "idx_posts_upload_id" not in indexes
+        assert "idx_uploads_uploaded_by" not in indexes
+
+    def test_migration_adds_indexes(self, plan_db):
+        """A v4 database gets the indexes on upgrade"""
+        with sqlite3.connect(plan_db.db_path) as conn:
+            for index in LOOKUP_INDEXES:
+                conn.execute(f"DROP INDEX {index}")
+            conn.execute("CREATE INDEX idx_posts_upload_id ON posts(upload_id)")
+            conn.execute("DELETE FROM schema_version WHERE version > 4")
+
+        MRPCDatabase.reset_initialization_cache(plan_db.db_path)
+        db = MRPCDatabase(plan_db.db_path)
+
+        assert db._get_schema_version() == MRPCDatabase.CURRENT_SCHEMA_VERSION
+        with sqlite3.connect(db.db_path) as conn:
+            indexes = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        assert LOOKUP_INDEXES <= indexes
+        assert "idx_posts_upload_id" not in indexes
+
+
+class TestHotQueryPlans:
+    """EXPLAIN QUERY PLAN for the post-detail and datatable queries"""
+
+    @pytest.mark.parametrize(
+        "method", ["get_ai_questions", "get_ai_categories", "get_user_questions"]
+    )
+    def test_post_url_lookups_use_index(self, plan_db, monkeypatch, method):
+        """post_url filters search idx_posts_post_url instead of scanning posts"""
+        results = []
+        plans = post_url_join_plans(
+            plan_db,
+            monkeypatch,
+            lambda: results.append(getattr(plan_db, method)("plan_1")),
+        )
+
+        assert results[0], "lookup should still return the shared-URL rows"
+        for plan in plans:
+            assert any("idx_posts_post_url" in step for step in plan), plan
+            assert not any(step.startswith("SCAN p") for step in plan), plan
+
+    def test_joined_lookups_are_covering(self, plan_db, monkeypatch):
+        """Joins to child tables read post_id from the index without touching posts"""
+        (plan,) = post_url_join_plans(
+            plan_db, monkeypatch, lambda: plan_db.get_user_questions("plan_1")
+        )
+
+        assert any("COVERING INDEX idx_posts_post_url" in step for step in plan)
+
+    def test_visible_posts_use_owner_and_upload_indexes(self, plan_db, monkeypatch):
+        """The datatable's upload ownership join searches both composite indexes"""
+        statements = captured_statements(
+            plan_db,
+            monkeypatch,
+            lambda: plan_db.get_datatable_page(page_size=10, user_id=1),
+        )
+        plan = query_plan(plan_db, statements[-1])
+
+        assert any("idx_uploads_owner_status" in step for step in plan), plan
+        assert any("idx_posts_upload_date" in step for step in plan), plan
+
+    def test_title_lookup_uses_index(self, plan_db):
+        """Equality lookups on original_title search idx_posts_original_title"""
+        plan = query_plan(
+            plan_db, "SELECT post_id FROM posts WHERE original_title = 'Same thread'"
+        )
+
+        assert any("idx_posts_original_title" in step for step in plan), plan
@@ -0,0 +1,144 @@
+"""
+Streaming Upload Test Suite
+
+Covers chunked CSV ingestion: lazy base64 decoding, per-chunk commits while
+the upload is hidden as 'processing', and cleanup when a later chunk cannot
+be read.
+"""
+
+import base64
+import io
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utilities.mrpc_database import MRPCDatabase
+from utilities.upload_service import UploadService, _Base64Reader
+
+
+def forum_csv(rows):
+    """Forum CSV text with the columns validate_csv_structure expects"""
+    frame = pd.DataFrame(
+        {
+            "forum": "cervical",
+            "original_title": [f"Title {i}" for i in range(rows)],
+            "original_post": [f"Body {i}" for i in range(rows)],
+            "post_url": [f"http://example.com/{i}" for i in range(rows)],
+            "LLM_inferred_question": [f"Question {i}?" for i in range(rows)],
+            "llm_cluster_name": "Screening",
+            "umap_x": 0.1,
+            "umap_y": 0.2,
+            "umap_z": 0.3,
+        }
+    )
+    return frame.to_csv(index=False)
+
+
+def as_contents(text):
+    return "data:text/csv;base64," + base64.b64encode(text.encode("utf-8")).decode()
+
+
+@pytest.fixture
+def stream_service(tmp_path):
+    """UploadService writing to a temporary database"""
+    service = UploadService()
+    service.db = MRPCDatabase(str(tmp_path / "stream.db"))
+    return service
+
+
+def count_posts(service):
+    with sqlite3.connect(service.db.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+
+class TestStreamingUpload:
+    """Tests for UploadService.process_csv_stream / MRPCDatabase.upload_csv_stream"""
+
+    def test_base64_reader_decodes_across_blocks(self, monkeypatch):
+        """Lazy decoding matches b64decode whatever the block boundaries"""
+        monkeypatch.setattr(_Base64Reader, "BLOCK_CHARS", 8)
+        text = forum_csv(7) + "naïve café\n"
+        encoded = base64.b64encode(text.encode("utf-8")).decode()
+
+        stream = io.TextIOWrapper(
+            io.BufferedReader(_Base64Reader(encoded), buffer_size=5), encoding="utf-8"
+        )
+
+        assert stream.read() == text
+
+    def test_chunks_are_all_inserted(self, stream_service):
+        """Every chunk lands and the result counts the whole file"""
+        result = stream_service.process_csv_stream(
+            io.StringIO(forum_csv(23)), "big.csv", "Big", user_id=1, chunksize=5
+        )
+
+        assert result["success"], result["message"]
+        assert result["new_records"] == result["total_processed"] == 23
+        assert count_posts(stream_service) == 23
+        upload = stream_service.db.get_upload_by_id(result["upload_id"])
+        assert upload["records_count"] == 23
+
+    def test_duplicates_skipped_across_chunks(self, stream_service):
+        """Re-streaming the same file skips every row, in every chunk"""
+        stream_service.process_csv_stream(
+            io.StringIO(forum_csv(12)), "a.csv", "A", user_id=1, chunksize=5
+        )
+        result = stream_service.process_csv_stream(
+            io.StringIO(forum_csv(12)), "b.csv", "B", user_id=1, chunksize=5
+        )
+
+        assert result["duplicates_skipped"] == 12
+        assert result["new_records"] == 0
+
+    def test_bad_later_chunk_rolls_back_upload(self, stream_service):
+        """A parse error after the first chunk leaves no rows and no upload behind"""
+        text = forum_csv(12) + "cervical,extra,fields,in,this,row,x,1,2,3,4\n"
+
+        result = stream_service.process_csv_stream(
+            io.StringIO(text), "bad.csv", "Bad", user_id=1, chunksize=5
+        )
+
+        assert result["success"] is False
+        assert "Error reading CSV file after row 10" in result["message"]
+        assert count_posts(stream_service) == 0
+        assert stream_service.db.get_all_uploads(user_id=1) == []
+
+    def test_write_lock_is_released_between_chunks(self, stream_service):
+        """Other writers get in between chunks and never see a partial upload"""
+        db = stream_service.db
+        upload_id = db.create_upload_record("c.csv", "C", 1)
+        seen = []
+        badges = []
+
+        def chunks():
+            for chunk in pd.read_csv(io.StringIO(forum_csv(10)), chunksize=5):
+                yield chunk
+                badges.append(db.get_all_uploads(user_id=1)[0]["status_style"])
+                with sqlite3.connect(db.db_path, timeout=0) as conn:
+                    conn.execute("UPDATE users SET is_active = is_active")
+                    seen.append(
+                        conn.execute(
+                            "SELECT status FROM uploads WHERE id = ?", (upload_id,)
+                        ).fetchone()[0]
+                    )
+
+        result = db.upload_csv_stream(upload_id, chunks(), user_id=1)
+
+        assert result["success"], result["message"]
+        assert seen == ["processing", "processing"]
+        assert badges[0] == {"color": "info", "icon": "⏳"}
+        assert db.get_upload_by_id(upload_id)["status"] == "active"
+        assert count_posts(stream_service) == 10
+
+    def test_process_file_upload_streams_base64(self, stream_service, monkeypatch):
+        """The dcc.Upload entry point streams its base64 contents"""
+        monkeypatch.setattr(UploadService, "CSV_CHUNK_ROWS", 4)
+        monkeypatch.setattr("utilities.upload_service.get_current_user_id", lambda: 1)
+
+        result = stream_service.process_file_upload(
+            as_contents(forum_csv(10)), "f.csv", "F", expected_type="forum_data"
+        )
+
+        assert result["success"], result["message"]
+        assert result["new_records"] == 10
@@ -0,0 +1,215 @@
+"""
+Tag Registry Test Suite
+
+Covers the trigger-maintained tag_registry counts, their reconciliation
+against ai_categories, the periodic task that runs it and the cached tag
+vocabulary behind get_available_tags.
+"""
+
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+
+from utilities.maintenance import PeriodicTask
+from utilities.mrpc_database import MRPCDatabase
+
+
+def forum_frame(clusters):
+    return pd.DataFrame(
+        {
+            "forum": "cervical",
+            "original_title": [f"Title {i}" for i in range(len(clusters))],
+            "original_post": [f"Body {i}" for i in range(len(clusters))],
+            "LLM_inferred_question": [f"Question {i}?" for i in range(len(clusters))],
+            "llm_cluster_name": clusters,
+        }
+    )
+
+
+@pytest.fixture
+def tag_db(upload_database):
+    """Database with active uploads 1 and 2 owned by user 1"""
+    return upload_database("tags.db", {1: 1, 2: 1})
+
+
+def registry(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return {
+            (tag_type, value): count
+            for tag_type, value, count in conn.execute(
+                "SELECT tag_type, tag_value, usage_count FROM tag_registry"
+            )
+        }
+
+
+def item_id(db, title):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute(
+            "SELECT id FROM posts WHERE original_title = ?", (title,)
+        ).fetchone()[0]
+
+
+class TestIncrementalRegistry:
+    """Tests for the ai_categories triggers"""
+
+    def test_uploads_adjust_counts(self, tag_db):
+        tag_db.upload_csv_data(1, forum_frame(["Surgery", "Surgery", "Diet"]), 1)
+        tag_db.upload_csv_data(2, forum_frame(["Diet"]).assign(original_title="New"), 1)
+
+        assert registry(tag_db) == {("group", "Surgery"): 2, ("group", "Diet"): 2}
+
+    def test_saving_tags_touches_only_that_post(self, tag_db):
+        """Replacing a post's tags moves counts without rebuilding the registry"""
+        tag_db.upload_csv_data(1, forum_frame(["Surgery", "Surgery"]), 1)
+        with sqlite3.connect(tag_db.db_path) as conn:
+            conn.execute(
+                "DELETE FROM ai_categories WHERE post_id = "
+                "(SELECT post_id FROM posts WHERE original_title = 'Title 0')"
+            )
+        assert registry(tag_db) == {("group", "Surgery"): 1}
+
+        saved = tag_db.save_tags_for_item(
+            item_id(tag_db, "Title 1"),
+            {"groups": ["Diet"], "subgroups": ["Meals"], "tags": ["Fibre", "Fibre"]},
+        )
+
+        assert saved
+        assert registry(tag_db) == {
+            ("group", "Diet"): 1,
+            ("subgroup", "Meals"): 1,
+            ("tag", "Fibre"): 2,
+        }
+        assert tag_db.reconcile_tag_registry()["corrected"] == 0
+
+    def test_updates_move_counts(self, tag_db):
+        tag_db.upload_csv_data(1, forum_frame(["Surgery", "Diet"]), 1)
+
+        with sqlite3.connect(tag_db.db_path) as conn:
+            conn.execute(
+                "UPDATE ai_categories SET category_value = 'Diet' "
+                "WHERE category_value = 'Surgery'"
+            )
+            conn.execute(
+                "UPDATE ai_categories SET category_type = 'theme' "
+                "WHERE post_id = (SELECT MIN(post_id) FROM posts)"
+            )
+
+        assert registry(tag_db) == {("group", "Diet"): 1}
+
+
+class TestReconciliation:
+    """Tests for MRPCDatabase.reconcile_tag_registry and PeriodicTask"""
+
+    def test_repairs_drift(self, tag_db):
+        tag_db.upload_csv_data(1, forum_frame(["Surgery", "Surgery", "Diet"]), 1)
+        with sqlite3.connect(tag_db.db_path) as conn:
+            conn.execute(
+                "UPDATE tag_registry SET usage_count = 7 WHERE tag_value = 'Surgery'"
+            )
+            conn.execute("DELETE FROM tag_registry WHERE tag_value = 'Diet'")
+            conn.execute(
+                "INSERT INTO tag_registry (tag_type, tag_value, usage_count) "
+                "VALUES ('tag', 'Orphan', 3)"
+            )
+
+        result = tag_db.reconcile_tag_registry()
+
+        assert result["success"] and result["corrected"] == 3
+        assert registry(tag_db) == {("group", "Surgery"): 2, ("group", "Diet"): 1}
+        assert tag_db.reconcile_tag_registry()["corrected"] == 0
+
+    def test_migration_adds_triggers_and_rebuilds(self, tag_db):
+        with sqlite3.connect(tag_db.db_path) as conn:
+            for trigger in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE 'tag_registry_%'"
+            ).fetchall():
+                conn.execute(f"DROP TRIGGER {trigger[0]}")
+        tag_db.upload_csv_data(1, forum_frame(["Surgery"]), 1)
+        assert registry(tag_db) == {}
+
+        tag_db._migration_v8_to_v9()
+
+        assert registry(tag_db) == {("group", "Surgery"): 1}
+        tag_db.upload_csv_data(
+            2, forum_frame(["Surgery"]).assign(original_title="New"), 1
+        )
+        assert registry(tag_db) == {("group", "Surgery"): 2}
+
+    def test_periodic_task_survives_errors(self):
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise RuntimeError("database is locked")
+
+        task = PeriodicTask("test-task", failing, interval=60)
+
+        assert task.run_once() is None
+        assert calls == [1]
+
+
+class TestTagVocabularyCache:
+    """Tests for the per-process vocabulary behind get_available_tags"""
+
+    def trace_statements(self, db, monkeypatch):
+        statements = []
+        pooled_connect = db._connect
+
+        @contextmanager
+        def tracing_connect():
+            with pooled_connect() as conn:
+                conn.set_trace_callback(statements.append)
+                yield conn
+                conn.set_trace_callback(None)
+
+        monkeypatch.setattr(db, "_connect", tracing_connect)
+        return statements
+
+    def test_cached_until_an_entry_appears(self, tag_db, monkeypatch):
+        tag_db.upload_csv_data(1, forum_frame(["Surgery", "Diet"]), 1)
+        assert tag_db.get_available_tags() == {
+            "groups": ["Diet", "Surgery"],
+            "subgroups": [],
+            "tags": [],
+        }
+        statements = self.trace_statements(tag_db, monkeypatch)
+
+        # Only counts change: the vocabulary is served from the cache
+        tag_db.upload_csv_data(2, forum_frame(["Diet"]).assign(original_title="New"), 1)
+        statements.clear()
+        assert tag_db.get_available_tags()["groups"] == ["Diet", "Surgery"]
+        assert not any(re.search(r"FROM tag_registry\b", sql) for sql in statements)
+
+        tag_db.save_tags_for_item(item_id(tag_db, "New"), {"tags": ["Fibre"]})
+        assert tag_db.get_available_tags() == {
+            "groups": ["Diet", "Surgery"],
+            "subgroups": [],
+            "tags": ["Fibre"],
+        }
+
+    def test_removed_entries_leave_the_vocabulary(self, tag_db):
+        tag_db.upload_csv_data(1, forum_frame(["Surgery"]), 1)
+        assert tag_db.get_available_tags()["groups"] == ["Surgery"]
+
+        tag_db.save_tags_for_item(item_id(tag_db, "Title 0"), {"groups": ["Diet"]})
+
+        assert tag_db.get_available_tags()["groups"] == ["Diet"]
+
+    def test_new_database_at_same_path_is_not_stale(self, tmp_path):
+        db_path = str(tmp_path / "reused.db")
+        db = MRPCDatabase(db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO tag_registry (tag_type, tag_value) VALUES ('tag', 'Old')"
+            )
+        assert db.get_available_tags()["tags"] == ["Old"]
+
+        os.remove(db_path)
+        MRPCDatabase.reset_initialization_cache(db_path)
+
+        assert MRPCDatabase(db_path).get_available_tags()["tags"] == []
@@ -0,0 +1,161 @@
+"""
+Transcription Ingestion Test Suite
+
+Covers the columnar conversion layer (typed arrays with validity masks) and
+MRPCDatabase.save_transcription_data, which inserts with one executemany and
+reports conversion failures per column.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.column_conversion import to_boolean, to_int, to_likert, to_timestamp
+from utilities.mrpc_database import MRPCDatabase
+
+BOOLEAN_COLUMNS = [
+    "zoom_ease",
+    "resource_access",
+    "info_missing",
+    "info_takeaway_desired",
+    "exercise_engaged",
+    "lifestyle_change",
+    "postop_adherence",
+    "family_involved",
+    "support_needed",
+]
+LIKERT_COLUMNS = [
+    "poll_usability",
+    "presession_anxiety",
+    "reassurance_provided",
+    "info_useful",
+]
+
+
+def transcription_frame(rows):
+    """Transcription upload with distinct values in every converted column"""
+    frame = pd.DataFrame(
+        {
+            "session_id": [f"S{i}" for i in range(rows)],
+            "participant_id": [f"P{i}" for i in range(rows)],
+            "session_date": "2025-03-01 10:30",
+            "session_duration": "45.7",
+        }
+    )
+    for offset, column in enumerate(BOOLEAN_COLUMNS):
+        frame[column] = [(i + offset) % 2 == 0 for i in range(rows)]
+    for offset, column in enumerate(LIKERT_COLUMNS):
+        frame[column] = [(i + offset) % 5 + 1 for i in range(rows)]
+    return frame
+
+
+@pytest.fixture
+def transcription_db(tmp_path):
+    db_path = str(tmp_path / "transcriptions.db")
+    db = MRPCDatabase(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO uploads (id, filename, user_readable_name, uploaded_by, status, upload_type) "
+            "VALUES (1, 't.csv', 'T', '1', 'active', 'transcription_data')"
+        )
+    return db
+
+
+def fetch_rows(db):
+    with sqlite3.connect(db.db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        return [
+            dict(row)
+            for row in conn.execute("SELECT * FROM transcriptions ORDER BY id")
+        ]
+
+
+class TestColumnConversion:
+    """Tests for the vectorized converters"""
+
+    def test_boolean_object_column(self):
+        """Strings, bools and 0/1 convert; other values are flagged invalid"""
+        series = pd.Series([" TRUE", "false", "1", 0, True, None, "yes", 1.0])
+        values, valid, invalid = to_boolean(series)
+
+        assert values[valid].tolist() == [True, False, True, False, True]
+        assert valid.tolist() == [True] * 5 + [False] * 3
+        assert invalid.tolist() == [False] * 6 + [True, True]
+
+    def test_boolean_numeric_columns(self):
+        """A 0/1 column widened to float by a blank cell still converts"""
+        values, valid, invalid = to_boolean(pd.Series([1.0, np.nan, 0.0, 2.0]))
+
+        assert valid.tolist() == [True, False, True, False]
+        assert values[valid].tolist() == [True, False]
+        assert invalid.tolist() == [False, False, False, True]
+
+    def test_likert(self):
+        """Only integers 1-5 are valid; booleans and fractions are not"""
+        values, valid, invalid = to_likert(pd.Series(["3", " 5 ", 0, 2.5, None, "x"]))
+        assert values[valid].tolist() == [3, 5]
+        assert invalid.tolist() == [False, False, True, True, False, True]
+
+        assert to_likert(pd.Series([1.0, np.nan, 4.0]))[1].tolist() == [
+            True,
+            False,
+            True,
+        ]
+        assert to_likert(pd.Series([True, False]))[2].all()
+
+    def test_int_and_timestamp(self):
+        values, valid, _ = to_int(pd.Series(["45.7", " 12", "n/a", None]))
+        assert values[valid].tolist() == [45, 12]
+
+        values, valid, _ = to_timestamp(pd.Series(["2025-03-01 10:30", "soon", None]))
+        assert values[:2].tolist() == ["2025-03-01T10:30:00", "soon"]
+        assert valid.tolist() == [True, True, False]
+
+
+class TestSaveTranscriptionData:
+    """Tests for MRPCDatabase.save_transcription_data"""
+
+    def test_values_land_in_their_columns(self, transcription_db):
+        """Every converted column is stored under its own name"""
+        frame = transcription_frame(6)
+
+        result = transcription_db.save_transcription_data(frame, 1)
+
+        assert result["success"] and result["records_saved"] == 6
+        rows = fetch_rows(transcription_db)
+        for i, row in enumerate(rows):
+            assert row["session_id"] == f"S{i}"
+            assert row["session_date"] == "2025-03-01T10:30:00"
+            assert row["session_duration"] == 45
+            for column in BOOLEAN_COLUMNS + LIKERT_COLUMNS:
+                assert row[column] == int(frame[column][i]), column
+        assert transcription_db.get_upload_by_id(1)["records_count"] == 6
+
+    def test_missing_and_blank_cells_are_null(self, transcription_db):
+        """Absent columns and empty cells are stored as NULL"""
+        frame = transcription_frame(3).drop(columns=["session_date"])
+        frame = frame.astype({"zoom_ease": object})
+        frame.loc[1, "poll_usability"] = np.nan
+        frame.loc[2, "zoom_ease"] = None
+
+        assert transcription_db.save_transcription_data(frame, 1)["success"]
+
+        rows = fetch_rows(transcription_db)
+        assert [row["session_date"] for row in rows] == [None] * 3
+        assert [row["poll_usability"] for row in rows] == [1, None, 3]
+        assert rows[2]["zoom_ease"] is None
+
+    def test_conversion_errors_counted_per_column(self, transcription_db):
+        """Invalid values fail the upload with a count for each column"""
+        frame = transcription_frame(5).astype({"zoom_ease": object})
+        frame.loc[[0, 3], "zoom_ease"] = "maybe"
+        frame.loc[4, "info_useful"] = 9
+
+        result = transcription_db.save_transcription_data(frame, 1)
+
+        assert result["success"] is False
+        assert result["conversion_errors"] == {"zoom_ease": 2, "info_useful": 1}
+        assert "zoom_ease: 2 invalid values (e.g. 'maybe')" in result["message"]
+        assert fetch_rows(transcription_db) == []
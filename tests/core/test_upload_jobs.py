@@ -0,0 +1,252 @@
+"""
+Background Upload Job Test Suite
+
+Covers the SQLite job table (claiming, progress, cancellation and recovery of
+jobs interrupted by a worker restart) and the runner that ingests spooled
+uploads off the request path.
+"""
+
+import sqlite3
+import time
+
+import pandas as pd
+import pytest
+
+from utilities.mrpc_database import MRPCDatabase
+from utilities.upload_jobs import (
+    TERMINAL_JOB_STATUSES,
+    UploadJobRunner,
+    UploadJobStore,
+    count_data_rows,
+)
+from utilities.upload_service import UploadService
+from utilities.upload_spool import UploadSpool
+
+
+def forum_csv(rows):
+    """Forum CSV text with the columns validate_csv_structure expects"""
+    frame = pd.DataFrame(
+        {
+            "forum": "cervical",
+            "original_title": [f"Title {i}" for i in range(rows)],
+            "original_post": [f"Body {i}" for i in range(rows)],
+            "LLM_inferred_question": [f"Question {i}?" for i in range(rows)],
+            "umap_x": 0.1,
+            "umap_y": 0.2,
+            "umap_z": 0.3,
+        }
+    )
+    return frame.to_csv(index=False)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadJobStore(str(tmp_path / "jobs.db"))
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    monkeypatch.setattr("utilities.upload_service.upload_spool", spool)
+    monkeypatch.setattr("utilities.upload_jobs.upload_spool", spool)
+    return spool
+
+
+@pytest.fixture
+def runner(tmp_path, store, spool):
+    """Runner over a temporary database; workers are started per test"""
+    service = UploadService()
+    service.db = MRPCDatabase(str(tmp_path / "jobs_main.db"))
+    runner = UploadJobRunner(service=service, store=store, workers=1)
+    runner.POLL_SECONDS = 0.05
+    yield runner
+    runner.stop()
+
+
+def spool_csv(spool, tmp_path, text, user_id=1):
+    """Spool CSV text the way the /api/uploads route does"""
+    handle = spool.incoming_file()
+    handle.write(text.encode("utf-8"))
+    handle.close()
+    return spool.register(handle.name, "jobs.csv", user_id)["token"]
+
+
+def wait_for(runner, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = runner.store.get_job(job_id)
+        if job["status"] in TERMINAL_JOB_STATUSES:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish: {job}")
+
+
+def count_posts(runner):
+    with sqlite3.connect(runner.service.db.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+
+class TestUploadJobStore:
+    """Tests for the job table"""
+
+    def test_claim_progress_and_finish(self, store):
+        """A queued job is claimed once and reports capped progress"""
+        job_id = store.create_job(1, "t" * 32, "a.csv", "A", total_rows=200)
+
+        job = store.claim_next_job("w1", stale_after=60, max_attempts=3)
+        assert job["id"] == job_id and job["status"] == "running"
+        assert store.claim_next_job("w2", stale_after=60, max_attempts=3) is None
+
+        assert store.report_progress(job_id, 100, upload_id=7) is False
+        assert store.get_job(job_id)["progress"] == 50
+        store.finish_job(job_id, "completed", "done", {"new_records": 200})
+
+        job = store.get_job(job_id, user_id=1)
+        assert job["progress"] == 100 and job["upload_id"] == 7
+        assert job["result"] == {"new_records": 200}
+        assert store.get_job(job_id, user_id=2) is None
+
+    def test_cancel(self, store):
+        """Queued jobs cancel at once; running jobs see the flag on their next report"""
+        running = store.create_job(1, "t" * 32, "a.csv", "A")
+        store.claim_next_job("w1", stale_after=60, max_attempts=3)
+        queued = store.create_job(1, "u" * 32, "b.csv", "B")
+
+        assert store.request_cancel(running, user_id=2) is False
+        assert store.request_cancel(queued, user_id=1)
+        assert store.request_cancel(running, user_id=1)
+
+        assert store.get_job(queued)["status"] == "cancelled"
+        assert store.report_progress(running, 10) is True
+
+    def test_interrupted_job_is_reclaimed(self, store):
+        """A running job whose worker stopped reporting is picked up again"""
+        job_id = store.create_job(1, "t" * 32, "a.csv", "A")
+        store.claim_next_job("dead-worker", stale_after=60, max_attempts=3)
+
+        assert store.claim_next_job("w2", stale_after=60, max_attempts=3) is None
+        job = store.claim_next_job("w2", stale_after=-1, max_attempts=3)
+
+        assert job["id"] == job_id
+        assert job["worker"] == "w2" and job["attempts"] == 2
+
+    def test_repeatedly_interrupted_job_fails(self, store):
+        """Jobs that keep killing their worker are failed, not retried forever"""
+        job_id = store.create_job(1, "t" * 32, "a.csv", "A")
+        store.claim_next_job("w1", stale_after=60, max_attempts=1)
+
+        assert store.claim_next_job("w2", stale_after=-1, max_attempts=1) is None
+        assert store.get_job(job_id)["status"] == "failed"
+
+    def test_one_running_job_at_a_time(self, store):
+        """Queued jobs wait while any worker has a job running"""
+        first = store.create_job(1, "t" * 32, "a.csv", "A")
+        second = store.create_job(2, "u" * 32, "b.csv", "B")
+        store.claim_next_job("w1", stale_after=60, max_attempts=3)
+
+        assert store.claim_next_job("w2", stale_after=60, max_attempts=3) is None
+
+        store.finish_job(first, "completed", "done")
+        assert store.claim_next_job("w2", stale_after=60, max_attempts=3)["id"] == second
+
+    def test_count_data_rows(self, tmp_path):
+        path = tmp_path / "rows.csv"
+        path.write_text(forum_csv(5))
+        assert count_data_rows(str(path)) == 5
+        path.write_text("a,b\n1,2")
+        assert count_data_rows(str(path)) == 1
+
+
+class TestUploadJobRunner:
+    """Tests for background processing of spooled uploads"""
+
+    def test_submit_returns_immediately_and_completes(self, runner, spool, tmp_path):
+        """Submitting queues a job that a worker ingests in the background"""
+        token = spool_csv(spool, tmp_path, forum_csv(12))
+
+        queued = runner.submit(token, "Jobs", expected_type="forum_data", user_id=1)
+        assert queued["success"]
+        assert runner.store.get_job(queued["job_id"])["total_rows"] == 12
+
+        job = wait_for(runner, queued["job_id"])
+
+        assert job["status"] == "completed", job["message"]
+        assert job["progress"] == 100
+        assert job["result"]["new_records"] == 12
+        assert count_posts(runner) == 12
+        assert spool.resolve(token, 1) is None
+
+    def test_failed_validation_marks_job_failed(self, runner, spool, tmp_path):
+        """Validation errors end the job as failed with the upload message"""
+        token = spool_csv(spool, tmp_path, "a,b\n1,2\n")
+
+        job_id = runner.submit(token, "Bad", expected_type="forum_data", user_id=1)[
+            "job_id"
+        ]
+        job = wait_for(runner, job_id)
+
+        assert job["status"] == "failed"
+        assert job["result"]["success"] is False
+
+    def test_cancel_running_job_rolls_back(self, runner, spool, tmp_path, monkeypatch):
+        """Cancelling mid-upload keeps no rows and no empty upload record"""
+        monkeypatch.setattr(UploadService, "CSV_CHUNK_ROWS", 5)
+        token = spool_csv(spool, tmp_path, forum_csv(20))
+        job_id = runner.store.create_job(1, token, "jobs.csv", "Cancel", None, None, 20)
+        job = runner.store.claim_next_job("w1", stale_after=60, max_attempts=3)
+        runner.store.request_cancel(job_id, user_id=1)
+
+        runner.run_job(job)
+
+        job = runner.store.get_job(job_id)
+        assert job["status"] == "cancelled"
+        assert count_posts(runner) == 0
+        assert runner.service.db.get_all_uploads(user_id=1) == []
+
+    def test_failed_job_records_and_discards_its_upload(
+        self, runner, spool, tmp_path, monkeypatch
+    ):
+        """The job knows its upload before any row lands and drops it on failure"""
+        token = spool_csv(spool, tmp_path, forum_csv(5))
+        job_id = runner.store.create_job(1, token, "jobs.csv", "Crash", None, None, 5)
+        job = runner.store.claim_next_job("w1", stale_after=60, max_attempts=3)
+
+        recorded = []
+
+        def crash(upload_id, *args, **kwargs):
+            recorded.append((runner.store.get_job(job_id)["upload_id"], upload_id))
+            raise RuntimeError("worker lost the database")
+
+        monkeypatch.setattr(runner.service.db, "upload_csv_stream", crash)
+
+        runner.run_job(job)
+
+        (stored, upload_id), = recorded
+        assert stored == upload_id
+        assert runner.store.get_job(job_id)["status"] == "failed"
+        assert runner.service.db.get_all_uploads(user_id=1) == []
+
+    def test_heartbeat_covers_the_whole_job(self, runner, monkeypatch):
+        """The heartbeat keeps ticking while the ingest reports no progress"""
+        runner.HEARTBEAT_SECONDS = 0.05
+        job_id = runner.store.create_job(1, "t" * 32, "a.csv", "Slow")
+        job = runner.store.claim_next_job("w1", stale_after=60, max_attempts=3)
+        beats = []
+
+        def slow_upload(*args, **kwargs):
+            time.sleep(0.3)
+            beats.append(runner.store.get_job(job_id)["heartbeat_at"])
+            return {"success": True, "message": "done"}
+
+        monkeypatch.setattr(runner.service, "process_spooled_upload", slow_upload)
+
+        runner.run_job(job)
+
+        assert beats[0] > job["heartbeat_at"]
+        assert runner.store.get_job(job_id)["status"] == "completed"
+
+    def test_unknown_token_not_queued(self, runner):
+        result = runner.submit("x" * 32, "Gone", user_id=1)
+
+        assert result["success"] is False
+        assert "not found" in result["message"]
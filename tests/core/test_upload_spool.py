@@ -0,0 +1,352 @@
+"""
+Upload Spool Test Suite
+
+Covers the /api/uploads route that streams multipart uploads to disk, the
+token-addressed UploadSpool, processing a spooled file from a callback, and
+skipping files the user has already uploaded.
+"""
+
+import base64
+import io
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+from dash import Dash, html
+
+from utilities.mrpc_database import MRPCDatabase
+from utilities.upload_routes import register_upload_routes
+from utilities.upload_service import UploadService
+from utilities.upload_spool import UploadSpool
+
+
+def forum_csv(rows):
+    """Forum CSV text with the columns validate_csv_structure expects"""
+    frame = pd.DataFrame(
+        {
+            "forum": "cervical",
+            "original_title": [f"Title {i}" for i in range(rows)],
+            "original_post": [f"Body {i}" for i in range(rows)],
+            "LLM_inferred_question": [f"Question {i}?" for i in range(rows)],
+            "umap_x": 0.1,
+            "umap_y": 0.2,
+            "umap_z": 0.3,
+        }
+    )
+    return frame.to_csv(index=False)
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    """Spool in a temporary directory, used by the route and the service"""
+    spool = UploadSpool(str(tmp_path / "spool"))
+    monkeypatch.setattr("utilities.upload_routes.upload_spool", spool)
+    monkeypatch.setattr("utilities.upload_service.upload_spool", spool)
+    return spool
+
+
+@pytest.fixture
+def client(spool, monkeypatch):
+    """Flask test client for an app with the upload route, signed in as user 1"""
+    monkeypatch.setattr("utilities.upload_routes.get_current_user_id", lambda: 1)
+    app = Dash(__name__)
+    app.layout = html.Div()
+    register_upload_routes(app)
+    return app.server.test_client()
+
+
+def post_file(client, text, filename="data.csv"):
+    return client.post(
+        "/api/uploads",
+        data={"file": (io.BytesIO(text.encode("utf-8")), filename)},
+        content_type="multipart/form-data",
+    )
+
+
+def spool_files(spool):
+    return sorted(os.listdir(spool.directory)) if os.path.isdir(spool.directory) else []
+
+
+class TestUploadRoute:
+    """Tests for the /api/uploads endpoint"""
+
+    def test_upload_is_spooled_under_token(self, client, spool):
+        """The file lands on disk once and the response carries only a token"""
+        text = forum_csv(3)
+        response = post_file(client, text)
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["success"] and body["filename"] == "data.csv"
+        assert body["size"] == len(text.encode("utf-8"))
+        assert "Title" not in response.get_data(as_text=True)
+
+        spooled = spool.resolve(body["token"], 1)
+        with open(spooled["path"], encoding="utf-8") as f:
+            assert f.read() == text
+        # Only the spooled file and its metadata - no leftover incoming parts
+        assert len(spool_files(spool)) == 2
+
+    def test_unauthenticated_upload_rejected(self, client, spool, monkeypatch):
+        """Requests without a signed-in user get 401 and write nothing"""
+        monkeypatch.setattr("utilities.upload_routes.get_current_user_id", lambda: None)
+
+        response = post_file(client, forum_csv(1))
+
+        assert response.status_code == 401
+        assert spool_files(spool) == []
+
+    def test_missing_file_field(self, client, spool):
+        """A multipart body without a 'file' part is a bad request"""
+        response = client.post(
+            "/api/uploads",
+            data={"other": (io.BytesIO(b"x"), "x.csv")},
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 400
+        assert spool_files(spool) == []
+
+    def test_oversized_upload_rejected(self, client, spool, monkeypatch):
+        """Bodies over MAX_UPLOAD_BYTES get a 413 and leave nothing on disk"""
+        monkeypatch.setattr("utilities.upload_routes.MAX_UPLOAD_BYTES", 100)
+
+        response = post_file(client, forum_csv(20))
+
+        assert response.status_code == 413
+        assert "too large" in response.get_json()["message"]
+        assert spool_files(spool) == []
+
+
+class TestUploadSpool:
+    """Tests for UploadSpool token handling"""
+
+    def test_tokens_are_private_to_their_owner(self, client, spool):
+        """Another user (or a malformed token) cannot resolve the upload"""
+        token = post_file(client, forum_csv(1)).get_json()["token"]
+
+        assert spool.resolve(token, 1) is not None
+        assert spool.resolve(token, 2) is None
+        assert spool.resolve("../" + token, 1) is None
+
+    def test_purge_expired(self, client, spool):
+        """Old spool files are removed"""
+        post_file(client, forum_csv(1))
+
+        assert spool.purge_expired(max_age=-1) == 2
+        assert spool_files(spool) == []
+
+
+class TestProcessSpooledUpload:
+    """Tests for UploadService.process_spooled_upload / preview_spooled_upload"""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("utilities.upload_service.get_current_user_id", lambda: 1)
+        service = UploadService()
+        service.db = MRPCDatabase(str(tmp_path / "spooled.db"))
+        return service
+
+    def test_preview_reads_spooled_file(self, client, service):
+        """The preview is built from the spooled file"""
+        token = post_file(client, forum_csv(4)).get_json()["token"]
+
+        preview = service.preview_spooled_upload(token, rows=2)
+
+        assert preview["success"] and preview["is_valid"]
+        assert preview["total_rows"] == 4
+        assert preview["detected_type"] == "forum_data"
+        assert len(preview["preview_data"]) == 2
+
+    def test_preview_parses_only_the_head(self, client, service, monkeypatch):
+        """Rows are counted from newlines; only the sample is parsed and validated"""
+        monkeypatch.setattr(UploadService, "PREVIEW_SAMPLE_ROWS", 10)
+        parsed = []
+        read_csv = pd.read_csv
+
+        def tracking_read_csv(*args, **kwargs):
+            frame = read_csv(*args, **kwargs)
+            parsed.append(len(frame))
+            return frame
+
+        monkeypatch.setattr("utilities.upload_service.pd.read_csv", tracking_read_csv)
+        token = post_file(client, forum_csv(50)).get_json()["token"]
+
+        preview = service.preview_spooled_upload(token, rows=3)
+
+        assert parsed == [10]
+        assert preview["total_rows"] == 50 and preview["is_valid"]
+        assert len(preview["preview_data"]) == 3
+
+    def test_preview_validates_transcriptions_as_transcriptions(self, client, service):
+        text = pd.DataFrame(
+            {"session_id": ["S1"], "participant_id": ["P1"], "zoom_ease": [True]}
+        ).to_csv(index=False)
+        token = post_file(client, text).get_json()["token"]
+
+        preview = service.preview_spooled_upload(token)
+
+        assert preview["detected_type"] == "transcription_data"
+        assert preview["is_valid"] is False
+        assert "Missing required columns" in preview["validation_errors"][0]
+
+    def test_base64_preview_counts_unterminated_last_row(self, service):
+        encoded = base64.b64encode(forum_csv(7).rstrip("\n").encode()).decode()
+
+        preview = service.preview_csv(f"data:text/csv;base64,{encoded}", rows=2)
+
+        assert preview["total_rows"] == 7 and preview["is_valid"]
+        assert [row["original_title"] for row in preview["preview_data"]] == [
+            "Title 0",
+            "Title 1",
+        ]
+
+    def test_ingests_and_discards_spool(self, client, spool, service):
+        """A successful upload stores the rows and deletes the spooled file"""
+        token = post_file(client, forum_csv(6), "six.csv").get_json()["token"]
+
+        result = service.process_spooled_upload(
+            token, "Six", expected_type="forum_data"
+        )
+
+        assert result["success"], result["message"]
+        assert result["new_records"] == 6
+        assert service.db.get_upload_by_id(result["upload_id"])["filename"] == "six.csv"
+        with sqlite3.connect(service.db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 6
+        assert spool_files(spool) == []
+
+    def test_failed_upload_keeps_spool_for_retry(self, client, spool, service):
+        """A type mismatch leaves the file so the form can be resubmitted"""
+        token = post_file(client, forum_csv(2)).get_json()["token"]
+
+        result = service.process_spooled_upload(
+            token, "Wrong", expected_type="transcription_data"
+        )
+
+        assert result["success"] is False
+        assert spool.resolve(token, 1) is not None
+
+    def test_unknown_token(self, service, spool):
+        """Expired or foreign tokens produce a clear message"""
+        result = service.process_spooled_upload("x" * 32, "Gone")
+
+        assert result["success"] is False
+        assert "not found" in result["message"]
+
+
+class TestIdenticalUploads:
+    """Tests for short-circuiting re-uploads of the same file"""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("utilities.upload_service.get_current_user_id", lambda: 1)
+        service = UploadService()
+        service.db = MRPCDatabase(str(tmp_path / "identical.db"))
+        return service
+
+    def test_reupload_is_not_parsed(self, client, spool, service, monkeypatch):
+        """The same bytes again report the earlier upload without reading the CSV"""
+        text = forum_csv(5)
+        first = service.process_spooled_upload(
+            post_file(client, text).get_json()["token"], "First"
+        )
+
+        def no_parse(*args, **kwargs):
+            raise AssertionError("identical file was parsed")
+
+        monkeypatch.setattr("utilities.upload_service.pd.read_csv", no_parse)
+        token = post_file(client, text, "again.csv").get_json()["token"]
+        result = service.process_spooled_upload(
+            token, "Again", expected_type="forum_data"
+        )
+
+        assert result["success"] and result["already_uploaded"]
+        assert result["upload_id"] == first["upload_id"]
+        assert "already uploaded as 'First'" in result["message"]
+        assert spool_files(spool) == []
+        assert len(service.db.get_all_uploads()) == 1
+        assert (
+            len(service.db.get_upload_by_id(first["upload_id"])["content_sha256"]) == 64
+        )
+
+    def test_other_type_or_deleted_upload_is_processed(self, client, service):
+        text = forum_csv(3)
+        first = service.process_spooled_upload(
+            post_file(client, text).get_json()["token"], "First"
+        )
+
+        mismatch = service.process_spooled_upload(
+            post_file(client, text).get_json()["token"],
+            "As transcription",
+            expected_type="transcription_data",
+        )
+        assert mismatch["success"] is False and "mismatch" in mismatch["message"]
+
+        with sqlite3.connect(service.db.db_path) as conn:
+            conn.execute(
+                "UPDATE uploads SET status = 'deleted' WHERE id = ?",
+                (first["upload_id"],),
+            )
+        again = service.process_spooled_upload(
+            post_file(client, text).get_json()["token"], "Again"
+        )
+        assert again["success"] and not again.get("already_uploaded")
+
+    def test_failed_upload_can_be_resent(self, client, service, monkeypatch):
+        """An ingest that fails part-way is not reported as already uploaded"""
+        monkeypatch.setattr(UploadService, "CSV_CHUNK_ROWS", 2)
+        text = forum_csv(5)
+        insert = service.db._bulk_insert_posts
+        calls = []
+
+        def flaky_insert(conn, records):
+            calls.append(len(records))
+            if len(calls) == 2:
+                raise sqlite3.OperationalError("database is locked")
+            return insert(conn, records)
+
+        monkeypatch.setattr(service.db, "_bulk_insert_posts", flaky_insert)
+        failed = service.process_spooled_upload(
+            post_file(client, text).get_json()["token"], "Flaky"
+        )
+        assert failed["success"] is False
+        assert service.db.get_all_uploads() == []
+
+        again = service.process_spooled_upload(
+            post_file(client, text).get_json()["token"], "Again"
+        )
+
+        assert again["success"] and not again.get("already_uploaded")
+        assert again["new_records"] == 5
+
+    def test_processing_upload_is_not_a_match(self, service):
+        """An upload that never published does not short-circuit a resend"""
+        upload_id = service.db.create_upload_record(
+            "a.csv", "Stuck", 1, content_sha256="f" * 64
+        )
+        with sqlite3.connect(service.db.db_path) as conn:
+            conn.execute(
+                "UPDATE uploads SET status = 'processing' WHERE id = ?", (upload_id,)
+            )
+
+        assert service.db.find_upload_by_content("f" * 64, 1) is None
+
+    def test_force_is_admin_only(self, service, monkeypatch):
+        """Admins can force re-ingestion; other users still get the short-circuit"""
+        encoded = base64.b64encode(forum_csv(4).encode()).decode()
+        contents = f"data:text/csv;base64,{encoded}"
+        service.process_file_upload(contents, "a.csv", "First")
+
+        forced = service.process_file_upload(contents, "a.csv", "Forced", force=True)
+        assert forced["success"] and not forced.get("already_uploaded")
+        assert forced["new_records"] == 4 and forced["duplicates_skipped"] == 0
+        with sqlite3.connect(service.db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 8
+
+        monkeypatch.setattr("utilities.upload_service.get_current_user_id", lambda: 2)
+        service.process_file_upload(contents, "a.csv", "Mine")
+        result = service.process_file_upload(contents, "a.csv", "Again", force=True)
+        assert result["already_uploaded"]
+        assert "'Mine'" in result["message"]
@@ -0,0 +1,213 @@
+"""
+Write Queue and Storage Profile Test Suite
+
+Covers the single-writer queue (batching, per-job isolation), the
+coalescing buffer for bursts of small writes and the "concurrent" storage
+profile used for multi-worker deployments.
+"""
+
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from utilities.connection_pool import close_all_pools
+from utilities.mrpc_database import MRPCDatabase
+from utilities.write_queue import (
+    CoalescingBuffer,
+    WriteQueue,
+    close_all_write_queues,
+)
+
+
+@pytest.fixture(autouse=True)
+def mock_auth_functions():
+    """Automatically mock authentication functions for all tests in this module."""
+    with patch("utilities.auth.get_current_user_id", return_value=1):
+        yield
+
+
+@pytest.fixture
+def db_path():
+    """Temporary database path with pools and writer threads shut down afterwards"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = str(Path(temp_dir) / "write_queue_test.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE items (v INTEGER UNIQUE)")
+        yield path
+        close_all_write_queues()
+        close_all_pools()
+
+
+class TestWriteQueue:
+    """Unit tests for WriteQueue"""
+
+    def test_jobs_commit_and_return_results(self, db_path):
+        """execute() returns the job result after the write is committed"""
+        write_queue = WriteQueue(db_path)
+        try:
+            rowid = write_queue.execute(
+                lambda conn: conn.execute("INSERT INTO items VALUES (1)").lastrowid
+            )
+        finally:
+            write_queue.close()
+
+        assert rowid == 1
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+    def test_concurrent_writes_are_batched(self, db_path):
+        """Writes submitted together share transactions"""
+        write_queue = WriteQueue(db_path, max_delay=0.02)
+        start = threading.Event()
+
+        def writer(value):
+            start.wait()
+            write_queue.execute(
+                lambda conn: conn.execute("INSERT INTO items VALUES (?)", (value,))
+            )
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(20)]
+        try:
+            for t in threads:
+                t.start()
+            start.set()
+            for t in threads:
+                t.join()
+        finally:
+            write_queue.close()
+
+        assert write_queue.stats["jobs"] == 20
+        assert write_queue.stats["batches"] < 20
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 20
+
+    def test_failed_job_does_not_affect_batch(self, db_path):
+        """A failing job is rolled back on its own; other jobs still commit"""
+        write_queue = WriteQueue(db_path, max_delay=0.05)
+        try:
+            ok_first = write_queue.submit(
+                lambda conn: conn.execute("INSERT INTO items VALUES (1)")
+            )
+            duplicate = write_queue.submit(
+                lambda conn: conn.execute("INSERT INTO items VALUES (1)")
+            )
+            ok_second = write_queue.submit(
+                lambda conn: conn.execute("INSERT INTO items VALUES (2)")
+            )
+
+            ok_first.result(timeout=5)
+            ok_second.result(timeout=5)
+            with pytest.raises(sqlite3.IntegrityError):
+                duplicate.result(timeout=5)
+        finally:
+            write_queue.close()
+
+        with sqlite3.connect(db_path) as conn:
+            values = [row[0] for row in conn.execute("SELECT v FROM items ORDER BY v")]
+        assert values == [1, 2]
+        assert write_queue.stats["jobs"] == 2
+        assert write_queue.stats["failed"] == 1
+
+    def test_nested_job_runs_inline(self, db_path):
+        """A job that queues another write doesn't wait on its own writer thread"""
+        write_queue = WriteQueue(db_path)
+
+        def outer(conn):
+            conn.execute("INSERT INTO items VALUES (1)")
+            return write_queue.execute(
+                lambda inner: inner.execute("INSERT INTO items VALUES (2)").rowcount,
+                timeout=1,
+            )
+
+        try:
+            assert write_queue.execute(outer, timeout=5) == 1
+        finally:
+            write_queue.close()
+
+        assert write_queue.stats["jobs"] == 1
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2
+
+
+class TestCoalescingBuffer:
+    """Unit tests for CoalescingBuffer"""
+
+    def test_items_flush_together_after_delay(self):
+        """Items added within the window reach flush_fn as one ordered batch"""
+        batches = []
+        flushed = threading.Event()
+        buffer = CoalescingBuffer(
+            lambda items: (batches.append(items), flushed.set()), max_delay=0.05
+        )
+
+        for i in range(5):
+            buffer.add(i)
+
+        assert flushed.wait(5)
+        assert batches == [[0, 1, 2, 3, 4]]
+        assert buffer.pending == 0
+
+    def test_full_buffer_flushes_immediately(self):
+        """Reaching max_items flushes without waiting for the timer"""
+        batches = []
+        buffer = CoalescingBuffer(batches.append, max_items=3, max_delay=60)
+
+        for i in range(4):
+            buffer.add(i)
+
+        assert batches == [[0, 1, 2]]
+        assert buffer.pending == 1
+        assert buffer.flush() == 1
+        assert batches == [[0, 1, 2], [3]]
+
+    def test_flush_errors_reach_the_caller(self):
+        """An explicit flush re-raises and counts the lost items"""
+
+        def fail(items):
+            raise sqlite3.OperationalError("database is locked")
+
+        buffer = CoalescingBuffer(fail, max_delay=60)
+        buffer.add("click")
+
+        with pytest.raises(sqlite3.OperationalError):
+            buffer.flush()
+        assert buffer.stats["failed"] == 1 and buffer.pending == 0
+
+
+class TestStorageProfiles:
+    """Tests for MRPCDatabase storage profiles"""
+
+    def test_unknown_profile_rejected(self, db_path):
+        """An unknown profile name fails loudly"""
+        with pytest.raises(ValueError):
+            MRPCDatabase(db_path, storage_profile="turbo")
+
+    def test_default_profile_writes_directly(self, db_path):
+        """The default profile keeps the rollback journal and no writer thread"""
+        db = MRPCDatabase(db_path, storage_profile="default")
+
+        assert db._write_queue is None
+        with db._connect() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    def test_concurrent_profile_uses_wal_and_write_queue(self, db_path):
+        """The concurrent profile enables WAL and routes saves through the queue"""
+        db = MRPCDatabase(db_path, storage_profile="concurrent")
+        with db._connect() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+            conn.execute(
+                "INSERT INTO posts (id, forum, original_title, post_url) "
+                "VALUES ('wq_post', 'cervical', 'Queued', 'http://example.com/wq')"
+            )
+
+        assert db.save_user_question("wq_post", "q1", "Queued question", "notes")
+        assert db._write_queue.stats["jobs"] == 1
+
+        questions = db.get_user_questions("wq_post")
+        assert [q["question_text"] for q in questions] == ["Queued question"]